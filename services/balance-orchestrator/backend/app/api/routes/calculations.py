@@ -1,56 +1,69 @@
-import json
+import re
+from urllib.parse import urlencode
 
 import gitlab.exceptions
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from app.core.gitlab_adapter import gitlab_client
-from app.schemas.calculation import CalculationSaveRequest
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.commit_buffer import commit_buffer
+from app.core.serialization import dumps_pretty, load_result, loads, result_files, stored_tables
+from app.schemas.calculation import CalculationSaveRequest, CalculationSubmitRequest
 
 
 router = APIRouter(prefix="/calculations", tags=["Calculations"])
 
 
+async def _task_branch(task_iid: int, project_id: int) -> str:
+    # Ищем РЕАЛЬНУЮ ветку задачи (Умный поиск); без ветки сохранять некуда
+    branch_name = await gitlab_client.find_branch_by_issue_iid(task_iid, project_id)
+    if not branch_name:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ветка для задачи #{task_iid} не найдена в GitLab. Убедитесь, что работа над задачей начата."
+        )
+    return branch_name
+
+
 @router.post("/save")
 async def save_calculation_result(req: CalculationSaveRequest):
     """
     Сохраняет результаты расчёта в ветку задачи.
+
+    Частые сохранения объединяются в один коммит (окно CALC_COMMIT_WINDOW секунд):
+    ответ со статусом 'pending' означает, что данные приняты и будут закоммичены.
+    С submit=true (или при отключённом окне) коммит создаётся сразу — статус 'saved'.
     """
     try:
-        # 1. Ищем РЕАЛЬНУЮ ветку задачи (Умный поиск)
-        # Передаем project_id, так как мы теперь в мульти-репо
-        branch_name = gitlab_client.find_branch_by_issue_iid(req.task_iid, req.project_id)
-
-        # Строгая проверка: если ветка не найдена, немедленно возвращаем ошибку
-        if not branch_name:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Ветка для задачи #{req.task_iid} не найдена в GitLab. Убедитесь, что работа над задачей начата."
-            )
+        # 1. Ищем ветку задачи (project_id — мы в мульти-репо)
+        branch_name = await _task_branch(req.task_iid, req.project_id)
 
         print(f"💾 Сохраняем в ветку: {branch_name} (Проект ID: {req.project_id})")
 
         # 2. Формируем фиксированный путь (перезаписываем файлы для работы Git Diff)
         base_path = f"calculations/{req.app_type}/current"
 
-        # 3. Готовим файлы
+        # 3. Готовим файлы (большие таблицы результата — в NDJSON рядом со сводкой result.json)
         files_to_commit = {
-            f"{base_path}/input.json": json.dumps(req.input_data, indent=2, ensure_ascii=False),
-            f"{base_path}/result.json": json.dumps(req.output_data, indent=2, ensure_ascii=False)
+            f"{base_path}/input.json": dumps_pretty(req.input_data),
+            **result_files(base_path, req.output_data),
         }
 
-        # 4. Коммитим (с указанием project_id!)
-        commit = gitlab_client.create_commit_multiple(
-            files=files_to_commit,
-            commit_message=f"Calc Result: {req.commit_message}",
-            branch=branch_name,
-            project_id=req.project_id # <--- Важно!
-        )
+        # 4. Кладём в буфер ветки; для каждого пути остаётся последнее содержимое
+        state = commit_buffer.stage(req.project_id, branch_name, files_to_commit, req.commit_message)
+        if not (req.submit or commit_buffer.window <= 0):
+            return {"status": "pending", "path": base_path, "branch": branch_name, "pending": state}
+
+        # 5. Коммитим сразу (вместе с накопленными ранее сохранениями ветки)
+        commit = await commit_buffer.flush(req.project_id, branch_name)
 
         return {
             "status": "saved",
-            "commit_id": commit.id,
+            "commit_id": commit.commit_id,
             "path": base_path,
-            "web_url": commit.web_url
+            "web_url": commit.web_url,
+            "pending": commit_buffer.state(req.project_id, branch_name),
         }
 
     except gitlab.exceptions.GitlabAuthenticationError:
@@ -66,31 +79,100 @@ async def save_calculation_result(req: CalculationSaveRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/submit")
+async def submit_calculation_results(req: CalculationSubmitRequest):
+    """
+    Коммитит накопленные сохранения ветки задачи сразу, не дожидаясь окна объединения.
+    """
+    try:
+        branch_name = await _task_branch(req.task_iid, req.project_id)
+        commit = await commit_buffer.flush(req.project_id, branch_name)
+    except gitlab.exceptions.GitlabAuthenticationError:
+        raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
+    except gitlab.exceptions.GitlabGetError:
+        raise HTTPException(status_code=404, detail="Объект не найден в GitLab")
+    except gitlab.exceptions.GitlabError as e:
+        raise HTTPException(status_code=502, detail=f"Ошибка GitLab API: {e}")
+
+    return {
+        "status": "saved" if commit else "nothing_to_commit",
+        "commit_id": commit.commit_id if commit else None,
+        "web_url": commit.web_url if commit else None,
+        "pending": commit_buffer.state(req.project_id, branch_name),
+    }
+
+
+@router.get("/pending")
+async def get_pending_state(task_iid: int = Query(...), project_id: int = Query(...)):
+    """
+    Состояние буфера сохранений ветки задачи: есть ли незакоммиченные изменения,
+    через сколько секунд они будут закоммичены, последний коммит и ошибка.
+    """
+    try:
+        branch_name = await gitlab_client.find_branch_by_issue_iid(task_iid, project_id)
+    except gitlab.exceptions.GitlabError as e:
+        raise HTTPException(status_code=502, detail=f"Ошибка GitLab API: {e}")
+    if not branch_name:
+        return {"found": False, "reason": "Branch not found"}
+    return {"found": True, "branch": branch_name, **commit_buffer.state(project_id, branch_name)}
+
+
 @router.get("/latest")
-async def get_latest_calculation(task_iid: int = Query(...), app_type: str = Query(...), project_id: int = Query(...)):
+async def get_latest_calculation(task_iid: int = Query(...), app_type: str = Query(...), project_id: int = Query(...),
+                                 inline_tables: bool = Query(False)):
     """
     Возвращает данные последнего расчёта для гидрации формы.
     Читает из фиксированного пути calculations/{app_type}/current/
+
+    Большой результат отдаётся сводкой (как в result.json): таблицы не читаются,
+    в 'tables' — ссылки на /latest/tables/{name}, откуда клиент получает их потоком
+    и подставляет на место сводок (WsaWrapper.restoreState).
+    inline_tables=true собирает таблицы в ответ целиком (весь результат в памяти).
     """
     try:
         # 1. Ищем РЕАЛЬНУЮ ветку задачи (Умный поиск)
-        branch_name = gitlab_client.find_branch_by_issue_iid(task_iid, project_id)
+        branch_name = await gitlab_client.find_branch_by_issue_iid(task_iid, project_id)
 
         if not branch_name:
             return {"found": False, "reason": "Branch not found"}
 
-        # 2. Читаем файлы напрямую из фиксированного пути
+        # 2. Читаем оба файла из фиксированного пути одним пакетным запросом
         base_path = f"calculations/{app_type}/current"
-        input_content = gitlab_client.get_file_content_decoded(f"{base_path}/input.json", ref=branch_name, project_id=project_id)
-        result_content = gitlab_client.get_file_content_decoded(f"{base_path}/result.json", ref=branch_name, project_id=project_id)
+        input_path, result_path = f"{base_path}/input.json", f"{base_path}/result.json"
+        # Отложенные сохранения сначала коммитятся; если GitLab недоступен — берутся из буфера
+        pending = await commit_buffer.flush_for_read(project_id, branch_name)
+        missing = [path for path in (input_path, result_path) if path not in pending]
+        files = await gitlab_client.get_files(missing, ref=branch_name, project_id=project_id) if missing else {}
+        files.update(pending)
+        input_content, result_content = files.get(input_path), files.get(result_path)
 
         if not input_content:
             return {"found": False, "reason": "Files missing"}
 
+        output_data = loads(result_content) if result_content else None
+        tables = stored_tables(output_data)
+        if tables and inline_tables:
+            # Таблицы из NDJSON-файлов читаются одним пакетным запросом
+            table_paths = [f"{base_path}/{name}" for name in tables]
+            missing = [path for path in table_paths if path not in pending]
+            table_files = await gitlab_client.get_files(missing, ref=branch_name, project_id=project_id) if missing else {}
+            table_files.update(pending)
+
+            async def read_table(name: str) -> str | None:
+                return table_files.get(f"{base_path}/{name}")
+
+            return {
+                "found": True,
+                "input_data": loads(input_content),
+                "output_data": await load_result(output_data, read_table),
+            }
+
+        query = urlencode({"task_iid": task_iid, "app_type": app_type, "project_id": project_id})
         return {
             "found": True,
-            "input_data": json.loads(input_content),
-            "output_data": json.loads(result_content) if result_content else None
+            "input_data": loads(input_content),
+            "output_data": output_data,
+            "tables": {name: f"/api/v1{router.prefix}/latest/tables/{name}?{query}" for name in tables},
         }
 
     except gitlab.exceptions.GitlabAuthenticationError:
@@ -103,3 +185,34 @@ async def get_latest_calculation(task_iid: int = Query(...), app_type: str = Que
         print(f"Error getting calc: {e}")
         # Не падаем с ошибкой, а просто говорим "данных нет", чтобы форма открылась пустой
         return {"found": False, "error": str(e)}
+
+
+_TABLE_NAME = re.compile(r"^[\w.-]+\.ndjson$")
+
+
+@router.get("/latest/tables/{name}")
+async def stream_result_table(name: str, task_iid: int = Query(...), app_type: str = Query(...),
+                              project_id: int = Query(...)):
+    """
+    Таблица большого результата (файл NDJSON из сводки result.json) потоком из GitLab:
+    одна строка — одна точка, файл целиком в памяти оркестратора не собирается.
+    """
+    if not _TABLE_NAME.match(name):
+        raise HTTPException(status_code=400, detail=f"Некорректное имя таблицы: {name}")
+    path = f"calculations/{app_type}/current/{name}"
+    try:
+        branch_name = await _task_branch(task_iid, project_id)
+        pending = (await commit_buffer.flush_for_read(project_id, branch_name)).get(path)
+        if pending is not None:
+            # Коммит буфера не удался — отдаём из буфера сохранений
+            return StreamingResponse(iter([pending.encode()]), media_type="application/x-ndjson")
+        response = await gitlab_client.open_file_stream(path, ref=branch_name, project_id=project_id)
+    except gitlab.exceptions.GitlabAuthenticationError:
+        raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
+    except gitlab.exceptions.GitlabGetError:
+        raise HTTPException(status_code=404, detail=f"Таблица {name} не найдена")
+    except gitlab.exceptions.GitlabError as e:
+        raise HTTPException(status_code=502, detail=f"Ошибка GitLab API: {e}")
+
+    return StreamingResponse(response.aiter_bytes(), media_type="application/x-ndjson",
+                             background=BackgroundTask(response.aclose))
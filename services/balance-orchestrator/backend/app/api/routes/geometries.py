@@ -1,28 +1,32 @@
 # api/routes/geometries.py
-import json
-
 import gitlab.exceptions
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Response
 
-from app.core.gitlab_adapter import gitlab_client
-from app.schemas.geometry import GeometriesManifest, GeometryInfo
+from app.core.geometry_store import geometry_store
+from app.schemas.geometry import GeometryInfo
 
 
 router = APIRouter(prefix="/geometries", tags=["Geometries"])
 
 
+def _etag(blob_id: str) -> str:
+    return f'"{blob_id}"'
+
+
+def _not_modified(etag: str, if_none_match: str | None) -> bool:
+    return if_none_match is not None and etag in {tag.strip() for tag in if_none_match.split(",")}
+
+
 @router.get("", response_model=list[GeometryInfo])
-async def list_geometries():
-    """Получить список всех доступных геометрий"""
+async def list_geometries(response: Response, if_none_match: str | None = Header(None)):
+    """Получить список всех доступных геометрий (ETag — blob sha манифеста)"""
     try:
-        project = gitlab_client.get_project()
-        file = project.files.get(
-            file_path="geometries/geometries_manifest.json",
-            ref=gitlab_client.default_branch
-        )
-        content = file.decode().decode("utf-8")
-        manifest = GeometriesManifest.model_validate_json(content)
-        return manifest.geometries
+        snapshot = await geometry_store.manifest()
+        etag = _etag(snapshot.blob_id)
+        if _not_modified(etag, if_none_match):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return snapshot.manifest.geometries
     except gitlab.exceptions.GitlabAuthenticationError:
         raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
     except gitlab.exceptions.GitlabGetError:
@@ -34,35 +38,19 @@ async def list_geometries():
 
 
 @router.get("/{geometry_id}")
-async def get_geometry(geometry_id: str):
-    """Получить полную геометрию по ID"""
+async def get_geometry(geometry_id: str, response: Response, if_none_match: str | None = Header(None)):
+    """Получить полную геометрию по ID (ETag — blob sha файла геометрии)"""
     try:
-        # Сначала находим файл в манифесте
-        project = gitlab_client.get_project()
-        manifest_file = project.files.get(
-            file_path="geometries/geometries_manifest.json",
-            ref=gitlab_client.default_branch
-        )
-        manifest = GeometriesManifest.model_validate_json(
-            manifest_file.decode().decode("utf-8")
-        )
-
-        # Ищем геометрию по ID
-        geometry_info = next(
-            (g for g in manifest.geometries if g.id == geometry_id),
-            None
-        )
-        if not geometry_info:
+        # Манифест и файл берутся из кеша, пока голова дефолтной ветки не сменилась
+        geometry = await geometry_store.geometry(geometry_id)
+        if geometry is None:
             raise HTTPException(status_code=404, detail=f"Геометрия {geometry_id} не найдена")
 
-        # Читаем файл геометрии
-        geometry_file = project.files.get(
-            file_path=geometry_info.file,
-            ref=gitlab_client.default_branch
-        )
-        geometry_data = json.loads(geometry_file.decode().decode("utf-8"))
-
-        return geometry_data
+        etag = _etag(geometry.blob_id)
+        if _not_modified(etag, if_none_match):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return geometry.data
 
     except gitlab.exceptions.GitlabAuthenticationError:
         raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
@@ -1,6 +1,8 @@
 # api/routes/health.py
 from fastapi import APIRouter
 
+from app.core.cache import cache_stats
+
 
 router = APIRouter(tags=["Health"])
 
@@ -9,3 +11,9 @@ router = APIRouter(tags=["Health"])
 async def health_check():
     """Проверка работоспособности сервиса"""
     return {"status": "ok", "service": "balance-orchestrator"}
+
+
+@router.get("/health/caches")
+async def caches_health():
+    """Метрики кешей GitLab: размер, попадания, промахи, загрузки"""
+    return cache_stats()
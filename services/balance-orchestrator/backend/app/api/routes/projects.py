@@ -2,7 +2,7 @@
 import gitlab.exceptions
 from fastapi import APIRouter, HTTPException, Query
 
-from app.core.gitlab_adapter import gitlab_client
+from app.core.async_gitlab_adapter import gitlab_client
 
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/projects", tags=["Projects"])
 async def list_projects(search: str = Query("", description="Поиск по названию проекта")):
     """Список проектов для выбора при создании задачи"""
     try:
-        return gitlab_client.get_user_projects(search)
+        return await gitlab_client.get_user_projects(search)
     except gitlab.exceptions.GitlabAuthenticationError:
         raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
     except gitlab.exceptions.GitlabError as e:
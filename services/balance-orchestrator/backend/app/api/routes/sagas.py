@@ -0,0 +1,58 @@
+# api/routes/sagas.py
+import gitlab.exceptions
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.saga import SagaExecutor, SagaNotFoundError, StepState
+from app.dependencies import get_saga_executor
+from app.schemas.saga import SagaCreateRequest
+
+
+router = APIRouter(prefix="/sagas", tags=["Sagas"])
+
+
+@router.post("", status_code=202)
+async def start_saga(req: SagaCreateRequest, executor: SagaExecutor = Depends(get_saga_executor)):
+    """
+    Запускает многошаговый расчёт в фоне. Ответ — id саги; статус опрашивается GET /sagas/{id}.
+    Результаты всех шагов коммитятся в ветку задачи одним коммитом после завершения расчёта.
+    """
+    try:
+        branch_name = await gitlab_client.find_branch_by_issue_iid(req.task_iid, req.project_id)
+    except gitlab.exceptions.GitlabAuthenticationError:
+        raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
+    except gitlab.exceptions.GitlabError as e:
+        raise HTTPException(status_code=502, detail=f"Ошибка GitLab API: {e}")
+
+    if not branch_name:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ветка для задачи #{req.task_iid} не найдена в GitLab. Убедитесь, что работа над задачей начата."
+        )
+
+    steps = [StepState(name=s.name, service=s.service, payload=s.payload, depends_on=s.depends_on)
+             for s in req.steps]
+    try:
+        saga = await executor.submit(
+            saga_type=req.saga_type,
+            project_id=req.project_id,
+            branch=branch_name,
+            base_path=f"calculations/{req.app_type}/current",
+            commit_message=f"Calc Result: {req.commit_message}",
+            steps=steps,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    print(f"🧩 Сага {saga.id}: {len(steps)} шагов, ветка {branch_name} (Проект ID: {req.project_id})")
+    return saga.to_dict()
+
+
+@router.get("/{saga_id}")
+async def get_saga(saga_id: str, with_results: bool = False, executor: SagaExecutor = Depends(get_saga_executor)):
+    """Статус саги и её шагов (для опроса клиентом); результаты шагов — при with_results=true"""
+    try:
+        saga = await executor.get(saga_id, with_results=with_results)
+        return saga.to_dict(with_results=with_results)
+    except SagaNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
@@ -3,7 +3,8 @@ import gitlab.exceptions
 from fastapi import APIRouter, HTTPException, Query
 from slugify import slugify
 
-from app.core.gitlab_adapter import gitlab_client
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.commit_buffer import commit_buffer
 from app.schemas.task import BranchCreateRequest, BranchInfo, TaskCreate, TaskInfo
 
 
@@ -24,7 +25,7 @@ async def list_tasks(state: str = "opened", my_only: bool = False):
             # даже если my_only=False, выдаем только назначенные текущему пользователю
             # т.к. глобальный запрос без assignee_id недоступен в нашем UX
             pass
-        issues = gitlab_client.get_all_assigned_issues(state=state)
+        issues = await gitlab_client.get_all_assigned_issues(state=state)
         return issues
     except gitlab.exceptions.GitlabAuthenticationError:
         raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
@@ -38,7 +39,7 @@ async def list_tasks(state: str = "opened", my_only: bool = False):
 async def get_task(issue_iid: int, project_id: int = Query(...)):
     """Получить задачу по номеру"""
     try:
-        issue = gitlab_client.get_issue(issue_iid, project_id)
+        issue = await gitlab_client.get_issue(issue_iid, project_id)
         return issue
     except gitlab.exceptions.GitlabAuthenticationError:
         raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
@@ -54,7 +55,7 @@ async def get_task(issue_iid: int, project_id: int = Query(...)):
 async def create_task(task: TaskCreate):
     """Создать новую задачу"""
     try:
-        issue_data = gitlab_client.create_issue(
+        issue_data = await gitlab_client.create_issue(
             title=task.title,
             description=task.description,
             labels=task.labels,
@@ -62,7 +63,7 @@ async def create_task(task: TaskCreate):
         )
 
         # Возвращаем полную информацию через get_issue
-        return gitlab_client.get_issue(issue_data["iid"], issue_data["project_id"])
+        return await gitlab_client.get_issue(issue_data["iid"], issue_data["project_id"])
     except gitlab.exceptions.GitlabAuthenticationError:
         raise HTTPException(status_code=401, detail="Ошибка авторизации в GitLab")
     except gitlab.exceptions.GitlabGetError:
@@ -83,7 +84,7 @@ async def create_task_branch(issue_iid: int, payload: BranchCreateRequest):
         project_id = payload.project_id
 
         # Получаем информацию о задаче
-        issue = gitlab_client.get_issue(issue_iid, project_id)
+        issue = await gitlab_client.get_issue(issue_iid, project_id)
 
         # 1. Генерируем безопасный slug (кириллица -> латиница, пробелы -> дефисы)
         # Пример: "Тестовый расчёт" -> "testovyi-raschet"
@@ -98,7 +99,7 @@ async def create_task_branch(issue_iid: int, payload: BranchCreateRequest):
         print(f"🛠 Пытаемся создать ветку: {branch_name}") # Лог для отладки
 
         # Создаём ветку
-        created = gitlab_client.create_branch(branch_name, project_id=project_id)
+        created = await gitlab_client.create_branch(branch_name, project_id=project_id)
 
         return BranchInfo(
             branch_name=branch_name,
@@ -121,10 +122,10 @@ async def create_task_branch(issue_iid: int, payload: BranchCreateRequest):
 async def submit_task(issue_iid: int, project_id: int = Query(...)):
     try:
         # 1. Получаем информацию о задаче
-        issue = gitlab_client.get_issue(issue_iid, project_id)
+        issue = await gitlab_client.get_issue(issue_iid, project_id)
 
         # 2. НАДЕЖНЫЙ ПОИСК ВЕТКИ
-        branch_name = gitlab_client.find_branch_by_issue_iid(issue_iid, project_id)
+        branch_name = await gitlab_client.find_branch_by_issue_iid(issue_iid, project_id)
 
         if not branch_name:
              # Фоллбек: если ветки нет, попробуем сгенерировать (вдруг еще не создана?)
@@ -136,12 +137,15 @@ async def submit_task(issue_iid: int, project_id: int = Query(...)):
 
         print(f"📌 Найдена ветка для сабмита: {branch_name}")
 
-        # 3. Формируем заголовок MR
+        # 3. Отложенные сохранения расчётов должны попасть в ветку до MR
+        await commit_buffer.flush(project_id, branch_name)
+
+        # 4. Формируем заголовок MR
         mr_title = f"Draft: Решение задачи #{issue_iid}: {issue['title']}"
         mr_desc = f"Автоматически созданный MR из Balance+ IDE.\nCloses #{issue_iid}"
 
-        # 4. Создаем MR
-        result = gitlab_client.create_merge_request(
+        # 5. Создаем MR
+        result = await gitlab_client.create_merge_request(
             source_branch=branch_name,
             title=mr_title,
             description=mr_desc,
@@ -1,7 +1,7 @@
 import gitlab.exceptions
 from fastapi import APIRouter, HTTPException
 
-from app.core.gitlab_adapter import gitlab_client
+from app.core.async_gitlab_adapter import gitlab_client
 
 
 router = APIRouter(prefix="/user", tags=["User"])
@@ -9,9 +9,8 @@ router = APIRouter(prefix="/user", tags=["User"])
 @router.get("/me")
 async def get_current_user():
     try:
-        # Убеждаемся, что соединение есть
-        gitlab_client.check_connection()
-        user = gitlab_client.gl.user
+        # Пользователь по токену (кешируется адаптером)
+        user = await gitlab_client.get_current_user()
         return {
             "name": user.name,          # Константинопольский К.
             "username": user.username,  # k.konstantinopolsky
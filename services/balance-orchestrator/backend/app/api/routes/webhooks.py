@@ -0,0 +1,37 @@
+# api/routes/webhooks.py
+import hmac
+import os
+
+from fastapi import APIRouter, Header, HTTPException, Request
+
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.geometry_store import geometry_store
+
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+
+
+@router.post("/gitlab")
+async def gitlab_webhook(
+    request: Request,
+    x_gitlab_event: str = Header(""),
+    x_gitlab_token: str = Header(""),
+):
+    """
+    Вебхук GitLab (Push events): поддерживает индекс веток задач и SHA головы
+    дефолтной ветки (кеш геометрий) в актуальном состоянии.
+    Secret token вебхука должен совпадать с GITLAB_WEBHOOK_SECRET; без секрета вебхук отключён.
+    """
+    secret = os.getenv("GITLAB_WEBHOOK_SECRET")
+    if not secret:
+        raise HTTPException(status_code=403, detail="Вебхук отключён: GITLAB_WEBHOOK_SECRET не задан")
+    if not hmac.compare_digest(x_gitlab_token.encode(), secret.encode()):
+        raise HTTPException(status_code=401, detail="Неверный токен вебхука")
+
+    if x_gitlab_event != "Push Hook":
+        return {"status": "ignored", "event": x_gitlab_event}
+
+    payload = await request.json()
+    applied = gitlab_client.branch_index.apply_push_event(payload)
+    applied = geometry_store.apply_push_event(payload) or applied
+    return {"status": "applied" if applied else "ignored", "event": x_gitlab_event}
@@ -0,0 +1,715 @@
+# async_gitlab_adapter.py — асинхронный адаптер GitLab для роутов оркестратора
+"""
+Асинхронный клиент GitLab REST API v4 поверх общего пула соединений httpx.
+
+Единственный клиент GitLab в оркестраторе; не блокирует цикл событий:
+- один `httpx.AsyncClient` на процесс (keep-alive, HTTP/2 при наличии пакета h2);
+- ограничение числа одновременных запросов к одному хосту;
+- таймауты на подключение/чтение и повторы с экспоненциальной задержкой и джиттером.
+
+Ошибки поднимаются теми же исключениями `gitlab.exceptions`, что и у python-gitlab,
+поэтому обработка ошибок в роутах не меняется.
+"""
+import asyncio
+import base64
+import importlib.util
+import os
+import posixpath
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote, urlsplit
+
+import httpx
+from dotenv import load_dotenv
+from gitlab.exceptions import (
+    GitlabAuthenticationError,
+    GitlabConnectionError,
+    GitlabCreateError,
+    GitlabError,
+    GitlabGetError,
+    GitlabHttpError,
+    GitlabListError,
+)
+
+from app.core.branch_index import BranchIndex
+from app.core.cache import TTLCache
+from app.core.serialization import dumps
+
+
+load_dotenv()
+
+# Коды ответа, при которых запрос имеет смысл повторить
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Пауза перед повторной попыткой GraphQL после его ошибки, с
+GRAPHQL_RETRY_AFTER = 300.0
+
+# Несколько файлов одним запросом; содержимое запрашивается только при withContent
+BLOBS_QUERY = """
+query($fullPath: ID!, $ref: String!, $paths: [String!]!, $withContent: Boolean!) {
+  project(fullPath: $fullPath) {
+    repository {
+      blobs(ref: $ref, paths: $paths) {
+        nodes { path oid rawTextBlob @include(if: $withContent) }
+      }
+    }
+  }
+}
+"""
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class GitLabClientSettings:
+    """Параметры HTTP-клиента GitLab"""
+    timeout: float = 10.0              # Таймаут чтения/записи, с
+    connect_timeout: float = 5.0       # Таймаут подключения, с
+    max_connections: int = 20          # Размер пула соединений
+    max_keepalive: int = 10            # Сколько соединений держать открытыми
+    keepalive_expiry: float = 30.0     # Время жизни простаивающего соединения, с
+    max_per_host: int = 8              # Одновременных запросов к одному хосту
+    retries: int = 3                   # Повторов сверх первой попытки
+    backoff_base: float = 0.2          # Базовая задержка повтора, с
+    backoff_max: float = 5.0           # Предельная задержка повтора, с
+
+    @classmethod
+    def from_env(cls) -> "GitLabClientSettings":
+        """Настройки из переменных окружения GITLAB_HTTP_* (остальное — по умолчанию)"""
+        return cls(
+            timeout=float(os.getenv("GITLAB_HTTP_TIMEOUT", cls.timeout)),
+            max_connections=int(os.getenv("GITLAB_HTTP_MAX_CONNECTIONS", cls.max_connections)),
+            max_per_host=int(os.getenv("GITLAB_HTTP_MAX_PER_HOST", cls.max_per_host)),
+            retries=int(os.getenv("GITLAB_HTTP_RETRIES", cls.retries)),
+        )
+
+
+class GitLabObject(dict):
+    """Ответ API: словарь с доступом к полям через атрибуты (project.name, commit.id)"""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text or response.reason_phrase
+    if isinstance(body, dict):
+        return str(body.get("message") or body.get("error") or body)
+    return str(body)
+
+
+def _issue_dict(issue: dict, project_name: str) -> dict:
+    return {
+        "iid": issue["iid"],
+        "project_id": issue["project_id"],
+        "project_name": project_name,  # без namespace
+        "title": issue["title"],
+        "description": issue.get("description"),
+        "state": issue["state"],
+        "labels": issue.get("labels", []),
+        "assignee": issue["assignee"]["username"] if issue.get("assignee") else None,
+        "created_at": issue["created_at"],
+        "due_date": issue.get("due_date"),
+        "web_url": issue["web_url"],
+    }
+
+
+class AsyncGitLabAdapter:
+    def __init__(self, settings: GitLabClientSettings | None = None,
+                 transport: httpx.AsyncBaseTransport | None = None):
+        self.url = os.getenv("GITLAB_URL")
+        self.token = os.getenv("GITLAB_PRIVATE_TOKEN")
+        self.project_id = os.getenv("GITLAB_PROJECT_ID")
+
+        if not self.url or not self.token:
+            raise ValueError("В файле .env не заданы настройки GitLab")
+
+        self.settings = settings or GitLabClientSettings.from_env()
+        self._transport = transport  # Подменяется в тестах (фейковый GitLab)
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+        self._project = None
+        self._default_branch = None
+        self._user = None
+        self._user_loaded_at = 0.0
+        self.CACHE_TTL = 300  # Время жизни кеша: 5 минут (300 сек)
+        # Кеши объектов GitLab (метрики — /health/caches)
+        self.projects_cache: TTLCache[int, GitLabObject] = TTLCache(
+            "gitlab.projects", maxsize=1024, ttl=self.CACHE_TTL, stale_ttl=self.CACHE_TTL)
+        self.issues_cache: TTLCache[tuple[int, int], dict] = TTLCache(
+            "gitlab.issues", maxsize=4096, ttl=30, stale_ttl=120)
+        # Содержимое файлов: (project, ref, path, blob sha) -> текст; blob неизменяем, храним долго
+        self.blobs_cache: TTLCache[tuple[int, str, str, str], str] = TTLCache(
+            "gitlab.blobs", maxsize=512, ttl=86400)
+        # Последний известный blob sha файла: (project, ref, path) -> sha
+        self.blob_heads: TTLCache[tuple[int, str, str], str] = TTLCache(
+            "gitlab.blob_heads", maxsize=4096, ttl=86400)
+        self.branch_index = BranchIndex(self._branch_names)
+        self._graphql_disabled_until = 0.0
+
+    # ==================== HTTP ====================
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Общий клиент с пулом соединений (создаётся при первом запросе в цикле событий)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # Соединения и семафоры привязаны к циклу событий — в новом цикле создаём заново
+            self._loop = loop
+            self._host_limits = {}
+            s = self.settings
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.url.rstrip('/')}/api/v4/",
+                headers={"PRIVATE-TOKEN": self.token},
+                timeout=httpx.Timeout(s.timeout, connect=s.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=s.max_connections,
+                    max_keepalive_connections=s.max_keepalive,
+                    keepalive_expiry=s.keepalive_expiry,
+                ),
+                http2=self._transport is None and _http2_available(),
+                verify=False,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Закрывает пул соединений (вызывается при остановке приложения)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncGitLabAdapter":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def _host_limit(self, url: httpx.URL) -> asyncio.Semaphore:
+        host = url.host or urlsplit(self.url).hostname or ""
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.settings.max_per_host)
+        return self._host_limits[host]
+
+    def _retry_delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Экспоненциальная задержка с полным джиттером; учитывает Retry-After"""
+        delay = random.uniform(0, min(self.settings.backoff_max, self.settings.backoff_base * 2 ** attempt))
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.settings.backoff_max))
+        return delay
+
+    async def _send(self, method: str, path: str, *, idempotent: bool | None = None, stream: bool = False,
+                    **kwargs) -> httpx.Response:
+        """Отправляет запрос с ограничением параллельности и повторами"""
+        client = self.client
+        request = client.build_request(method, path, **kwargs)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self.settings.retries + 1
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                async with self._host_limit(request.url):
+                    response = await client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # Запрос не ушёл на сервер — повторять безопасно для любого метода
+                if last:
+                    raise GitlabConnectionError(f"GitLab недоступен: {e!r}") from e
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+            except httpx.TransportError as e:
+                if last or not idempotent:
+                    raise GitlabConnectionError(f"Ошибка соединения с GitLab: {e!r}") from e
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+
+            retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+            if retryable and not last:
+                print(f"🔁 GitLab ответил {response.status_code} на {method} {request.url.path}, повтор {attempt + 1}")
+                await response.aclose()
+                await asyncio.sleep(self._retry_delay(attempt, response))
+                continue
+            return response
+
+        raise AssertionError("unreachable")
+
+    async def _request(self, method: str, path: str, *, error: type[GitlabError] = GitlabHttpError,
+                       idempotent: bool | None = None, stream: bool = False, **kwargs) -> httpx.Response:
+        """Запрос к API; ошибки HTTP превращаются в исключения python-gitlab"""
+        response = await self._send(method, path, idempotent=idempotent, stream=stream, **kwargs)
+        if stream and response.is_error:
+            await response.aread()
+        if response.status_code == 401:
+            raise GitlabAuthenticationError(
+                error_message=_error_message(response), response_code=401, response_body=response.content
+            )
+        if response.is_error:
+            raise error(
+                error_message=_error_message(response),
+                response_code=response.status_code,
+                response_body=response.content,
+            )
+        return response
+
+    async def _get_json(self, path: str, **params) -> Any:
+        response = await self._request("GET", path, error=GitlabGetError, params=params)
+        return response.json()
+
+    async def _graphql(self, query: str, variables: dict) -> dict:
+        """Запрос к GraphQL API (только чтение — повторяется как идемпотентный)"""
+        response = await self._request(
+            "POST", f"{self.url.rstrip('/')}/api/graphql", idempotent=True,
+            headers={"Authorization": f"Bearer {self.token}"}, json={"query": query, "variables": variables},
+        )
+        body = response.json()
+        if body.get("errors"):
+            messages = "; ".join(str(e.get("message", e)) for e in body["errors"])
+            raise GitlabHttpError(error_message=f"GraphQL: {messages}", response_code=response.status_code)
+        return body["data"]
+
+    async def _list(self, endpoint: str, *, get_all: bool = True, **params) -> list[GitLabObject]:
+        """GET списка с обходом страниц по заголовку X-Next-Page"""
+        params.setdefault("per_page", 100)
+        items: list[GitLabObject] = []
+        while True:
+            response = await self._request("GET", endpoint, error=GitlabListError, params=params)
+            items.extend(GitLabObject(item) for item in response.json())
+            next_page = response.headers.get("X-Next-Page")
+            if not get_all or not next_page:
+                return items
+            params = {**params, "page": next_page}
+
+    @staticmethod
+    def _project_path(project_id: int | str) -> str:
+        return f"projects/{quote(str(project_id), safe='')}"
+
+    @staticmethod
+    def _file_path(project_id: int | str, file_path: str) -> str:
+        return f"projects/{quote(str(project_id), safe='')}/repository/files/{quote(file_path, safe='')}"
+
+    # ==================== ПРОЕКТ ====================
+
+    async def check_connection(self) -> str:
+        try:
+            user = await self.get_current_user(refresh=True)
+            return f"OK: {user.username}"
+        except Exception as e:
+            return f"Error: {e}"
+
+    async def get_current_user(self, refresh: bool = False) -> GitLabObject:
+        """Текущий пользователь (по токену), кешируется на CACHE_TTL"""
+        if self._user is None or refresh or time.time() - self._user_loaded_at >= self.CACHE_TTL:
+            self._user = GitLabObject(await self._get_json("user"))
+            self._user_loaded_at = time.time()
+        return self._user
+
+    async def get_project(self) -> GitLabObject:
+        """Получает объект текущего рабочего проекта (с кешированием)"""
+        if self._project is None:
+            if not self.project_id:
+                raise ValueError("GITLAB_PROJECT_ID не задан в .env")
+            self._project = GitLabObject(await self._get_json(self._project_path(self.project_id)))
+            self._default_branch = self._project.default_branch
+            print(f"📌 Подключён к проекту: {self._project.path_with_namespace}")
+            print(f"📌 Дефолтная ветка: {self._default_branch}")
+        return self._project
+
+    async def get_project_by_id(self, project_id: int) -> GitLabObject:
+        """Получает проект по ID с кешированием и TTL"""
+        return await self.projects_cache.aget_or_load(project_id, lambda: self._fetch_project(project_id))
+
+    async def _fetch_project(self, project_id: int) -> GitLabObject:
+        print(f"🔄 Обновляю кеш для проекта ID {project_id}...")
+        return GitLabObject(await self._get_json(self._project_path(project_id)))
+
+    async def get_projects_by_ids(self, project_ids: set[int]) -> dict[int, GitLabObject]:
+        """Проекты по набору ID: каждый проект запрашивается один раз, недостающие в кеше — параллельно"""
+        ids = sorted(project_ids)
+        projects = await asyncio.gather(*(self.get_project_by_id(pid) for pid in ids))
+        return dict(zip(ids, projects, strict=True))
+
+    async def get_default_branch(self) -> str:
+        """Возвращает дефолтную ветку проекта"""
+        if self._default_branch is None:
+            await self.get_project()
+        return self._default_branch
+
+    async def _resolve(self, project_id: int | None, ref: str | None = None) -> tuple[GitLabObject, str]:
+        """Проект (по ID или рабочий из .env) и ветка (явная или дефолтная)"""
+        project = await self.get_project_by_id(project_id) if project_id else await self.get_project()
+        return project, ref or project.default_branch
+
+    # ==================== РАБОТА С ФАЙЛАМИ ====================
+
+    async def get_file_content(self, file_path: str, ref: str | None = None, project_id: int | None = None) -> str:
+        """
+        Читает содержимое файла из репозитория.
+        Если файл уже читался, сначала HEAD-запросом сверяется blob sha: при совпадении
+        содержимое берётся из кеша без повторной загрузки.
+        """
+        project, ref = await self._resolve(project_id, ref)
+        head_key = (project.id, ref, file_path)
+        if self.blob_heads.peek(head_key) is not None:
+            blob_id = await self.get_file_blob_id(file_path, ref, project_id=project.id)
+            content = self.blobs_cache.get((*head_key, blob_id)) if blob_id else None
+            if content is not None:
+                return content
+
+        blob_id, content = await self.get_file_blob(file_path, ref, project_id=project.id)
+        self.blob_heads.set(head_key, blob_id)
+        self.blobs_cache.set((*head_key, blob_id), content)
+        return content
+
+    async def get_files(self, file_paths: list[str], ref: str | None = None,
+                        project_id: int | None = None) -> dict[str, str | None]:
+        """
+        Содержимое нескольких файлов одной ветки: {путь: текст или None, если файла нет}.
+
+        Файлы запрашиваются одним GraphQL-запросом `blobs`. Если все файлы уже читались,
+        сначала запрашиваются только blob sha, а скачиваются лишь изменившиеся файлы.
+        Если GraphQL недоступен — параллельные REST-запросы по файлам.
+        """
+        project, ref = await self._resolve(project_id, ref)
+        paths = list(dict.fromkeys(file_paths))
+        if not paths:
+            return {}
+        if time.monotonic() >= self._graphql_disabled_until:
+            try:
+                return await self._get_files_graphql(project, ref, paths)
+            except GitlabHttpError as e:
+                self._graphql_disabled_until = time.monotonic() + GRAPHQL_RETRY_AFTER
+                print(f"⚠️ GraphQL blobs недоступен ({e}), читаю файлы по одному")
+
+        async def read(path: str) -> str | None:
+            try:
+                return await self.get_file_content(path, ref, project_id=project.id)
+            except GitlabGetError as e:
+                if e.response_code == 404:
+                    return None
+                raise
+
+        contents = await asyncio.gather(*(read(path) for path in paths))
+        return dict(zip(paths, contents, strict=True))
+
+    async def _get_files_graphql(self, project: GitLabObject, ref: str, paths: list[str]) -> dict[str, str | None]:
+        async def blobs(batch: list[str], with_content: bool) -> dict[str, dict]:
+            data = await self._graphql(BLOBS_QUERY, {
+                "fullPath": project.path_with_namespace, "ref": ref, "paths": batch, "withContent": with_content,
+            })
+            if data.get("project") is None:
+                raise GitlabGetError(error_message="404 Project Not Found", response_code=404)
+            return {node["path"]: node for node in data["project"]["repository"]["blobs"]["nodes"]}
+
+        known = all(self.blob_heads.peek((project.id, ref, path)) is not None for path in paths)
+        nodes = await blobs(paths, with_content=not known)
+
+        result: dict[str, str | None] = {}
+        stale = []
+        for path in paths:
+            node = nodes.get(path)
+            if node is None:
+                result[path] = None
+                continue
+            key = (project.id, ref, path, node["oid"])
+            content = node.get("rawTextBlob") if not known else self.blobs_cache.get(key)
+            if content is None:
+                stale.append(path)
+                continue
+            result[path] = content
+            self.blob_heads.set(key[:3], node["oid"])
+            self.blobs_cache.set(key, content)
+
+        if stale:
+            # Изменившиеся файлы — вторым запросом, уже с содержимым
+            for path, node in (await blobs(stale, with_content=True)).items():
+                self.blob_heads.set((project.id, ref, path), node["oid"])
+                self.blobs_cache.set((project.id, ref, path, node["oid"]), node["rawTextBlob"])
+                result[path] = node["rawTextBlob"]
+        return {path: result.get(path) for path in paths}
+
+    async def get_file_blob(self, file_path: str, ref: str | None = None,
+                            project_id: int | None = None) -> tuple[str, str]:
+        """Blob sha и содержимое файла одним запросом (без кеширования)"""
+        project, ref = await self._resolve(project_id, ref)
+        data = await self._get_json(self._file_path(project.id, file_path), ref=ref)
+        return data["blob_id"], base64.b64decode(data["content"]).decode("utf-8")
+
+    async def get_file_blob_id(self, file_path: str, ref: str | None = None,
+                               project_id: int | None = None) -> str | None:
+        """Blob sha файла HEAD-запросом, без загрузки содержимого"""
+        project, ref = await self._resolve(project_id, ref)
+        response = await self._request("HEAD", self._file_path(project.id, file_path), error=GitlabGetError,
+                                       params={"ref": ref})
+        return response.headers.get("X-Gitlab-Blob-Id")
+
+    async def open_file_stream(self, file_path: str, ref: str | None = None,
+                               project_id: int | None = None) -> httpx.Response:
+        """
+        Открывает содержимое файла потоком (файл целиком в память не читается).
+        Ответ нужно закрыть: `await response.aclose()`.
+        """
+        project, ref = await self._resolve(project_id, ref)
+        return await self._request("GET", f"{self._file_path(project.id, file_path)}/raw", error=GitlabGetError,
+                                   stream=True, params={"ref": ref})
+
+    async def file_exists(self, file_path: str, ref: str | None = None, project_id: int | None = None) -> bool:
+        """Проверяет, существует ли файл (HEAD-запрос, без загрузки содержимого)"""
+        project, ref = await self._resolve(project_id, ref)
+        try:
+            await self._request("HEAD", self._file_path(project.id, file_path), error=GitlabGetError,
+                                params={"ref": ref})
+            return True
+        except GitlabGetError:
+            return False
+
+    async def create_commit(self, file_path: str, content: str, commit_message: str, branch: str | None = None,
+                            project_id: int | None = None) -> GitLabObject:
+        """Создает или обновляет файл в репозитории"""
+        return await self.create_commit_multiple({file_path: content}, commit_message, branch, project_id)
+
+    async def create_commit_multiple(self, files: dict[str, str], commit_message: str, branch: str | None = None,
+                                     project_id: int | None = None) -> GitLabObject:
+        """Создает коммит с несколькими файлами одновременно"""
+        project, branch = await self._resolve(project_id, branch)
+
+        existing = await self.existing_paths(list(files), branch, project_id=project_id)
+        actions = [
+            {"action": "update" if file_path in existing else "create", "file_path": file_path, "content": content}
+            for file_path, content in files.items()
+        ]
+
+        data = {
+            "branch": branch,
+            "commit_message": commit_message,
+            "actions": actions,
+        }
+        # Тело коммита с результатами расчётов бывает большим — кодируем orjson
+        response = await self._request(
+            "POST", f"{self._project_path(project.id)}/repository/commits", error=GitlabCreateError,
+            content=dumps(data), headers={"Content-Type": "application/json"},
+        )
+        return GitLabObject(response.json())
+
+    async def existing_paths(self, file_paths: list[str], ref: str | None = None,
+                             project_id: int | None = None) -> set[str]:
+        """
+        Какие из файлов уже есть в ветке.
+
+        Один листинг repository_tree на каждую папку (параллельно), а не запрос на файл.
+        Если листинг папки не удался, файлы этой папки проверяются параллельными HEAD-запросами.
+        """
+        project, ref = await self._resolve(project_id, ref)
+        by_dir: dict[str, list[str]] = {}
+        for file_path in file_paths:
+            by_dir.setdefault(posixpath.dirname(file_path), []).append(file_path)
+
+        async def existing_in(directory: str, paths: list[str]) -> set[str]:
+            try:
+                tree = await self._list(f"{self._project_path(project.id)}/repository/tree", path=directory, ref=ref)
+            except GitlabListError as e:
+                if e.response_code == 404:
+                    return set()  # Папки ещё нет — все файлы новые
+                print(f"⚠️ Листинг {directory or '/'} не удался ({e.response_code}), проверяю файлы по одному")
+                found = await asyncio.gather(*(self.file_exists(p, ref, project_id=project.id) for p in paths))
+                return {p for p, ok in zip(paths, found, strict=True) if ok}
+            blobs = {item.path for item in tree if item.get("type") == "blob"}
+            return blobs.intersection(paths)
+
+        results = await asyncio.gather(*(existing_in(d, paths) for d, paths in by_dir.items()))
+        return set().union(*results)
+
+    async def list_files_in_path(self, path: str, ref: str, project_id: int | None = None) -> list[dict]:
+        """Возвращает список файлов в папке"""
+        project, ref = await self._resolve(project_id, ref)
+        try:
+            return await self._list(f"{self._project_path(project.id)}/repository/tree", path=path, ref=ref)
+        except GitlabError:
+            # Папка не найдена, нет доступа или другие ошибки GitLab API
+            return []
+
+    async def get_file_content_decoded(self, file_path: str, ref: str, project_id: int | None = None) -> str | None:
+        """Читает файл и декодирует контент"""
+        try:
+            return await self.get_file_content(file_path, ref, project_id)
+        except GitlabError:
+            # Файл не найден или другие ошибки GitLab API
+            return None
+
+    # ==================== РАБОТА С ВЕТКАМИ ====================
+
+    async def create_branch(self, branch_name: str, source_branch: str | None = None,
+                            project_id: int | None = None) -> bool:
+        """Создаёт новую ветку. Возвращает True если создана, False если уже существует"""
+        project, source = await self._resolve(project_id, source_branch)
+        try:
+            await self._request(
+                "POST", f"{self._project_path(project.id)}/repository/branches", error=GitlabCreateError,
+                params={"branch": branch_name, "ref": source},
+            )
+            print(f"✅ Создана ветка: {branch_name}")
+            self.branch_index.record_branch(project.id, branch_name)
+            return True
+        except GitlabCreateError as e:
+            if "already exists" in str(e):
+                print(f"ℹ️ Ветка {branch_name} уже существует")
+                self.branch_index.record_branch(project.id, branch_name)
+                return False
+            raise
+
+    async def branch_exists(self, branch_name: str, project_id: int | None = None) -> bool:
+        """Проверяет существование ветки"""
+        project, _ = await self._resolve(project_id)
+        try:
+            await self._get_json(f"{self._project_path(project.id)}/repository/branches/{quote(branch_name, safe='')}")
+            return True
+        except GitlabGetError:
+            return False
+
+    async def get_branch_head(self, branch_name: str | None = None, project_id: int | None = None) -> str:
+        """SHA последнего коммита ветки (по умолчанию — дефолтной)"""
+        project, branch_name = await self._resolve(project_id, branch_name)
+        branch = await self._get_json(f"{self._project_path(project.id)}/repository/branches/{quote(branch_name, safe='')}")
+        return branch["commit"]["id"]
+
+    async def _branch_names(self, project_id: int, search: str | None = None) -> list[str]:
+        """Имена веток проекта (все или по поиску API)"""
+        params = {"search": search} if search else {}
+        branches = await self._list(f"{self._project_path(project_id)}/repository/branches", **params)
+        return [b.name for b in branches]
+
+    async def find_branch_by_issue_iid(self, issue_iid: int, project_id: int) -> str | None:
+        """
+        Умный поиск ветки задачи.
+        Ищет ветку, которая начинается с '4-' или 'issue/4-' или 'feature/4-'.
+        Ответ берётся из индекса веток проекта (см. BranchIndex).
+        """
+        await self.get_project_by_id(project_id)
+        try:
+            branch = await self.branch_index.find(project_id, issue_iid)
+        except Exception as e:
+            print(f"Ошибка поиска веток: {e}")
+            return None
+
+        if branch is None:
+            print(f"❌ Ветка для задачи #{issue_iid} не найдена (паттерн 'ID-' или '/ID-')")
+        return branch
+
+    # ==================== РАБОТА С ЗАДАЧАМИ (ISSUES) ====================
+
+    async def get_all_assigned_issues(self, state: str = "opened") -> list[dict]:
+        """Получает ВСЕ задачи из ВСЕХ проектов, назначенные на текущего пользователя."""
+        user = await self.get_current_user()
+        issues = await self._list("issues", assignee_id=user.id, state=state, scope="all")
+
+        projects = await self.get_projects_by_ids({issue.project_id for issue in issues})
+        result = [_issue_dict(issue, projects[issue.project_id].name) for issue in issues]
+        for issue in result:
+            self.issues_cache.set((issue["project_id"], issue["iid"]), issue)
+        return result
+
+    async def get_issue(self, issue_iid: int, project_id: int) -> dict:
+        return dict(await self.issues_cache.aget_or_load(
+            (project_id, issue_iid), lambda: self._fetch_issue(issue_iid, project_id)))
+
+    async def _fetch_issue(self, issue_iid: int, project_id: int) -> dict:
+        project = await self.get_project_by_id(project_id)
+        issue = await self._get_json(f"{self._project_path(project_id)}/issues/{issue_iid}")
+        return {**_issue_dict(issue, project.name), "project_id": project_id}
+
+    async def get_user_projects(self, search: str = "") -> list[dict]:
+        """Возвращает проекты пользователя (для выпадающего списка)"""
+        projects = await self._list(
+            "projects",
+            get_all=False,  # Не тянем все 100500, хватит первых 50 для саджеста
+            membership=True,
+            search=search,
+            order_by="last_activity_at",
+            min_access_level=30,  # Developer и выше (чтобы мог создавать задачи)
+            simple=True,
+            per_page=50,
+        )
+        return [{"id": p.id, "name": p.name_with_namespace, "web_url": p.web_url} for p in projects]
+
+    async def create_issue(self, title: str, description: str = "", labels: list[str] | None = None,
+                           project_id: int | None = None) -> dict:
+        """Создаёт новую задачу"""
+        project, _ = await self._resolve(project_id)
+        user = await self.get_current_user()
+        response = await self._request(
+            "POST", f"{self._project_path(project.id)}/issues", error=GitlabCreateError,
+            json={
+                "title": title,
+                "description": description,
+                "labels": ",".join(labels or []),
+                "assignee_ids": [user.id],  # Сразу назначаем на себя
+            },
+        )
+        issue = response.json()
+        return {
+            "iid": issue["iid"],
+            "title": issue["title"],
+            "project_id": project.id,
+            "web_url": issue["web_url"],
+        }
+
+    # ==================== РАБОТА С MERGE REQUESTS ====================
+
+    async def create_merge_request(
+        self,
+        source_branch: str,
+        title: str,
+        description: str = "",
+        target_branch: str | None = None,
+        assignee_id: int | None = None,
+        project_id: int | None = None
+    ) -> dict:
+        """Создаёт Merge Request"""
+        project, target = await self._resolve(project_id, target_branch)
+
+        if not await self.branch_exists(source_branch, project_id=project_id):
+            raise ValueError(f"Ветка {source_branch} не найдена")
+
+        mr_data = {
+            "source_branch": source_branch,
+            "target_branch": target,
+            "title": title,
+            "description": description,
+            "remove_source_branch": True,  # Удалять ветку после слияния
+        }
+        if assignee_id:
+            mr_data["assignee_id"] = assignee_id
+
+        try:
+            response = await self._request(
+                "POST", f"{self._project_path(project.id)}/merge_requests", error=GitlabCreateError, json=mr_data
+            )
+        except GitlabCreateError as e:
+            if "already exists" in str(e):
+                raise ValueError("Merge Request для этой ветки уже существует") from e
+            raise
+        mr = response.json()
+        return {
+            "iid": mr["iid"],
+            "title": mr["title"],
+            "web_url": mr["web_url"],
+            "state": mr["state"],
+        }
+
+
+# Глобальный экземпляр
+gitlab_client = AsyncGitLabAdapter()
@@ -0,0 +1,141 @@
+# branch_index.py — индекс веток задач: iid -> имя ветки
+"""
+Кеш соответствия «номер задачи -> ветка» по проектам.
+
+Правило соответствия то же, что в поиске ветки задачи: имя ветки начинается с 'ID-',
+содержит '/ID-' (issue/4-..., feature/4-...) или совпадает с 'ID'.
+
+- Первое обращение к проекту загружает список всех веток одним листингом.
+- Индекс живёт `ttl` секунд, затем перечитывается целиком.
+- Если задачи нет в свежем индексе, один раз ищем её ветку поиском API (ветка могла
+  появиться в обход оркестратора), а при неудаче запоминаем промах на `miss_ttl` секунд.
+- Ветки, созданные оркестратором, и события push из вебхука GitLab обновляют индекс сразу.
+"""
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from app.core.cache import TTLCache
+
+
+BRANCH_INDEX_TTL = 300  # Время жизни индекса проекта, с
+BRANCH_MISS_TTL = 30    # Время жизни отрицательного результата, с
+
+_IID_PATTERN = re.compile(r"(?:^|/)(\d+)-")
+_ZERO_SHA = "0" * 40
+
+# fetch(project_id, search) -> имена веток; search=None — все ветки проекта
+BranchFetcher = Callable[[int, str | None], Awaitable[list[str]]]
+
+
+def issue_iids(branch_name: str) -> set[int]:
+    """Номера задач, к которым относится ветка (по правилу 'ID-', '/ID-' или 'ID')"""
+    # Номер сравнивается как строка: ветка '007-x' не относится к задаче #7
+    iids = {int(m) for m in _IID_PATTERN.findall(branch_name) if str(int(m)) == m}
+    if branch_name.isdigit() and str(int(branch_name)) == branch_name:
+        iids.add(int(branch_name))
+    return iids
+
+
+@dataclass
+class _ProjectBranches:
+    index: dict[int, set[str]] = field(default_factory=dict)
+    misses: dict[int, float] = field(default_factory=dict)  # iid -> время промаха
+
+    def add(self, branch_name: str) -> None:
+        for iid in issue_iids(branch_name):
+            self.index.setdefault(iid, set()).add(branch_name)
+            self.misses.pop(iid, None)
+
+    def remove(self, branch_name: str) -> None:
+        for iid in issue_iids(branch_name):
+            names = self.index.get(iid)
+            if names:
+                names.discard(branch_name)
+                if not names:
+                    del self.index[iid]
+
+    def get(self, iid: int) -> str | None:
+        # При нескольких подходящих ветках — первая по имени (как в выдаче API)
+        names = self.index.get(iid)
+        return min(names) if names else None
+
+
+class BranchIndex:
+    """Индекс веток задач по проектам с TTL, отрицательным кешем и обновлением по событиям"""
+
+    def __init__(self, fetch: BranchFetcher, ttl: float = BRANCH_INDEX_TTL, miss_ttl: float = BRANCH_MISS_TTL,
+                 max_projects: int = 256):
+        self._fetch = fetch
+        self.miss_ttl = miss_ttl
+        self._projects: TTLCache[int, _ProjectBranches] = TTLCache("gitlab.branches", maxsize=max_projects, ttl=ttl)
+
+    @property
+    def ttl(self) -> float:
+        return self._projects.ttl
+
+    async def _load(self, project_id: int) -> _ProjectBranches:
+        names = await self._fetch(project_id, None)
+        entry = _ProjectBranches()
+        for name in names:
+            entry.add(name)
+        print(f"🗂 Индекс веток проекта {project_id}: {len(names)} веток, {len(entry.index)} задач")
+        return entry
+
+    async def find(self, project_id: int, issue_iid: int) -> str | None:
+        """Ветка задачи или None"""
+        # Параллельные запросы к одному проекту ждут одну загрузку
+        entry = await self._projects.aget_or_load(project_id, lambda: self._load(project_id))
+
+        branch = entry.get(issue_iid)
+        if branch is not None:
+            return branch
+
+        missed_at = entry.misses.get(issue_iid)
+        if missed_at is not None and time.monotonic() - missed_at < self.miss_ttl:
+            return None
+
+        # Ветка могла появиться в обход оркестратора: точечный поиск
+        for name in await self._fetch(project_id, str(issue_iid)):
+            entry.add(name)
+        branch = entry.get(issue_iid)
+        if branch is None:
+            entry.misses[issue_iid] = time.monotonic()
+        return branch
+
+    def record_branch(self, project_id: int, branch_name: str) -> None:
+        """Учесть ветку, созданную оркестратором (если индекс проекта уже загружен)"""
+        entry = self._projects.peek(project_id)
+        if entry is not None:
+            entry.add(branch_name)
+
+    def forget_branch(self, project_id: int, branch_name: str) -> None:
+        entry = self._projects.peek(project_id)
+        if entry is not None:
+            entry.remove(branch_name)
+
+    def invalidate(self, project_id: int | None = None) -> None:
+        """Сбросить индекс проекта (или всех проектов) — следующий поиск перечитает ветки"""
+        if project_id is None:
+            self._projects.clear()
+        else:
+            self._projects.invalidate(project_id)
+
+    def apply_push_event(self, payload: dict) -> bool:
+        """
+        Обновить индекс по событию push из вебхука GitLab.
+        Создание ветки — before из нулей, удаление — after из нулей.
+        Возвращает True, если событие относится к ветке.
+        """
+        ref = payload.get("ref") or ""
+        project_id = payload.get("project_id") or (payload.get("project") or {}).get("id")
+        if not ref.startswith("refs/heads/") or project_id is None:
+            return False
+
+        branch_name = ref.removeprefix("refs/heads/")
+        if payload.get("after") == _ZERO_SHA:
+            self.forget_branch(project_id, branch_name)
+        else:
+            self.record_branch(project_id, branch_name)
+        return True
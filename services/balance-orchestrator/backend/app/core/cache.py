@@ -0,0 +1,170 @@
+# cache.py — общий кеш объектов GitLab для оркестратора
+"""
+Ограниченный по размеру кеш с TTL для проектов, задач, веток и содержимого файлов.
+
+- LRU-вытеснение сверх `maxsize` записей;
+- запись свежая `ttl` секунд, затем ещё `stale_ttl` секунд отдаётся устаревшей,
+  пока в фоне идёт обновление (stale-while-revalidate);
+- одновременные промахи по одному ключу объединяются в одну загрузку (single-flight);
+- счётчики попаданий/промахов доступны через `cache_stats()` и /health/caches.
+
+Кеш рассчитан на корутины одного цикла событий (`aget_or_load`): все обращения
+идут из одного потока, поэтому блокировки не нужны.
+"""
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+# Все созданные кеши по имени (для метрик); кеш удаляется вместе с владельцем
+_registry: "weakref.WeakValueDictionary[str, TTLCache]" = weakref.WeakValueDictionary()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0          # Свежее значение из кеша
+    stale_hits: int = 0    # Устаревшее значение, обновление в фоне
+    misses: int = 0        # Значения нет или оно слишком старое
+    loads: int = 0         # Успешные загрузки
+    load_errors: int = 0   # Загрузки с ошибкой
+    coalesced: int = 0     # Промахи, дождавшиеся чужой загрузки
+    evictions: int = 0     # Вытеснено по размеру
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300.0, stale_ttl: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._data: OrderedDict[K, _Entry] = OrderedDict()
+        self._ainflight: dict[K, asyncio.Task] = {}  # Текущие загрузки по ключам
+        _registry[name] = self
+
+    # ==================== ХРАНЕНИЕ ====================
+
+    def _lookup(self, key: K) -> tuple[Any, str]:
+        """Значение и его состояние: 'fresh', 'stale' или 'miss' (со счётчиками)"""
+        entry = self._data.get(key)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            if age < self.ttl:
+                self._data.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value, "fresh"
+            if age < self.ttl + self.stale_ttl:
+                self.stats.stale_hits += 1
+                return entry.value, "stale"
+            del self._data[key]
+        self.stats.misses += 1
+        return _MISSING, "miss"
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        """Свежее значение или default"""
+        value, state = self._lookup(key)
+        return value if state == "fresh" else default
+
+    def peek(self, key: K, default: Any = None) -> V | Any:
+        """Любое хранимое значение (даже устаревшее), без счётчиков и продления"""
+        entry = self._data.get(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = _Entry(value, self._clock())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        """Удалить записи, ключи которых удовлетворяют условию; возвращает число удалённых"""
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> dict[str, Any]:
+        total = self.stats.hits + self.stats.stale_hits + self.stats.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            **asdict(self.stats),
+            "hit_ratio": round((self.stats.hits + self.stats.stale_hits) / total, 4) if total else None,
+        }
+
+    # ==================== ЗАГРУЗКА ====================
+
+    async def aget_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """Значение из кеша или результат await loader() (одна загрузка на ключ для всех корутин)"""
+        value, state = self._lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            if key not in self._ainflight:
+                self._load_task(key, loader)
+            return value
+        # shield: отмена одного запроса не прерывает загрузку, которую ждут другие
+        return await asyncio.shield(self._load_task(key, loader))
+
+    def _load_task(self, key: K, loader: Callable[[], Awaitable[V]]) -> asyncio.Task:
+        task = self._ainflight.get(key)
+        if task is not None and not task.done():
+            self.stats.coalesced += 1
+            return task
+        task = asyncio.get_running_loop().create_task(self._aload(key, loader))
+        self._ainflight[key] = task
+        task.add_done_callback(self._load_done(key))
+        return task
+
+    async def _aload(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await loader()
+        except Exception:
+            self.stats.load_errors += 1
+            raise
+        self.set(key, value)
+        self.stats.loads += 1
+        return value
+
+    def _load_done(self, key: K) -> Callable[[asyncio.Task], None]:
+        def done(task: asyncio.Task) -> None:
+            if self._ainflight.get(key) is task:
+                del self._ainflight[key]
+            # Ошибку фонового обновления никто не ждёт — забираем её, чтобы не было предупреждений
+            if not task.cancelled() and task.exception() is not None and self.peek(key, _MISSING) is not _MISSING:
+                print(f"⚠️ Кеш {self.name}: не удалось обновить {key!r}: {task.exception()}")
+        return done
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Метрики всех живых кешей по имени"""
+    return {name: cache.info() for name, cache in sorted(_registry.items())}
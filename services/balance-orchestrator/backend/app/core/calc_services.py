@@ -0,0 +1,136 @@
+# calc_services.py — исполнители шагов саги в расчётных сервисах
+"""
+HTTP-клиенты расчётных сервисов для движка саг.
+
+- `ValveStemsRunner` — POST /api/v1/calculate сервиса штоков клапанов;
+  сервис сохраняет результат в своей БД, компенсация удаляет его (DELETE /api/v1/{id}).
+- `CondenserRunner` — POST /api/v1/calculations конденсатора. Сетка, превышающая лимит
+  синхронного расчёта (413), ставится в очередь POST /api/v1/jobs; задание опрашивается
+  до завершения, результат читается потоком NDJSON. Отмена шага отменяет задание.
+
+Сетевые ошибки, 429 и 5xx — повторяемые (`StepError(retryable=True)`), 4xx — нет.
+"""
+import asyncio
+import os
+from typing import Any
+
+import httpx
+
+from app.core.saga import StepError
+from app.core.serialization import loads
+
+
+VALVE_STEMS_URL = os.getenv("VALVE_STEMS_URL", "http://localhost:5253")
+CONDENSER_URL = os.getenv("CONDENSER_URL", "http://localhost:8001")
+SERVICE_TIMEOUT = float(os.getenv("CALC_SERVICE_TIMEOUT", "60"))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _detail(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text or response.reason_phrase
+    return str(body.get("detail", body)) if isinstance(body, dict) else str(body)
+
+
+class ServiceRunner:
+    """Общий HTTP-клиент сервиса: base_url, таймаут, разбор ошибок"""
+
+    service_name = "service"
+
+    def __init__(self, base_url: str, transport: httpx.AsyncBaseTransport | None = None,
+                 timeout: float = SERVICE_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._transport = transport  # Подменяется в тестах
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(base_url=f"{self.base_url}/api/v1/", timeout=self.timeout,
+                                             transport=self._transport)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, path: str, *, ok: tuple[int, ...] = (), **kwargs) -> httpx.Response:
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.TransportError as e:
+            raise StepError(f"{self.service_name} недоступен: {e!r}", retryable=True) from e
+        if response.is_error and response.status_code not in ok:
+            raise StepError(f"{self.service_name} ответил {response.status_code}: {_detail(response)}",
+                            retryable=response.status_code in RETRY_STATUSES)
+        return response
+
+
+class ValveStemsRunner(ServiceRunner):
+    service_name = "Сервис штоков клапанов"
+
+    async def run(self, payload: dict[str, Any]) -> Any:
+        response = await self._request("POST", "calculate", json=payload)
+        return loads(response.content)
+
+    async def compensate(self, payload: dict[str, Any], result: Any) -> None:
+        result_id = result.get("id") if isinstance(result, dict) else None
+        if result_id is not None:
+            # Результат уже удалён — компенсация выполнена
+            await self._request("DELETE", str(result_id), ok=(404,))
+
+
+class CondenserRunner(ServiceRunner):
+    service_name = "Сервис конденсатора"
+
+    def __init__(self, base_url: str, transport: httpx.AsyncBaseTransport | None = None,
+                 timeout: float = SERVICE_TIMEOUT, poll_interval: float = 1.0):
+        super().__init__(base_url, transport, timeout)
+        self.poll_interval = poll_interval
+
+    async def run(self, payload: dict[str, Any]) -> Any:
+        response = await self._request("POST", "calculations", json=payload, ok=(413,))
+        if response.status_code != 413:
+            return loads(response.content)
+        # Большая сетка: расчёт в очереди конденсатора
+        return await self._run_job(payload)
+
+    async def _run_job(self, payload: dict[str, Any]) -> dict[str, Any]:
+        job = (await self._request("POST", "jobs", json=payload)).json()
+        job_id = job["job_id"]
+        try:
+            while job["status"] == "running":
+                await asyncio.sleep(self.poll_interval)
+                job = (await self._request("GET", f"jobs/{job_id}")).json()
+        except asyncio.CancelledError:
+            # Шаг отменён (упал соседний шаг или остановка сервиса) — снимаем задание
+            try:
+                await self._request("DELETE", f"jobs/{job_id}", ok=(404,))
+            except StepError as e:
+                print(f"⚠️ Не удалось отменить задание конденсатора {job_id}: {e}")
+            raise
+        if job["status"] != "done":
+            raise StepError(f"Задание конденсатора {job_id}: {job['status']} ({job.get('error')})")
+
+        columns: dict[str, list] = {}
+        async with self.client.stream("GET", f"jobs/{job_id}/result") as response:
+            if response.is_error:
+                await response.aread()
+                raise StepError(f"{self.service_name} ответил {response.status_code}: {_detail(response)}",
+                                retryable=response.status_code in RETRY_STATUSES)
+            async for line in response.aiter_lines():
+                if line:
+                    for name, value in loads(line).items():
+                        columns.setdefault(name, []).append(value)
+        return {"strategy": job["strategy"], "job_id": job_id, "size": job["size"], "columns": columns}
+
+    async def compensate(self, payload: dict[str, Any], result: Any) -> None:
+        # Расчёт конденсатора ничего не сохраняет — откатывать нечего
+        return None
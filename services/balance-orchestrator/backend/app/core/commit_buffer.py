@@ -0,0 +1,263 @@
+# commit_buffer.py — отложенная запись сохранений расчётов в GitLab
+"""
+Буфер коммитов по паре (проект, ветка): частые сохранения из форм расчёта
+объединяются в один коммит вместо коммита на каждое сохранение.
+
+- Сохранение кладёт файлы в буфер; для каждого пути хранится только последнее содержимое.
+- Коммит уходит через `window` секунд после последнего сохранения, но не позже
+  `max_delay` секунд после первого несохранённого изменения.
+- `flush` коммитит сразу (явная отправка пользователем, остановка сервиса).
+- Если коммит не удался, изменения остаются в буфере (более новые сохранения важнее)
+  и повторяются через `window` секунд; ошибка видна в состоянии буфера.
+
+`window=0` отключает буферизацию: каждое сохранение коммитится сразу.
+
+Чтение ветки (`flush_for_read`) сначала коммитит её буфер, поэтому /latest и таблицы
+читаются из GitLab, а не из памяти процесса. Если коммит не удался, чтение
+дополняется незакоммиченными файлами буфера.
+
+Ограничение: буфер живёт в памяти одного процесса. Сервис запускается одним
+процессом uvicorn (без --workers): иначе сохранения, попавшие в буфер другого
+процесса, не видны при чтении до его коммита. При аварийной остановке теряются
+изменения не более чем за `max_delay` секунд; при штатной их коммитит `flush_all`.
+
+Буфер ветки удаляется, как только в нём не осталось изменений и таймера; последний
+коммит и ошибка ветки хранятся отдельно в ограниченном кеше (`CALC_COMMIT_STATUS_*`).
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.cache import TTLCache
+
+
+CALC_COMMIT_WINDOW = float(os.getenv("CALC_COMMIT_WINDOW", "15"))         # Пауза после сохранения, с
+CALC_COMMIT_MAX_DELAY = float(os.getenv("CALC_COMMIT_MAX_DELAY", "120"))  # Предельная задержка коммита, с
+CALC_COMMIT_STATUS_SIZE = int(os.getenv("CALC_COMMIT_STATUS_SIZE", "1024"))  # Веток с известным последним коммитом
+CALC_COMMIT_STATUS_TTL = float(os.getenv("CALC_COMMIT_STATUS_TTL", "3600"))  # Сколько помнить последний коммит, с
+
+BufferKey = tuple[int, str]  # (project_id, branch)
+
+
+@dataclass
+class CommitInfo:
+    commit_id: str
+    web_url: str
+    files: list[str]
+    saves: int
+    committed_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class _PendingBatch:
+    files: dict[str, str] = field(default_factory=dict)
+    messages: list[str] = field(default_factory=list)
+    saves: int = 0
+    first_saved_at: float = 0.0
+    last_saved_at: float = 0.0
+
+    def merge_older(self, older: "_PendingBatch") -> None:
+        """Вернуть в буфер незакоммиченный пакет; уже сделанные позже сохранения важнее"""
+        self.files = {**older.files, **self.files}
+        self.messages = older.messages + self.messages
+        self.saves += older.saves
+        self.first_saved_at = older.first_saved_at
+
+
+@dataclass
+class _BranchBuffer:
+    pending: _PendingBatch | None = None
+    timer: asyncio.Task | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def idle(self) -> bool:
+        """Нет изменений, таймера и идущего коммита — буфер можно удалить"""
+        return self.pending is None and (self.timer is None or self.timer.done()) and not self.lock.locked()
+
+
+@dataclass
+class _BranchStatus:
+    last_commit: CommitInfo | None = None
+    last_error: str | None = None
+
+
+def _commit_message(messages: list[str]) -> str:
+    # Последнее сообщение — самое актуальное; число сохранений видно в истории
+    message = f"Calc Result: {messages[-1]}"
+    return message if len(messages) == 1 else f"{message} ({len(messages)} сохранений)"
+
+
+class CommitBuffer:
+    def __init__(self, gitlab, window: float = CALC_COMMIT_WINDOW, max_delay: float = CALC_COMMIT_MAX_DELAY):
+        self.gitlab = gitlab
+        self.window = window
+        self.max_delay = max_delay
+        self._buffers: dict[BufferKey, _BranchBuffer] = {}  # Только ветки с незакоммиченными изменениями
+        self._status: TTLCache[BufferKey, _BranchStatus] = TTLCache(
+            "commit_buffer_status", maxsize=CALC_COMMIT_STATUS_SIZE, ttl=CALC_COMMIT_STATUS_TTL)
+
+    def _buffer(self, key: BufferKey) -> _BranchBuffer:
+        if key not in self._buffers:
+            self._buffers[key] = _BranchBuffer()
+        return self._buffers[key]
+
+    def _prune(self, key: BufferKey) -> None:
+        buffer = self._buffers.get(key)
+        if buffer is not None and buffer.idle:
+            del self._buffers[key]
+
+    def _branch_status(self, key: BufferKey) -> _BranchStatus:
+        return self._status.get(key) or _BranchStatus()
+
+    def _set_status(self, key: BufferKey, **changes: Any) -> None:
+        self._status.set(key, replace(self._branch_status(key), **changes))
+
+    # ==================== СОХРАНЕНИЕ ====================
+
+    def stage(self, project_id: int, branch: str, files: dict[str, str], message: str) -> dict[str, Any]:
+        """Положить файлы в буфер ветки; возвращает состояние буфера"""
+        buffer = self._buffer((project_id, branch))
+        now = time.monotonic()
+        batch = buffer.pending
+        if batch is None:
+            batch = buffer.pending = _PendingBatch(first_saved_at=now)
+        batch.files.update(files)
+        batch.messages.append(message)
+        batch.saves += 1
+        batch.last_saved_at = now
+        if self.window > 0:
+            self._schedule(project_id, branch, buffer)
+        return self.state(project_id, branch)
+
+    def _flush_delay(self, batch: _PendingBatch) -> float:
+        now = time.monotonic()
+        due = min(batch.last_saved_at + self.window, batch.first_saved_at + self.max_delay)
+        return max(0.0, due - now)
+
+    def _schedule(self, project_id: int, branch: str, buffer: _BranchBuffer) -> None:
+        # Каждое сохранение переносит коммит (в пределах max_delay)
+        if buffer.timer is not None and not buffer.timer.done():
+            buffer.timer.cancel()
+        delay = self._flush_delay(buffer.pending)
+        buffer.timer = asyncio.get_running_loop().create_task(self._flush_later(project_id, branch, delay))
+
+    async def _flush_later(self, project_id: int, branch: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        buffer = self._buffers.get((project_id, branch))
+        if buffer is None:
+            return
+        buffer.timer = None  # Дальше таймер не отменяем: коммит уже начался
+        try:
+            await self.flush(project_id, branch)
+        except Exception as e:
+            print(f"⚠️ Отложенный коммит в {branch} (Проект ID: {project_id}) не удался: {e}")
+            self._retry_later(project_id, branch)
+
+    def _retry_later(self, project_id: int, branch: str) -> None:
+        """Повторить неудавшийся коммит через window секунд (если никто не запланировал раньше)"""
+        buffer = self._buffers.get((project_id, branch))
+        if buffer is not None and buffer.pending is not None and buffer.timer is None and self.window > 0:
+            buffer.timer = asyncio.get_running_loop().create_task(
+                self._flush_later(project_id, branch, max(self.window, 1.0)))
+
+    # ==================== КОММИТ ====================
+
+    async def flush(self, project_id: int, branch: str) -> CommitInfo | None:
+        """
+        Закоммитить накопленные изменения ветки сейчас.
+        Возвращает коммит с изменениями ветки (последний, если новых изменений нет).
+        Ошибки GitLab поднимаются вызывающему; изменения остаются в буфере.
+        """
+        key = (project_id, branch)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return self._branch_status(key).last_commit
+        try:
+            return await self._flush_buffer(key, buffer)
+        finally:
+            self._prune(key)
+
+    async def _flush_buffer(self, key: BufferKey, buffer: _BranchBuffer) -> CommitInfo | None:
+        project_id, branch = key
+        async with buffer.lock:
+            batch = buffer.pending
+            if batch is None:
+                return self._branch_status(key).last_commit
+            if buffer.timer is not None and not buffer.timer.done():
+                buffer.timer.cancel()
+            buffer.timer = None
+            buffer.pending = None  # Сохранения во время коммита попадут в новый пакет
+
+            try:
+                commit = await self.gitlab.create_commit_multiple(
+                    files=batch.files,
+                    commit_message=_commit_message(batch.messages),
+                    branch=branch,
+                    project_id=project_id,
+                )
+            except BaseException as e:
+                if buffer.pending is None:
+                    buffer.pending = batch
+                else:
+                    buffer.pending.merge_older(batch)
+                self._set_status(key, last_error=str(e) or type(e).__name__)
+                raise
+
+            last_commit = CommitInfo(commit_id=commit.id, web_url=commit.web_url,
+                                     files=sorted(batch.files), saves=batch.saves)
+            self._set_status(key, last_commit=last_commit, last_error=None)
+            print(f"💾 Коммит {commit.id} в {branch}: {len(batch.files)} файлов, {batch.saves} сохранений")
+            if buffer.pending is not None and self.window > 0:
+                self._schedule(project_id, branch, buffer)
+            return last_commit
+
+    async def flush_for_read(self, project_id: int, branch: str) -> dict[str, str]:
+        """
+        Закоммитить буфер ветки перед чтением её файлов из GitLab.
+        Возвращает файлы, оставшиеся в буфере (коммит не удался) — они новее содержимого ветки.
+        """
+        try:
+            await self.flush(project_id, branch)
+        except Exception as e:
+            print(f"⚠️ Буфер {branch} (Проект ID: {project_id}) не закоммичен перед чтением: {e}")
+            self._retry_later(project_id, branch)
+        return self.pending_files(project_id, branch)
+
+    async def flush_all(self) -> None:
+        """Закоммитить все буферы (остановка сервиса); ошибки отдельных веток не прерывают остальные"""
+        for project_id, branch in list(self._buffers):
+            try:
+                await self.flush(project_id, branch)
+            except Exception as e:
+                print(f"❌ Изменения в {branch} (Проект ID: {project_id}) не закоммичены: {e}")
+
+    # ==================== СОСТОЯНИЕ ====================
+
+    def pending_files(self, project_id: int, branch: str) -> dict[str, str]:
+        """Ещё не закоммиченные файлы ветки (для чтения своих же сохранений)"""
+        buffer = self._buffers.get((project_id, branch))
+        return dict(buffer.pending.files) if buffer is not None and buffer.pending is not None else {}
+
+    def state(self, project_id: int, branch: str) -> dict[str, Any]:
+        """Состояние буфера ветки для клиента"""
+        buffer = self._buffers.get((project_id, branch))
+        batch = buffer.pending if buffer is not None else None
+        status = self._branch_status((project_id, branch))
+        last = status.last_commit
+        return {
+            "pending": batch is not None,
+            "files": sorted(batch.files) if batch else [],
+            "saves": batch.saves if batch else 0,
+            "flush_in": round(self._flush_delay(batch), 1) if batch and self.window > 0 else None,
+            "last_commit_id": last.commit_id if last else None,
+            "last_commit_url": last.web_url if last else None,
+            "error": status.last_error,
+        }
+
+
+# Глобальный экземпляр
+commit_buffer = CommitBuffer(gitlab_client)
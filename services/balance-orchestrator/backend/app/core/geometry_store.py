@@ -0,0 +1,124 @@
+# geometry_store.py — кеш манифеста и файлов геометрий
+"""
+Геометрии читаются из дефолтной ветки рабочего проекта и кешируются по SHA:
+
+- SHA головы дефолтной ветки хранится `GEOMETRY_HEAD_TTL` секунд (или до push-события
+  из вебхука), поэтому пока ничего не меняется, запросы к GitLab не делаются;
+- манифест и индекс id -> файл разбираются один раз на коммит;
+- содержимое файлов хранится по blob sha: в новом коммите неизменённый файл
+  распознаётся HEAD-запросом и повторно не скачивается.
+
+Blob sha файла служит ETag ответа.
+"""
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.async_gitlab_adapter import AsyncGitLabAdapter, gitlab_client
+from app.core.cache import TTLCache
+from app.core.serialization import loads
+from app.schemas.geometry import GeometriesManifest, GeometryInfo
+
+
+MANIFEST_PATH = "geometries/geometries_manifest.json"
+GEOMETRY_HEAD_TTL = float(os.getenv("GEOMETRY_HEAD_TTL", "60"))  # Как часто сверять голову ветки, с
+_ZERO_SHA = "0" * 40
+
+
+@dataclass(frozen=True)
+class ManifestSnapshot:
+    """Манифест геометрий на конкретном коммите"""
+    commit_sha: str
+    blob_id: str
+    manifest: GeometriesManifest
+    index: dict[str, GeometryInfo]  # id -> описание геометрии
+
+
+@dataclass(frozen=True)
+class GeometryPayload:
+    blob_id: str
+    data: Any
+
+
+def _parse_manifest(content: str) -> tuple[GeometriesManifest, dict[str, GeometryInfo]]:
+    manifest = GeometriesManifest.model_validate_json(content)
+    return manifest, {g.id: g for g in manifest.geometries}
+
+
+class GeometryStore:
+    def __init__(self, gitlab: AsyncGitLabAdapter, head_ttl: float = GEOMETRY_HEAD_TTL):
+        self.gitlab = gitlab
+        self._heads: TTLCache[str, str] = TTLCache("geometries.heads", maxsize=4, ttl=head_ttl)
+        self._manifests: TTLCache[str, ManifestSnapshot] = TTLCache("geometries.manifests", maxsize=16,
+                                                                    ttl=float("inf"))
+        # (commit sha, путь) -> blob sha; blob sha -> разобранное содержимое
+        self._paths: TTLCache[tuple[str, str], str] = TTLCache("geometries.paths", maxsize=4096, ttl=float("inf"))
+        self._blobs: TTLCache[str, Any] = TTLCache("geometries.blobs", maxsize=256, ttl=float("inf"))
+        self._seen_paths: set[str] = set()
+        self._project_id: int | None = None
+        self._branch: str | None = None
+
+    async def head_sha(self) -> str:
+        """SHA головы дефолтной ветки (кешируется на head_ttl)"""
+        return await self._heads.aget_or_load("head", self._load_head)
+
+    async def _load_head(self) -> str:
+        project = await self.gitlab.get_project()
+        self._project_id, self._branch = project.id, project.default_branch
+        return await self.gitlab.get_branch_head()
+
+    async def _blob(self, commit_sha: str, path: str, parse: Callable[[str], Any]) -> tuple[str, Any]:
+        """Blob sha и разобранное содержимое файла на коммите"""
+        async def resolve() -> str:
+            if path in self._seen_paths:
+                # Файл уже читался на другом коммите — возможно, он не менялся
+                blob_id = await self.gitlab.get_file_blob_id(path, commit_sha)
+                if blob_id and self._blobs.peek(blob_id) is not None:
+                    return blob_id
+            blob_id, content = await self.gitlab.get_file_blob(path, commit_sha)
+            self._blobs.set(blob_id, parse(content))
+            return blob_id
+
+        blob_id = await self._paths.aget_or_load((commit_sha, path), resolve)
+        self._seen_paths.add(path)
+        parsed = self._blobs.get(blob_id)
+        if parsed is None:
+            # Содержимое вытеснено из кеша — перечитываем
+            self._paths.invalidate((commit_sha, path))
+            blob_id = await self._paths.aget_or_load((commit_sha, path), resolve)
+            parsed = self._blobs.peek(blob_id)
+        return blob_id, parsed
+
+    async def manifest(self) -> ManifestSnapshot:
+        """Манифест геометрий на голове дефолтной ветки"""
+        commit_sha = await self.head_sha()
+
+        async def load() -> ManifestSnapshot:
+            blob_id, (manifest, index) = await self._blob(commit_sha, MANIFEST_PATH, _parse_manifest)
+            return ManifestSnapshot(commit_sha=commit_sha, blob_id=blob_id, manifest=manifest, index=index)
+
+        return await self._manifests.aget_or_load(commit_sha, load)
+
+    async def geometry(self, geometry_id: str) -> GeometryPayload | None:
+        """Полная геометрия по ID или None, если её нет в манифесте"""
+        snapshot = await self.manifest()
+        info = snapshot.index.get(geometry_id)
+        if info is None:
+            return None
+        blob_id, data = await self._blob(snapshot.commit_sha, info.file, loads)
+        return GeometryPayload(blob_id=blob_id, data=data)
+
+    def apply_push_event(self, payload: dict) -> bool:
+        """Push в дефолтную ветку рабочего проекта сразу обновляет SHA головы"""
+        project_id = payload.get("project_id") or (payload.get("project") or {}).get("id")
+        after = payload.get("after")
+        if (self._project_id is None or project_id != self._project_id
+                or payload.get("ref") != f"refs/heads/{self._branch}" or not after or after == _ZERO_SHA):
+            return False
+        self._heads.set("head", after)
+        return True
+
+
+# Глобальный экземпляр
+geometry_store = GeometryStore(gitlab_client)
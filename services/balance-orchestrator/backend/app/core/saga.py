@@ -0,0 +1,546 @@
+# saga.py — движок саг оркестратора: многошаговые расчёты в фоне
+"""
+Сага — набор шагов расчёта в сервисах (штоки клапанов, конденсатор) с итоговым
+коммитом всех результатов в ветку задачи одним коммитом.
+
+- Запуск саги только сохраняет её и ставит в очередь брокера: HTTP-запрос клиента
+  не ждёт расчёта, клиент опрашивает статус по id саги.
+- Шаг запускается, когда выполнены шаги из его depends_on; независимые шаги идут
+  параллельно, не больше `max_parallel` одновременно на один сервис.
+- Ошибка, которую имеет смысл повторить (сеть, 5xx, 429), повторяется с
+  экспоненциальной задержкой; после исчерпания попыток выполненные шаги
+  компенсируются в обратном порядке и сага завершается статусом 'compensated'.
+- Состояние саги и каждого шага сохраняется после каждого перехода
+  (таблица saga_instances из docs/architecture/platform/postgresql-database.md,
+  здесь — в SQLite). После перезапуска незавершённые саги продолжаются:
+  выполненные шаги не пересчитываются.
+- Запись в SQLite идёт в отдельном потоке (`asyncio.to_thread`), цикл событий
+  её не ждёт. Результаты шагов хранятся отдельной таблицей saga_step_results и
+  записываются один раз при завершении шага, а не с каждым переходом саги.
+
+Брокер (RabbitMQ/Celery в архитектуре) заменён `InProcessBroker` — очередью
+asyncio с пулом обработчиков внутри процесса.
+"""
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+from app.core.serialization import dumps, dumps_pretty, loads, result_files
+
+
+SagaStatus = Literal["pending", "running", "committing", "completed", "compensating", "compensated", "failed"]
+StepStatus = Literal["pending", "running", "done", "failed", "compensating", "compensated"]
+
+FINISHED_STATUSES = frozenset({"completed", "compensated", "failed"})
+
+# По умолчанию — backend/data/sagas.db, независимо от рабочего каталога (data/ в .gitignore)
+SAGA_DB_PATH = os.getenv("SAGA_DB_PATH", str(Path(__file__).resolve().parents[2] / "data" / "sagas.db"))
+SAGA_WORKERS = int(os.getenv("SAGA_WORKERS", "2"))             # Саг одновременно
+SAGA_MAX_PARALLEL = int(os.getenv("SAGA_MAX_PARALLEL", "4"))   # Шагов одновременно на сервис
+SAGA_STEP_RETRIES = int(os.getenv("SAGA_STEP_RETRIES", "3"))   # Повторов шага сверх первой попытки
+
+
+class SagaNotFoundError(KeyError):
+    pass
+
+
+class StepError(Exception):
+    """Ошибка шага; retryable — имеет ли смысл повторить попытку"""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class StepRunner(Protocol):
+    """Исполнитель шагов одного сервиса"""
+
+    async def run(self, payload: dict[str, Any]) -> Any: ...
+
+    async def compensate(self, payload: dict[str, Any], result: Any) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+@dataclass
+class StepState:
+    name: str
+    service: str                  # Ключ исполнителя: 'valves', 'condenser'
+    payload: dict[str, Any]
+    depends_on: list[str] = field(default_factory=list)
+    status: StepStatus = "pending"
+    attempts: int = 0
+    result: Any = None
+    error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+@dataclass
+class SagaState:
+    id: str
+    saga_type: str
+    project_id: int
+    branch: str
+    base_path: str                # Каталог результатов в репозитории
+    commit_message: str
+    steps: list[StepState]
+    status: SagaStatus = "pending"
+    current_state: str = "QUEUED"
+    error: str | None = None
+    commit_id: str | None = None
+    web_url: str | None = None
+    lock_version: int = 0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def step(self, name: str) -> StepState:
+        return next(s for s in self.steps if s.name == name)
+
+    def context(self) -> dict[str, Any]:
+        """Всё, что хранится в поле context таблицы (результаты шагов — в saga_step_results)"""
+        return {
+            "project_id": self.project_id,
+            "branch": self.branch,
+            "base_path": self.base_path,
+            "commit_message": self.commit_message,
+            "error": self.error,
+            "commit_id": self.commit_id,
+            "web_url": self.web_url,
+            "steps": [{f.name: getattr(s, f.name) for f in fields(s) if f.name != "result"} for s in self.steps],
+        }
+
+    def to_dict(self, with_results: bool = False) -> dict[str, Any]:
+        """Представление для API; результаты шагов — только по запросу"""
+        steps = []
+        for s in self.steps:
+            step = asdict(s)
+            del step["payload"]
+            if not with_results:
+                del step["result"]
+            steps.append(step)
+        return {
+            "saga_id": self.id,
+            "saga_type": self.saga_type,
+            "status": self.status,
+            "current_state": self.current_state,
+            "project_id": self.project_id,
+            "branch": self.branch,
+            "path": self.base_path,
+            "steps_total": len(self.steps),
+            "steps_done": sum(s.status == "done" for s in self.steps),
+            "steps": steps,
+            "error": self.error,
+            "commit_id": self.commit_id,
+            "web_url": self.web_url,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def validate_steps(steps: list[StepState]) -> None:
+    """Имена шагов уникальны, зависимости существуют и не образуют цикл"""
+    names = [s.name for s in steps]
+    if not steps:
+        raise ValueError("Сага должна содержать хотя бы один шаг")
+    if len(set(names)) != len(names):
+        raise ValueError("Имена шагов саги должны быть уникальны")
+    deps = {s.name: set(s.depends_on) for s in steps}
+    for name, required in deps.items():
+        unknown = required - deps.keys()
+        if unknown:
+            raise ValueError(f"Шаг '{name}' зависит от неизвестных шагов: {', '.join(sorted(unknown))}")
+
+    resolved: set[str] = set()
+    while len(resolved) < len(deps):
+        ready = {name for name, required in deps.items() if name not in resolved and required <= resolved}
+        if not ready:
+            raise ValueError("Зависимости шагов саги образуют цикл")
+        resolved |= ready
+
+
+# ==================== ХРАНИЛИЩЕ ====================
+
+class SagaStore:
+    """
+    Состояние саг в SQLite; каждое сохранение увеличивает lock_version.
+    Запись с меньшим lock_version, чем в таблице, не применяется: снимки, записанные
+    из потоков не по порядку, не затирают более новое состояние.
+    """
+
+    def __init__(self, path: str = SAGA_DB_PATH):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Соединение открывается при первом обращении (и создаёт таблицу)"""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS saga_instances (
+                        id TEXT PRIMARY KEY,
+                        saga_type TEXT NOT NULL,
+                        current_state TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        context TEXT NOT NULL,
+                        lock_version INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_saga_instances_status ON saga_instances (status)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS saga_step_results (
+                        saga_id TEXT NOT NULL,
+                        step TEXT NOT NULL,
+                        result TEXT NOT NULL,
+                        PRIMARY KEY (saga_id, step)
+                    )
+                """)
+            self._conn = conn
+        return self._conn
+
+    def save(self, saga: SagaState) -> None:
+        self._write(self._snapshot(saga))
+
+    async def asave(self, saga: SagaState) -> None:
+        """Снимок состояния — сразу (в цикле событий), запись в SQLite — в потоке"""
+        await asyncio.to_thread(self._write, self._snapshot(saga))
+
+    def save_result(self, saga_id: str, step: StepState) -> None:
+        data = dumps(step.result)
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO saga_step_results VALUES (?, ?, ?)", (saga_id, step.name, data))
+
+    async def asave_result(self, saga_id: str, step: StepState) -> None:
+        """Результат завершённого шага (после завершения не меняется, сериализуется в потоке)"""
+        await asyncio.to_thread(self.save_result, saga_id, step)
+
+    def get(self, saga_id: str, with_results: bool = True) -> SagaState:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM saga_instances WHERE id = ?", (saga_id,)).fetchone()
+            results = self._results(saga_id) if row is not None and with_results else []
+        if row is None:
+            raise SagaNotFoundError(f"Сага '{saga_id}' не найдена")
+        return self._from_row(row, results)
+
+    def unfinished(self) -> list[SagaState]:
+        """Саги, прерванные остановкой сервиса (в порядке создания)"""
+        placeholders = ", ".join("?" * len(FINISHED_STATUSES))
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM saga_instances WHERE status NOT IN ({placeholders}) ORDER BY created_at",
+                tuple(FINISHED_STATUSES),
+            ).fetchall()
+            return [self._from_row(row, self._results(row[0])) for row in rows]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _snapshot(saga: SagaState) -> tuple:
+        saga.updated_at = time.time()
+        saga.lock_version += 1
+        return (saga.id, saga.saga_type, saga.current_state, saga.status,
+                dumps(saga.context()), saga.lock_version, saga.created_at, saga.updated_at)
+
+    def _write(self, row: tuple) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO saga_instances VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    current_state = excluded.current_state, status = excluded.status, context = excluded.context,
+                    lock_version = excluded.lock_version, updated_at = excluded.updated_at
+                WHERE excluded.lock_version > saga_instances.lock_version
+            """, row)
+
+    def _results(self, saga_id: str) -> list[tuple[str, str]]:
+        return self.conn.execute("SELECT step, result FROM saga_step_results WHERE saga_id = ?", (saga_id,)).fetchall()
+
+    @staticmethod
+    def _from_row(row: tuple, results: list[tuple[str, str]]) -> SagaState:
+        saga_id, saga_type, current_state, status, context, lock_version, created_at, updated_at = row
+        ctx = loads(context)
+        stored = {name: loads(data) for name, data in results}
+        saga = SagaState(
+            id=saga_id, saga_type=saga_type, current_state=current_state, status=status,
+            project_id=ctx["project_id"], branch=ctx["branch"], base_path=ctx["base_path"],
+            commit_message=ctx["commit_message"], error=ctx["error"],
+            commit_id=ctx["commit_id"], web_url=ctx["web_url"],
+            steps=[StepState(**s) for s in ctx["steps"]],
+            lock_version=lock_version, created_at=created_at, updated_at=updated_at,
+        )
+        for step in saga.steps:
+            if step.name in stored:
+                step.result = stored[step.name]
+        return saga
+
+
+# ==================== БРОКЕР ====================
+
+class InProcessBroker:
+    """
+    Очередь сообщений внутри процесса: `workers` обработчиков разбирают id саг.
+    Заменяет RabbitMQ — интерфейс publish/start/stop тот же, что нужен продюсеру задач.
+    """
+
+    def __init__(self, workers: int = SAGA_WORKERS):
+        self.workers = workers
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._handler: Callable[[str], Awaitable[None]] | None = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, handler: Callable[[str], Awaitable[None]]) -> None:
+        self._handler = handler
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.get_running_loop().create_task(self._consume()) for _ in range(self.workers)]
+
+    def publish(self, message: str) -> None:
+        if self._queue is None:
+            raise RuntimeError("Брокер не запущен")
+        self._queue.put_nowait(message)
+
+    async def join(self) -> None:
+        """Дождаться обработки всех опубликованных сообщений"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _consume(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._handler(message)
+            except Exception as e:
+                print(f"❌ Ошибка обработки сообщения {message}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# ==================== ИСПОЛНИТЕЛЬ ====================
+
+class SagaExecutor:
+    def __init__(self, store: SagaStore, broker: InProcessBroker, runners: dict[str, StepRunner], gitlab,
+                 max_parallel: int = SAGA_MAX_PARALLEL, retries: int = SAGA_STEP_RETRIES,
+                 backoff_base: float = 0.5, backoff_max: float = 10.0):
+        self.store = store
+        self.broker = broker
+        self.runners = runners
+        self.gitlab = gitlab
+        self.max_parallel = max_parallel
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limits: dict[str, asyncio.Semaphore] = {}
+
+    # ---------- Жизненный цикл ----------
+
+    async def start(self) -> int:
+        """Запускает обработчики брокера и продолжает прерванные саги; возвращает их число"""
+        self._limits = {}  # Семафоры привязаны к циклу событий
+        self.broker.start(self.execute)
+        unfinished = await asyncio.to_thread(self.store.unfinished)
+        for saga in unfinished:
+            print(f"♻️ Продолжаем сагу {saga.id} ({saga.status}, {saga.current_state})")
+            self.broker.publish(saga.id)
+        return len(unfinished)
+
+    async def stop(self) -> None:
+        # Прерванные саги остаются незавершёнными в хранилище и продолжатся при следующем запуске
+        await self.broker.stop()
+
+    # ---------- API ----------
+
+    async def submit(self, saga_type: str, project_id: int, branch: str, base_path: str, commit_message: str,
+                     steps: list[StepState]) -> SagaState:
+        """Сохраняет сагу и ставит её в очередь; ошибки описания шагов — сразу (ValueError)"""
+        validate_steps(steps)
+        unknown = {s.service for s in steps} - self.runners.keys()
+        if unknown:
+            raise ValueError(f"Неизвестные сервисы: {', '.join(sorted(unknown))}")
+
+        saga = SagaState(id=uuid.uuid4().hex, saga_type=saga_type, project_id=project_id, branch=branch,
+                         base_path=base_path, commit_message=commit_message, steps=steps)
+        await self.store.asave(saga)
+        self.broker.publish(saga.id)
+        return saga
+
+    async def get(self, saga_id: str, with_results: bool = True) -> SagaState:
+        return await asyncio.to_thread(self.store.get, saga_id, with_results)
+
+    # ---------- Выполнение ----------
+
+    async def execute(self, saga_id: str) -> None:
+        """Обработчик сообщения брокера: доводит сагу до конечного статуса"""
+        saga = await asyncio.to_thread(self.store.get, saga_id)
+        if saga.finished:
+            return
+
+        if saga.status in ("pending", "running"):
+            # Шаг, прерванный остановкой сервиса, выполняется заново
+            for step in saga.steps:
+                if step.status == "running":
+                    step.status = "pending"
+            await self._transition(saga, "running", "RUNNING_STEPS")
+            # Шаг мог упасть до остановки сервиса, а компенсация — не начаться
+            failed = next((s for s in saga.steps if s.status == "failed"), None)
+            if failed is None:
+                failed = await self._run_steps(saga)
+            if failed is not None:
+                saga.error = f"Шаг '{failed.name}': {failed.error}"
+                await self._compensate(saga)
+                return
+            not_done = [s.name for s in saga.steps if s.status != "done"]
+            if not_done:
+                saga.error = f"Шаги не выполнены: {', '.join(not_done)}"
+                await self._compensate(saga)
+                return
+            await self._transition(saga, "committing", "COMMITTING_RESULTS")
+
+        if saga.status == "committing":
+            try:
+                await self._commit(saga)
+            except Exception as e:
+                # Не только GitlabError: сетевые ошибки и таймауты httpx тоже не должны оставлять сагу в committing
+                saga.error = f"Ошибка коммита в GitLab: {type(e).__name__}: {e}"
+                await self._compensate(saga)
+                return
+            await self._transition(saga, "completed", "COMPLETED")
+            print(f"✅ Сага {saga.id} завершена, коммит {saga.commit_id}")
+            return
+
+        if saga.status == "compensating":
+            await self._compensate(saga)
+
+    async def _transition(self, saga: SagaState, status: SagaStatus, current_state: str) -> None:
+        saga.status, saga.current_state = status, current_state
+        await self.store.asave(saga)
+
+    def _limit(self, service: str) -> asyncio.Semaphore:
+        if service not in self._limits:
+            self._limits[service] = asyncio.Semaphore(self.max_parallel)
+        return self._limits[service]
+
+    def _retry_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _run_steps(self, saga: SagaState) -> StepState | None:
+        """Выполняет шаги по готовности зависимостей; возвращает упавший шаг или None"""
+        running: dict[asyncio.Task, StepState] = {}
+        failed: StepState | None = None
+        try:
+            while failed is None:
+                done_names = {s.name for s in saga.steps if s.status == "done"}
+                for step in saga.steps:
+                    if step.status == "pending" and set(step.depends_on) <= done_names:
+                        step.status = "running"
+                        running[asyncio.create_task(self._run_step(saga, step))] = step
+                if not running:
+                    break
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    step = running.pop(task)
+                    if step.status == "failed":
+                        failed = failed or step
+        finally:
+            # Упал шаг (или сагу прервали) — параллельные шаги больше не нужны
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            for step in running.values():
+                if step.status == "running":
+                    step.status = "pending"
+            if running:
+                await self.store.asave(saga)
+        return failed
+
+    async def _run_step(self, saga: SagaState, step: StepState) -> None:
+        runner = self.runners[step.service]
+        async with self._limit(step.service):
+            step.started_at = time.time()
+            await self.store.asave(saga)
+            while True:
+                step.attempts += 1
+                try:
+                    step.result = await runner.run(step.payload)
+                except StepError as e:
+                    step.error = str(e)
+                    if e.retryable and step.attempts <= self.retries:
+                        print(f"🔁 Сага {saga.id}: шаг '{step.name}' — {e}, повтор {step.attempts}")
+                        await self.store.asave(saga)
+                        await asyncio.sleep(self._retry_delay(step.attempts - 1))
+                        continue
+                    step.status = "failed"
+                except Exception as e:
+                    step.error = f"{type(e).__name__}: {e}"
+                    step.status = "failed"
+                else:
+                    await self.store.asave_result(saga.id, step)
+                    step.status, step.error = "done", None
+                step.finished_at = time.time()
+                await self.store.asave(saga)
+                return
+
+    async def _commit(self, saga: SagaState) -> None:
+        """Все результаты саги — одним коммитом в ветку задачи"""
+        files = {}
+        for step in saga.steps:
+            step_path = f"{saga.base_path}/{step.name}"
+            files[f"{step_path}/input.json"] = dumps_pretty(step.payload)
+            files.update(result_files(step_path, step.result))
+        commit = await self.gitlab.create_commit_multiple(
+            files=files, commit_message=saga.commit_message, branch=saga.branch, project_id=saga.project_id
+        )
+        saga.commit_id, saga.web_url = commit.id, commit.web_url
+
+    async def _compensate(self, saga: SagaState) -> None:
+        """Откатывает выполненные шаги в порядке, обратном завершению"""
+        await self._transition(saga, "compensating", "COMPENSATING")
+        print(f"↩️ Сага {saga.id}: {saga.error}; компенсируем выполненные шаги")
+        to_undo = [s for s in saga.steps if s.status in ("done", "compensating")]
+        ok = True
+        for step in sorted(to_undo, key=lambda s: s.finished_at or 0, reverse=True):
+            step.status = "compensating"
+            await self.store.asave(saga)
+            try:
+                await self.runners[step.service].compensate(step.payload, step.result)
+            except Exception as e:
+                ok = False
+                step.error = f"Компенсация не выполнена: {e}"
+                print(f"❌ Сага {saga.id}: шаг '{step.name}' не компенсирован: {e}")
+                await self.store.asave(saga)
+                continue
+            step.status = "compensated"
+            await self.store.asave(saga)
+        if ok:
+            await self._transition(saga, "compensated", "COMPENSATED")
+        else:
+            await self._transition(saga, "failed", "COMPENSATION_FAILED")
@@ -0,0 +1,132 @@
+# serialization.py — JSON для файлов расчётов и ответов API (orjson)
+"""
+Быстрая сериализация результатов расчётов и хранение больших результатов.
+
+- `dumps` / `dumps_pretty` / `loads` — orjson вместо json: UTF-8 без экранирования,
+  отступ 2 пробела, NaN/inf записываются как null. Байт в байт с json.dumps
+  вывод не совпадает: числа с плавающей точкой записываются иначе (1e-7 вместо
+  1e-07, 1e16 вместо 1e+16), поэтому первое сохранение после перехода даёт diff в таких числах.
+- Результат больше `CALC_INLINE_RESULT_LIMIT` байт хранится раздельно:
+  таблицы (словари колонок одинаковой длины, как `columns` таблиц диапазонов
+  конденсатора) — построчно в NDJSON рядом с result.json, а в самом result.json
+  остаётся читаемая сводка со ссылками на эти файлы.
+- `load_result` собирает полный результат обратно по сводке.
+"""
+import os
+import re
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+import orjson
+
+
+CALC_INLINE_RESULT_LIMIT = int(os.getenv("CALC_INLINE_RESULT_LIMIT", str(1024 * 1024)))
+
+STORED_KEY = "$ndjson"        # Маркер таблицы, вынесенной в отдельный файл
+NDJSON_CHUNK_ROWS = 5_000      # Строк NDJSON на одну порцию записи/отдачи
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS  # Нестроковые ключи — строками, как в json.dumps
+
+
+def dumps(obj: Any) -> str:
+    """Компактный JSON"""
+    return orjson.dumps(obj, option=_OPTIONS).decode()
+
+
+def dumps_pretty(obj: Any) -> str:
+    """JSON с отступами (для файлов, которые смотрят в Git Diff)"""
+    return orjson.dumps(obj, option=_OPTIONS | orjson.OPT_INDENT_2).decode()
+
+
+def loads(data: str | bytes) -> Any:
+    return orjson.loads(data)
+
+
+# ==================== ТАБЛИЦЫ ====================
+
+def _is_table(value: Any) -> bool:
+    """Словарь колонок: все значения — списки одной (ненулевой) длины"""
+    if not isinstance(value, dict) or not value:
+        return False
+    lengths = {len(v) if isinstance(v, list) else -1 for v in value.values()}
+    return len(lengths) == 1 and lengths.pop() > 0
+
+
+def iter_ndjson(table: dict[str, list], chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """Таблица построчно в NDJSON, порциями по chunk_rows строк"""
+    names = list(table)
+    columns = list(table.values())
+    size = len(columns[0])
+    for start in range(0, size, chunk_rows):
+        rows = zip(*(col[start:start + chunk_rows] for col in columns), strict=True)
+        yield b"".join(orjson.dumps(dict(zip(names, row, strict=True)), option=_OPTIONS) + b"\n" for row in rows)
+
+
+def _table_summary(table: dict[str, list]) -> dict[str, Any]:
+    """Размер, колонки и диапазоны числовых значений таблицы"""
+    ranges = {}
+    for name, values in table.items():
+        numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool) and v == v]
+        if numbers:
+            ranges[name] = [min(numbers), max(numbers)]
+    return {"rows": len(next(iter(table.values()))), "columns": list(table), "ranges": ranges}
+
+
+# ==================== ФАЙЛЫ РЕЗУЛЬТАТА ====================
+
+def result_files(base_path: str, data: Any, name: str = "result",
+                 inline_limit: int = CALC_INLINE_RESULT_LIMIT) -> dict[str, str]:
+    """
+    Файлы результата для коммита: {путь: содержимое}.
+    Небольшой результат — один {name}.json с отступами. Большой — таблицы в
+    {name}.{ключ}.ndjson (или {name}.ndjson, если таблица — весь результат),
+    а {name}.json — сводка со ссылками на них.
+    """
+    compact = orjson.dumps(data, option=_OPTIONS)
+    if len(compact) <= inline_limit or not isinstance(data, dict):
+        return {f"{base_path}/{name}.json": dumps_pretty(data)}
+
+    files: dict[str, str] = {}
+
+    def extract(value: Any, key_path: list[str], depth: int) -> Any:
+        if _is_table(value):
+            file_name = ".".join([name, *key_path, "ndjson"])
+            files[f"{base_path}/{file_name}"] = b"".join(iter_ndjson(value)).decode()
+            return {STORED_KEY: file_name, **_table_summary(value)}
+        if isinstance(value, dict) and depth < 3:
+            return {k: extract(v, [*key_path, re.sub(r"[^\w-]", "_", str(k))], depth + 1) for k, v in value.items()}
+        return value
+
+    files[f"{base_path}/{name}.json"] = dumps_pretty(extract(data, [], 0))
+    return files
+
+
+def stored_tables(summary: Any) -> list[str]:
+    """Имена NDJSON-файлов, на которые ссылается сводка"""
+    found: list[str] = []
+    if isinstance(summary, dict):
+        if STORED_KEY in summary:
+            return [summary[STORED_KEY]]
+        for value in summary.values():
+            found.extend(stored_tables(value))
+    return found
+
+
+def _table_from_ndjson(content: str, names: list[str]) -> dict[str, list]:
+    table: dict[str, list] = {name: [] for name in names}
+    for line in content.splitlines():
+        if line:
+            for key, value in orjson.loads(line).items():
+                table.setdefault(key, []).append(value)
+    return table
+
+
+async def load_result(summary: Any, read_file: Callable[[str], Awaitable[str | None]]) -> Any:
+    """Полный результат по сводке: таблицы читаются из NDJSON-файлов через read_file(имя)"""
+    if not isinstance(summary, dict):
+        return summary
+    if STORED_KEY in summary:
+        content = await read_file(summary[STORED_KEY])
+        return _table_from_ndjson(content or "", summary.get("columns", []))
+    return {k: await load_result(v, read_file) for k, v in summary.items()}
+
@@ -0,0 +1,20 @@
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.calc_services import CONDENSER_URL, VALVE_STEMS_URL, CondenserRunner, ValveStemsRunner
+from app.core.saga import InProcessBroker, SagaExecutor, SagaStore
+
+
+# Один исполнитель саг на процесс: обработчики брокера запускаются в lifespan приложения,
+# состояние саг — в SQLite (SAGA_DB_PATH), поэтому прерванные саги продолжаются после перезапуска.
+saga_executor = SagaExecutor(
+    store=SagaStore(),
+    broker=InProcessBroker(),
+    runners={
+        "valves": ValveStemsRunner(VALVE_STEMS_URL),
+        "condenser": CondenserRunner(CONDENSER_URL),
+    },
+    gitlab=gitlab_client,
+)
+
+
+def get_saga_executor() -> SagaExecutor:
+    return saga_executor
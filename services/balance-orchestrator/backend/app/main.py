@@ -1,14 +1,47 @@
 # main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.api.routes import (
+    calculations,
+    config,
+    geometries,
+    health,
+    projects,
+    sagas,
+    tasks,
+    user,
+    webhooks,
+)
+from app.core.async_gitlab_adapter import gitlab_client
+from app.core.commit_buffer import commit_buffer
+from app.dependencies import saga_executor
+
 
-from app.api.routes import calculations, config, geometries, health, projects, tasks, user
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Обработчики саг; прерванные при прошлой остановке саги продолжаются
+    await saga_executor.start()
+    yield
+    await saga_executor.stop()
+    for runner in saga_executor.runners.values():
+        await runner.aclose()
+    # Несохранённые изменения из буфера — в GitLab до закрытия соединений
+    await commit_buffer.flush_all()
+    # Закрываем пул соединений с GitLab
+    await gitlab_client.aclose()
 
 
 app = FastAPI(
     title="Balance+ Orchestrator",
     description="Сервис оркестрации задач для инженерных расчётов",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -18,6 +51,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Сжатие ответов (большие результаты расчётов); мелкие ответы не сжимаются
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Подключаем роуты
 app.include_router(health.router)
@@ -27,6 +62,8 @@ app.include_router(user.router, prefix="/api/v1")
 app.include_router(calculations.router, prefix="/api/v1")
 app.include_router(projects.router, prefix="/api/v1")
 app.include_router(config.router, prefix="/api/v1")
+app.include_router(webhooks.router, prefix="/api/v1")
+app.include_router(sagas.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -10,3 +10,9 @@ class CalculationSaveRequest(BaseModel):
     input_data: dict[str, Any]
     output_data: dict[str, Any]
     commit_message: str | None = "Сохранение результатов расчёта"
+    submit: bool = False     # Закоммитить сразу, не дожидаясь окна объединения сохранений
+
+
+class CalculationSubmitRequest(BaseModel):
+    task_iid: int
+    project_id: int
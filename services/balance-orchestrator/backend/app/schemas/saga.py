@@ -0,0 +1,20 @@
+# schemas/saga.py
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class SagaStepRequest(BaseModel):
+    name: str = Field(pattern=r"^[\w.-]+$")   # Каталог результатов шага в репозитории
+    service: Literal["valves", "condenser"]
+    payload: dict[str, Any]                   # Тело запроса к расчётному сервису
+    depends_on: list[str] = []
+
+
+class SagaCreateRequest(BaseModel):
+    task_iid: int
+    project_id: int
+    app_type: str
+    saga_type: str = "CALCULATION"
+    steps: list[SagaStepRequest]
+    commit_message: str | None = "Результаты многошагового расчёта"
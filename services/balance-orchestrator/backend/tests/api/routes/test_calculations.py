@@ -1,21 +1,39 @@
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import gitlab.exceptions
+import httpx
 import pytest
 from fastapi import HTTPException
 
-from app.api.routes.calculations import get_latest_calculation, save_calculation_result
-from app.schemas.calculation import CalculationSaveRequest
+from app.api.routes.calculations import (
+    get_latest_calculation,
+    get_pending_state,
+    save_calculation_result,
+    stream_result_table,
+    submit_calculation_results,
+)
+from app.core.commit_buffer import CommitBuffer
+from app.core.serialization import CALC_INLINE_RESULT_LIMIT
+from app.schemas.calculation import CalculationSaveRequest, CalculationSubmitRequest
+
+
+@pytest.fixture
+def commit_buffer():
+    """Буфер коммитов роута; gitlab подставляется тестом"""
+    buffer = CommitBuffer(None, window=0)
+    with patch("app.api.routes.calculations.commit_buffer", buffer):
+        yield buffer
 
 
 class TestSaveCalculationResult:
     """Tests for save_calculation_result endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
-    async def test_successful_save(self, mock_gitlab: MagicMock):
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_successful_save(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
         """Should successfully save calculation result."""
+        commit_buffer.gitlab = mock_gitlab
         # Setup mocks
         branch_name = "issue/42-test-task"
         mock_commit = MagicMock()
@@ -57,9 +75,10 @@ class TestSaveCalculationResult:
         assert "calculations/valves/current/result.json" in call_args.kwargs["files"]
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
-    async def test_returns_400_when_branch_not_found(self, mock_gitlab: MagicMock):
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_returns_400_when_branch_not_found(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
         """Should return 400 Bad Request when branch is not found."""
+        commit_buffer.gitlab = mock_gitlab
         mock_gitlab.find_branch_by_issue_iid.return_value = None
 
         request = CalculationSaveRequest(
@@ -79,9 +98,10 @@ class TestSaveCalculationResult:
         mock_gitlab.create_commit_multiple.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
-    async def test_raises_401_on_authentication_error(self, mock_gitlab: MagicMock):
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_raises_401_on_authentication_error(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
         """Should raise HTTPException 401 on GitLab authentication error."""
+        commit_buffer.gitlab = mock_gitlab
         mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
         mock_gitlab.create_commit_multiple.side_effect = gitlab.exceptions.GitlabAuthenticationError("Auth failed")
 
@@ -100,9 +120,10 @@ class TestSaveCalculationResult:
         assert exc_info.value.detail == "Ошибка авторизации в GitLab"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
-    async def test_raises_404_on_get_error(self, mock_gitlab: MagicMock):
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_raises_404_on_get_error(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
         """Should raise HTTPException 404 on GitLabGetError."""
+        commit_buffer.gitlab = mock_gitlab
         mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
         mock_gitlab.create_commit_multiple.side_effect = gitlab.exceptions.GitlabGetError("Not found")
 
@@ -121,9 +142,10 @@ class TestSaveCalculationResult:
         assert exc_info.value.detail == "Объект не найден в GitLab"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
-    async def test_raises_502_on_gitlab_error(self, mock_gitlab: MagicMock):
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_raises_502_on_gitlab_error(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
         """Should raise HTTPException 502 on GitLab API error."""
+        commit_buffer.gitlab = mock_gitlab
         mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
         mock_gitlab.create_commit_multiple.side_effect = gitlab.exceptions.GitlabError("API error")
 
@@ -142,9 +164,10 @@ class TestSaveCalculationResult:
         assert exc_info.value.detail == "Ошибка GitLab API: API error"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
-    async def test_raises_500_on_generic_error(self, mock_gitlab: MagicMock):
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_raises_500_on_generic_error(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
         """Should raise HTTPException 500 on generic error."""
+        commit_buffer.gitlab = mock_gitlab
         mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
         mock_gitlab.create_commit_multiple.side_effect = Exception("Unexpected error")
 
@@ -166,7 +189,7 @@ class TestGetLatestCalculation:
     """Tests for get_latest_calculation endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_calculation_data_when_found(self, mock_gitlab: MagicMock):
         """Should return calculation data when files exist."""
         branch_name = "issue/42-test-task"
@@ -174,10 +197,10 @@ class TestGetLatestCalculation:
         output_data = {"result": "success", "value": 42.5}
 
         mock_gitlab.find_branch_by_issue_iid.return_value = branch_name
-        mock_gitlab.get_file_content_decoded.side_effect = [
-            json.dumps(input_data),
-            json.dumps(output_data)
-        ]
+        mock_gitlab.get_files.return_value = {
+            "calculations/valves/current/input.json": json.dumps(input_data),
+            "calculations/valves/current/result.json": json.dumps(output_data),
+        }
 
         result = await get_latest_calculation(task_iid=42, app_type="valves", project_id=123)
 
@@ -185,22 +208,16 @@ class TestGetLatestCalculation:
         assert result["input_data"] == input_data
         assert result["output_data"] == output_data
 
-        # Verify calls
+        # Verify calls: both files in one batched request
         mock_gitlab.find_branch_by_issue_iid.assert_called_once_with(42, 123)
-        assert mock_gitlab.get_file_content_decoded.call_count == 2
-        mock_gitlab.get_file_content_decoded.assert_any_call(
-            "calculations/valves/current/input.json",
-            ref=branch_name,
-            project_id=123
-        )
-        mock_gitlab.get_file_content_decoded.assert_any_call(
-            "calculations/valves/current/result.json",
+        mock_gitlab.get_files.assert_called_once_with(
+            ["calculations/valves/current/input.json", "calculations/valves/current/result.json"],
             ref=branch_name,
             project_id=123
         )
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_found_false_when_branch_not_found(self, mock_gitlab: MagicMock):
         """Should return found=False when branch is not found."""
         mock_gitlab.find_branch_by_issue_iid.return_value = None
@@ -210,15 +227,18 @@ class TestGetLatestCalculation:
         assert result["found"] is False
         assert result["reason"] == "Branch not found"
         mock_gitlab.find_branch_by_issue_iid.assert_called_once_with(999, 123)
-        mock_gitlab.get_file_content_decoded.assert_not_called()
+        mock_gitlab.get_files.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_found_false_when_input_file_missing(self, mock_gitlab: MagicMock):
         """Should return found=False when input file is missing."""
         branch_name = "issue/42-test-task"
         mock_gitlab.find_branch_by_issue_iid.return_value = branch_name
-        mock_gitlab.get_file_content_decoded.return_value = None
+        mock_gitlab.get_files.return_value = {
+            "calculations/valves/current/input.json": None,
+            "calculations/valves/current/result.json": None,
+        }
 
         result = await get_latest_calculation(task_iid=42, app_type="valves", project_id=123)
 
@@ -226,17 +246,17 @@ class TestGetLatestCalculation:
         assert result["reason"] == "Files missing"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_handles_missing_output_file(self, mock_gitlab: MagicMock):
         """Should handle missing output file gracefully."""
         branch_name = "issue/42-test-task"
         input_data = {"param1": "value1"}
 
         mock_gitlab.find_branch_by_issue_iid.return_value = branch_name
-        mock_gitlab.get_file_content_decoded.side_effect = [
-            json.dumps(input_data),
-            None  # output file missing
-        ]
+        mock_gitlab.get_files.return_value = {
+            "calculations/valves/current/input.json": json.dumps(input_data),
+            "calculations/valves/current/result.json": None,  # output file missing
+        }
 
         result = await get_latest_calculation(task_iid=42, app_type="valves", project_id=123)
 
@@ -245,7 +265,7 @@ class TestGetLatestCalculation:
         assert result["output_data"] is None
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_found_false_on_authentication_error(self, mock_gitlab: MagicMock):
         """Should return found=False on GitLab authentication error."""
         mock_gitlab.find_branch_by_issue_iid.side_effect = gitlab.exceptions.GitlabAuthenticationError("Auth failed")
@@ -256,7 +276,7 @@ class TestGetLatestCalculation:
         assert "Ошибка авторизации в GitLab" in result["error"]
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_found_false_on_get_error(self, mock_gitlab: MagicMock):
         """Should return found=False on GitLabGetError."""
         mock_gitlab.find_branch_by_issue_iid.side_effect = gitlab.exceptions.GitlabGetError("Not found")
@@ -267,7 +287,7 @@ class TestGetLatestCalculation:
         assert result["reason"] == "Branch or files not found"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_found_false_on_gitlab_error(self, mock_gitlab: MagicMock):
         """Should return found=False on GitLab API error."""
         mock_gitlab.find_branch_by_issue_iid.side_effect = gitlab.exceptions.GitlabError("API error")
@@ -278,7 +298,7 @@ class TestGetLatestCalculation:
         assert "Ошибка GitLab API" in result["error"]
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.calculations.gitlab_client")
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
     async def test_returns_found_false_on_generic_error(self, mock_gitlab: MagicMock):
         """Should return found=False on generic error."""
         mock_gitlab.find_branch_by_issue_iid.side_effect = Exception("Unexpected error")
@@ -289,3 +309,162 @@ class TestGetLatestCalculation:
         assert "error" in result
         assert "Unexpected error" in result["error"]
 
+
+
+class TestWriteBehindSaves:
+    """Saves are buffered per branch and committed together."""
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_saves_are_pending_until_read(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
+        """Should buffer saves and commit only the latest content before the branch is read."""
+        commit_buffer.gitlab = mock_gitlab
+        commit_buffer.window = 60
+        mock_commit = MagicMock()
+        mock_commit.id, mock_commit.web_url = "abc123", "https://gitlab/commit/abc123"
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
+        mock_gitlab.create_commit_multiple.return_value = mock_commit
+
+        for value in (1, 2, 3):
+            result = await save_calculation_result(CalculationSaveRequest(
+                task_iid=42, project_id=123, app_type="valves",
+                input_data={"value": value}, output_data={"result": value}, commit_message="Итерация"
+            ))
+            assert result["status"] == "pending"
+        assert result["pending"]["saves"] == 3
+        assert result["pending"]["files"] == ["calculations/valves/current/input.json",
+                                              "calculations/valves/current/result.json"]
+        mock_gitlab.create_commit_multiple.assert_not_called()
+
+        # Чтение ветки сначала коммитит буфер, затем читает GitLab
+        async def get_files(paths, ref, project_id):
+            files = mock_gitlab.create_commit_multiple.call_args.kwargs["files"]
+            return {path: files.get(path) for path in paths}
+
+        mock_gitlab.get_files.side_effect = get_files
+        latest = await get_latest_calculation(task_iid=42, app_type="valves", project_id=123)
+        assert latest["input_data"] == {"value": 3}
+        mock_gitlab.create_commit_multiple.assert_called_once()
+        kwargs = mock_gitlab.create_commit_multiple.call_args.kwargs
+        assert json.loads(kwargs["files"]["calculations/valves/current/input.json"]) == {"value": 3}
+        assert kwargs["commit_message"] == "Calc Result: Итерация (3 сохранений)"
+
+        submitted = await submit_calculation_results(CalculationSubmitRequest(task_iid=42, project_id=123))
+
+        assert submitted["status"] == "saved"
+        assert submitted["commit_id"] == "abc123"
+        assert submitted["pending"]["pending"] is False
+        mock_gitlab.create_commit_multiple.assert_called_once()
+
+        state = await get_pending_state(task_iid=42, project_id=123)
+        assert state["found"] is True
+        assert state["last_commit_id"] == "abc123"
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_read_falls_back_to_buffer_when_commit_fails(self, mock_gitlab: MagicMock,
+                                                               commit_buffer: CommitBuffer):
+        """Should serve the buffered save if the commit before the read fails."""
+        commit_buffer.gitlab = mock_gitlab
+        commit_buffer.window = 60
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
+        mock_gitlab.create_commit_multiple.side_effect = httpx.ConnectTimeout("timed out")
+
+        await save_calculation_result(CalculationSaveRequest(
+            task_iid=42, project_id=123, app_type="valves", input_data={"value": 1}, output_data={"result": 1}
+        ))
+        latest = await get_latest_calculation(task_iid=42, app_type="valves", project_id=123)
+
+        assert latest["input_data"] == {"value": 1}
+        assert latest["output_data"] == {"result": 1}
+        mock_gitlab.get_files.assert_not_called()
+        assert commit_buffer.state(123, "issue/42-test")["pending"] is True
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_submit_flag_commits_immediately(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
+        """Should commit right away when submit=True even with a window."""
+        commit_buffer.gitlab = mock_gitlab
+        commit_buffer.window = 60
+        mock_commit = MagicMock()
+        mock_commit.id, mock_commit.web_url = "def456", "https://gitlab/commit/def456"
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
+        mock_gitlab.create_commit_multiple.return_value = mock_commit
+
+        result = await save_calculation_result(CalculationSaveRequest(
+            task_iid=42, project_id=123, app_type="valves",
+            input_data={"value": 1}, output_data={"result": 1}, submit=True
+        ))
+
+        assert result["status"] == "saved"
+        assert result["commit_id"] == "def456"
+        mock_gitlab.create_commit_multiple.assert_called_once()
+
+
+class TestLargeResults:
+    """Large results are stored as NDJSON tables next to a summary."""
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_large_result_round_trip(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
+        """Should store tables as NDJSON on save and return a summary with table links on /latest."""
+        commit_buffer.gitlab = mock_gitlab
+        rows = CALC_INLINE_RESULT_LIMIT // 4
+        output = {"size": rows, "columns": {"p": list(range(rows)), "t": [i / 2 for i in range(rows)]}}
+        assert len(json.dumps(output)) > CALC_INLINE_RESULT_LIMIT
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
+        mock_gitlab.create_commit_multiple.return_value = MagicMock(id="abc123", web_url="u")
+
+        await save_calculation_result(CalculationSaveRequest(
+            task_iid=42, project_id=123, app_type="condenser", input_data={"x": 1}, output_data=output
+        ))
+
+        files = mock_gitlab.create_commit_multiple.call_args.kwargs["files"]
+        assert sorted(files) == ["calculations/condenser/current/input.json",
+                                 "calculations/condenser/current/result.columns.ndjson",
+                                 "calculations/condenser/current/result.json"]
+
+        async def get_files(paths, ref, project_id):
+            return {path: files.get(path) for path in paths}
+
+        mock_gitlab.get_files.side_effect = get_files
+        latest = await get_latest_calculation(task_iid=42, app_type="condenser", project_id=123,
+                                              inline_tables=False)
+
+        # Таблица не читается: только input.json и сводка
+        mock_gitlab.get_files.assert_called_once()
+        assert latest["found"] is True
+        assert latest["output_data"]["size"] == rows
+        assert latest["output_data"]["columns"]["$ndjson"] == "result.columns.ndjson"
+        assert latest["output_data"]["columns"]["rows"] == rows
+        assert latest["tables"] == {
+            "result.columns.ndjson": "/api/v1/calculations/latest/tables/result.columns.ndjson"
+                                     "?task_iid=42&app_type=condenser&project_id=123",
+        }
+        assert len(json.dumps(latest)) < 10_000
+
+        full = await get_latest_calculation(task_iid=42, app_type="condenser", project_id=123,
+                                            inline_tables=True)
+        assert full["output_data"] == output
+        assert "tables" not in full
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.calculations.gitlab_client", new_callable=AsyncMock)
+    async def test_table_is_streamed(self, mock_gitlab: MagicMock, commit_buffer: CommitBuffer):
+        """Should stream an NDJSON table from GitLab and reject unsafe names."""
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-test"
+        upstream = httpx.Response(200, content=b'{"p":1}\n{"p":2}\n')
+        mock_gitlab.open_file_stream.return_value = upstream
+
+        response = await stream_result_table("result.columns.ndjson", task_iid=42, app_type="condenser",
+                                             project_id=123)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+
+        assert response.media_type == "application/x-ndjson"
+        assert body == b'{"p":1}\n{"p":2}\n'
+        mock_gitlab.open_file_stream.assert_called_once_with(
+            "calculations/condenser/current/result.columns.ndjson", ref="issue/42-test", project_id=123)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await stream_result_table("../secrets.ndjson", task_iid=42, app_type="condenser", project_id=123)
+        assert exc_info.value.status_code == 400
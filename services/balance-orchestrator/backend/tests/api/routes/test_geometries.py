@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, patch
+
+import gitlab.exceptions
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.routes.geometries import get_geometry, list_geometries
+from app.core.geometry_store import GeometryPayload, ManifestSnapshot
+from app.schemas.geometry import GeometriesManifest
+
+
+MANIFEST = GeometriesManifest(schema_version="1.0", geometries=[
+    {"id": "k-300", "name": "К-300", "type": "condenser", "file": "geometries/k-300.json"},
+])
+SNAPSHOT = ManifestSnapshot(commit_sha="c" * 40, blob_id="b" * 40, manifest=MANIFEST,
+                            index={g.id: g for g in MANIFEST.geometries})
+
+
+class TestListGeometries:
+    """Tests for list_geometries endpoint."""
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.geometries.geometry_store", new_callable=AsyncMock)
+    async def test_returns_geometries_with_etag(self, mock_store: AsyncMock):
+        mock_store.manifest.return_value = SNAPSHOT
+        response = Response()
+
+        result = await list_geometries(response, if_none_match=None)
+
+        assert result == MANIFEST.geometries
+        assert response.headers["ETag"] == f'"{"b" * 40}"'
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.geometries.geometry_store", new_callable=AsyncMock)
+    async def test_not_modified(self, mock_store: AsyncMock):
+        mock_store.manifest.return_value = SNAPSHOT
+
+        result = await list_geometries(Response(), if_none_match=f'"x", "{"b" * 40}"')
+
+        assert result.status_code == 304
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.geometries.geometry_store", new_callable=AsyncMock)
+    async def test_manifest_missing(self, mock_store: AsyncMock):
+        mock_store.manifest.side_effect = gitlab.exceptions.GitlabGetError("Not found")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await list_geometries(Response(), if_none_match=None)
+
+        assert exc_info.value.status_code == 404
+
+
+class TestGetGeometry:
+    """Tests for get_geometry endpoint."""
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.geometries.geometry_store", new_callable=AsyncMock)
+    async def test_returns_geometry(self, mock_store: AsyncMock):
+        mock_store.geometry.return_value = GeometryPayload(blob_id="a" * 40, data={"id": "k-300"})
+        response = Response()
+
+        assert await get_geometry("k-300", response, if_none_match=None) == {"id": "k-300"}
+        assert response.headers["ETag"] == f'"{"a" * 40}"'
+        assert (await get_geometry("k-300", Response(), if_none_match=f'"{"a" * 40}"')).status_code == 304
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.geometries.geometry_store", new_callable=AsyncMock)
+    async def test_unknown_geometry(self, mock_store: AsyncMock):
+        mock_store.geometry.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_geometry("nope", Response(), if_none_match=None)
+
+        assert exc_info.value.status_code == 404
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import gitlab.exceptions
 import pytest
@@ -11,7 +11,7 @@ class TestListProjects:
     """Tests for list_projects endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.projects.gitlab_client")
+    @patch("app.api.routes.projects.gitlab_client", new_callable=AsyncMock)
     async def test_returns_projects_list(self, mock_gitlab: MagicMock):
         """Should return list of projects."""
         mock_projects = [
@@ -26,7 +26,7 @@ class TestListProjects:
         mock_gitlab.get_user_projects.assert_called_once_with("")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.projects.gitlab_client")
+    @patch("app.api.routes.projects.gitlab_client", new_callable=AsyncMock)
     async def test_filters_projects_by_search(self, mock_gitlab: MagicMock):
         """Should filter projects by search query."""
         mock_projects = [
@@ -40,7 +40,7 @@ class TestListProjects:
         mock_gitlab.get_user_projects.assert_called_once_with("alpha")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.projects.gitlab_client")
+    @patch("app.api.routes.projects.gitlab_client", new_callable=AsyncMock)
     async def test_returns_empty_list(self, mock_gitlab: MagicMock):
         """Should return empty list when no projects found."""
         mock_gitlab.get_user_projects.return_value = []
@@ -51,7 +51,7 @@ class TestListProjects:
         mock_gitlab.get_user_projects.assert_called_once_with("nonexistent")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.projects.gitlab_client")
+    @patch("app.api.routes.projects.gitlab_client", new_callable=AsyncMock)
     async def test_raises_401_on_authentication_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 401 on GitLab authentication error."""
         mock_gitlab.get_user_projects.side_effect = gitlab.exceptions.GitlabAuthenticationError("Auth failed")
@@ -63,7 +63,7 @@ class TestListProjects:
         assert exc_info.value.detail == "Ошибка авторизации в GitLab"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.projects.gitlab_client")
+    @patch("app.api.routes.projects.gitlab_client", new_callable=AsyncMock)
     async def test_raises_502_on_gitlab_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 502 on GitLab API error."""
         mock_gitlab.get_user_projects.side_effect = gitlab.exceptions.GitlabError("API error")
@@ -75,7 +75,7 @@ class TestListProjects:
         assert exc_info.value.detail == "Ошибка GitLab API: API error"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.projects.gitlab_client")
+    @patch("app.api.routes.projects.gitlab_client", new_callable=AsyncMock)
     async def test_raises_500_on_generic_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 500 on generic error."""
         mock_gitlab.get_user_projects.side_effect = Exception("Unexpected error")
@@ -0,0 +1,94 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes.sagas import get_saga, start_saga
+from app.core.saga import SagaNotFoundError, SagaState, StepState
+from app.schemas.saga import SagaCreateRequest
+
+
+def _request(**overrides) -> SagaCreateRequest:
+    data = {
+        "task_iid": 4,
+        "project_id": 123,
+        "app_type": "valves",
+        "steps": [
+            {"name": "stems", "service": "valves", "payload": {"valve_drawing": "V-1"}},
+            {"name": "condenser", "service": "condenser", "payload": {"strategy": "s"}, "depends_on": ["stems"]},
+        ],
+    }
+    return SagaCreateRequest(**{**data, **overrides})
+
+
+def _saga(steps: list[StepState]) -> SagaState:
+    return SagaState(id="s1", saga_type="CALCULATION", project_id=123, branch="issue/4-calc",
+                     base_path="calculations/valves/current", commit_message="Calc", steps=steps)
+
+
+class TestStartSaga:
+    @pytest.mark.asyncio
+    @patch("app.api.routes.sagas.gitlab_client", new_callable=AsyncMock)
+    async def test_returns_saga_id_without_waiting(self, mock_gitlab: MagicMock):
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/4-calc"
+        executor = MagicMock(submit=AsyncMock(), get=AsyncMock())
+        executor.submit.side_effect = lambda **kwargs: _saga(kwargs["steps"])
+
+        result = await start_saga(_request(), executor)
+
+        assert result["saga_id"] == "s1"
+        assert result["status"] == "pending"
+        assert result["steps_total"] == 2
+        kwargs = executor.submit.call_args.kwargs
+        assert kwargs["branch"] == "issue/4-calc"
+        assert kwargs["base_path"] == "calculations/valves/current"
+        assert kwargs["steps"][1].depends_on == ["stems"]
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.sagas.gitlab_client", new_callable=AsyncMock)
+    async def test_branch_not_found(self, mock_gitlab: MagicMock):
+        mock_gitlab.find_branch_by_issue_iid.return_value = None
+        executor = MagicMock(submit=AsyncMock(), get=AsyncMock())
+
+        with pytest.raises(HTTPException) as exc_info:
+            await start_saga(_request(), executor)
+
+        assert exc_info.value.status_code == 400
+        executor.submit.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.sagas.gitlab_client", new_callable=AsyncMock)
+    async def test_invalid_steps(self, mock_gitlab: MagicMock):
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/4-calc"
+        executor = MagicMock(submit=AsyncMock(), get=AsyncMock())
+        executor.submit.side_effect = ValueError("Зависимости шагов саги образуют цикл")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await start_saga(_request(), executor)
+
+        assert exc_info.value.status_code == 422
+
+
+class TestGetSaga:
+    @pytest.mark.asyncio
+    async def test_status_hides_results_by_default(self):
+        step = StepState(name="stems", service="valves", payload={}, status="done", result={"Gi": [1.0]})
+        executor = MagicMock(submit=AsyncMock(), get=AsyncMock())
+        executor.get.return_value = _saga([step])
+
+        brief = await get_saga("s1", executor=executor)
+        full = await get_saga("s1", with_results=True, executor=executor)
+
+        assert brief["steps_done"] == 1
+        assert "result" not in brief["steps"][0]
+        assert full["steps"][0]["result"] == {"Gi": [1.0]}
+
+    @pytest.mark.asyncio
+    async def test_not_found(self):
+        executor = MagicMock(submit=AsyncMock(), get=AsyncMock())
+        executor.get.side_effect = SagaNotFoundError("Сага 'x' не найдена")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_saga("x", executor=executor)
+
+        assert exc_info.value.status_code == 404
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import gitlab.exceptions
 import pytest
@@ -9,7 +9,9 @@ from app.api.routes.tasks import (
     create_task_branch,
     get_task,
     list_tasks,
+    submit_task,
 )
+from app.core.commit_buffer import CommitBuffer
 from app.schemas.task import BranchCreateRequest, TaskCreate
 
 
@@ -17,7 +19,7 @@ class TestListTasks:
     """Tests for list_tasks endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_opened_all_users_returns_issues(self, mock_gitlab: MagicMock):
         """Should return issues for opened state and all users."""
         mock_gitlab.get_all_assigned_issues.return_value = [{"iid": 1, "title": "Test"}]
@@ -26,7 +28,7 @@ class TestListTasks:
         mock_gitlab.get_all_assigned_issues.assert_called_once_with(state="opened")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_opened_my_only_returns_issues(self, mock_gitlab: MagicMock):
         """Should return issues for opened state and my_only=True."""
         mock_gitlab.get_all_assigned_issues.return_value = [{"iid": 2, "title": "My task"}]
@@ -35,7 +37,7 @@ class TestListTasks:
         mock_gitlab.get_all_assigned_issues.assert_called_once_with(state="opened")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_closed_state_returns_issues(self, mock_gitlab: MagicMock):
         """Should handle closed state correctly."""
         mock_gitlab.get_all_assigned_issues.return_value = []
@@ -44,7 +46,7 @@ class TestListTasks:
         mock_gitlab.get_all_assigned_issues.assert_called_once_with(state="closed")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_all_state_returns_issues(self, mock_gitlab: MagicMock):
         """Should handle all state correctly."""
         mock_gitlab.get_all_assigned_issues.return_value = [{"iid": 3}]
@@ -53,7 +55,7 @@ class TestListTasks:
         mock_gitlab.get_all_assigned_issues.assert_called_once_with(state="all")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_empty_state_passes_to_gitlab(self, mock_gitlab: MagicMock):
         """Should pass empty state to gitlab_client."""
         mock_gitlab.get_all_assigned_issues.return_value = []
@@ -62,7 +64,7 @@ class TestListTasks:
         mock_gitlab.get_all_assigned_issues.assert_called_once_with(state="")
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_raises_500_on_gitlab_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 500 on gitlab_client error."""
         mock_gitlab.get_all_assigned_issues.side_effect = Exception("Connection failed")
@@ -76,7 +78,7 @@ class TestGetTask:
     """Tests for get_task endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_valid_iid_returns_task(self, mock_gitlab: MagicMock):
         """Should return task info for valid issue_iid."""
         expected_issue = {"iid": 42, "title": "Test task"}
@@ -86,7 +88,7 @@ class TestGetTask:
         mock_gitlab.get_issue.assert_called_once_with(42, 123)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_zero_iid_calls_gitlab(self, mock_gitlab: MagicMock):
         """Should handle zero issue_iid boundary case."""
         mock_gitlab.get_issue.return_value = {"iid": 0}
@@ -95,7 +97,7 @@ class TestGetTask:
         mock_gitlab.get_issue.assert_called_once_with(0, 123)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_negative_iid_calls_gitlab(self, mock_gitlab: MagicMock):
         """Should handle negative issue_iid edge case."""
         mock_gitlab.get_issue.return_value = {"iid": -1}
@@ -104,7 +106,7 @@ class TestGetTask:
         mock_gitlab.get_issue.assert_called_once_with(-1, 123)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_large_iid_calls_gitlab(self, mock_gitlab: MagicMock):
         """Should handle large issue_iid boundary case."""
         large_iid = 999999999
@@ -114,7 +116,7 @@ class TestGetTask:
         mock_gitlab.get_issue.assert_called_once_with(large_iid, 123)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_raises_404_on_gitlab_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 404 on gitlab_client error."""
         mock_gitlab.get_issue.side_effect = gitlab.exceptions.GitlabGetError("Issue not found")
@@ -124,7 +126,7 @@ class TestGetTask:
         assert exc_info.value.detail == "Задача #999 не найдена в GitLab"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_non_int_iid_passes_to_gitlab(self, mock_gitlab: MagicMock):
         """Should pass non-int issue_iid to gitlab_client (Python typing)."""
         mock_gitlab.get_issue.return_value = {"iid": "str"}
@@ -136,7 +138,7 @@ class TestCreateTask:
     """Tests for create_task endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_valid_task_creates_and_returns_full_info(self, mock_gitlab: MagicMock):
         """Should create issue and return full task info."""
         task = TaskCreate(title="New Task", description="Details", labels=["feature"], project_id=123)
@@ -152,7 +154,7 @@ class TestCreateTask:
         mock_gitlab.get_issue.assert_called_once_with(123, 123)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_empty_title_passes_to_gitlab(self, mock_gitlab: MagicMock):
         """Should handle empty title edge case."""
         task = TaskCreate(title="", description="", labels=[], project_id=123)
@@ -162,7 +164,7 @@ class TestCreateTask:
         mock_gitlab.create_issue.assert_called_once_with(title="", description="", labels=[], project_id=123)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_raises_500_on_create_issue_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 500 on create_issue error."""
         task = TaskCreate(title="Fail task", project_id=123)
@@ -173,7 +175,7 @@ class TestCreateTask:
         assert exc_info.value.detail == "Ошибка создания задачи: Validation failed"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     async def test_raises_500_on_get_issue_error(self, mock_gitlab: MagicMock):
         """Should raise HTTPException 500 on get_issue after create."""
         task = TaskCreate(title="Test", project_id=123)
@@ -189,7 +191,7 @@ class TestCreateTaskBranch:
     """Tests for create_task_branch endpoint."""
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     @patch("app.api.routes.tasks.slugify")
     async def test_successful_branch_creation(self, mock_slugify: MagicMock, mock_gitlab: MagicMock):
         """Should create branch with slugified title."""
@@ -211,7 +213,7 @@ class TestCreateTaskBranch:
         mock_gitlab.create_branch.assert_called_once_with(branch_name, project_id=project_id)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     @patch("app.api.routes.tasks.slugify")
     async def test_empty_slug_uses_fallback(self, mock_slugify: MagicMock, mock_gitlab: MagicMock):
         """Should use 'task' fallback when slug is empty."""
@@ -228,7 +230,7 @@ class TestCreateTaskBranch:
         mock_slugify.assert_called_once_with("!!!", max_length=40)
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     @patch("app.api.routes.tasks.slugify")
     async def test_zero_iid_boundary(self, mock_slugify: MagicMock, mock_gitlab: MagicMock):
         """Should handle zero issue_iid boundary case."""
@@ -246,7 +248,7 @@ class TestCreateTaskBranch:
         assert result.created is False
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     @patch("app.api.routes.tasks.slugify")
     async def test_raises_500_on_get_issue_error(self, mock_slugify: MagicMock, mock_gitlab: MagicMock):
         """Should raise HTTPException 500 on get_issue error."""
@@ -258,7 +260,7 @@ class TestCreateTaskBranch:
         assert exc_info.value.detail == "Ошибка создания ветки: Issue not found"
 
     @pytest.mark.asyncio
-    @patch("app.api.routes.tasks.gitlab_client")
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
     @patch("app.api.routes.tasks.slugify")
     async def test_raises_500_on_create_branch_error(self, mock_slugify: MagicMock, mock_gitlab: MagicMock):
         """Should raise HTTPException 500 on create_branch error."""
@@ -273,3 +275,48 @@ class TestCreateTaskBranch:
         assert exc_info.value.status_code == 500
         assert exc_info.value.detail == "Ошибка создания ветки: Branch exists"
 
+
+class TestSubmitTask:
+    """Tests for submit_task endpoint."""
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
+    async def test_flushes_pending_saves_before_merge_request(self, mock_gitlab: MagicMock):
+        """Pending calculation saves should be committed before the MR is opened."""
+        events = []
+        buffer_gitlab = AsyncMock()
+        buffer_gitlab.create_commit_multiple.side_effect = lambda **kwargs: events.append("commit") or MagicMock(id="c1")
+        buffer = CommitBuffer(buffer_gitlab, window=15)
+        mock_gitlab.get_issue.return_value = {"title": "Расчёт"}
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-calc"
+        mock_gitlab.create_merge_request.side_effect = (
+            lambda **kwargs: events.append("mr") or {"web_url": "https://gitlab/mr/1", "iid": 1}
+        )
+
+        with patch("app.api.routes.tasks.commit_buffer", buffer):
+            buffer.stage(123, "issue/42-calc", {"calculations/valves/current/result.json": "{}"}, "save")
+            result = await submit_task(42, project_id=123)
+
+        assert result["mr_iid"] == 1
+        assert events == ["commit", "mr"]
+        assert buffer.pending_files(123, "issue/42-calc") == {}
+        assert buffer_gitlab.create_commit_multiple.call_args.kwargs["branch"] == "issue/42-calc"
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.tasks.gitlab_client", new_callable=AsyncMock)
+    async def test_flush_error_does_not_open_merge_request(self, mock_gitlab: MagicMock):
+        """A failed flush should surface as a GitLab error without creating the MR."""
+        buffer_gitlab = AsyncMock()
+        buffer_gitlab.create_commit_multiple.side_effect = gitlab.exceptions.GitlabCreateError("branch protected", 403)
+        buffer = CommitBuffer(buffer_gitlab, window=15)
+        mock_gitlab.get_issue.return_value = {"title": "Расчёт"}
+        mock_gitlab.find_branch_by_issue_iid.return_value = "issue/42-calc"
+
+        with patch("app.api.routes.tasks.commit_buffer", buffer):
+            buffer.stage(123, "issue/42-calc", {"a.json": "{}"}, "save")
+            with pytest.raises(HTTPException) as exc_info:
+                await submit_task(42, project_id=123)
+            assert buffer.pending_files(123, "issue/42-calc") == {"a.json": "{}"}
+
+        assert exc_info.value.status_code == 502
+        mock_gitlab.create_merge_request.assert_not_awaited()
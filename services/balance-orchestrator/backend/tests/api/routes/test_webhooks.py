@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+client = TestClient(app)
+PUSH = {"ref": "refs/heads/issue/5-x", "project_id": 3, "before": "0" * 40, "after": "a" * 40}
+HEADERS = {"X-Gitlab-Token": "s3cret"}
+
+
+class TestGitlabWebhook:
+    """Tests for the GitLab webhook endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def webhook_secret(self, monkeypatch):
+        monkeypatch.setenv("GITLAB_WEBHOOK_SECRET", "s3cret")
+
+    @patch("app.api.routes.webhooks.gitlab_client")
+    def test_push_event_updates_branch_index(self, mock_gitlab: MagicMock):
+        mock_gitlab.branch_index.apply_push_event.return_value = True
+
+        response = client.post("/api/v1/webhooks/gitlab", json=PUSH, headers={**HEADERS, "X-Gitlab-Event": "Push Hook"})
+
+        assert response.json() == {"status": "applied", "event": "Push Hook"}
+        mock_gitlab.branch_index.apply_push_event.assert_called_once_with(PUSH)
+
+    @patch("app.api.routes.webhooks.gitlab_client")
+    def test_other_events_ignored(self, mock_gitlab: MagicMock):
+        response = client.post("/api/v1/webhooks/gitlab", json={}, headers={**HEADERS, "X-Gitlab-Event": "Issue Hook"})
+
+        assert response.json()["status"] == "ignored"
+        mock_gitlab.branch_index.apply_push_event.assert_not_called()
+
+    @patch("app.api.routes.webhooks.gitlab_client")
+    def test_secret_checked(self, mock_gitlab: MagicMock):
+        response = client.post("/api/v1/webhooks/gitlab", json=PUSH,
+                               headers={"X-Gitlab-Event": "Push Hook", "X-Gitlab-Token": "wrong"})
+
+        assert response.status_code == 401
+        mock_gitlab.branch_index.apply_push_event.assert_not_called()
+
+    @patch("app.api.routes.webhooks.gitlab_client")
+    def test_rejected_without_configured_secret(self, mock_gitlab: MagicMock, monkeypatch):
+        monkeypatch.delenv("GITLAB_WEBHOOK_SECRET")
+
+        response = client.post("/api/v1/webhooks/gitlab", json=PUSH, headers={"X-Gitlab-Event": "Push Hook"})
+
+        assert response.status_code == 403
+        mock_gitlab.branch_index.apply_push_event.assert_not_called()
@@ -0,0 +1,241 @@
+"""
+Фейковый GitLab для тестов адаптера: FastAPI-приложение с состоянием в памяти,
+подключаемое к httpx через ASGITransport (без сети).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+
+TOKEN = "test-token"
+
+
+@dataclass
+class FakeGitLabState:
+    """Содержимое фейкового GitLab и журнал обращений к нему"""
+    projects: dict[int, dict] = field(default_factory=lambda: {
+        1: {"id": 1, "name": "Turbine", "name_with_namespace": "SKB / Turbine",
+            "path_with_namespace": "skb/turbine", "default_branch": "main",
+            "web_url": "http://gitlab.test/skb/turbine"},
+        2: {"id": 2, "name": "Condenser", "name_with_namespace": "SKB / Condenser",
+            "path_with_namespace": "skb/condenser", "default_branch": "master",
+            "web_url": "http://gitlab.test/skb/condenser"},
+    })
+    files: dict[tuple[int, str, str], str] = field(default_factory=dict)
+    branches: dict[int, list[str]] = field(default_factory=lambda: {1: ["main"], 2: ["master"]})
+    issues: list[dict] = field(default_factory=list)
+    commits: list[dict] = field(default_factory=list)
+    calls: list[tuple[str, str]] = field(default_factory=list)
+    fail_statuses: list[int] = field(default_factory=list)  # Коды ответа для ближайших запросов
+    tree_broken: bool = False  # Листинг папок отвечает 500
+    graphql_enabled: bool = True
+    snapshots: dict[str, dict[str, str]] = field(default_factory=dict)  # sha коммита -> {путь: содержимое}
+
+    def files_at(self, pid: int, ref: str) -> dict[str, str]:
+        """Файлы проекта на ветке или на коммите (ref = sha из head_of)"""
+        if ref in self.snapshots:
+            return self.snapshots[ref]
+        return {p: c for (fp, r, p), c in self.files.items() if fp == pid and r == ref}
+
+    def head_of(self, pid: int, branch: str) -> str:
+        """SHA головы ветки: хеш её содержимого (снимок запоминается для чтения по sha)"""
+        files = self.files_at(pid, branch)
+        sha = hashlib.sha1(json.dumps(sorted(files.items())).encode()).hexdigest()
+        self.snapshots[sha] = dict(files)
+        return sha
+    delay: float = 0.0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+def _issue(iid: int, project_id: int, title: str = "Задача") -> dict:
+    return {
+        "iid": iid, "project_id": project_id, "title": title, "description": "",
+        "state": "opened", "labels": [], "assignee": {"username": "engineer"},
+        "created_at": "2026-01-01T00:00:00Z", "due_date": None,
+        "web_url": f"http://gitlab.test/issues/{iid}",
+    }
+
+
+def build_fake_gitlab(state: FakeGitLabState) -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def bookkeeping(request: Request, call_next):
+        token = request.headers.get("PRIVATE-TOKEN")
+        if request.url.path == "/api/graphql":
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token != TOKEN:
+            return JSONResponse({"message": "401 Unauthorized"}, status_code=401)
+        state.calls.append((request.method, request.url.path))
+        state.in_flight += 1
+        state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        try:
+            if state.delay:
+                await asyncio.sleep(state.delay)
+            if state.fail_statuses:
+                return JSONResponse({"message": "unavailable"}, status_code=state.fail_statuses.pop(0))
+            return await call_next(request)
+        finally:
+            state.in_flight -= 1
+
+    def not_found(what: str = "404 Not Found") -> JSONResponse:
+        return JSONResponse({"message": what}, status_code=404)
+
+    @app.post("/api/graphql")
+    async def graphql(request: Request):
+        if not state.graphql_enabled:
+            return JSONResponse({"message": "404 Not Found"}, status_code=404)
+        variables = (await request.json())["variables"]
+        project = next((p for p in state.projects.values()
+                        if p["path_with_namespace"] == variables["fullPath"]), None)
+        if project is None:
+            return {"data": {"project": None}}
+        files = state.files_at(project["id"], variables["ref"])
+        nodes = []
+        for path in variables["paths"]:
+            if path in files:
+                node = {"path": path, "oid": hashlib.sha1(files[path].encode("utf-8")).hexdigest()}
+                if variables["withContent"]:
+                    node["rawTextBlob"] = files[path]
+                nodes.append(node)
+        return {"data": {"project": {"repository": {"blobs": {"nodes": nodes}}}}}
+
+    @app.get("/api/v4/user")
+    async def user():
+        return {"id": 7, "username": "engineer", "name": "Инженер", "avatar_url": ""}
+
+    @app.get("/api/v4/projects")
+    async def projects(search: str = ""):
+        return [p for p in state.projects.values() if search.lower() in p["name"].lower()]
+
+    @app.get("/api/v4/projects/{pid}")
+    async def project(pid: int):
+        return state.projects.get(pid) or not_found("404 Project Not Found")
+
+    @app.get("/api/v4/projects/{pid}/repository/files/{file_path:path}/raw")
+    async def raw_file(pid: int, file_path: str, ref: str):
+        files = state.files_at(pid, ref)
+        if file_path not in files:
+            return not_found("404 File Not Found")
+        return PlainTextResponse(files[file_path])
+
+    @app.api_route("/api/v4/projects/{pid}/repository/files/{file_path:path}", methods=["GET", "HEAD"])
+    async def file_meta(request: Request, pid: int, file_path: str, ref: str):
+        files = state.files_at(pid, ref)
+        if file_path not in files:
+            return not_found("404 File Not Found")
+        content = files[file_path].encode("utf-8")
+        blob_id = hashlib.sha1(content).hexdigest()
+        headers = {"X-Gitlab-File-Path": file_path, "X-Gitlab-Blob-Id": blob_id}
+        if request.method == "HEAD":
+            return Response(headers=headers)
+        return JSONResponse({"file_path": file_path, "blob_id": blob_id, "encoding": "base64",
+                             "content": base64.b64encode(content).decode("ascii")}, headers=headers)
+
+    @app.get("/api/v4/projects/{pid}/repository/tree")
+    async def tree(pid: int, ref: str, path: str = "", page: int = 1, per_page: int = 20):
+        if state.tree_broken:
+            return JSONResponse({"message": "500 Internal Server Error"}, status_code=500)
+        prefix = f"{path.rstrip('/')}/" if path else ""
+        entries = {}
+        for p in state.files_at(pid, ref):
+            if p.startswith(prefix):
+                name, _, rest = p[len(prefix):].partition("/")
+                entries[name] = "tree" if rest else "blob"
+        if path and not entries:
+            return not_found("404 Tree Not Found")
+        items = [{"name": n, "path": f"{prefix}{n}", "type": t} for n, t in sorted(entries.items())]
+        headers = {"X-Next-Page": str(page + 1)} if page * per_page < len(items) else {}
+        return JSONResponse(items[(page - 1) * per_page:page * per_page], headers=headers)
+
+    @app.post("/api/v4/projects/{pid}/repository/commits")
+    async def commit(pid: int, request: Request):
+        data = await request.json()
+        for action in data["actions"]:
+            key = (pid, data["branch"], action["file_path"])
+            if (action["action"] == "create") == (key in state.files):
+                return JSONResponse({"message": "A file with this name doesn't exist"}, status_code=400)
+            state.files[key] = action["content"]
+        state.commits.append(data)
+        sha = f"{len(state.commits):040x}"
+        return JSONResponse({"id": sha, "web_url": f"http://gitlab.test/commit/{sha}"}, status_code=201)
+
+    @app.get("/api/v4/projects/{pid}/repository/branches")
+    async def branches(pid: int, search: str = ""):
+        return [{"name": b} for b in sorted(state.branches.get(pid, [])) if search in b]
+
+    @app.get("/api/v4/projects/{pid}/repository/branches/{name:path}")
+    async def branch(pid: int, name: str):
+        if name not in state.branches.get(pid, []):
+            return not_found("404 Branch Not Found")
+        return {"name": name, "commit": {"id": state.head_of(pid, name)}}
+
+    @app.post("/api/v4/projects/{pid}/repository/branches")
+    async def create_branch(pid: int, branch: str, ref: str):
+        if branch in state.branches[pid]:
+            return JSONResponse({"message": "Branch already exists"}, status_code=400)
+        state.branches[pid].append(branch)
+        return JSONResponse({"name": branch}, status_code=201)
+
+    @app.get("/api/v4/issues")
+    async def issues(request: Request, page: int = 1, per_page: int = 20):
+        chunk = state.issues[(page - 1) * per_page:page * per_page]
+        headers = {"X-Next-Page": str(page + 1)} if page * per_page < len(state.issues) else {}
+        return JSONResponse(chunk, headers=headers)
+
+    @app.get("/api/v4/projects/{pid}/issues/{iid}")
+    async def issue(pid: int, iid: int):
+        found = next((i for i in state.issues if i["project_id"] == pid and i["iid"] == iid), None)
+        return found or not_found("404 Issue Not Found")
+
+    @app.post("/api/v4/projects/{pid}/issues")
+    async def create_issue(pid: int, request: Request):
+        data = await request.json()
+        issue = _issue(len(state.issues) + 1, pid, data["title"])
+        state.issues.append(issue)
+        return JSONResponse(issue, status_code=201)
+
+    @app.post("/api/v4/projects/{pid}/merge_requests")
+    async def create_mr(pid: int, request: Request):
+        data = await request.json()
+        return JSONResponse({"iid": 1, "title": data["title"], "state": "opened",
+                             "web_url": "http://gitlab.test/mr/1"}, status_code=201)
+
+    return app
+
+
+@pytest.fixture
+def fake_gitlab() -> FakeGitLabState:
+    return FakeGitLabState(issues=[_issue(1, 1), _issue(2, 1), _issue(3, 2)])
+
+
+@pytest.fixture
+def adapter_factory(fake_gitlab, monkeypatch):
+    from app.core.async_gitlab_adapter import AsyncGitLabAdapter, GitLabClientSettings
+
+    monkeypatch.setenv("GITLAB_URL", "http://gitlab.test")
+    monkeypatch.setenv("GITLAB_PRIVATE_TOKEN", TOKEN)
+    monkeypatch.setenv("GITLAB_PROJECT_ID", "1")
+
+    def make(**settings) -> AsyncGitLabAdapter:
+        settings.setdefault("backoff_base", 0.0)
+        transport = httpx.ASGITransport(app=build_fake_gitlab(fake_gitlab))
+        return AsyncGitLabAdapter(settings=GitLabClientSettings(**settings), transport=transport)
+
+    return make
+
+
+@pytest.fixture
+def adapter(adapter_factory):
+    return adapter_factory()
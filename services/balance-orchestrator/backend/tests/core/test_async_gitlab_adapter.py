@@ -0,0 +1,265 @@
+import asyncio
+
+import gitlab.exceptions
+import httpx
+import pytest
+
+from app.core.async_gitlab_adapter import AsyncGitLabAdapter, GitLabClientSettings
+
+
+class TestAsyncGitLabAdapter:
+    """Tests for AsyncGitLabAdapter against the fake GitLab server."""
+
+    @pytest.mark.asyncio
+    async def test_check_connection(self, adapter):
+        assert await adapter.check_connection() == "OK: engineer"
+
+    @pytest.mark.asyncio
+    async def test_wrong_token_raises_authentication_error(self, adapter):
+        adapter.token = "wrong"
+        with pytest.raises(gitlab.exceptions.GitlabAuthenticationError):
+            await adapter.get_current_user()
+
+    @pytest.mark.asyncio
+    async def test_files(self, adapter, fake_gitlab):
+        fake_gitlab.files[(1, "main", "calc/input.json")] = '{"p": 1}'
+
+        assert await adapter.get_file_content("calc/input.json") == '{"p": 1}'
+        assert await adapter.file_exists("calc/input.json", "main", project_id=1)
+        assert not await adapter.file_exists("calc/missing.json", "main", project_id=1)
+        assert await adapter.get_file_content_decoded("calc/missing.json", "main", project_id=1) is None
+        assert [f["name"] for f in await adapter.list_files_in_path("calc", "main", project_id=1)] == ["input.json"]
+
+    @pytest.mark.asyncio
+    async def test_open_file_stream(self, adapter, fake_gitlab):
+        fake_gitlab.files[(1, "main", "calc/result.ndjson")] = '{"p": 1}\n{"p": 2}\n'
+
+        response = await adapter.open_file_stream("calc/result.ndjson", "main", project_id=1)
+        body = b"".join([chunk async for chunk in response.aiter_bytes()])
+        await response.aclose()
+
+        assert body.decode().splitlines() == ['{"p": 1}', '{"p": 2}']
+        with pytest.raises(gitlab.exceptions.GitlabGetError):
+            await adapter.open_file_stream("calc/missing.ndjson", "main", project_id=1)
+
+    @pytest.mark.asyncio
+    async def test_file_content_cached_by_blob_sha(self, adapter, fake_gitlab):
+        fake_gitlab.files[(1, "main", "calc/result.json")] = "v1"
+        assert await adapter.get_file_content("calc/result.json", "main", project_id=1) == "v1"
+        fake_gitlab.calls.clear()
+
+        assert await adapter.get_file_content("calc/result.json", "main", project_id=1) == "v1"
+        assert [m for m, _ in fake_gitlab.calls] == ["HEAD"]
+
+        fake_gitlab.files[(1, "main", "calc/result.json")] = "v2"
+        assert await adapter.get_file_content("calc/result.json", "main", project_id=1) == "v2"
+
+    @pytest.mark.asyncio
+    async def test_get_files_batched(self, adapter, fake_gitlab):
+        fake_gitlab.files[(1, "issue/1-a", "calc/input.json")] = "in"
+        fake_gitlab.files[(1, "issue/1-a", "calc/result.json")] = "out"
+        paths = ["calc/input.json", "calc/result.json", "calc/missing.json"]
+        await adapter.get_project_by_id(1)
+        fake_gitlab.calls.clear()
+
+        assert await adapter.get_files(paths, "issue/1-a", project_id=1) == {
+            "calc/input.json": "in", "calc/result.json": "out", "calc/missing.json": None}
+        assert fake_gitlab.calls == [("POST", "/api/graphql")]
+
+        # Повторно: один запрос blob sha, затем скачивается только изменённый файл
+        fake_gitlab.files[(1, "issue/1-a", "calc/result.json")] = "out2"
+        fake_gitlab.calls.clear()
+        files = await adapter.get_files(paths[:2], "issue/1-a", project_id=1)
+        assert files == {"calc/input.json": "in", "calc/result.json": "out2"}
+        assert len(fake_gitlab.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_files_rest_fallback(self, adapter, fake_gitlab):
+        fake_gitlab.graphql_enabled = False
+        fake_gitlab.files[(1, "main", "calc/input.json")] = "in"
+
+        files = await adapter.get_files(["calc/input.json", "calc/result.json"], "main", project_id=1)
+
+        assert files == {"calc/input.json": "in", "calc/result.json": None}
+        fake_gitlab.calls.clear()
+        await adapter.get_files(["calc/input.json"], "main", project_id=1)
+        assert ("POST", "/api/graphql") not in fake_gitlab.calls  # GraphQL не дёргаем повторно
+
+    @pytest.mark.asyncio
+    async def test_concurrent_project_misses_coalesced(self, adapter, fake_gitlab):
+        await asyncio.gather(*(adapter.get_project_by_id(2) for _ in range(5)))
+        assert fake_gitlab.calls == [("GET", "/api/v4/projects/2")]
+
+    @pytest.mark.asyncio
+    async def test_create_commit_multiple(self, adapter, fake_gitlab):
+        fake_gitlab.files[(2, "master", "calc/input.json")] = "old"
+
+        commit = await adapter.create_commit_multiple(
+            {"calc/input.json": "new", "calc/result.json": "{}"}, "Calc Result", project_id=2
+        )
+
+        assert commit.id == commit["id"]
+        assert commit.web_url.endswith(commit.id)
+        actions = {a["file_path"]: a["action"] for a in fake_gitlab.commits[-1]["actions"]}
+        assert actions == {"calc/input.json": "update", "calc/result.json": "create"}
+        assert fake_gitlab.files[(2, "master", "calc/input.json")] == "new"
+
+    @pytest.mark.asyncio
+    async def test_commit_actions_from_tree_listing(self, adapter, fake_gitlab):
+        for i in range(150):
+            fake_gitlab.files[(1, "main", f"calc/out/{i}.json")] = "old"
+        fake_gitlab.files[(1, "main", "calc/input.json")] = "old"
+        await adapter.get_project_by_id(1)
+        fake_gitlab.calls.clear()
+
+        files = {f"calc/out/{i}.json": "new" for i in range(140, 160)}
+        files |= {"calc/input.json": "new", "calc/out": "file-named-like-dir", "new/dir/a.json": "{}"}
+        await adapter.create_commit_multiple(files, "Batch", project_id=1)
+
+        actions = {a["file_path"]: a["action"] for a in fake_gitlab.commits[-1]["actions"]}
+        assert [p for p, a in actions.items() if a == "update"] == [f"calc/out/{i}.json" for i in range(140, 150)] + [
+            "calc/input.json"]
+        # Листинг трёх папок (calc/out — две страницы) и сам коммит, без запросов по файлам
+        assert sorted(method for method, _ in fake_gitlab.calls) == ["GET"] * 4 + ["POST"]
+
+    @pytest.mark.asyncio
+    async def test_commit_actions_fallback_to_head(self, adapter, fake_gitlab):
+        fake_gitlab.files[(1, "main", "calc/input.json")] = "old"
+        fake_gitlab.tree_broken = True
+
+        await adapter.create_commit_multiple({"calc/input.json": "new", "calc/result.json": "{}"}, "msg",
+                                             project_id=1)
+
+        actions = {a["file_path"]: a["action"] for a in fake_gitlab.commits[-1]["actions"]}
+        assert actions == {"calc/input.json": "update", "calc/result.json": "create"}
+        assert [method for method, _ in fake_gitlab.calls].count("HEAD") == 2
+
+    @pytest.mark.asyncio
+    async def test_find_branch_by_issue_iid(self, adapter, fake_gitlab):
+        fake_gitlab.branches[1] += ["feature/142-other", "issue/42-test", "issue/420-x"]
+        assert await adapter.find_branch_by_issue_iid(42, 1) == "issue/42-test"
+        assert await adapter.find_branch_by_issue_iid(7, 1) is None
+
+    @pytest.mark.asyncio
+    async def test_find_branch_uses_index(self, adapter, fake_gitlab):
+        fake_gitlab.branches[1] += ["issue/1-a", "issue/2-b"]
+        assert await adapter.find_branch_by_issue_iid(1, 1) == "issue/1-a"
+        fake_gitlab.calls.clear()
+
+        assert await adapter.find_branch_by_issue_iid(2, 1) == "issue/2-b"
+        assert await adapter.create_branch("issue/3-c", project_id=1) is True
+        assert await adapter.find_branch_by_issue_iid(3, 1) == "issue/3-c"
+        assert [m for m, _ in fake_gitlab.calls] == ["POST"]
+
+    @pytest.mark.asyncio
+    async def test_create_branch_and_merge_request(self, adapter):
+        assert await adapter.create_branch("issue/1-task", project_id=1) is True
+        assert await adapter.create_branch("issue/1-task", project_id=1) is False
+
+        mr = await adapter.create_merge_request("issue/1-task", "Draft: #1", project_id=1)
+        assert mr["web_url"] == "http://gitlab.test/mr/1"
+        with pytest.raises(ValueError, match="не найдена"):
+            await adapter.create_merge_request("issue/9-none", "Draft: #9", project_id=1)
+
+    @pytest.mark.asyncio
+    async def test_issues(self, adapter, fake_gitlab):
+        fake_gitlab.issues += [dict(fake_gitlab.issues[0], iid=100 + i) for i in range(150)]
+
+        issues = await adapter.get_all_assigned_issues()
+
+        assert len(issues) == 153  # Две страницы по 100
+        assert {i["project_name"] for i in issues} == {"Turbine", "Condenser"}
+        issue = await adapter.get_issue(3, 2)
+        assert issue["project_name"] == "Condenser" and issue["assignee"] == "engineer"
+        with pytest.raises(gitlab.exceptions.GitlabGetError):
+            await adapter.get_issue(99, 1)
+
+    @pytest.mark.asyncio
+    async def test_issue_list_round_trips(self, adapter_factory, fake_gitlab):
+        adapter = adapter_factory(max_per_host=4)
+        fake_gitlab.delay = 0.01
+        fake_gitlab.projects |= {pid: dict(fake_gitlab.projects[1], id=pid, name=f"P{pid}") for pid in range(3, 13)}
+        fake_gitlab.issues += [dict(fake_gitlab.issues[0], iid=10 + pid, project_id=pid) for pid in range(3, 13)]
+
+        await adapter.get_all_assigned_issues()
+        projects_fetched = [p for _, p in fake_gitlab.calls if p.startswith("/api/v4/projects/")]
+        assert sorted(projects_fetched) == sorted({f"/api/v4/projects/{pid}" for pid in range(1, 13)})
+        assert fake_gitlab.max_in_flight == 4  # Проекты запрашиваются параллельно
+
+        fake_gitlab.calls.clear()
+        await adapter.get_all_assigned_issues(state="closed")
+        assert [p for _, p in fake_gitlab.calls] == ["/api/v4/issues"]  # Пользователь и проекты из кеша
+
+    @pytest.mark.asyncio
+    async def test_create_issue_assigns_current_user(self, adapter):
+        created = await adapter.create_issue("Новая задача", project_id=2)
+        assert created["project_id"] == 2
+        assert (await adapter.get_issue(created["iid"], 2))["title"] == "Новая задача"
+
+    @pytest.mark.asyncio
+    async def test_user_projects(self, adapter):
+        assert [p["name"] for p in await adapter.get_user_projects("cond")] == ["SKB / Condenser"]
+
+
+class TestResilience:
+    """Pooling, retries, timeouts and per-host concurrency limits."""
+
+    @pytest.mark.asyncio
+    async def test_connection_pool_is_reused(self, adapter):
+        await adapter.get_current_user()
+        client = adapter.client
+        await adapter.get_project_by_id(2)
+        assert adapter.client is client
+        await adapter.aclose()
+        assert adapter._client is None
+
+    @pytest.mark.asyncio
+    async def test_get_retried_on_unavailable(self, adapter, fake_gitlab):
+        fake_gitlab.fail_statuses = [503, 502]
+        assert (await adapter.get_project_by_id(1)).name == "Turbine"
+        assert len(fake_gitlab.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self, adapter_factory, fake_gitlab):
+        adapter = adapter_factory(retries=1)
+        fake_gitlab.fail_statuses = [503, 503, 503]
+        with pytest.raises(gitlab.exceptions.GitlabGetError) as exc_info:
+            await adapter.get_project_by_id(1)
+        assert exc_info.value.response_code == 503
+        assert len(fake_gitlab.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_on_bad_gateway(self, adapter, fake_gitlab):
+        await adapter.get_project_by_id(1)
+        fake_gitlab.fail_statuses = [502]
+        with pytest.raises(gitlab.exceptions.GitlabCreateError):
+            await adapter.create_branch("issue/5-x", project_id=1)
+        assert fake_gitlab.calls[-1][0] == "POST" and len(fake_gitlab.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_retried_on_rate_limit(self, adapter, fake_gitlab):
+        fake_gitlab.fail_statuses = [429]
+        assert await adapter.create_branch("issue/5-x", project_id=1) is True
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_per_host(self, adapter_factory, fake_gitlab):
+        adapter = adapter_factory(max_per_host=2)
+        fake_gitlab.delay = 0.01
+        await asyncio.gather(*(adapter.branch_exists(f"b{i}", project_id=1) for i in range(10)))
+        assert fake_gitlab.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_retried_then_connection_error(self, monkeypatch):
+        monkeypatch.setenv("GITLAB_URL", "http://gitlab.test")
+        monkeypatch.setenv("GITLAB_PRIVATE_TOKEN", "t")
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        adapter = AsyncGitLabAdapter(settings=GitLabClientSettings(retries=2, backoff_base=0.0),
+                                     transport=httpx.MockTransport(handler))
+        with pytest.raises(gitlab.exceptions.GitlabConnectionError):
+            await adapter.get_current_user()
+        assert len(attempts) == 3
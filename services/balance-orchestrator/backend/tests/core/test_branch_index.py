@@ -0,0 +1,98 @@
+import pytest
+
+from app.core.branch_index import BranchIndex, issue_iids
+
+
+class FakeBranches:
+    """Источник веток с подсчётом обращений."""
+
+    def __init__(self, names: list[str]):
+        self.names = names
+        self.calls: list[str | None] = []
+
+    async def __call__(self, project_id: int, search: str | None) -> list[str]:
+        self.calls.append(search)
+        return sorted(n for n in self.names if search is None or search in n)
+
+
+class TestIssueIids:
+    def test_patterns(self):
+        assert issue_iids("42-fix") == {42}
+        assert issue_iids("issue/42-test") == {42}
+        assert issue_iids("42") == {42}
+        assert issue_iids("feature/x42-y") == set()
+        assert issue_iids("007-legacy") == set()
+        assert issue_iids("main") == set()
+
+
+class TestBranchIndex:
+    @pytest.mark.asyncio
+    async def test_single_listing_serves_many_lookups(self):
+        fetch = FakeBranches(["main", "issue/4-a", "issue/42-b", "feature/142-c"])
+        index = BranchIndex(fetch)
+
+        assert await index.find(1, 42) == "issue/42-b"
+        assert await index.find(1, 4) == "issue/4-a"
+        assert await index.find(1, 142) == "feature/142-c"
+        assert fetch.calls == [None]
+
+    @pytest.mark.asyncio
+    async def test_first_branch_by_name_wins(self):
+        index = BranchIndex(FakeBranches(["issue/4-b", "4-a"]))
+        assert await index.find(1, 4) == "4-a"
+
+    @pytest.mark.asyncio
+    async def test_negative_cache(self):
+        fetch = FakeBranches(["main"])
+        index = BranchIndex(fetch)
+
+        assert await index.find(1, 9) is None
+        assert await index.find(1, 9) is None
+        assert fetch.calls == [None, "9"]
+
+        fetch.names.append("issue/9-late")  # Появилась в обход оркестратора
+        index.miss_ttl = 0
+        assert await index.find(1, 9) == "issue/9-late"
+
+    @pytest.mark.asyncio
+    async def test_recorded_branch_clears_miss(self):
+        fetch = FakeBranches(["main"])
+        index = BranchIndex(fetch)
+        assert await index.find(1, 5) is None
+
+        index.record_branch(1, "issue/5-new")
+
+        assert await index.find(1, 5) == "issue/5-new"
+        assert fetch.calls == [None, "5"]
+
+    @pytest.mark.asyncio
+    async def test_ttl_reload(self):
+        fetch = FakeBranches(["issue/1-a"])
+        index = BranchIndex(fetch, ttl=0)
+        await index.find(1, 1)
+        await index.find(1, 1)
+        assert fetch.calls == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_push_events(self):
+        index = BranchIndex(FakeBranches(["issue/3-a"]))
+        await index.find(7, 3)
+
+        assert index.apply_push_event({"ref": "refs/heads/issue/8-b", "project_id": 7, "before": "0" * 40,
+                                       "after": "a" * 40})
+        assert await index.find(7, 8) == "issue/8-b"
+
+        index.apply_push_event({"ref": "refs/heads/issue/3-a", "project": {"id": 7}, "after": "0" * 40})
+        index.miss_ttl = 60
+        index._projects.peek(7).misses[3] = float("inf")  # Без точечного поиска
+        assert await index.find(7, 3) is None
+        assert not index.apply_push_event({"ref": "refs/tags/v1", "project_id": 7})
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        fetch = FakeBranches(["issue/1-a"])
+        index = BranchIndex(fetch)
+        await index.find(1, 1)
+        index.invalidate(1)
+        await index.find(1, 1)
+        assert fetch.calls == [None, None]
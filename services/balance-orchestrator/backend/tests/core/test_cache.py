@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import TTLCache, cache_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_lru_eviction(self):
+        cache = TTLCache("test.lru", maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # 'a' становится самым свежим
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = TTLCache("test.ttl", ttl=10, clock=clock)
+        cache.set("k", "v")
+        clock.now = 9.9
+        assert cache.get("k") == "v"
+        clock.now = 10.0
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        cache = TTLCache("test.errors")
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def loader():
+            return 1
+
+        with pytest.raises(RuntimeError):
+            await cache.aget_or_load("k", failing)
+        assert await cache.aget_or_load("k", loader) == 1
+        assert cache.stats.load_errors == 1
+
+    @pytest.mark.asyncio
+    async def test_async_single_flight(self):
+        cache = TTLCache("test.async")
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        results = await asyncio.gather(*(cache.aget_or_load(1, loader) for _ in range(10)))
+
+        assert all(r is results[0] for r in results)
+        assert len(calls) == 1
+        assert cache.info()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        clock = FakeClock()
+        cache = TTLCache("test.swr", ttl=10, stale_ttl=60, clock=clock)
+        versions = iter(["v1", "v2"])
+
+        async def loader():
+            await asyncio.sleep(0)
+            return next(versions)
+
+        assert await cache.aget_or_load("k", loader) == "v1"
+        clock.now = 30
+        assert await cache.aget_or_load("k", loader) == "v1"  # Сразу устаревшее значение
+        await asyncio.sleep(0.01)  # Фоновое обновление
+        assert cache.get("k") == "v2"
+        assert cache.stats.stale_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_revalidation_keeps_stale_value(self):
+        clock = FakeClock()
+        cache = TTLCache("test.swr_error", ttl=10, stale_ttl=60, clock=clock)
+        cache.set("k", "old")
+        clock.now = 20
+
+        async def failing():
+            raise RuntimeError("GitLab down")
+
+        assert await cache.aget_or_load("k", failing) == "old"
+        await asyncio.sleep(0.01)
+        assert cache.peek("k") == "old" and cache.stats.load_errors == 1
+
+    def test_metrics_registry(self):
+        cache = TTLCache("test.metrics")
+        cache.get("missing")
+        cache.set("k", 1)
+        cache.get("k")
+
+        info = cache_stats()["test.metrics"]
+        assert (info["hits"], info["misses"], info["size"], info["hit_ratio"]) == (1, 1, 1, 0.5)
@@ -0,0 +1,141 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from gitlab.exceptions import GitlabCreateError
+
+from app.core.commit_buffer import CommitBuffer
+
+
+def _gitlab() -> AsyncMock:
+    gitlab = AsyncMock()
+    commits = iter(range(1, 100))
+
+    async def create_commit_multiple(**kwargs):
+        commit = MagicMock()
+        commit.id = f"c{next(commits)}"
+        commit.web_url = f"https://gitlab/commit/{commit.id}"
+        return commit
+
+    gitlab.create_commit_multiple.side_effect = create_commit_multiple
+    return gitlab
+
+
+class TestCommitBuffer:
+    @pytest.mark.asyncio
+    async def test_window_coalesces_saves_per_branch(self):
+        gitlab = _gitlab()
+        buffer = CommitBuffer(gitlab, window=0.05, max_delay=10)
+
+        buffer.stage(1, "issue/4-a", {"a.json": "1", "b.json": "1"}, "save")
+        buffer.stage(1, "issue/4-a", {"a.json": "2"}, "save")
+        buffer.stage(2, "issue/4-a", {"a.json": "x"}, "other project")
+        assert buffer.state(1, "issue/4-a")["saves"] == 2
+        await asyncio.sleep(0.15)
+
+        assert gitlab.create_commit_multiple.await_count == 2
+        by_project = {c.kwargs["project_id"]: c.kwargs for c in gitlab.create_commit_multiple.call_args_list}
+        assert by_project[1]["files"] == {"a.json": "2", "b.json": "1"}
+        assert by_project[2]["files"] == {"a.json": "x"}
+        assert buffer.state(1, "issue/4-a")["pending"] is False
+
+    @pytest.mark.asyncio
+    async def test_max_delay_caps_debounce(self):
+        gitlab = _gitlab()
+        buffer = CommitBuffer(gitlab, window=0.05, max_delay=0.12)
+
+        for i in range(8):  # Сохранения чаще окна: без предела коммит откладывался бы бесконечно
+            buffer.stage(1, "b", {"a.json": str(i)}, "save")
+            await asyncio.sleep(0.03)
+
+        assert gitlab.create_commit_multiple.await_count >= 1
+        await buffer.flush_all()
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_keeps_changes(self):
+        gitlab = _gitlab()
+        buffer = CommitBuffer(gitlab, window=60)
+        buffer.stage(1, "b", {"a.json": "1", "b.json": "1"}, "save")
+        gitlab.create_commit_multiple.side_effect = GitlabCreateError("rate limited", 429)
+
+        with pytest.raises(GitlabCreateError):
+            await buffer.flush(1, "b")
+        state = buffer.state(1, "b")
+        assert state["pending"] is True
+        assert "rate limited" in state["error"]
+
+        # Новое сохранение важнее незакоммиченного
+        buffer.stage(1, "b", {"a.json": "2"}, "save")
+        gitlab.create_commit_multiple.side_effect = None
+        gitlab.create_commit_multiple.return_value = MagicMock(id="c9", web_url="u")
+        commit = await buffer.flush(1, "b")
+
+        assert commit.commit_id == "c9"
+        assert commit.saves == 2
+        assert gitlab.create_commit_multiple.call_args.kwargs["files"] == {"a.json": "2", "b.json": "1"}
+        assert buffer.state(1, "b")["error"] is None
+
+    @pytest.mark.asyncio
+    async def test_read_commits_branch_first(self):
+        gitlab = _gitlab()
+        buffer = CommitBuffer(gitlab, window=60)
+        buffer.stage(1, "b", {"a.json": "1"}, "save")
+
+        assert await buffer.flush_for_read(1, "b") == {}
+        gitlab.create_commit_multiple.assert_awaited_once()
+
+        # GitLab недоступен: чтение получает файлы из буфера, коммит повторится по таймеру
+        buffer.stage(1, "b", {"a.json": "2"}, "save")
+        gitlab.create_commit_multiple.side_effect = GitlabCreateError("unavailable", 503)
+        assert await buffer.flush_for_read(1, "b") == {"a.json": "2"}
+        assert buffer._buffers[(1, "b")].timer is not None
+        buffer._buffers[(1, "b")].timer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_flush_all_commits_everything_on_shutdown(self):
+        gitlab = _gitlab()
+        buffer = CommitBuffer(gitlab, window=60)
+        buffer.stage(1, "a", {"x.json": "1"}, "save")
+        buffer.stage(1, "b", {"x.json": "1"}, "save")
+
+        await buffer.flush_all()
+
+        assert gitlab.create_commit_multiple.await_count == 2
+        assert buffer.pending_files(1, "a") == {}
+        # Повторный flush без изменений коммит не создаёт
+        assert (await buffer.flush(1, "a")).commit_id in {"c1", "c2"}
+        assert gitlab.create_commit_multiple.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_branch_buffers_are_dropped(self):
+        gitlab = _gitlab()
+        buffer = CommitBuffer(gitlab, window=0.05, max_delay=10)
+        for i in range(20):
+            buffer.stage(1, f"issue/{i}", {"a.json": "1"}, "save")
+        assert len(buffer._buffers) == 20
+
+        await asyncio.sleep(0.15)
+
+        # Остаётся только состояние последнего коммита (в ограниченном кеше)
+        assert buffer._buffers == {}
+        state = buffer.state(1, "issue/7")
+        assert state["pending"] is False
+        assert state["last_commit_id"] is not None
+        assert (await buffer.flush(1, "issue/7")).commit_id == state["last_commit_id"]
+        # flush ветки без сохранений буфер не создаёт
+        assert await buffer.flush(1, "issue/unknown") is None
+        assert buffer._buffers == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_branch_buffer_is_kept(self):
+        gitlab = _gitlab()
+        gitlab.create_commit_multiple.side_effect = GitlabCreateError("rate limited", 429)
+        buffer = CommitBuffer(gitlab, window=60)
+        buffer.stage(1, "b", {"a.json": "1"}, "save")
+
+        with pytest.raises(GitlabCreateError):
+            await buffer.flush(1, "b")
+
+        assert list(buffer._buffers) == [(1, "b")]
+        await buffer.flush_all()  # Ошибка логируется, изменения остаются
+        assert buffer.pending_files(1, "b") == {"a.json": "1"}
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from app.core.geometry_store import MANIFEST_PATH, GeometryStore
+
+
+MANIFEST = {
+    "schema_version": "1.0",
+    "geometries": [
+        {"id": "k-300", "name": "К-300", "type": "condenser", "file": "geometries/k-300.json"},
+        {"id": "k-500", "name": "К-500", "type": "condenser", "file": "geometries/k-500.json"},
+    ],
+}
+
+
+@pytest.fixture
+def store(adapter, fake_gitlab):
+    fake_gitlab.files[(1, "main", MANIFEST_PATH)] = json.dumps(MANIFEST)
+    fake_gitlab.files[(1, "main", "geometries/k-300.json")] = json.dumps({"id": "k-300", "tubes": 100})
+    fake_gitlab.files[(1, "main", "geometries/k-500.json")] = json.dumps({"id": "k-500", "tubes": 200})
+    return GeometryStore(adapter, head_ttl=60)
+
+
+class TestGeometryStore:
+    @pytest.mark.asyncio
+    async def test_no_gitlab_calls_while_nothing_changes(self, store, fake_gitlab):
+        snapshot = await store.manifest()
+        geometry = await store.geometry("k-300")
+        assert [g.id for g in snapshot.manifest.geometries] == ["k-300", "k-500"]
+        assert geometry.data == {"id": "k-300", "tubes": 100}
+        fake_gitlab.calls.clear()
+
+        for _ in range(5):
+            assert (await store.manifest()).blob_id == snapshot.blob_id
+            assert (await store.geometry("k-300")).blob_id == geometry.blob_id
+        assert await store.geometry("unknown") is None
+        assert fake_gitlab.calls == []
+
+    @pytest.mark.asyncio
+    async def test_new_commit_reuses_unchanged_blobs(self, store, fake_gitlab):
+        await store.geometry("k-300")
+        await store.geometry("k-500")
+        fake_gitlab.files[(1, "main", "geometries/k-500.json")] = json.dumps({"id": "k-500", "tubes": 250})
+        store._heads.clear()  # Истёк TTL головы ветки
+        fake_gitlab.calls.clear()
+
+        assert (await store.geometry("k-300")).data["tubes"] == 100
+        assert (await store.geometry("k-500")).data["tubes"] == 250
+        # Голова ветки, HEAD манифеста и двух файлов; скачивается только изменённый файл
+        methods = [m for m, _ in fake_gitlab.calls]
+        assert methods.count("HEAD") == 3
+        assert [p for m, p in fake_gitlab.calls if m == "GET" and "/files/" in p] == [
+            "/api/v4/projects/1/repository/files/geometries/k-500.json"]
+
+    @pytest.mark.asyncio
+    async def test_push_event_moves_head(self, store, fake_gitlab):
+        first = await store.head_sha()
+        fake_gitlab.files[(1, "main", "geometries/k-300.json")] = json.dumps({"id": "k-300", "tubes": 1})
+        new_head = fake_gitlab.head_of(1, "main")
+
+        assert not store.apply_push_event({"project_id": 1, "ref": "refs/heads/feature", "after": new_head})
+        assert store.apply_push_event({"project_id": 1, "ref": "refs/heads/main", "after": new_head})
+
+        assert await store.head_sha() == new_head != first
+        assert (await store.geometry("k-300")).data["tubes"] == 1
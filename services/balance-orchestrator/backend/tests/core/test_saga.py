@@ -0,0 +1,318 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from gitlab.exceptions import GitlabCreateError
+
+from app.core.calc_services import CondenserRunner, ValveStemsRunner
+from app.core.saga import (
+    InProcessBroker,
+    SagaExecutor,
+    SagaState,
+    SagaStore,
+    StepError,
+    StepState,
+    validate_steps,
+)
+
+
+class FakeRunner:
+    """Исполнитель шагов без сети: сценарий ошибок по имени шага"""
+
+    def __init__(self, failures: dict[str, list[Exception]] | None = None, delay: float = 0.0):
+        self.failures = failures or {}
+        self.delay = delay
+        self.calls: list[str] = []
+        self.compensated: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def run(self, payload):
+        name = payload["name"]
+        self.calls.append(name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures.get(name):
+                raise self.failures[name].pop(0)
+            return {"name": name, "value": len(self.calls)}
+        finally:
+            self.in_flight -= 1
+
+    async def compensate(self, payload, result):
+        self.compensated.append(payload["name"])
+
+    async def aclose(self):
+        pass
+
+
+def _step(name: str, service: str = "valves", depends_on: list[str] | None = None) -> StepState:
+    return StepState(name=name, service=service, payload={"name": name}, depends_on=depends_on or [])
+
+
+def _gitlab() -> AsyncMock:
+    gitlab = AsyncMock()
+    commit = MagicMock()
+    commit.id, commit.web_url = "c0ffee", "https://gitlab/commit/c0ffee"
+    gitlab.create_commit_multiple.return_value = commit
+    return gitlab
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SagaStore(str(tmp_path / "sagas.db"))
+    yield store
+    store.close()
+
+
+def _executor(store, runners, gitlab=None, **kwargs) -> SagaExecutor:
+    return SagaExecutor(store, InProcessBroker(workers=2), runners, gitlab or _gitlab(), backoff_base=0, **kwargs)
+
+
+async def _run(executor: SagaExecutor, steps: list[StepState]):
+    await executor.start()
+    try:
+        saga = await executor.submit("CALCULATION", 1, "issue/4-calc", "calculations/valves/current", "Calc", steps)
+        await asyncio.wait_for(executor.broker.join(), 5)
+    finally:
+        await executor.stop()
+    return await executor.get(saga.id)
+
+
+class TestSagaStore:
+    def test_creates_missing_data_directory(self, tmp_path):
+        store = SagaStore(str(tmp_path / "data" / "sagas.db"))
+        try:
+            assert store.unfinished() == []
+        finally:
+            store.close()
+        assert (tmp_path / "data" / "sagas.db").is_file()
+
+    @pytest.mark.asyncio
+    async def test_step_results_stored_outside_context(self, store):
+        step = _step("a")
+        step.status, step.result = "done", {"rows": list(range(100))}
+        saga = SagaState(id="results", saga_type="CALCULATION", project_id=1, branch="issue/4-calc",
+                         base_path="calculations/valves/current", commit_message="Calc", steps=[step])
+        await store.asave_result(saga.id, step)
+        await store.asave(saga)
+
+        (context,) = store.conn.execute("SELECT context FROM saga_instances WHERE id = 'results'").fetchone()
+        assert "result" not in json.loads(context)["steps"][0]
+        assert store.get("results").step("a").result == {"rows": list(range(100))}
+        assert store.get("results", with_results=False).step("a").result is None
+
+    def test_stale_snapshot_does_not_overwrite_newer_state(self, store):
+        saga = SagaState(id="race", saga_type="CALCULATION", project_id=1, branch="issue/4-calc",
+                         base_path="calculations/valves/current", commit_message="Calc", steps=[_step("a")])
+        stale = store._snapshot(saga)
+        saga.status = "completed"
+        store.save(saga)
+        store._write(stale)  # Запись из потока, опоздавшая к более новой
+
+        assert store.get("race").status == "completed"
+
+
+class TestValidateSteps:
+    def test_rejects_unknown_dependency_and_cycle(self):
+        with pytest.raises(ValueError, match="неизвестных"):
+            validate_steps([_step("a", depends_on=["x"])])
+        with pytest.raises(ValueError, match="цикл"):
+            validate_steps([_step("a", depends_on=["b"]), _step("b", depends_on=["a"])])
+        with pytest.raises(ValueError, match="уникальны"):
+            validate_steps([_step("a"), _step("a")])
+
+
+class TestSagaExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_steps_and_commits_once(self, store):
+        runner, gitlab = FakeRunner(), _gitlab()
+        executor = _executor(store, {"valves": runner, "condenser": runner}, gitlab)
+
+        saga = await _run(executor, [_step("stems"), _step("condenser", "condenser"),
+                                     _step("balance", depends_on=["stems", "condenser"])])
+
+        assert saga.status == "completed"
+        assert saga.commit_id == "c0ffee"
+        assert runner.calls[-1] == "balance"
+        gitlab.create_commit_multiple.assert_awaited_once()
+        files = gitlab.create_commit_multiple.call_args.kwargs["files"]
+        assert sorted(files) == [f"calculations/valves/current/{name}/{kind}.json"
+                                 for name in ("balance", "condenser", "stems") for kind in ("input", "result")]
+        assert json.loads(files["calculations/valves/current/balance/result.json"])["name"] == "balance"
+        assert gitlab.create_commit_multiple.call_args.kwargs["branch"] == "issue/4-calc"
+
+    @pytest.mark.asyncio
+    async def test_parallelism_is_bounded_per_service(self, store):
+        runner = FakeRunner(delay=0.02)
+        executor = _executor(store, {"valves": runner}, max_parallel=2)
+
+        saga = await _run(executor, [_step(f"s{i}") for i in range(6)])
+
+        assert saga.status == "completed"
+        assert runner.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_retryable_error_is_retried(self, store):
+        runner = FakeRunner({"stems": [StepError("503", retryable=True), StepError("503", retryable=True)]})
+        executor = _executor(store, {"valves": runner}, retries=3)
+
+        saga = await _run(executor, [_step("stems")])
+
+        assert saga.status == "completed"
+        assert saga.step("stems").attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_compensates_done_steps_in_reverse_order(self, store):
+        runner = FakeRunner({"c": [StepError("400 Bad Request")]})
+        gitlab = _gitlab()
+        executor = _executor(store, {"valves": runner}, gitlab)
+
+        saga = await _run(executor, [_step("a"), _step("b", depends_on=["a"]), _step("c", depends_on=["b"])])
+
+        assert saga.status == "compensated"
+        assert "400 Bad Request" in saga.error
+        assert saga.step("c").attempts == 1  # Неповторяемая ошибка
+        assert runner.compensated == ["b", "a"]
+        assert [s.status for s in saga.steps] == ["compensated", "compensated", "failed"]
+        gitlab.create_commit_multiple.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_commit_error_compensates(self, store):
+        runner, gitlab = FakeRunner(), _gitlab()
+        gitlab.create_commit_multiple.side_effect = GitlabCreateError("branch protected", 403)
+        executor = _executor(store, {"valves": runner}, gitlab)
+
+        saga = await _run(executor, [_step("a")])
+
+        assert saga.status == "compensated"
+        assert runner.compensated == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_commit_transport_error_compensates(self, store):
+        runner, gitlab = FakeRunner(), _gitlab()
+        gitlab.create_commit_multiple.side_effect = httpx.ConnectTimeout("timed out")
+        executor = _executor(store, {"valves": runner}, gitlab)
+
+        saga = await _run(executor, [_step("a")])
+
+        assert saga.status == "compensated"
+        assert "ConnectTimeout" in saga.error
+        assert runner.compensated == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_saga_resumes_without_rerunning_done_steps(self, store):
+        runner = FakeRunner()
+        saga_id = "interrupted"
+        steps = [_step("a"), _step("b", depends_on=["a"])]
+        steps[0].status, steps[0].result = "done", {"name": "a"}
+        steps[1].status = "running"  # Сервис остановился посреди шага
+        store.save(SagaState(id=saga_id, saga_type="CALCULATION", project_id=1, branch="issue/4-calc",
+                             base_path="calculations/valves/current", commit_message="Calc",
+                             steps=steps, status="running"))
+        store.save_result(saga_id, steps[0])
+
+        executor = _executor(store, {"valves": runner})
+        assert await executor.start() == 1
+        await asyncio.wait_for(executor.broker.join(), 5)
+        await executor.stop()
+
+        saga = store.get(saga_id)
+        assert saga.status == "completed"
+        assert runner.calls == ["b"]
+        assert store.unfinished() == []
+
+    @pytest.mark.asyncio
+    async def test_resumed_saga_with_failed_step_compensates(self, store):
+        runner, gitlab = FakeRunner(), _gitlab()
+        steps = [_step("a"), _step("b"), _step("c", depends_on=["b"])]
+        steps[0].status, steps[0].result, steps[0].finished_at = "done", {"name": "a"}, 1.0
+        steps[1].status, steps[1].error = "failed", "400 Bad Request"  # Остановка до компенсации
+        store.save(SagaState(id="failed-step", saga_type="CALCULATION", project_id=1, branch="issue/4-calc",
+                             base_path="calculations/valves/current", commit_message="Calc",
+                             steps=steps, status="running"))
+        store.save_result("failed-step", steps[0])
+
+        executor = _executor(store, {"valves": runner}, gitlab)
+        await executor.start()
+        await asyncio.wait_for(executor.broker.join(), 5)
+        await executor.stop()
+
+        saga = store.get("failed-step")
+        assert saga.status == "compensated"
+        assert "'b'" in saga.error
+        assert runner.calls == []
+        assert runner.compensated == ["a"]
+        assert saga.step("c").status == "pending"
+        gitlab.create_commit_multiple.assert_not_awaited()
+
+
+def _valves_app(state: dict) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path == "/api/v1/calculate":
+            state["posts"] += 1
+            if state["posts"] <= state.get("fail", 0):
+                return httpx.Response(503, json={"detail": "busy"})
+            return httpx.Response(200, json={"id": 17, "output_data": {"Gi": [1.0]}})
+        if request.method == "DELETE":
+            state["deleted"].append(request.url.path)
+            return httpx.Response(204)
+        return httpx.Response(404, json={"detail": "not found"})
+    return httpx.MockTransport(handler)
+
+
+class TestServiceRunners:
+    @pytest.mark.asyncio
+    async def test_valve_stems_run_and_compensate(self):
+        state = {"posts": 0, "deleted": []}
+        runner = ValveStemsRunner("http://valves", transport=_valves_app(state))
+
+        result = await runner.run({"valve_drawing": "V-1"})
+        await runner.compensate({}, result)
+        await runner.aclose()
+
+        assert result["id"] == 17
+        assert state["deleted"] == ["/api/v1/17"]
+
+    @pytest.mark.asyncio
+    async def test_service_errors_are_classified(self):
+        state = {"posts": 0, "deleted": [], "fail": 1}
+        runner = ValveStemsRunner("http://valves", transport=_valves_app(state))
+        with pytest.raises(StepError) as e:
+            await runner.run({})
+        assert e.value.retryable
+
+        def bad_request(request):
+            return httpx.Response(400, json={"detail": "Клапан не найден"})
+        runner = ValveStemsRunner("http://valves", transport=httpx.MockTransport(bad_request))
+        with pytest.raises(StepError, match="Клапан не найден") as e:
+            await runner.run({})
+        assert not e.value.retryable
+
+    @pytest.mark.asyncio
+    async def test_condenser_large_grid_goes_through_job_queue(self):
+        polls = {"n": 0}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if path == "/api/v1/calculations":
+                return httpx.Response(413, json={"detail": "Используйте POST /jobs."})
+            if path == "/api/v1/jobs":
+                return httpx.Response(202, json={"job_id": "j1", "status": "running", "strategy": "s", "size": 2})
+            if path == "/api/v1/jobs/j1":
+                polls["n"] += 1
+                status = "done" if polls["n"] >= 2 else "running"
+                return httpx.Response(200, json={"job_id": "j1", "status": status, "strategy": "s", "size": 2})
+            if path == "/api/v1/jobs/j1/result":
+                return httpx.Response(200, text='{"p": 1, "t": 30}\n{"p": 2, "t": 40}\n')
+            return httpx.Response(404)
+
+        runner = CondenserRunner("http://condenser", transport=httpx.MockTransport(handler), poll_interval=0)
+        result = await runner.run({"strategy": "s", "inputs": {}, "grid": {}})
+        await runner.aclose()
+
+        assert result["columns"] == {"p": [1, 2], "t": [30, 40]}
+        assert polls["n"] == 2
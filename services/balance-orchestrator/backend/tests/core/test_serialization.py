@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from app.core.serialization import (
+    STORED_KEY,
+    dumps_pretty,
+    iter_ndjson,
+    load_result,
+    loads,
+    result_files,
+    stored_tables,
+)
+
+
+TABLE = {"p_kPa": [float(i) for i in range(1000)], "t_C": [30.0 + i / 10 for i in range(1000)]}
+
+
+class TestSerialization:
+    def test_pretty_format_matches_json_module(self):
+        data = {"Расход": [1, 2.5, None], "nested": {"ok": True, "empty": {}}, 7: "int key"}
+        assert dumps_pretty(data) == json.dumps(data, indent=2, ensure_ascii=False)
+        assert loads(dumps_pretty(data))["7"] == "int key"
+
+    def test_nan_is_null(self):
+        assert loads(dumps_pretty({"x": float("nan")})) == {"x": None}
+
+    def test_iter_ndjson_chunks(self):
+        chunks = list(iter_ndjson({"a": [1, 2, 3], "b": ["x", "y", "z"]}, chunk_rows=2))
+        assert len(chunks) == 2
+        assert b"".join(chunks).decode().splitlines() == [
+            '{"a":1,"b":"x"}', '{"a":2,"b":"y"}', '{"a":3,"b":"z"}']
+
+
+class TestResultFiles:
+    def test_small_result_stays_inline(self):
+        files = result_files("calc", {"value": 1})
+        assert files == {"calc/result.json": dumps_pretty({"value": 1})}
+
+    @pytest.mark.asyncio
+    async def test_large_tables_go_to_ndjson_next_to_summary(self):
+        data = {"strategy": "berman", "size": 1000, "columns": TABLE}
+
+        files = result_files("calc", data, inline_limit=1000)
+
+        assert sorted(files) == ["calc/result.columns.ndjson", "calc/result.json"]
+        summary = loads(files["calc/result.json"])
+        assert summary["strategy"] == "berman"
+        assert summary["columns"][STORED_KEY] == "result.columns.ndjson"
+        assert summary["columns"]["rows"] == 1000
+        assert summary["columns"]["ranges"]["t_C"] == [30.0, 129.9]
+        assert len(files["calc/result.json"]) < 1000
+        assert stored_tables(summary) == ["result.columns.ndjson"]
+
+        async def read(name):
+            return files[f"calc/{name}"]
+
+        assert await load_result(summary, read) == data
+
+    @pytest.mark.asyncio
+    async def test_whole_result_as_table(self):
+        files = result_files("calc", TABLE, inline_limit=1000)
+
+        summary = loads(files["calc/result.json"])
+        assert summary[STORED_KEY] == "result.ndjson"
+
+        async def read(name):
+            return files[f"calc/{name}"]
+
+        assert await load_result(summary, read) == TABLE
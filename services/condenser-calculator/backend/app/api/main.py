@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.api.routes import berman, calculations, ejector, jobs
+
+
+api_router = APIRouter()
+
+api_router.include_router(calculations.router)
+api_router.include_router(jobs.router)
+api_router.include_router(ejector.router)
+api_router.include_router(berman.router)
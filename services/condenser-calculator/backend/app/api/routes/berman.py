@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.dependencies import get_berman_cache
+from app.schemas.calculation import BermanTableRequest, BermanTableResponse, columns_to_json
+from app.utils.berman_incremental import IncrementalBerman
+
+
+router = APIRouter(tags=["Berman"])
+
+
+@router.post("/berman/table", response_model=BermanTableResponse)
+def calculate_table(req: BermanTableRequest, cache: IncrementalBerman = Depends(get_berman_cache)):
+    """
+    Таблица Бермана с инкрементальным пересчётом: этапы, входы которых не менялись
+    с прошлых запросов, берутся из кеша. `stages` показывает, что пересчитано.
+    """
+    try:
+        result = cache.calculate(req.params, columnar=True)
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"Отсутствует обязательный параметр: {e.args[0]}")
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    table = result["main_results"]
+    return BermanTableResponse(
+        size=len(table),
+        dims=list(table.dims),
+        columns=columns_to_json({name: table[name] for name in table.names}),
+        ejector_results=result["ejector_results"],
+        stages=result["stages"],
+    )
@@ -0,0 +1,50 @@
+from dataclasses import fields
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.config import settings
+from app.dependencies import get_engine
+from app.schemas.calculation import CalculationResponse, SyncCalculationRequest, columns_to_json
+from app.utils.condenser_engine import CondenserEngine, UnknownStrategyError
+
+
+router = APIRouter(tags=["Calculations"])
+
+
+@router.get("/strategies")
+def list_strategies(engine: CondenserEngine = Depends(get_engine)):
+    """Зарегистрированные методики и имена их входных параметров."""
+    return {
+        name: [f.metadata.get("key", f.name) for f in fields(adapter.inputs_model)]
+        for name, adapter in engine.strategies.items()
+    }
+
+
+@router.post("/calculations", response_model=CalculationResponse)
+def calculate(req: SyncCalculationRequest, engine: CondenserEngine = Depends(get_engine)):
+    """
+    Синхронный расчёт небольшой сетки в рамках запроса.
+
+    Сетки больше `SYNC_MAX_POINTS` точек отклоняются с кодом 413 до развёртывания
+    сетки — такие таблицы диапазонов ставятся в очередь через POST /jobs.
+    """
+    try:
+        size = engine.grid_points(req.strategy, req.grid, product=req.product)
+        if size > settings.SYNC_MAX_POINTS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Сетка из {size} точек превышает лимит синхронного расчёта "
+                       f"({settings.SYNC_MAX_POINTS}). Используйте POST /jobs."
+            )
+        result = engine.run(req.strategy, req.inputs, req.grid, mode=req.mode, product=req.product)
+    except UnknownStrategyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e.args[0]) if e.args else str(e))
+
+    return CalculationResponse(
+        strategy=result.strategy,
+        mode=result.mode,
+        size=result.size,
+        columns=columns_to_json(result.columns),
+    )
@@ -0,0 +1,28 @@
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from app.schemas.calculation import EjectorRequest, EjectorResponse, columns_to_json
+from app.utils.ejector import ejector_pressure
+
+
+router = APIRouter(tags=["Ejector"])
+
+
+def _matrix_to_json(values: np.ndarray) -> list[list[float | None]]:
+    return [columns_to_json({"row": row})["row"] for row in values]
+
+
+@router.post("/ejector", response_model=EjectorResponse)
+def calculate_ejector(req: EjectorRequest):
+    """Давление эжекторов для всех сочетаний числа эжекторов и температур воды на входе."""
+    try:
+        table = ejector_pressure(req.inlet_temperatures, req.G_air, req.number_of_ejectors)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return EjectorResponse(
+        inlet_temperatures=req.inlet_temperatures,
+        number_of_ejectors=req.number_of_ejectors,
+        P_ejector_kPa=_matrix_to_json(table["P_ejector_kPa"]),
+        P_ejector_atm=_matrix_to_json(table["P_ejector_atm"]),
+    )
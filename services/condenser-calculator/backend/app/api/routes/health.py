@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/health")
+def health_check():
+    """Проверка работоспособности сервиса"""
+    return {"status": "ok", "service": "condenser-calculator"}
@@ -0,0 +1,80 @@
+import orjson
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.core.job_queue import Job, JobNotFoundError, JobNotReadyError, JobQueue
+from app.dependencies import get_job_queue
+from app.schemas.calculation import CalculationRequest, ChunkResponse, JobResponse, columns_to_json
+from app.utils.condenser_engine import UnknownStrategyError
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def _get_job(queue: JobQueue, job_id: str) -> Job:
+    try:
+        return queue.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+def submit_job(req: CalculationRequest, queue: JobQueue = Depends(get_job_queue)):
+    """Поставить расчёт таблицы диапазонов в очередь. Ответ — идентификатор и прогресс."""
+    try:
+        job = queue.submit(req.strategy, req.inputs, req.grid, product=req.product)
+    except UnknownStrategyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e.args[0]) if e.args else str(e))
+    return job.to_dict()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """Статус и прогресс задания (для опроса клиентом)."""
+    return _get_job(queue, job_id).to_dict()
+
+
+@router.delete("/{job_id}", response_model=JobResponse)
+def cancel_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """Отмена задания. Для завершённого задания статус не меняется."""
+    _get_job(queue, job_id)
+    return queue.cancel(job_id).to_dict()
+
+
+@router.get("/{job_id}/chunks/{index}", response_model=ChunkResponse)
+def get_chunk(job_id: str, index: int, queue: JobQueue = Depends(get_job_queue)):
+    """Часть результата; доступна сразу после расчёта части, не дожидаясь всего задания."""
+    job = _get_job(queue, job_id)
+    try:
+        columns = queue.chunk(job_id, index)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except JobNotReadyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    start, stop = job.chunk_bounds[index]
+    return ChunkResponse(job_id=job_id, index=index, start=start, stop=stop,
+                         columns=columns_to_json(columns))
+
+
+@router.get("/{job_id}/result")
+def download_result(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Полный результат завершённого задания потоком NDJSON: одна строка — одна точка сетки.
+    Части сериализуются по очереди (orjson, одна порция ответа на часть),
+    весь результат в памяти не собирается. NaN записывается как null.
+    """
+    job = _get_job(queue, job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Задание '{job_id}' в статусе '{job.status}'")
+
+    def _lines():
+        for columns in queue.iter_chunks(job_id):
+            names = list(columns)
+            data = [columns[name].tolist() for name in names]
+            yield b"".join(orjson.dumps(dict(zip(names, row, strict=True))) + b"\n"
+                           for row in zip(*data, strict=True))
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,27 @@
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    API_V1_STR: str = "/api/v1"
+    PROJECT_NAME: str = "Condenser Calculator"
+
+    # Расчёты с числом точек не больше порога выполняются синхронно в запросе,
+    # большие таблицы диапазонов — только через очередь заданий.
+    SYNC_MAX_POINTS: int = _env_int("CONDENSER_SYNC_MAX_POINTS", 10_000)
+
+    # Число долгоживущих процессов-исполнителей (0 — по числу ядер)
+    JOB_WORKERS: int = _env_int("CONDENSER_JOB_WORKERS", 0)
+    # Размер части сетки задания; части скачиваются по отдельности
+    JOB_CHUNK_SIZE: int = _env_int("CONDENSER_JOB_CHUNK_SIZE", 5_000)
+    # Сколько завершённых заданий хранить в памяти
+    JOB_MAX_STORED: int = _env_int("CONDENSER_JOB_MAX_STORED", 100)
+
+
+settings = Settings()
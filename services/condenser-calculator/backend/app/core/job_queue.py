@@ -0,0 +1,217 @@
+"""
+Очередь заданий расчёта конденсатора.
+
+Локальная замена брокера (RabbitMQ/Celery из docs/architecture/services/condenser_worker.md):
+задание делится на части сетки, части исполняются пулом долгоживущих процессов.
+Каждый процесс при старте создаёт свой `CondenserEngine` (`warm_up_worker`), поэтому
+интерполяторы методик строятся один раз на процесс, а не на каждое задание.
+
+Состояние заданий хранится в памяти процесса API: прогресс считается по готовым
+частям, готовые части можно скачивать до завершения всего задания.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from app.utils.condenser_engine import (
+    Columns,
+    CondenserEngine,
+    evaluate_chunk,
+    grid_size,
+    warm_up_worker,
+)
+
+
+JobStatus = Literal["running", "done", "failed", "cancelled"]
+
+
+class JobNotFoundError(KeyError):
+    pass
+
+
+class JobNotReadyError(ValueError):
+    pass
+
+
+@dataclass
+class Job:
+    """Задание расчёта: сетка разбита на части `chunk_bounds`."""
+    id: str
+    strategy: str
+    size: int
+    chunk_bounds: list[tuple[int, int]]
+    grid_columns: Columns
+    status: JobStatus = "running"
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    chunks: list[Columns | None] = field(default_factory=list)
+    futures: list[Future] = field(default_factory=list, repr=False)
+
+    @property
+    def chunks_total(self) -> int:
+        return len(self.chunk_bounds)
+
+    @property
+    def chunks_done(self) -> int:
+        return sum(chunk is not None for chunk in self.chunks)
+
+    @property
+    def points_done(self) -> int:
+        return sum(stop - start for (start, stop), chunk in zip(self.chunk_bounds, self.chunks, strict=True)
+                   if chunk is not None)
+
+    @property
+    def progress(self) -> float:
+        return self.points_done / self.size if self.size else 1.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "strategy": self.strategy,
+            "status": self.status,
+            "size": self.size,
+            "points_done": self.points_done,
+            "progress": self.progress,
+            "chunks_total": self.chunks_total,
+            "chunks_done": self.chunks_done,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Приём заданий, опрос прогресса, отмена и выдача результата по частям."""
+
+    def __init__(self, engine: CondenserEngine | None = None, *,
+                 max_workers: int | None = None,
+                 chunk_size: int = 5_000,
+                 max_stored: int = 100,
+                 executor: Executor | None = None) -> None:
+        self.engine = engine or CondenserEngine()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_stored = max_stored
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------- ЗАДАНИЯ ---------------------------
+    def submit(self, strategy: str, inputs: Any, grid: Mapping[str, Sequence] | None = None, *,
+               product: bool = True) -> Job:
+        """Поставить расчёт в очередь. Ошибки входных данных возникают сразу, до постановки."""
+        adapter = self.engine.get_adapter(strategy)
+        if not isinstance(inputs, adapter.inputs_model):
+            inputs = adapter.inputs_model.from_params(inputs)
+        grid_columns = self.engine.expand_grid(strategy, grid, product=product)
+        size = grid_size(grid_columns)
+
+        bounds = [(start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+        job = Job(id=uuid.uuid4().hex, strategy=strategy, size=size,
+                  chunk_bounds=bounds, grid_columns=grid_columns, chunks=[None] * len(bounds))
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+
+        executor = self._get_executor()
+        for index, (start, stop) in enumerate(bounds):
+            if job.finished:
+                break
+            chunk_grid = {name: col[start:stop] for name, col in grid_columns.items()}
+            future = executor.submit(evaluate_chunk, strategy, inputs, chunk_grid, stop - start)
+            job.futures.append(future)
+            future.add_done_callback(lambda f, i=index: self._on_chunk_done(job, i, f))
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self._lock:
+            if job_id not in self._jobs:
+                raise JobNotFoundError(f"Задание '{job_id}' не найдено")
+            return self._jobs[job_id]
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Отменить задание: части, ещё не взятые исполнителями, снимаются с очереди.
+        Уже выполняющиеся части досчитываются, но их результат отбрасывается.
+        """
+        job = self.get(job_id)
+        with self._lock:
+            if job.finished:
+                return job
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        for future in job.futures:
+            future.cancel()
+        return job
+
+    def chunk(self, job_id: str, index: int) -> Columns:
+        """Колонки части `index`: значения сетки и результаты методики."""
+        job = self.get(job_id)
+        if not 0 <= index < job.chunks_total:
+            raise JobNotFoundError(f"Часть {index} задания '{job_id}' не существует")
+        chunk = job.chunks[index]
+        if chunk is None:
+            raise JobNotReadyError(f"Часть {index} задания '{job_id}' ещё не рассчитана")
+        return chunk
+
+    def iter_chunks(self, job_id: str) -> Iterator[Columns]:
+        """Все части завершённого задания по порядку."""
+        job = self.get(job_id)
+        if job.status != "done":
+            raise JobNotReadyError(f"Задание '{job_id}' в статусе '{job.status}'")
+        for index in range(job.chunks_total):
+            yield self.chunk(job_id, index)
+
+    def shutdown(self) -> None:
+        """Остановить собственный пул исполнителей (внешний пул не трогается)."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    # ---------------------- INTERNAL -----------------------------
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=warm_up_worker)
+        return self._executor
+
+    def _on_chunk_done(self, job: Job, index: int, future: Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        with self._lock:
+            if job.finished:
+                return
+            if error is not None:
+                job.status = "failed"
+                job.error = f"{type(error).__name__}: {error}"
+                job.finished_at = time.time()
+            else:
+                start, stop = job.chunk_bounds[index]
+                grid = {name: col[start:stop] for name, col in job.grid_columns.items()}
+                job.chunks[index] = {**grid, **future.result()}
+                if job.chunks_done == job.chunks_total:
+                    job.status = "done"
+                    job.finished_at = time.time()
+        if error is not None:
+            for other in job.futures:
+                other.cancel()
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        while len(self._jobs) > self.max_stored and finished:
+            del self._jobs[finished.pop(0)]
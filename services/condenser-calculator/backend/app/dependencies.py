@@ -0,0 +1,32 @@
+from app.core.config import settings
+from app.core.job_queue import JobQueue
+from app.utils.berman_incremental import IncrementalBerman
+from app.utils.condenser_engine import CondenserEngine
+
+
+# Один движок на процесс API: экземпляры методик и кеши интерполяторов
+# переиспользуются между синхронными запросами.
+engine = CondenserEngine()
+
+job_queue = JobQueue(
+    engine,
+    max_workers=settings.JOB_WORKERS or None,
+    chunk_size=settings.JOB_CHUNK_SIZE,
+    max_stored=settings.JOB_MAX_STORED,
+)
+
+# Кеш этапов Бермана общий для запросов: повторный расчёт таблицы с одним
+# изменённым входом пересчитывает только зависящие от него этапы.
+berman_cache = IncrementalBerman()
+
+
+def get_engine() -> CondenserEngine:
+    return engine
+
+
+def get_job_queue() -> JobQueue:
+    return job_queue
+
+
+def get_berman_cache() -> IncrementalBerman:
+    return berman_cache
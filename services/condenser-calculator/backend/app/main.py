@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.api.main import api_router
+from app.api.routes import health
+from app.core.config import settings
+from app.dependencies import job_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Останавливаем процессы-исполнители вместе с сервисом
+    job_queue.shutdown()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    description="Сервис расчёта конденсатора: синхронный расчёт и очередь заданий",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Таблицы диапазонов бывают в десятки МБ: ответы (и поток NDJSON) сжимаются
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+app.include_router(health.router)
+app.include_router(api_router, prefix=settings.API_V1_STR)
+
+
+@app.get("/")
+def root():
+    return {
+        "service": settings.PROJECT_NAME,
+        "docs": "/docs",
+        "health": "/health",
+    }
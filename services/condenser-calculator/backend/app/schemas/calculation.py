@@ -0,0 +1,77 @@
+import math
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class CalculationRequest(BaseModel):
+    strategy: str                              # имя методики: 'berman', 'vku', ...
+    inputs: dict[str, Any]                     # плоские параметры методики
+    grid: dict[str, list[float]] | None = None  # варьируемые поля → значения
+    product: bool = True                       # True — декартово произведение, False — поэлементно
+
+
+class SyncCalculationRequest(CalculationRequest):
+    mode: Literal["scalar", "vectorized"] = "vectorized"
+
+
+class CalculationResponse(BaseModel):
+    strategy: str
+    mode: str
+    size: int
+    columns: dict[str, list[float | None]]     # NaN передаётся как null
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    strategy: str
+    status: str
+    size: int
+    points_done: int
+    progress: float
+    chunks_total: int
+    chunks_done: int
+    error: str | None = None
+    created_at: float
+    finished_at: float | None = None
+
+
+class ChunkResponse(BaseModel):
+    job_id: str
+    index: int
+    start: int
+    stop: int
+    columns: dict[str, list[float | None]]
+
+
+class EjectorRequest(BaseModel):
+    inlet_temperatures: list[float] = Field(min_length=1)  # температуры воды на входе [°C]
+    G_air: float = Field(ge=0)                             # расход воздуха [кг/ч]
+    number_of_ejectors: list[int] = [1, 2]
+
+
+class EjectorResponse(BaseModel):
+    inlet_temperatures: list[float]
+    number_of_ejectors: list[int]
+    P_ejector_kPa: list[list[float | None]]    # строки — число эжекторов, столбцы — температуры
+    P_ejector_atm: list[list[float | None]]
+
+
+class BermanTableRequest(BaseModel):
+    params: dict[str, Any]                     # параметры BermanStrategy.calculate (списки осей)
+
+
+class BermanTableResponse(BaseModel):
+    size: int
+    dims: list[str]
+    columns: dict[str, list[float | None]]     # координаты точек и выходные величины
+    ejector_results: list[dict[str, float]]
+    stages: dict[str, dict[str, int]]          # этап → {'computed': n, 'reused': m}
+
+
+def columns_to_json(columns: dict[str, Any]) -> dict[str, list[float | None]]:
+    """Колонки NumPy → списки для JSON (NaN → None: JSON не допускает NaN)."""
+    return {
+        name: [None if isinstance(value, float) and math.isnan(value) else value for value in values.tolist()]
+        for name, values in columns.items()
+    }
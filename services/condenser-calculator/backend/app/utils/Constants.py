@@ -1,48 +1,22 @@
+from . import tables
 
 
 coefficient_B_const = 0.974
 temperature_cooling_water_average_heating_const = 25.0
 speed_cooling_water_const = 2.0
-k_interpolation_data = {
-            "temperature_points": [5, 15, 27, 38, 50, 70, 95, 120, 150],  # Средняя температура tср [°C]
-            "speed_points": [0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 1.9, 2.0, 2.1, 2.2, 2.4, 2.6, 2.8, 3.0, 3.2, 3.4, 3.6], # Скорость воды Cов [м/с]
-            "k_values_matrix": [
-                [800, 1050, 1260, 1430, 1540, 1670, 1770, 1870, 1930],
-                [1260, 1510, 1720, 1890, 2000, 2170, 2270, 2370, 2430],
-                [1670, 1920, 2130, 2300, 2430, 2600, 2700, 2800, 2860],
-                [1970, 2220, 2450, 2620, 2750, 2950, 3060, 3160, 3230],
-                [2200, 2450, 2680, 2850, 2990, 3190, 3290, 3390, 3490],
-                [2410, 2680, 2900, 3080, 3210, 3400, 3520, 3620, 3700],
-                [2590, 2840, 3070, 3230, 3380, 3570, 3690, 3790, 3880],
-                [2760, 3010, 3230, 3420, 3550, 3730, 3850, 3960, 4040],
-                [2830, 3080, 3300, 3490, 3630, 3810, 3930, 4040, 4120],
-                [2900, 3150, 3370, 3570, 3700, 3870, 4000, 4110, 4190],
-                [2980, 3230, 3440, 3640, 3770, 3950, 4070, 4180, 4250],
-                [3040, 3290, 3500, 3690, 3830, 4000, 4120, 4220, 4310],
-                [3150, 3400, 3620, 3810, 3940, 4120, 4230, 4350, 4420],
-                [3250, 3500, 3710, 3910, 4040, 4220, 4330, 4440, 4540],
-                [3340, 3590, 3800, 3990, 4130, 4320, 4420, 4530, 4610],
-                [3440, 3690, 3870, 4050, 4180, 4390, 4500, 4600, 4670],
-                [3500, 3750, 3930, 4100, 4230, 4460, 4560, 4660, 4730],
-                [3560, 3810, 3990, 4160, 4290, 4520, 4620, 4720, 4790],
-                [3600, 3850, 4040, 4200, 4340, 4560, 4660, 4760, 4840]
-            ]
-        }
 _TVOZD_CONST_DEFAULT = 20.0
-_P_DATA: list = [
-        [40, 35, 30, 25, 20],
-        [40, 50, 60, 70, 80, 90, 100, 110, 120, 130, 140],
-        [
-            [0.104011054, 0.080455609, 0.061998746, 0.046804974, 0.036709784],
-            [0.111862869, 0.086879821, 0.067199298, 0.050985811, 0.039972876],
-            [0.119918627, 0.093100090, 0.072297880, 0.055880448, 0.043847797],
-            [0.127974385, 0.099830217, 0.077498432, 0.060367200, 0.047416804],
-            [0.136743944, 0.106968231, 0.083718701, 0.065567752, 0.051597640],
-            [0.145819418, 0.114718074, 0.090142913, 0.070360419, 0.056186363],
-            [0.155812637, 0.123181719, 0.097280927, 0.075866886, 0.060673115],
-            [0.165805856, 0.131543391, 0.104418940, 0.081373354, 0.065873667],
-            [0.176512876, 0.140618866, 0.112168783, 0.087899538, 0.071686050],
-            [0.187525812, 0.150000255, 0.119918627, 0.094323750, 0.077498432],
-            [0.198232832, 0.159381644, 0.127668470, 0.101155848, 0.083718701]
-        ]
-    ]
+
+
+# Таблицы читаются из хранилища `tables` при первом обращении к атрибуту модуля
+_LAZY_TABLES = {
+    "k_interpolation_data": tables.k_interpolation_data,
+    "_P_DATA": tables.vku_pressure_data,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_TABLES:
+        value = _LAZY_TABLES[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
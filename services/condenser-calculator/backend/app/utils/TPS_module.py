@@ -1,11 +1,37 @@
-from typing import Any
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import numpy as np
-from scipy import interpolate
+
+
+if TYPE_CHECKING:
+    from scipy import interpolate
+
+
+def _table_hash(kind: str, table_data: list) -> str:
+    """Хеш содержимого таблицы (оси и значения) для ключа кеша интерполяторов."""
+    digest = hashlib.blake2b(kind.encode(), digest_size=16)
+    for part in table_data:
+        arr = np.ascontiguousarray(part, dtype=float)
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+    return digest.hexdigest()
 
 
 class TablePressureStrategy:
-    def _create_namet_interpolator(self, namet_data: list) -> interpolate.RectBivariateSpline:
+    # Интерполяторы NAMET/NAMED общие для всех экземпляров: одни и те же таблицы
+    # конденсатора приходят в запросах многократно. Ключ — хеш содержимого таблицы,
+    # вытеснение — LRU.
+    _CACHE_MAXSIZE: ClassVar[int] = 128
+    _interpolator_cache: ClassVar[OrderedDict] = OrderedDict()
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+    _cache_stats: ClassVar[dict[str, int]] = {"hits": 0, "misses": 0}
+
+    def _create_namet_interpolator(self, namet_data: list) -> "interpolate.RectBivariateSpline":
+        from scipy.interpolate import RectBivariateSpline
+
         t_axis_raw = np.array(namet_data[0])
         g_axis = np.array(namet_data[1])
         values_raw = np.array(namet_data[2])
@@ -17,13 +43,52 @@ class TablePressureStrategy:
             t_axis = t_axis_raw
             values = values_raw
 
-        return interpolate.RectBivariateSpline(t_axis, g_axis, values, kx=1, ky=1)
+        return RectBivariateSpline(t_axis, g_axis, values, kx=1, ky=1)
+
+    def _create_named_interpolator(self, named_data: list) -> "interpolate.interp1d":
+        from scipy.interpolate import interp1d
 
-    def _create_named_interpolator(self, named_data: list) -> interpolate.interp1d:
         t_axis = np.array(named_data[0])
         p_axis = np.array(named_data[1])
 
-        return interpolate.interp1d(t_axis, p_axis, bounds_error=False, fill_value="extrapolate")
+        return interp1d(t_axis, p_axis, bounds_error=False, fill_value="extrapolate")
+
+    def _get_interpolator(self, kind: str, table_data: list):
+        """Интерполятор из кеша; при промахе строится и кладётся в кеш."""
+        key = _table_hash(kind, table_data)
+        cache = TablePressureStrategy._interpolator_cache
+        stats = TablePressureStrategy._cache_stats
+
+        with TablePressureStrategy._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                stats["hits"] += 1
+                return cache[key]
+
+        if kind == "NAMET":
+            interpolator = self._create_namet_interpolator(table_data)
+        else:
+            interpolator = self._create_named_interpolator(table_data)
+
+        with TablePressureStrategy._cache_lock:
+            stats["misses"] += 1
+            cache[key] = interpolator
+            cache.move_to_end(key)
+            while len(cache) > self._CACHE_MAXSIZE:
+                cache.popitem(last=False)
+        return interpolator
+
+    @classmethod
+    def cache_info(cls) -> dict[str, int]:
+        """Статистика кеша интерполяторов: попадания, промахи, размер."""
+        with cls._cache_lock:
+            return {**cls._cache_stats, "size": len(cls._interpolator_cache), "maxsize": cls._CACHE_MAXSIZE}
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            cls._interpolator_cache.clear()
+            cls._cache_stats.update(hits=0, misses=0)
 
     def calculate(self, params: dict[str, Any]) -> dict[str, Any]:
         namet_block = params['NAMET']
@@ -34,12 +99,12 @@ class TablePressureStrategy:
         named_data = named_block['data']
         named_inputs = params['inputs']
 
-        named_interpolator = self._create_named_interpolator(named_data)
+        named_interpolator = self._get_interpolator("NAMED", named_data)
         pressure_flow_path_1_NAMED = named_interpolator(
             named_inputs['temperature_cooling_water_1']
         )
 
-        namet_interpolator = self._create_namet_interpolator(namet_data)
+        namet_interpolator = self._get_interpolator("NAMET", namet_data)
         pressure_flow_path_1_NAMET = namet_interpolator(
             namet_inputs['temperature_cooling_water_1'],
             namet_inputs['mass_flow_flow_path_1']
@@ -55,3 +120,27 @@ class TablePressureStrategy:
             'pressure_flow_path_1_NAMED': float(pressure_flow_path_1_NAMED),
             'pressure_flow_path_1': pressure_flow_path_1
         }
+
+    def calculate_many(self, namet_data: list, named_data: list,
+                       temperature_cooling_water_1: np.ndarray,
+                       mass_flow_flow_path_1: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Расчёт давления сразу для массива точек (t_ов1, G).
+
+        Массивы `temperature_cooling_water_1` и `mass_flow_flow_path_1` приводятся
+        к общей форме по правилам broadcasting NumPy; результат имеет ту же форму.
+        """
+        t_cw1, g = np.broadcast_arrays(
+            np.asarray(temperature_cooling_water_1, dtype=float),
+            np.asarray(mass_flow_flow_path_1, dtype=float),
+        )
+
+        p_named = self._get_interpolator("NAMED", named_data)(t_cw1)
+        p_namet = self._get_interpolator("NAMET", namet_data)(t_cw1.ravel(), g.ravel(), grid=False)
+        p_namet = p_namet.reshape(t_cw1.shape)
+
+        return {
+            'pressure_flow_path_1_NAMET': p_namet,
+            'pressure_flow_path_1_NAMED': p_named,
+            'pressure_flow_path_1': np.where(p_namet >= p_named, p_namet, p_named),
+        }
@@ -1,7 +1,88 @@
-from typing import Any, ClassVar
+import csv
+import functools
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
 
 import numpy as np
-from scipy.interpolate import RegularGridInterpolator
+
+from . import tables
+
+
+def read_weather_series(path: str | Path, column: str = 'temperature_air', *,
+                        chunk_size: int = 8760, delimiter: str = ',') -> Iterator[np.ndarray]:
+    """
+    Потоковое чтение ряда температур наружного воздуха из CSV или Parquet.
+
+    Файл читается частями по `chunk_size` значений, поэтому многолетние почасовые
+    ряды не загружаются в память целиком. Формат определяется по расширению
+    (`.parquet`/`.pq` — Parquet, иначе CSV с заголовком). В CSV допускается
+    десятичная запятая.
+
+    Args:
+        path: Путь к файлу.
+        column: Имя столбца с температурой воздуха [°C].
+        chunk_size: Количество значений в одной части.
+        delimiter: Разделитель столбцов CSV.
+
+    Yields:
+        np.ndarray: Очередная часть ряда температур.
+
+    Raises:
+        KeyError: Если в файле нет столбца `column`.
+        ImportError: Если для чтения Parquet не установлен pyarrow.
+    """
+    path = Path(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Для чтения Parquet требуется пакет pyarrow.") from e
+
+        parquet_file = pq.ParquetFile(path)
+        if column not in parquet_file.schema_arrow.names:
+            raise KeyError(f"Столбец '{column}' отсутствует в файле {path.name}")
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=[column]):
+            yield batch.column(0).to_numpy(zero_copy_only=False).astype(float)
+        return
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        if reader.fieldnames is None or column not in reader.fieldnames:
+            raise KeyError(f"Столбец '{column}' отсутствует в файле {path.name}")
+
+        buffer: list[float] = []
+        for row in reader:
+            buffer.append(float(row[column].replace(',', '.')))
+            if len(buffer) == chunk_size:
+                yield np.array(buffer)
+                buffer = []
+        if buffer:
+            yield np.array(buffer)
+
+
+@functools.cache
+def _pressure_interpolator():
+    """
+    Интерполятор таблицы ВКУ P(Gк_прив, tвозд); строится один раз на процесс.
+    Ось температур в таблице убывает — для интерполятора она разворачивается.
+    """
+    from scipy.interpolate import RegularGridInterpolator
+
+    t_air_axis = tables.get_table("vku_temperature_air")
+    g_reduced_axis = tables.get_table("vku_mass_flow_reduced")
+    p_values = tables.get_table("vku_pressure")
+
+    if t_air_axis[0] > t_air_axis[-1]:
+        t_air_axis = np.flip(t_air_axis)
+        p_values = np.fliplr(p_values)
+
+    return RegularGridInterpolator(
+        (g_reduced_axis, t_air_axis),
+        p_values,
+        bounds_error=False,
+        fill_value=None
+    )
 
 
 class VKUStrategy:
@@ -11,23 +92,6 @@ class VKUStrategy:
     и температуре наружного воздуха с использованием 2D-интерполяции.
     """
     _TVOZD_CONST_DEFAULT = 20.0
-    _P_DATA: ClassVar[list] = [
-        [40, 35, 30, 25, 20],
-        [40, 50, 60, 70, 80, 90, 100, 110, 120, 130, 140],
-        [
-            [0.104011054, 0.080455609, 0.061998746, 0.046804974, 0.036709784],
-            [0.111862869, 0.086879821, 0.067199298, 0.050985811, 0.039972876],
-            [0.119918627, 0.093100090, 0.072297880, 0.055880448, 0.043847797],
-            [0.127974385, 0.099830217, 0.077498432, 0.060367200, 0.047416804],
-            [0.136743944, 0.106968231, 0.083718701, 0.065567752, 0.051597640],
-            [0.145819418, 0.114718074, 0.090142913, 0.070360419, 0.056186363],
-            [0.155812637, 0.123181719, 0.097280927, 0.075866886, 0.060673115],
-            [0.165805856, 0.131543391, 0.104418940, 0.081373354, 0.065873667],
-            [0.176512876, 0.140618866, 0.112168783, 0.087899538, 0.071686050],
-            [0.187525812, 0.150000255, 0.119918627, 0.094323750, 0.077498432],
-            [0.198232832, 0.159381644, 0.127668470, 0.101155848, 0.083718701]
-        ]
-    ]
 
     def __init__(self, mass_flow_steam_nom: float, degree_dryness_steam_nom: float):
         if mass_flow_steam_nom <= 0:
@@ -40,24 +104,8 @@ class VKUStrategy:
 
         self._interpolator = self._create_interpolator()
 
-    def _create_interpolator(self) -> RegularGridInterpolator:
-        t_air_axis_desc = np.array(self._P_DATA[0])
-        g_reduced_axis = np.array(self._P_DATA[1])
-        p_values = np.array(self._P_DATA[2])
-
-        if t_air_axis_desc[0] > t_air_axis_desc[-1]:
-            t_air_axis_asc = np.flip(t_air_axis_desc)
-            p_values_reordered = np.fliplr(p_values)
-        else:
-            t_air_axis_asc = t_air_axis_desc
-            p_values_reordered = p_values
-
-        return RegularGridInterpolator(
-            (g_reduced_axis, t_air_axis_asc),
-            p_values_reordered,
-            bounds_error=False,
-            fill_value=None
-        )
+    def _create_interpolator(self):
+        return _pressure_interpolator()
 
     def calculate(self, params: dict[str, Any]) -> dict[str, float]:
         """
@@ -101,3 +149,56 @@ class VKUStrategy:
         }
 
         return results
+
+    def calculate_many(self, mass_flow_flow_path_1: np.ndarray, degree_dryness_flow_path_1: np.ndarray,
+                       temperature_air: np.ndarray | None = None) -> dict[str, np.ndarray]:
+        """
+        Выполняет расчет давления сразу для массива режимов одним вызовом интерполятора.
+
+        Args:
+            mass_flow_flow_path_1: G1, текущий расход пара [т/ч].
+            degree_dryness_flow_path_1: X1, текущая степень сухости.
+            temperature_air: tвозд, температура наружного воздуха [°C]
+                (по умолчанию 20°С для всех точек).
+
+        Массивы приводятся к общей форме по правилам broadcasting NumPy,
+        поэтому один режим (G1, X1) можно задать скалярами, а температуру — рядом.
+
+        Returns:
+            Dict[str, np.ndarray]: Те же ключи, что и у `calculate`, значения — массивы.
+        """
+        if temperature_air is None:
+            temperature_air = self._TVOZD_CONST_DEFAULT
+
+        g, x, t_air = np.broadcast_arrays(
+            np.asarray(mass_flow_flow_path_1, dtype=float),
+            np.asarray(degree_dryness_flow_path_1, dtype=float),
+            np.asarray(temperature_air, dtype=float),
+        )
+
+        mass_flow_reduced_steam_condencer = (
+                (g / self.mass_flow_steam_nom) *
+                (x / self.degree_dryness_steam_nom) * 100
+        )
+
+        points = np.column_stack((mass_flow_reduced_steam_condencer.ravel(), t_air.ravel()))
+        pressure_flow_path_1 = self._interpolator(points).reshape(g.shape)
+
+        return {
+            'pressure_flow_path_1': pressure_flow_path_1,
+            'mass_flow_reduced_steam_condencer': mass_flow_reduced_steam_condencer
+        }
+
+    def calculate_weather_series(self, path: str | Path, mass_flow_flow_path_1: float,
+                                 degree_dryness_flow_path_1: float, *, column: str = 'temperature_air',
+                                 chunk_size: int = 8760, delimiter: str = ',') -> Iterator[dict[str, np.ndarray]]:
+        """
+        Потоковый расчет одного режима (G1, X1) по ряду температур воздуха из файла.
+
+        Файл читается частями (см. `read_weather_series`), для каждой части
+        выдается результат `calculate_many` с добавленным ключом 'temperature_air'.
+        """
+        for t_air in read_weather_series(path, column, chunk_size=chunk_size, delimiter=delimiter):
+            result = self.calculate_many(mass_flow_flow_path_1, degree_dryness_flow_path_1, t_air)
+            result['temperature_air'] = t_air
+            yield result
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 class ProblemDefinition:
     """
@@ -34,3 +36,22 @@ class ProblemDefinition:
         if x <= 0:
             return float('nan')
         return -self.c * self.power_minus_1 * math.pow(x, self.power_minus_1 - 1.0)
+
+    # -------------- Векторные версии (массивы X и target_delta) --------------
+    def calculate_delta_many(self, x: np.ndarray) -> np.ndarray:
+        """A3_delt для массива X; для X <= 0 — NaN."""
+        x = np.asarray(x, dtype=float)
+        positive = x > 0
+        power = np.power(np.where(positive, x, 1.0), self.power_minus_1)
+        return np.where(positive, 1.0 - self.c * power, np.nan)
+
+    def f_many(self, x: np.ndarray, target_delta: np.ndarray) -> np.ndarray:
+        """F(X) = A3_delt(X) - target_delta поэлементно."""
+        return self.calculate_delta_many(x) - target_delta
+
+    def df_many(self, x: np.ndarray) -> np.ndarray:
+        """Производная F(X) для массива X; для X <= 0 — NaN."""
+        x = np.asarray(x, dtype=float)
+        positive = x > 0
+        power = np.power(np.where(positive, x, 1.0), self.power_minus_1 - 1.0)
+        return np.where(positive, -self.c * self.power_minus_1 * power, np.nan)
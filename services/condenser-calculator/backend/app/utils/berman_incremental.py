@@ -0,0 +1,83 @@
+"""
+Инкрементальный пересчёт таблиц методики Бермана.
+
+`BermanStrategy` считает точку по этапам `STAGES` с явными зависимостями от
+входных данных (см. berman_strategy.py). Здесь результат каждого этапа
+запоминается по ключу из значений, от которых он зависит. Поэтому при изменении
+коэффициента чистоты пересчитывается только этап solution, при изменении одной
+температуры — этапы heat_transfer и далее только для этой температуры. Отчёт
+`stages` показывает, сколько результатов этапа рассчитано и сколько взято из кеша.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, ClassVar
+
+from .berman_strategy import STAGES, BermanStrategy
+
+
+@dataclass
+class StageReport:
+    """Сколько результатов этапа рассчитано заново и сколько взято из кеша."""
+    computed: int = 0
+    reused: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {"computed": self.computed, "reused": self.reused}
+
+
+class IncrementalBerman(BermanStrategy):
+    """
+    Расчёт Бермана с запоминанием промежуточных этапов между вызовами.
+
+    Кеш каждого этапа ограничен `max_entries` записями (вытеснение — LRU).
+    Экземпляр потокобезопасен: этапы разных запросов не смешиваются в отчёте.
+    """
+
+    _CACHE_MAXSIZE: ClassVar[int] = 100_000
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries or self._CACHE_MAXSIZE
+        self._caches: dict[str, OrderedDict[Hashable, Any]] = {stage: OrderedDict() for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def cache_sizes(self) -> dict[str, int]:
+        return {stage: len(cache) for stage, cache in self._caches.items()}
+
+    def _stage(self, stage: str, key: Hashable, compute: Callable[..., Any], *args,
+               report: dict[str, StageReport]) -> Any:
+        cache = self._caches[stage]
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                report[stage].reused += 1
+                return cache[key]
+        value = compute(*args)
+        with self._lock:
+            report[stage].computed += 1
+            cache[key] = value
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+        return value
+
+    def calculate(self, params: dict, *, columnar: bool = False) -> dict:
+        """
+        Расчёт с параметрами `BermanStrategy.calculate`.
+
+        :return: 'main_results' (список словарей или `ColumnarResult`), 'ejector_results'
+            и 'stages' — отчёт по этапам {этап: {'computed': n, 'reused': m}}.
+        """
+        report = {stage: StageReport() for stage in STAGES}
+        result = self._calculate(params, columnar, partial(self._stage, report=report))
+        result['stages'] = {stage: r.to_dict() for stage, r in report.items()}
+        return result
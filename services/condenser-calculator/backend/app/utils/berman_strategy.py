@@ -1,6 +1,349 @@
 import math
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .columnar import ColumnarResult
+from .ejector import ejector_records
+from .saturation import saturation_pressure, saturation_pressure_berman
+
+
+# Величины одной расчётной точки основного контура (порядок колонок результата)
+MAIN_RESULT_FIELDS = (
+    "F_main", "F_builtin", "g_k_nom", "C_main", "C_builtin", "B_main", "B_builtin", "X_main",
+    "X_builtin", "Phi_c_main", "Phi_c_builtin", "Phi_z_main", "Phi_z_builtin", "Phi_t_main",
+    "Phi_t_builtin", "g_k_priv_main", "g_k_priv_builtin", "g_k", "Phi_g_main", "Phi_g_builtin",
+    "K_base_main", "K_base_builtin", "K_load_main", "K_load_builtin", "K_clean_main",
+    "K_clean_builtin", "K_dirty_main", "K_dirty_builtin", "D", "delta_t_heat_main",
+    "delta_t_heat_builtin", "delta_t_main", "delta_t_builtin", "t_sat", "t2_main", "t2_builtin",
+    "P_steam_seuif_Pa", "P_steam_seuif_atm", "P_steam_formula_Pa", "P_steam_formula_atm",
+)
+
+# Координаты точки: расходы воды, коэффициент чистоты, температуры воды на входе, расход пара
+COORD_DIMS = ("W_main", "W_builtin", "coefficient_b", "t1_main", "t1_builtin", "G_steam")
+
+# Этапы расчёта точки и входные данные, от которых они зависят:
+#
+#     geometry       F, g_k_nom                  ← L, N, d_in, S_tube, G_nom
+#     velocity       C, активные пучки           ← geometry, Z, пара расходов воды W
+#     heat_transfer  B, X, Φ_c, Φ_t, Φ_z, K_base ← velocity, пара температур t1
+#     load           Φ_g, K_load, K_clean, Δt     ← heat_transfer, G_steam, λ, H_steam
+#     solution       K_dirty, t_sat, давление     ← load, коэффициент чистоты b
+#
+# Величины пучков хранятся тройками с 1-индексацией (1 — ОП, 2 — ВП), как в исходном
+# алгоритме; величины неактивного в точке пучка равны 0.
+STAGES = ("geometry", "velocity", "heat_transfer", "load", "solution")
+
+_BUNDLES = (1, 2)
+
+Triple = tuple[float, float, float]
+
+# Вызов этапа: stage(имя, ключ зависимостей, функция, *аргументы) -> результат этапа
+StageCall = Callable[..., Any]
+
+
+@dataclass(frozen=True, slots=True)
+class Geometry:
+    F: Triple
+    g_k_nom: float
+
+
+@dataclass(frozen=True, slots=True)
+class Velocity:
+    C: Triple
+    active: tuple[bool, bool, bool]
+    F_active: float
+
+
+@dataclass(frozen=True, slots=True)
+class HeatTransfer:
+    B: Triple
+    X: Triple
+    Phi_c: Triple
+    Phi_t: Triple
+    Phi_z: Triple
+    g_k_priv: Triple
+    K_base: Triple
+
+
+@dataclass(frozen=True, slots=True)
+class Load:
+    g_k: float
+    Phi_g: Triple
+    K_load: Triple
+    K_clean: Triple
+    D: float
+    delta_t_heat: Triple
+
+
+@dataclass(frozen=True, slots=True)
+class Solution:
+    K_dirty: Triple
+    delta_t_heat: Triple
+    delta_t: Triple
+    t_sat: float
+    t2_main: float
+    t2_builtin: float
+    P_steam_seuif_Pa: float
+    P_steam_seuif_atm: float
+    P_steam_formula_Pa: float
+    P_steam_formula_atm: float
+
+
+# ------------------------------ ЭТАПЫ ------------------------------
+
+
+def geometry_stage(L_main: float, L_builtin: float, N_main: int, N_builtin: int,
+                   d_in_mm: float, S_tube_mm: float, G_nom: float) -> Geometry:
+    """Площади поверхности пучков и номинальная удельная паровая нагрузка."""
+    d_in, S_tube = d_in_mm / 1000.0, S_tube_mm / 1000.0
+    L = (0.0, L_main / 1000.0, L_builtin / 1000.0)
+    F1 = math.pi * L[1] * N_main * (d_in + 2.0 * S_tube)
+    # Проверяем физическое наличие второго пучка
+    F2 = math.pi * L[2] * N_builtin * (d_in + 2.0 * S_tube) if L[2] > 0 and N_builtin > 0 else 0.0
+    F_total = F1 + F2
+    g_k_nom = (G_nom * 1000.0 / F_total) if F_total != 0 else 0.0
+    return Geometry(F=(0.0, F1, F2), g_k_nom=g_k_nom)
+
+
+def velocity_stage(geometry: Geometry, N: tuple[int, int, int], Z: tuple[int, int, int],
+                   d_in_mm: float, W: Triple) -> Velocity:
+    """Скорости воды в трубках и активные пучки (есть поверхность и расход воды)."""
+    F, d_in = geometry.F, d_in_mm / 1000.0
+    active = (False, F[1] > 0 and W[1] > 0, F[2] > 0 and W[2] > 0)
+    F_active = sum(F[b] for b in _BUNDLES if active[b])
+    C = [0.0, 0.0, 0.0]
+    for b in _BUNDLES:
+        if N[b] > 0 and d_in > 0:
+            C[b] = W[b] * Z[b] / (900.0 * math.pi * N[b] * d_in ** 2)
+    return Velocity(C=tuple(C), active=active, F_active=F_active)
+
+
+def heat_transfer_stage(velocity: Velocity, geometry: Geometry, Z: tuple[int, int, int],
+                        d_in_mm: float, t: Triple) -> HeatTransfer:
+    """Базовый коэффициент теплопередачи и поправочные коэффициенты активных пучков."""
+    values = {name: [0.0, 0.0, 0.0] for name in ("B", "X", "Phi_c", "Phi_t", "Phi_z", "g_k_priv", "K_base")}
+    B, X, Phi_c, Phi_t, Phi_z, g_k_priv, K_base = values.values()
+    d_in = d_in_mm / 1000.0
+    for b in _BUNDLES:
+        if not velocity.active[b]:
+            continue
+        # Средняя температура воды — по температуре на входе (нагрев на этом этапе не учитывается)
+        avg_water_temp = t[b]
+
+        # Коэффициент скорости воды (диаметр — в мм)
+        if velocity.C[b] > 0 and d_in > 0:
+            B[b] = 1.1 * velocity.C[b] / d_in_mm ** 0.25
+            X[b] = 0.12 * (1.0 + 0.15 * avg_water_temp)
+            Phi_c[b] = B[b] ** X[b]
+        else:
+            B[b], X[b], Phi_c[b] = 0, 0, 1.0
+
+        # Коэффициенты температуры воды и числа ходов
+        if avg_water_temp < 35.0:
+            Phi_t[b] = 1.0 - 0.00042 * (35.0 - avg_water_temp) ** 2
+            Phi_z[b] = 1.0 + (Z[b] - 2.0) / 10.0 * (1.0 - avg_water_temp / 35.0)
+        else:
+            Phi_t[b] = 1.0 + 0.002 * (avg_water_temp - 35.0)
+            Phi_z[b] = 1.0 + (Z[b] - 2.0) / 10.0 * (1.0 - avg_water_temp / 45.0)
+
+        # Приведенный расход пара и базовый коэффициент теплопередачи
+        g_k_priv[b] = (0.9 - 0.012 * avg_water_temp) * geometry.g_k_nom
+        K_base[b] = 3500.0 * Phi_c[b] * Phi_t[b] * Phi_z[b]
+    return HeatTransfer(**{name: tuple(v) for name, v in values.items()})
+
+
+def load_stage(heat: HeatTransfer, velocity: Velocity, geometry: Geometry, W: Triple,
+               G_steam: float, lam: float, S_tube_mm: float, H_steam: float) -> Load:
+    """Учёт паровой нагрузки и стенки трубок; нагрев воды при равномерной нагрузке пучков."""
+    Phi_g, K_load, K_clean, delta_t_heat = [0.0] * 3, [0.0] * 3, [0.0] * 3, [0.0] * 3
+    S_tube = S_tube_mm / 1000.0
+    # Удельная нагрузка — на АКТИВНУЮ площадь
+    g_k = G_steam * 1000.0 / velocity.F_active if velocity.F_active != 0 else 0.0
+    D = 0.0
+    for b in _BUNDLES:
+        if not velocity.active[b]:
+            continue
+        # Коэффициент удельной паровой нагрузки
+        load_ratio = g_k / heat.g_k_priv[b] if heat.g_k_priv[b] != 0 else float('inf')
+        Phi_g[b] = load_ratio * (2.0 - load_ratio) if load_ratio < 1.0 else 1.0
+        K_load[b] = heat.K_base[b] * Phi_g[b]
+
+        # Учет термического сопротивления стенки
+        k_inv = 1.0 / K_load[b] if K_load[b] != 0 else float('inf')
+        wall_resistance_term = (S_tube / lam - 0.001 / 90.0) if lam != 0 else float('inf')
+        new_k_inv = k_inv + wall_resistance_term
+        K_clean[b] = 1.0 / new_k_inv if not math.isinf(new_k_inv) else 0.0
+
+        # Расчет нагрева воды
+        D = g_k * geometry.F[b]
+        delta_t_heat[b] = D * H_steam / (W[b] * 1000.0) if W[b] > 0 else 0.0
+    return Load(g_k=g_k, Phi_g=tuple(Phi_g), K_load=tuple(K_load), K_clean=tuple(K_clean),
+                D=D, delta_t_heat=tuple(delta_t_heat))
+
+
+def _exp(value: float) -> float:
+    try:
+        return math.exp(value)
+    except OverflowError:
+        return float('inf')
+
+
+def solution_stage(load: Load, velocity: Velocity, geometry: Geometry, W: Triple, t: Triple,
+                   G_steam: float, H_steam: float, fouling_resistance: float) -> Solution:
+    """Температура насыщения с учётом загрязнения и давление пара в конденсаторе."""
+    F = geometry.F
+    K_dirty, delta_t, t_sat = [0.0] * 3, [0.0] * 3, [0.0] * 3
+    delta_t_heat = list(load.delta_t_heat)
+
+    if velocity.active[1] and velocity.active[2]:
+        # Итерационное выравнивание температур насыщения двух пучков
+        temp_diff_check, temp_diff_step = 0.0, 0.1
+        for _ in range(3000):
+            for b in _BUNDLES:
+                k_inv = 1.0 / load.K_clean[b] if load.K_clean[b] != 0 else float('inf')
+                K_dirty[b] = 1.0 / (k_inv + fouling_resistance)
+                exp_val = _exp(K_dirty[b] / W[b] * F[b] / 1000.0) if W[b] > 0 else float('inf')
+                delta_t[b] = delta_t_heat[b] / (exp_val - 1.0) if (exp_val - 1.0) != 0 else 0.0
+                t_sat[b] = t[b] + delta_t_heat[b] + delta_t[b]
+
+            temp_diff = t_sat[1] - t_sat[2]
+            if temp_diff_check * temp_diff < 0:
+                temp_diff_step /= 5.0
+            temp_diff_check = temp_diff
+            if abs(temp_diff) <= 0.000001:
+                break
+
+            delta_t_heat[1] += -temp_diff_step if temp_diff > 0 else temp_diff_step
+            if W[2] > 0:
+                delta_t_heat[2] = (G_steam * H_steam - delta_t_heat[1] * W[1]) / W[2]
+            else:
+                break
+        t_sat_final = t_sat[1]
+    else:
+        # Однопучковый конденсатор (или в точке работает один пучок)
+        b = 1 if velocity.active[1] else 2
+        k_inv = 1.0 / load.K_clean[b] if load.K_clean[b] != 0 else float('inf')
+        K_dirty[b] = 1.0 / (k_inv + fouling_resistance)
+        exp_val = _exp(K_dirty[b] / W[b] * F[b] / 1000.0)
+        delta_t[b] = delta_t_heat[b] / (exp_val - 1.0) if exp_val > 1.00001 else 0.0
+        t_sat_final = t[b] + delta_t_heat[b] + delta_t[b]
+
+    # Давление насыщения по финальной температуре
+    P_steam_formula_atm = saturation_pressure_berman(t_sat_final) / 0.0980665
+    P_steam_seuif_Pa = saturation_pressure(t_sat_final) * 1000
+    return Solution(
+        K_dirty=tuple(K_dirty),
+        delta_t_heat=tuple(delta_t_heat),
+        delta_t=tuple(delta_t),
+        t_sat=t_sat_final,
+        t2_main=t[1] + delta_t_heat[1],
+        t2_builtin=t[2] + delta_t_heat[2] if velocity.active[2] else 0.0,
+        P_steam_seuif_Pa=P_steam_seuif_Pa,
+        P_steam_seuif_atm=P_steam_seuif_Pa / 98.0665,
+        P_steam_formula_Pa=P_steam_formula_atm * 98.0665,
+        P_steam_formula_atm=P_steam_formula_atm,
+    )
+
+
+def result_row(geometry: Geometry, velocity: Velocity, heat: HeatTransfer, load: Load,
+               solution: Solution) -> tuple:
+    """Значения точки в порядке `MAIN_RESULT_FIELDS`."""
+    def pair(values):
+        return values[1], values[2]
+
+    return (
+        *pair(geometry.F), geometry.g_k_nom, *pair(velocity.C), *pair(heat.B), *pair(heat.X),
+        *pair(heat.Phi_c), *pair(heat.Phi_z), *pair(heat.Phi_t), *pair(heat.g_k_priv), load.g_k,
+        *pair(load.Phi_g), *pair(heat.K_base), *pair(load.K_load), *pair(load.K_clean),
+        *pair(solution.K_dirty), load.D, *pair(solution.delta_t_heat), *pair(solution.delta_t),
+        solution.t_sat, solution.t2_main, solution.t2_builtin, solution.P_steam_seuif_Pa,
+        solution.P_steam_seuif_atm, solution.P_steam_formula_Pa, solution.P_steam_formula_atm,
+    )
+
+
+# ------------------------------ ТОЧКИ ------------------------------
+
+
+def _padded(values: list, size: int) -> list:
+    return [*values, *[0.0] * (size - len(values))]
+
+
+def _last_nonzero(*lists: list) -> int:
+    return max((i + 1 for values in lists for i, v in enumerate(values) if v != 0), default=0)
+
+
+def iter_points(params: dict):
+    """
+    Точки сетки в порядке расчёта (W → b → t1 → G_steam); перебор по оси останавливается
+    на первом нулевом значении. Элементы: (W, beta, R*, t1, G_steam), W и t1 — пары
+    (ОП, ВП) с нулевым элементом по индексу 0.
+    """
+    W_main, W_builtin = params['W_main_list'], params.get('W_builtin_list') or []
+    size_w = max(len(W_main), len(W_builtin))
+    W_main, W_builtin = _padded(W_main, size_w), _padded(W_builtin, size_w)
+
+    t_main, t_builtin = params['t1_main_list'], params.get('t1_builtin_list') or []
+    max_temp_idx = _last_nonzero(t_main, t_builtin)
+    size_t = max(len(t_main), len(t_builtin))
+    t_main, t_builtin = _padded(t_main, size_t), _padded(t_builtin, size_t)
+
+    G = params['G_steam_list']
+    max_steam_flow_idx = _last_nonzero(G)
+    b_list = params['coefficient_b_list']
+
+    for i in range(size_w):
+        # Если оба расхода 0, прерываем (но если один есть - работаем)
+        W = (0.0, W_main[i], W_builtin[i])
+        if W[1] == 0 and W[2] == 0:
+            break
+        for m, beta in enumerate(b_list):
+            # Расчет R* по коэффициенту бета: R* = (417.3 - 417.2 * beta) * 10^-6
+            fouling_resistance = (417.3 - 417.2 * beta) * 1e-6
+            if fouling_resistance == 0 and m > 0:
+                break
+            for j in range(max_temp_idx):
+                t1, t2 = t_main[j], t_builtin[j]
+                if t1 == 0 and t2 == 0:
+                    break
+                # Если температура задана только для одного пучка, она же и для второго
+                t = (0.0, t1 or t2, t2 or t1)
+                for k in range(max_steam_flow_idx):
+                    if G[k] == 0:
+                        break
+                    yield W, beta, fouling_resistance, t, G[k]
+
+
+def ejector_temperatures(params: dict) -> list[float]:
+    """Температуры воды на входе от последней к первой; если для ОП не задана — берётся ВП."""
+    t_main, t_builtin = params['t1_main_list'], params.get('t1_builtin_list') or []
+    size_t = max(len(t_main), len(t_builtin))
+    t_main, t_builtin = _padded(t_main, size_t), _padded(t_builtin, size_t)
+    temps = [t_main[j] or t_builtin[j] for j in range(_last_nonzero(t_main, t_builtin) - 1, -1, -1)]
+    return [t for t in temps if t != 0]
 
-from seuif97 import *
+
+def _compute(stage: str, key: Hashable, compute: Callable[..., Any], *args) -> Any:
+    return compute(*args)
+
+
+def _point_row(stage: StageCall, geometry_key: tuple, geometry: Geometry, N: tuple[int, int, int],
+               Z: tuple[int, int, int], d_in: float, S_tube: float, lam: float, H_steam: float,
+               W: Triple, fouling_resistance: float, t: Triple, G_steam: float) -> tuple | None:
+    """Значения точки (`MAIN_RESULT_FIELDS`) по этапам velocity … solution; None — нет активного пучка."""
+    velocity_key = (geometry_key, Z, W)
+    velocity = stage("velocity", velocity_key, velocity_stage, geometry, N, Z, d_in, W)
+    if velocity.F_active == 0:
+        return None
+    heat_key = (velocity_key, t)
+    heat = stage("heat_transfer", heat_key, heat_transfer_stage, velocity, geometry, Z, d_in, t)
+    load_key = (heat_key, G_steam, lam, H_steam)
+    load = stage("load", load_key, load_stage, heat, velocity, geometry, W, G_steam, lam, S_tube, H_steam)
+    solution = stage("solution", (load_key, fouling_resistance), solution_stage,
+                     load, velocity, geometry, W, t, G_steam, H_steam, fouling_resistance)
+    return result_row(geometry, velocity, heat, load, solution)
 
 
 class BermanStrategy:
@@ -12,406 +355,100 @@ class BermanStrategy:
     Алгоритм учитывает наличие двух пучков трубок: основного (ОП) и встроенного (ВП).
     """
 
-    def calculate(self, params: dict) -> dict:
+    def calculate(self, params: dict, *, columnar: bool = False) -> dict:
         """
         Выполняет основной расчет.
 
         :param params: Словарь с входными параметрами.
+        :param columnar: False — 'main_results' как список словарей (по одному на точку),
+            True — как `ColumnarResult`: массивы величин `MAIN_RESULT_FIELDS` и координаты
+            точек по осям `COORD_DIMS` (порядок строк тот же).
         :return: Словарь с результатами расчета для основного контура и эжекторов.
         """
-        # --- 1. Извлечение и подготовка входных данных ---
-
-        # Геометрия: длины пучков
-        L = [0.0] * 3
-        L[1] = params['L_main'] / 1000.0
-        L[2] = params.get('L_builtin', 0.0) / 1000.0
-
-        # Геометрия: число ходов
-        Z = [0] * 3
-        Z[1] = params['Z_main']
-        Z[2] = params.get('Z_builtin', 0)
-
-        # Геометрия: количество трубок
-        N = [0] * 3
-        N[1] = params['N_main']
-        N[2] = params.get('N_builtin', 0)
-
-        # Параметры пара и материалов
-        H_steam = params['H_steam'] # ккал/кг энтальпия определяется как разность энтальпий перед конденсатором и энтальпии конденсата
-        G_nom = params['G_nom']
-        lam = params['lambda']  # Используем lam, так как lambda - зарезервированное слово Python
-
-        # Диаметры и толщины в метрах
-        d_in = params['d_in'] / 1000.0
-        S_tube = params['S_tube'] / 1000.0
-
-        # Списки итеративных параметров
-        W = [params['W_main_list'],
-             params.get('W_builtin_list', [])]
-        t1 = [params['t1_main_list'],
-              params.get('t1_builtin_list', [])]
-        G = params['G_steam_list']
-        coefficient_b_list = params['coefficient_b_list']
-
-        # Расход воздуха для расчета эжекторов
+        return self._calculate(params, columnar, _compute)
+
+    def _calculate(self, params: dict, columnar: bool, stage: StageCall) -> dict:
+        """
+        Расчёт по этапам `STAGES`. Каждый этап вызывается через
+        stage(имя, ключ, функция, *аргументы), где ключ — значения входных данных,
+        от которых зависит результат этапа (для запоминания в `IncrementalBerman`).
+        """
+        # --- 1. Входные данные ---
+        N = (0, params['N_main'], params.get('N_builtin', 0))
+        Z = (0, params['Z_main'], params.get('Z_builtin', 0))
+        d_in, S_tube = params['d_in'], params['S_tube']  # мм
+        lam = params['lambda']  # lam, так как lambda - зарезервированное слово Python
+        # ккал/кг: разность энтальпий пара перед конденсатором и конденсата
+        H_steam = params['H_steam']
+
+        geometry_key = (params['L_main'], params.get('L_builtin', 0.0), N[1], N[2], d_in, S_tube,
+                        params['G_nom'])
+        geometry = stage("geometry", geometry_key, geometry_stage, *geometry_key)
+
+        # --- 2. Расчёт по точкам сетки ---
+        rows, coord_rows = [], []
+        for W, beta, fouling_resistance, t, G_steam in iter_points(params):
+            row = _point_row(stage, geometry_key, geometry, N, Z, d_in, S_tube, lam, H_steam,
+                             W, fouling_resistance, t, G_steam)
+            if row is not None:
+                coord_rows.append((W[1], W[2], beta, t[1], t[2], G_steam))
+                rows.append(row)
+
+        # --- 3. Расчет эжекторов ---
         G_air = params.get('G_air', 0)
+        ejector_results = ejector_records(ejector_temperatures(params), G_air) if G_air > 0 else []
 
-        # --- 2. Инициализация рабочих матриц и переменных ---
-
-        # Инициализируем матрицы для хранения итеративных данных
-        # Размер определяется количеством заданных значений
-
-        # Для расходов воды берем максимум между основным и встроенным пучком (если он есть)
-        len_w_main = len(W[0])
-        len_w_builtin = len(W[1]) if len(W) > 1 and W[1] else 0
-        size_w = max(len_w_main, len_w_builtin) + 1
-
-        # Для температур
-        len_t_main = len(t1[0])
-        len_t_builtin = len(t1[1]) if len(t1) > 1 and t1[1] else 0
-        size_t = max(len_t_main, len_t_builtin) + 1
-
-        # Для расходов пара и загрязнений
-        size_g = len(G) + 1
-        size_r = len(coefficient_b_list) + 1
-
-        W_matrix = [[0.0] * 3 for _ in range(size_w)]
-        t_matrix = [[0.0] * 3 for _ in range(size_t)]
-        steam_flows = [0.0] * size_g
-        fouling_resistances = [0.0] * size_r
-
-        # Заполнение матриц из входных списков (с 1-индексацией, как в оригинале)
-        for i, val in enumerate(W[0], 1):
-            W_matrix[i][1] = val
-        if len(W) > 1 and W[1]:
-            for i, val in enumerate(W[1], 1):
-                W_matrix[i][2] = val
-
-        max_temp_idx = 0
-        # Заполняем Main
-        for i, val in enumerate(t1[0], 1):
-            t_matrix[i][1] = val
-            # Обновляем макс индекс
-            if val != 0 and i > max_temp_idx:
-                max_temp_idx = i
-
-        # Заполняем Built-in и тоже обновляем max_temp_idx
-        if len(t1) > 1 and t1[1]:
-            for i, val in enumerate(t1[1], 1):
-                t_matrix[i][2] = val
-                # Обновляем макс индекс, если ВП длиннее или единственный
-                if val != 0 and i > max_temp_idx:
-                    max_temp_idx = i
-
-        max_steam_flow_idx = 0
-        for i, val in enumerate(G, 1):
-            steam_flows[i] = val
-            if val != 0:
-                max_steam_flow_idx = i
-
-        # Расчет R* по коэффициенту бета: R* = (417.3 - 417.2 * beta) * 10^-6
-        for i, beta in enumerate(coefficient_b_list, 1):
-            fouling_resistances[i] = (417.3 - 417.2 * beta) * 1e-6
-
-            # --- 3. Основной цикл расчетов ---
-
-        main_results = []
-        pi = math.pi
-
-        # Расчетные переменные для каждого пучка
-        C = [0.0] * 3
-        B = [0.0] * 3
-        X = [0.0] * 3
-        Phi_c = [0.0] * 3
-        Phi_t = [0.0] * 3
-        Phi_z = [0.0] * 3
-        g_k_priv = [0.0] * 3
-        Phi_g = [0.0] * 3
-        K_base = [0.0] * 3
-        K_load = [0.0] * 3
-        K_clean = [0.0] * 3
-        K_dirty = [0.0] * 3
-        delta_t_heat = [0.0] * 3
-        delta_t = [0.0] * 3
-        t_sat = [0.0] * 3
-        avg_water_temps = [0.0] * 3
-
-        # Расчет площадей поверхности для каждого пучка
-        F = [0.0] * 3
-        F[1] = pi * L[1] * N[1] * (d_in + 2.0 * S_tube)
-        # Проверяем физическое наличие второго пучка
-        if L[2] > 0 and N[2] > 0:
-            F[2] = pi * L[2] * N[2] * (d_in + 2.0 * S_tube)
+        if columnar:
+            main_results = ColumnarResult.from_rows(COORD_DIMS, coord_rows, MAIN_RESULT_FIELDS, rows)
         else:
-            F[2] = 0.0
-        F_total = F[1] + F[2]
-        g_k_nom = (G_nom * 1000.0 / F_total) if F_total != 0 else 0.0
-
-        # Внешние циклы по всем вариантам входных данных
-        for i in range(1, size_w):
-            # Если оба расхода 0, прерываем (но если один есть - работаем)
-            if W_matrix[i][1] == 0 and W_matrix[i][2] == 0:
-                break
-
-            # Определяем статус активности каждого пучка отдельно
-            is_op_active = (F[1] > 0) and (W_matrix[i][1] > 0)
-            is_vp_active = (F[2] > 0) and (W_matrix[i][2] > 0)
-
-            use_two_bundles = is_op_active and is_vp_active
-
-            # Считаем активную площадь
-            current_F_total = 0.0
-            if is_op_active:
-                current_F_total += F[1]
-            if is_vp_active:
-                current_F_total += F[2]
+            main_results = [dict(zip(MAIN_RESULT_FIELDS, row, strict=True)) for row in rows]
+        return {'main_results': main_results, 'ejector_results': ejector_results}
 
-            # Защита от деления на ноль, если все отключено (хотя break сработает раньше)
-            if current_F_total == 0:
+    def calculate_many(self, params: Mapping[str, Any]) -> dict[str, np.ndarray]:
+        """
+        Расчёт набора независимых точек за один вызов (без перебора осей и эжекторов).
+
+        :param params: Ключи как у `calculate`, но оси точки задаются без суффикса
+            `_list`: 'W_main', 'W_builtin', 't1_main', 't1_builtin', 'G_steam',
+            'coefficient_b'. Каждое значение — скаляр или массив; массивы приводятся
+            к общей форме по правилам broadcasting NumPy.
+        :return: Массивы величин `MAIN_RESULT_FIELDS`. Точки, которые `calculate`
+            пропускает (нет расхода воды, температуры или расхода пара, нет активного
+            пучка), дают NaN.
+
+        Результаты этапов geometry … load запоминаются на время вызова, поэтому
+        геометрия, общая для всех точек, считается один раз.
+        """
+        names = list(params)
+        arrays = np.broadcast_arrays(*(np.asarray(params[name], dtype=float) for name in names))
+        memo: dict[tuple[str, Hashable], Any] = {}
+
+        def stage(name: str, key: Hashable, compute: Callable[..., Any], *args) -> Any:
+            if name == "solution":
+                return compute(*args)
+            if (name, key) not in memo:
+                memo[name, key] = compute(*args)
+            return memo[name, key]
+
+        rows = []
+        for values in zip(*(a.ravel().tolist() for a in arrays), strict=True):
+            p = dict(zip(names, values, strict=True))
+            N = (0, p['N_main'], p.get('N_builtin', 0.0))
+            Z = (0, p['Z_main'], p.get('Z_builtin', 0.0))
+            W = (0.0, p['W_main'], p.get('W_builtin', 0.0))
+            t1, t2 = p['t1_main'], p.get('t1_builtin', 0.0)
+            G_steam = p['G_steam']
+            if (W[1] == 0 and W[2] == 0) or (t1 == 0 and t2 == 0) or G_steam == 0:
+                rows.append(None)
                 continue
 
-            # Расчет скорости воды в трубках для каждого пучка
-            if N[1] > 0 and d_in > 0:
-                C[1] = W_matrix[i][1] * Z[1] / (900.0 * pi * N[1] * d_in ** 2)
-            else:
-                C[1] = 0.0
-
-            if N[2] > 0 and d_in > 0:
-                C[2] = W_matrix[i][2] * Z[2] / (900.0 * pi * N[2] * d_in ** 2)
-            else:
-                C[2] = 0.0
-
-            for m in range(1, len(coefficient_b_list) + 1):
-                current_fouling_resistance = fouling_resistances[m]
-                if current_fouling_resistance == 0 and m > 1:
-                    break
+            geometry_key = (p['L_main'], p.get('L_builtin', 0.0), N[1], N[2], p['d_in'], p['S_tube'], p['G_nom'])
+            geometry = stage("geometry", geometry_key, geometry_stage, *geometry_key)
+            fouling_resistance = (417.3 - 417.2 * p.get('coefficient_b', 1.0)) * 1e-6
+            rows.append(_point_row(stage, geometry_key, geometry, N, Z, p['d_in'], p['S_tube'], p['lambda'],
+                                   p['H_steam'], W, fouling_resistance, (0.0, t1 or t2, t2 or t1), G_steam))
 
-                for j in range(1, max_temp_idx + 1):
-                    # Прерываем, только если данных нет ни для ОП, ни для ВП
-                    if t_matrix[j][1] == 0 and t_matrix[j][2] == 0:
-                        break
-
-                    # Если температура задана только для одного пучка, копируем её во второй
-                    if t_matrix[j][1] == 0 and t_matrix[j][2] != 0:
-                        t_matrix[j][1] = t_matrix[j][2]
-                    elif t_matrix[j][2] == 0 and t_matrix[j][1] != 0:
-                        t_matrix[j][2] = t_matrix[j][1]
-
-                    for steam_idx in range(1, max_steam_flow_idx + 1):
-                        current_steam_flow = steam_flows[steam_idx]
-                        if current_steam_flow == 0:
-                            break
-
-                        delta_t_heat[1], delta_t_heat[2] = 0.0, 0.0
-
-                        # Цикл для расчета коэффициента теплопередачи (без итераций, выполняется один раз для инициализации)
-                        for _ in range(1):
-                            for bundle_idx in range(1, 3):
-                                # Универсальная проверка активности
-                                if bundle_idx == 1 and not is_op_active:
-                                    continue
-                                if bundle_idx == 2 and not is_vp_active:
-                                    continue
-                                avg_water_temps[bundle_idx] = t_matrix[j][bundle_idx] + delta_t_heat[bundle_idx]
-
-                                # Коэффициент скорости воды
-                                if C[bundle_idx] > 0 and d_in > 0:
-                                    B[bundle_idx] = 1.1 * C[bundle_idx] / (params['d_in']) ** 0.25  # Используем диаметр в мм
-                                    X[bundle_idx] = 0.12 * (1.0 + 0.15 * avg_water_temps[bundle_idx])
-                                    Phi_c[bundle_idx] = B[bundle_idx] ** X[bundle_idx]
-                                else:
-                                    B[bundle_idx], X[bundle_idx], Phi_c[bundle_idx] = 0, 0, 1.0
-
-                                # Коэффициент температуры воды
-                                if avg_water_temps[bundle_idx] < 35.0:
-                                    Phi_t[bundle_idx] = 1.0 - 0.00042 * (35.0 - avg_water_temps[bundle_idx]) ** 2
-                                else:
-                                    Phi_t[bundle_idx] = 1.0 + 0.002 * (avg_water_temps[bundle_idx] - 35.0)
-
-                                # Коэффициент числа ходов
-                                if avg_water_temps[bundle_idx] < 35.0:
-                                    Phi_z[bundle_idx] = 1.0 + (Z[bundle_idx] - 2.0) / 10.0 * (1.0 - avg_water_temps[bundle_idx] / 35.0)
-                                else:
-                                    Phi_z[bundle_idx] = 1.0 + (Z[bundle_idx] - 2.0) / 10.0 * (1.0 - avg_water_temps[bundle_idx] / 45.0)
-
-                                # Приведенный расход пара
-                                g_k_priv[bundle_idx] = (0.9 - 0.012 * avg_water_temps[bundle_idx]) * g_k_nom
-
-                                # Базовый коэффициент теплопередачи
-                                K_base[bundle_idx] = 3500.0 * Phi_c[bundle_idx] * Phi_t[bundle_idx] * Phi_z[bundle_idx]
-
-                            for bundle_idx in range(1, 3):
-                                # Универсальная проверка активности
-                                if bundle_idx == 1 and not is_op_active:
-                                    continue
-                                if bundle_idx == 2 and not is_vp_active:
-                                    continue
-
-                                # Считаем удельную нагрузку на основе АКТИВНОЙ площади.
-                                g_k = current_steam_flow * 1000.0 / current_F_total if current_F_total != 0 else 0.0
-
-                                load_ratio = g_k / g_k_priv[bundle_idx] if g_k_priv[bundle_idx] != 0 else float('inf')
-
-                                # Коэффициент удельной паровой нагрузки
-                                Phi_g[bundle_idx] = load_ratio * (2.0 - load_ratio) if load_ratio < 1.0 else 1.0
-
-                                # Коэффициент теплопередачи с учетом паровой нагрузки
-                                K_load[bundle_idx] = K_base[bundle_idx] * Phi_g[bundle_idx]
-
-                                # Учет термического сопротивления стенки
-                                k_inv = 1.0 / K_load[bundle_idx] if K_load[bundle_idx] != 0 else float('inf')
-                                wall_resistance_term = (S_tube / lam - 0.001 / 90.0) if lam != 0 else float('inf')
-                                new_k_inv = k_inv + wall_resistance_term
-
-                                # Коэффициент теплопередачи с учетом материала стенки (чистый)
-                                K_clean[bundle_idx] = 1.0 / new_k_inv if not math.isinf(new_k_inv) else 0.0
-
-                                # Расчет нагрева воды
-                                D = g_k * F[bundle_idx]
-
-                                delta_t_heat[bundle_idx] = D * H_steam / (W_matrix[i][bundle_idx] * 1000.0) if W_matrix[i][bundle_idx] > 0 else 0.0
-
-                        # Итерационный решатель для двухпучковых конденсаторов
-                        if use_two_bundles:
-                            temp_diff_check, temp_diff_step = 0.0, 0.1
-                            for _ in range(3000):  # Итерационный цикл
-                                for bundle_idx in range(1, 3):
-                                    k_inv = 1.0 / K_clean[bundle_idx] if K_clean[bundle_idx] != 0 else float('inf')
-                                    K_dirty[bundle_idx] = 1.0 / (k_inv + current_fouling_resistance)
-
-                                    exp_arg = (K_dirty[bundle_idx] / W_matrix[i][bundle_idx] * F[bundle_idx] / 1000.0) if \
-                                    W_matrix[i][bundle_idx] > 0 else float('inf')
-                                    try:
-                                        exp_val = math.exp(exp_arg)
-                                    except OverflowError:
-                                        exp_val = float('inf')
-
-                                    delta_t[bundle_idx] = delta_t_heat[bundle_idx] / (exp_val - 1.0) if (exp_val - 1.0) != 0 else 0.0
-                                    t_sat[bundle_idx] = t_matrix[j][bundle_idx] + delta_t_heat[bundle_idx] + delta_t[bundle_idx]
-
-                                temp_diff = t_sat[1] - t_sat[2]
-                                if temp_diff_check * temp_diff < 0:
-                                    temp_diff_step /= 5.0
-                                temp_diff_check = temp_diff
-                                if abs(temp_diff) <= 0.000001:
-                                    break
-
-                                step_direction = -temp_diff_step if temp_diff > 0 else temp_diff_step
-                                delta_t_heat[1] += step_direction
-                                if W_matrix[i][2] > 0:
-                                    delta_t_heat[2] = (current_steam_flow * H_steam - delta_t_heat[1] * W_matrix[i][1]) / W_matrix[i][2]
-                                else:
-                                    break
-
-                            t_sat_final = t_sat[1]
-
-                        else:  # Расчет для однопучкового конденсатора
-                            # Определяем индекс активного пучка
-                            active_idx = 1 if is_op_active else 2
-                            k_inv = 1.0 / K_clean[active_idx] if K_clean[active_idx] != 0 else float('inf')
-                            K_dirty[active_idx] = 1.0 / (k_inv + current_fouling_resistance)
-
-                            exp_arg = (K_dirty[active_idx] / W_matrix[i][active_idx] * F[active_idx] / 1000.0)
-                            try:
-                                exp_val = math.exp(exp_arg)
-                            except OverflowError:
-                                exp_val = float('inf')
-
-                            if exp_val > 1.00001:
-                                delta_t[active_idx] = delta_t_heat[active_idx] / (exp_val - 1.0)
-                            else:
-                                delta_t[active_idx] = 0.0
-                            t_sat_final = t_matrix[j][active_idx] + delta_t_heat[active_idx] + delta_t[active_idx]
-
-                        # Расчет давления насыщения по финальной температуре
-                        saturation_temp_K = t_sat_final + 273.15
-                        try:
-                            pressure_exponent = 82.86568 + 1.028003 / 100.0 * saturation_temp_K - 7821.541 / saturation_temp_K - 11.48776 * math.log(saturation_temp_K)
-                            P_steam_formula_atm = math.exp(pressure_exponent) / 0.0980665
-                            P_steam_formula_Pa = P_steam_formula_atm * 98.0665
-
-                            P_steam_seuif_Pa = tx(t_sat_final,1.0,0) * 1000
-                            P_steam_seuif_atm = P_steam_seuif_Pa / 98.0665
-                        except (ValueError, ZeroDivisionError):
-                            _condenser_pressure_Pa = 0.0
-
-                        # Температура на выходе
-                        t2_main = t_matrix[j][1] + delta_t_heat[1]
-
-                        # Для встроенного пучка считаем, только если он используется
-                        t2_builtin = 0.0
-                        if is_vp_active:
-                            t2_builtin = t_matrix[j][2] + delta_t_heat[2]
-
-                        main_results.append({
-                            "F_main": F[1],
-                            "F_builtin": F[2],
-                            "g_k_nom": g_k_nom,
-                            "C_main": C[1],
-                            "C_builtin": C[2],
-                            "B_main": B[1],
-                            "B_builtin": B[2],
-                            "X_main": X[1],
-                            "X_builtin": X[2],
-                            "Phi_c_main": Phi_c[1],
-                            "Phi_c_builtin": Phi_c[2],
-                            "Phi_z_main": Phi_z[1],
-                            "Phi_z_builtin": Phi_z[2],
-                            "Phi_t_main": Phi_t[1],
-                            "Phi_t_builtin": Phi_t[2],
-                            "g_k_priv_main": g_k_priv[1],
-                            "g_k_priv_builtin": g_k_priv[2],
-                            "g_k": g_k,
-                            "Phi_g_main": Phi_g[1],
-                            "Phi_g_builtin": Phi_g[2],
-                            "K_base_main": K_base[1],
-                            "K_base_builtin": K_base[2],
-                            "K_load_main": K_load[1],
-                            "K_load_builtin": K_load[2],
-                            "K_clean_main": K_clean[1],
-                            "K_clean_builtin": K_clean[2],
-                            "K_dirty_main": K_dirty[1],
-                            "K_dirty_builtin": K_dirty[2],
-                            "D": D,
-                            "delta_t_heat_main": delta_t_heat[1],
-                            "delta_t_heat_builtin": delta_t_heat[2],
-                            "delta_t_main": delta_t[1],
-                            "delta_t_builtin": delta_t[2],
-                            "t_sat": t_sat_final,
-                            "t2_main": t2_main,
-                            "t2_builtin": t2_builtin,
-                            "P_steam_seuif_Pa": P_steam_seuif_Pa,
-                            "P_steam_seuif_atm": P_steam_seuif_atm,
-                            "P_steam_formula_Pa": P_steam_formula_Pa,
-                            "P_steam_formula_atm": P_steam_formula_atm
-                        })
-
-        # --- 4. Расчет эжекторов ---
-        ejector_results = []
-        if G_air > 0:
-            for num_ejectors in range(1, 3):
-                for temp_idx in range(1, max_temp_idx + 1):
-                    list_idx = max_temp_idx - temp_idx + 1
-                    inlet_temp_C = t_matrix[list_idx][1]
-                    if inlet_temp_C == 0:
-                        inlet_temp_C = t_matrix[list_idx][2]
-                    if inlet_temp_C == 0:
-                        continue
-                    water_temp_K = inlet_temp_C + 273.15 + 1.0
-                    scaled_temp = water_temp_K / 1000.0
-                    try:
-                        ejector_pressure_exponent = -7.821541 / scaled_temp + 82.86586 + 10.28 * scaled_temp - 11.48776 * math.log(
-                            water_temp_K)
-                        ejector_pressure_Pa = math.exp(ejector_pressure_exponent)
-                        P_ejector_kPa = (0.009 + 0.0003 * G_air / num_ejectors + ejector_pressure_Pa * 10) * 100
-                        P_ejector_atm = P_ejector_kPa / 98.0665
-
-                        ejector_results.append({
-                            "number_of_ejectors": num_ejectors,
-                            "P_ejector_kPa": P_ejector_kPa,
-                            "P_ejector_atm": P_ejector_atm
-                        })
-                    except (ValueError, ZeroDivisionError):
-                        pass
-
-        return {'main_results': main_results, 'ejector_results': ejector_results}
+        empty = (math.nan,) * len(MAIN_RESULT_FIELDS)
+        table = np.array([row if row is not None else empty for row in rows], dtype=float)
+        table = table.reshape(len(rows), len(MAIN_RESULT_FIELDS))
+        return {name: table[:, i] for i, name in enumerate(MAIN_RESULT_FIELDS)}
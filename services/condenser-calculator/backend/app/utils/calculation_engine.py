@@ -1,49 +1,44 @@
+import functools
 import math
 
-import numpy as np
-import seuif97
-from scipy.interpolate import RegularGridInterpolator
-
+from . import tables
+from .saturation import saturation_pressure
 from .uniconv import UnitConverter
 
 
 coefficient_B_const = 1.0
 
-k_interpolation_data = {
-    "temperature_points": [5, 15, 27, 38, 50, 70, 95, 120, 150],  # Средняя температура tср [°C]
-    "speed_points": [0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 1.9, 2.0, 2.1, 2.2, 2.4, 2.6, 2.8, 3.0, 3.2, 3.4, 3.6], # Скорость воды Cов [м/с]
-    "k_values_matrix": [
-        [800, 1050, 1260, 1430, 1540, 1670, 1770, 1870, 1930],
-        [1260, 1510, 1720, 1890, 2000, 2170, 2270, 2370, 2430],
-        [1670, 1920, 2130, 2300, 2430, 2600, 2700, 2800, 2860],
-        [1970, 2220, 2450, 2620, 2750, 2950, 3060, 3160, 3230],
-        [2200, 2450, 2680, 2850, 2990, 3190, 3290, 3390, 3490],
-        [2410, 2680, 2900, 3080, 3210, 3400, 3520, 3620, 3700],
-        [2590, 2840, 3070, 3230, 3380, 3570, 3690, 3790, 3880],
-        [2760, 3010, 3230, 3420, 3550, 3730, 3850, 3960, 4040],
-        [2830, 3080, 3300, 3490, 3630, 3810, 3930, 4040, 4120],
-        [2900, 3150, 3370, 3570, 3700, 3870, 4000, 4110, 4190],
-        [2980, 3230, 3440, 3640, 3770, 3950, 4070, 4180, 4250],
-        [3040, 3290, 3500, 3690, 3830, 4000, 4120, 4220, 4310],
-        [3150, 3400, 3620, 3810, 3940, 4120, 4230, 4350, 4420],
-        [3250, 3500, 3710, 3910, 4040, 4220, 4330, 4440, 4540],
-        [3340, 3590, 3800, 3990, 4130, 4320, 4420, 4530, 4610],
-        [3440, 3690, 3870, 4050, 4180, 4390, 4500, 4600, 4670],
-        [3500, 3750, 3930, 4100, 4230, 4460, 4560, 4660, 4730],
-        [3560, 3810, 3990, 4160, 4290, 4520, 4620, 4720, 4790],
-        [3600, 3850, 4040, 4200, 4340, 4560, 4660, 4760, 4840]
-    ]
+
+# Таблица K читается из хранилища `tables` при первом обращении к атрибуту модуля
+_LAZY_TABLES = {
+    "k_interpolation_data": tables.k_interpolation_data,
 }
 
-def calculate_pressure(params):
-    get_k_from_table_temp = RegularGridInterpolator(
-        (k_interpolation_data["speed_points"], k_interpolation_data["temperature_points"]),
-        np.array(k_interpolation_data["k_values_matrix"]),
+
+def __getattr__(name: str):
+    if name in _LAZY_TABLES:
+        value = _LAZY_TABLES[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.cache
+def _k_interpolator():
+    from scipy.interpolate import RegularGridInterpolator
+
+    return RegularGridInterpolator(
+        (tables.get_table("k_speed_points"), tables.get_table("k_temperature_points")),
+        tables.get_table("k_values"),
         method="linear",
         bounds_error=False,
         fill_value=None
     )
 
+
+def calculate_pressure(params):
+    get_k_from_table_temp = _k_interpolator()
+
     def get_heat_of_vaporization(temperature: float) -> float:
         return (30 - temperature) * 0.582 + 580.4
 
@@ -99,7 +94,7 @@ def calculate_pressure(params):
     T_sat = T_cw2 + delta_T_rel * (T_cw2 - T_cw1)
 
     _T_K = uc.convert(T_sat, from_unit="°C", to_unit="K", parameter_type="temperature")
-    p_MPa = seuif97.tx2p(T_sat, 1)
+    p_MPa = saturation_pressure(T_sat)
     p_kgf = uc.convert(p_MPa, from_unit="МПа", to_unit="кгс/см²", parameter_type="pressure")
 
     res_str = f"| {m_cw:<8.1f} | {T_cw1:<8.1f} | {T_cw2:<8.2f} | {T_sat:<8.2f} | {m_flow:<7.1f} | {p_kgf:<11.4f} |"
@@ -114,17 +109,11 @@ def calculate_pressure(params):
 
 
 def batch_calculate(params_template, varying_params: dict):
-    from itertools import product
-
-    keys = list(varying_params.keys())
-    values = list(varying_params.values())
-
-    results = []
-    for combo in product(*values):
-        params = params_template.copy()
-        params.update(dict(zip(keys, combo, strict=True)))
-        res = calculate_pressure(params)
-        res.update(dict(zip(keys, combo, strict=True)))
-        results.append(res)
-
-    return results
+    """
+    Расчёт по декартову произведению `varying_params` (порядок как у itertools.product).
+    Выполняется через CondenserEngine (методика "metro_vickers_engine").
+    """
+    from .condenser_engine import CondenserEngine
+
+    result = CondenserEngine().run("metro_vickers_engine", params_template, grid=varying_params)
+    return result.to_records()
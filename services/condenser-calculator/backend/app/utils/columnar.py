@@ -0,0 +1,116 @@
+"""
+Колоночный результат расчёта: координаты измерений и выходные величины
+как одномерные массивы NumPy одной длины (одна строка — одна расчётная точка).
+
+В отличие от списка словарей на точку, такой результат занимает память
+порядка 8 байт на значение и экспортируется целиком: в Arrow/Parquet без
+копирования данных (массивы передаются в pyarrow как есть) и в JSON Lines
+потоково, частями.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+import orjson
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Для экспорта в Arrow/Parquet требуется пакет pyarrow.") from e
+    return pa
+
+
+@dataclass
+class ColumnarResult:
+    """
+    Результат в колоночном виде.
+
+    coords  — координаты точки по измерениям `dims` (значения входных осей);
+    columns — выходные величины методики.
+    """
+    dims: tuple[str, ...]
+    coords: dict[str, np.ndarray]
+    columns: dict[str, np.ndarray]
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        lengths = {len(values) for values in (*self.coords.values(), *self.columns.values())}
+        if len(lengths) > 1:
+            raise ValueError(f"Колонки результата разной длины: {sorted(lengths)}")
+        overlap = set(self.coords) & set(self.columns)
+        if overlap:
+            raise ValueError(f"Имена {sorted(overlap)} заданы и как координаты, и как колонки")
+
+    @classmethod
+    def from_rows(cls, dims: tuple[str, ...], coord_rows: list[tuple], names: tuple[str, ...],
+                  rows: list[tuple], attrs: Mapping[str, Any] | None = None) -> ColumnarResult:
+        """Собрать результат из кортежей значений (порядок — как в `dims` и `names`)."""
+        def to_columns(keys: tuple[str, ...], data: list[tuple]) -> dict[str, np.ndarray]:
+            matrix = np.array(data, dtype=float).reshape(len(data), len(keys))
+            return {key: np.ascontiguousarray(matrix[:, i]) for i, key in enumerate(keys)}
+
+        return cls(dims=dims, coords=to_columns(dims, coord_rows), columns=to_columns(names, rows),
+                   attrs=dict(attrs or {}))
+
+    def __len__(self) -> int:
+        for values in (*self.coords.values(), *self.columns.values()):
+            return len(values)
+        return 0
+
+    @property
+    def names(self) -> list[str]:
+        """Все имена: сначала координаты, затем выходные величины."""
+        return [*self.coords, *self.columns]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self.columns:
+            return self.columns[name]
+        return self.coords[name]
+
+    # ------------------------- ЭКСПОРТ ---------------------------
+    def to_records(self) -> list[dict[str, float]]:
+        """Построчное представление (только выходные величины, как у `main_results`)."""
+        names = list(self.columns)
+        data = [self.columns[name].tolist() for name in names]
+        return [dict(zip(names, row, strict=True)) for row in zip(*data, strict=True)]
+
+    def to_arrow(self):
+        """Таблица pyarrow; числовые колонки передаются без копирования."""
+        pa = _require_pyarrow()
+        table = pa.table({name: self[name] for name in self.names})
+        metadata = {"dims": json.dumps(self.dims), **{k: json.dumps(v) for k, v in self.attrs.items()}}
+        return table.replace_schema_metadata(metadata)
+
+    def to_parquet(self, path: str | Path, **kwargs) -> None:
+        """Запись в Parquet (параметры `kwargs` передаются в `pyarrow.parquet.write_table`)."""
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path, **kwargs)
+
+    def iter_jsonl(self, chunk_size: int = 10_000) -> Iterator[str]:
+        """
+        Строки JSON Lines (с переводом строки), формируются частями по `chunk_size`.
+        NaN и ±inf в JSON недопустимы — orjson записывает их как null.
+        """
+        names = self.names
+        for start in range(0, len(self), chunk_size):
+            data = [self[name][start:start + chunk_size].tolist() for name in names]
+            for row in zip(*data, strict=True):
+                yield orjson.dumps(dict(zip(names, row, strict=True))).decode() + "\n"
+
+    def to_jsonl(self, target: str | Path | IO[str], chunk_size: int = 10_000) -> None:
+        """Запись в JSON Lines: путь к файлу или открытый текстовый поток."""
+        if isinstance(target, (str, Path)):
+            with open(target, "w", encoding="utf-8") as f:
+                f.writelines(self.iter_jsonl(chunk_size))
+        else:
+            target.writelines(self.iter_jsonl(chunk_size))
@@ -0,0 +1,576 @@
+"""
+Единый движок расчёта конденсатора.
+
+Собирает все методики (Берман, Метро-Виккерс, ВКУ, табличный метод, исключения,
+`calculation_engine.calculate_pressure`) за одной точкой входа:
+
+    engine = CondenserEngine()
+    result = engine.run("vku", VKUInputs(...), grid={"temperature_air": range(-30, 41)})
+
+Каждая методика описывается адаптером `StrategyAdapter` в реестре движка:
+типизированная модель входных данных (dataclass), фабрика экземпляра стратегии,
+поточечный расчёт и (если методика это поддерживает) векторный расчёт по массивам.
+
+Сетка `grid` задаёт варьируемые поля входной модели. По умолчанию строится
+декартово произведение значений (порядок как у `itertools.product`), при
+`product=False` массивы берутся поэлементно (одинаковой длины).
+
+Режимы исполнения:
+- ``"scalar"`` — поточечный вызов стратегии;
+- ``"vectorized"`` — один вызов по массивам; методики без векторного расчёта
+  (`metro_vickers_engine`, `exceptions`) считаются поточечно, и в результате
+  указывается фактический режим ``"scalar"``;
+- ``"pooled"`` — сетка делится на части и считается в пуле процессов.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import MISSING, asdict, dataclass, field, fields, replace
+from typing import Any, Literal
+
+import numpy as np
+
+from .berman_strategy import BermanStrategy
+from .calculation_engine import calculate_pressure
+from .exceptions_method import CondenserExceptions
+from .metrovickers_strategy import MetroVickersStrategy
+from .TPS_module import TablePressureStrategy
+from .VKU_strategy import VKUStrategy
+
+
+ExecutionMode = Literal["scalar", "vectorized", "pooled"]
+Columns = dict[str, np.ndarray]
+
+
+class UnknownStrategyError(ValueError):
+    pass
+
+
+# =============================================================================
+# ТИПИЗИРОВАННЫЕ ВХОДНЫЕ ДАННЫЕ
+# =============================================================================
+
+
+class _InputsModel:
+    """
+    Общая часть моделей входных данных.
+
+    Имя ключа в словаре параметров стратегии совпадает с именем поля,
+    если в метаданных поля не указан `key` (например, `lambda_` → 'lambda').
+    """
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, Any]):
+        """Строит модель из плоского словаря параметров (лишние ключи игнорируются)."""
+        values = {}
+        for f in fields(cls):
+            key = f.metadata.get("key", f.name)
+            if key in params:
+                values[f.name] = params[key]
+            elif f.default is MISSING and f.default_factory is MISSING:
+                raise KeyError(f"Отсутствует обязательный параметр: '{key}'")
+        return cls(**values)
+
+    def to_params(self) -> dict[str, Any]:
+        """Плоский словарь параметров с ключами стратегии (поля со значением None опускаются)."""
+        return {
+            f.metadata.get("key", f.name): getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+
+@dataclass(frozen=True)
+class BermanInputs(_InputsModel):
+    """Одна точка расчёта по методике Бермана (размеры — в мм, как в BermanStrategy)."""
+    L_main: float
+    N_main: int
+    Z_main: int
+    d_in: float
+    S_tube: float
+    H_steam: float
+    G_nom: float
+    W_main: float
+    t1_main: float
+    G_steam: float
+    lambda_: float = field(default=90.0, metadata={"key": "lambda"})
+    L_builtin: float = 0.0
+    N_builtin: int = 0
+    Z_builtin: int = 0
+    W_builtin: float = 0.0
+    t1_builtin: float = 0.0
+    coefficient_b: float = 1.0
+    G_air: float = 0.0
+
+    def to_strategy_params(self) -> dict[str, Any]:
+        """Словарь в формате BermanStrategy.calculate (списки из одного значения)."""
+        return {
+            "L_main": self.L_main,
+            "L_builtin": self.L_builtin,
+            "N_main": self.N_main,
+            "N_builtin": self.N_builtin,
+            "Z_main": self.Z_main,
+            "Z_builtin": self.Z_builtin,
+            "d_in": self.d_in,
+            "S_tube": self.S_tube,
+            "H_steam": self.H_steam,
+            "G_nom": self.G_nom,
+            "lambda": self.lambda_,
+            "W_main_list": [self.W_main],
+            "W_builtin_list": [self.W_builtin],
+            "t1_main_list": [self.t1_main],
+            "t1_builtin_list": [self.t1_builtin],
+            "G_steam_list": [self.G_steam],
+            "coefficient_b_list": [self.coefficient_b],
+            "G_air": self.G_air,
+        }
+
+
+@dataclass(frozen=True)
+class MetroVickersInputs(_InputsModel):
+    """Входные данные методики Метро-Виккерс (и `calculation_engine.calculate_pressure`)."""
+    diameter_inside_of_pipes: float
+    thickness_pipe_wall: float
+    length_cooling_tubes_of_the_main_bundle: float
+    number_cooling_tubes_of_the_main_bundle: int
+    number_cooling_tubes_of_the_built_in_bundle: int
+    number_cooling_water_passes_of_the_main_bundle: int
+    mass_flow_cooling_water: float
+    temperature_cooling_water_1: float
+    thermal_conductivity_cooling_surface_tube_material: float
+    mass_flow_flow_path_1: float
+    degree_dryness_flow_path_1: float
+    coefficient_b: float = 1.0
+    number_air_cooler_total_pipes: float | None = None
+
+    def to_strategy_params(self) -> dict[str, Any]:
+        return self.to_params()
+
+
+@dataclass(frozen=True)
+class VKUInputs(_InputsModel):
+    """Входные данные ВКУ: номинальные параметры и текущий режим."""
+    mass_flow_steam_nom: float
+    degree_dryness_steam_nom: float
+    mass_flow_flow_path_1: float
+    degree_dryness_flow_path_1: float
+    temperature_air: float = VKUStrategy._TVOZD_CONST_DEFAULT
+
+    def to_strategy_params(self) -> dict[str, Any]:
+        return {
+            "mass_flow_flow_path_1": self.mass_flow_flow_path_1,
+            "degree_dryness_flow_path_1": self.degree_dryness_flow_path_1,
+            "temperature_air": self.temperature_air,
+        }
+
+
+@dataclass(frozen=True)
+class TablePressureInputs(_InputsModel):
+    """Входные данные табличного метода: таблицы NAMET/NAMED и точка расчёта."""
+    namet: list = field(metadata={"key": "NAMET"})
+    named: list = field(metadata={"key": "NAMED"})
+    temperature_cooling_water_1: float
+    mass_flow_flow_path_1: float
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, Any]):
+        """Принимает как плоский словарь, так и формат TablePressureStrategy.calculate."""
+        inputs = params.get("inputs", params)
+        namet, named = params["NAMET"], params["NAMED"]
+        return cls(
+            namet=namet["data"] if isinstance(namet, Mapping) else namet,
+            named=named["data"] if isinstance(named, Mapping) else named,
+            temperature_cooling_water_1=inputs["temperature_cooling_water_1"],
+            mass_flow_flow_path_1=inputs["mass_flow_flow_path_1"],
+        )
+
+    def to_strategy_params(self) -> dict[str, Any]:
+        return {
+            "NAMET": {"data": self.namet},
+            "NAMED": {"data": self.named},
+            "inputs": {
+                "temperature_cooling_water_1": self.temperature_cooling_water_1,
+                "mass_flow_flow_path_1": self.mass_flow_flow_path_1,
+            },
+        }
+
+
+@dataclass(frozen=True)
+class ExceptionsInputs(_InputsModel):
+    """Входные данные исключительных случаев (заданное давление / PIF)."""
+    pressure_condenser: float | None = None
+    temperature_cooling_water_1: float | None = None
+    pif: float | None = None
+
+    def to_strategy_params(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+# =============================================================================
+# АДАПТЕРЫ СТРАТЕГИЙ
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class StrategyAdapter:
+    """
+    Описание методики для движка.
+
+    - `factory(inputs)` создаёт экземпляр стратегии (кешируется по `cache_key(inputs)`);
+    - `calculate(strategy, inputs)` считает одну точку и возвращает плоский словарь чисел;
+    - `calculate_many(strategy, inputs, columns)` (опционально) считает массивы за один вызов.
+    """
+    name: str
+    inputs_model: type
+    factory: Callable[[Any], Any]
+    calculate: Callable[[Any, Any], dict[str, float]]
+    calculate_many: Callable[[Any, Any, Columns], Columns] | None = None
+    cache_key: Callable[[Any], Any] = lambda inputs: None
+
+
+def _berman_point(strategy: BermanStrategy, inputs: BermanInputs) -> dict[str, float]:
+    main_results = strategy.calculate(inputs.to_strategy_params())["main_results"]
+    return main_results[0] if main_results else {}
+
+
+def _berman_many(strategy: BermanStrategy, inputs: BermanInputs, columns: Columns) -> Columns:
+    return strategy.calculate_many({f.metadata.get("key", f.name): columns[f.name] for f in fields(inputs)})
+
+
+def _metro_vickers_many(strategy: MetroVickersStrategy, inputs: MetroVickersInputs,
+                        columns: Columns) -> Columns:
+    return strategy.calculate_many(columns)
+
+
+def _vku_many(strategy: VKUStrategy, inputs: VKUInputs, columns: Columns) -> Columns:
+    return strategy.calculate_many(
+        columns["mass_flow_flow_path_1"],
+        columns["degree_dryness_flow_path_1"],
+        columns["temperature_air"],
+    )
+
+
+def _table_pressure_many(strategy: TablePressureStrategy, inputs: TablePressureInputs,
+                         columns: Columns) -> Columns:
+    return strategy.calculate_many(
+        inputs.namet, inputs.named,
+        columns["temperature_cooling_water_1"], columns["mass_flow_flow_path_1"],
+    )
+
+
+def _exceptions_point(_strategy: None, inputs: ExceptionsInputs) -> dict[str, float]:
+    pressure = CondenserExceptions(**inputs.to_strategy_params()).calculate_pressure()
+    return {"pressure_flow_path_1": pressure}
+
+
+DEFAULT_ADAPTERS: tuple[StrategyAdapter, ...] = (
+    StrategyAdapter(
+        name="berman",
+        inputs_model=BermanInputs,
+        factory=lambda inputs: BermanStrategy(),
+        calculate=_berman_point,
+        calculate_many=_berman_many,
+    ),
+    StrategyAdapter(
+        name="metro_vickers",
+        inputs_model=MetroVickersInputs,
+        factory=lambda inputs: MetroVickersStrategy(),
+        calculate=lambda strategy, inputs: strategy.calculate(inputs.to_strategy_params()),
+        calculate_many=_metro_vickers_many,
+    ),
+    StrategyAdapter(
+        name="metro_vickers_engine",
+        inputs_model=MetroVickersInputs,
+        factory=lambda inputs: None,
+        calculate=lambda _strategy, inputs: calculate_pressure(inputs.to_strategy_params()),
+    ),
+    StrategyAdapter(
+        name="vku",
+        inputs_model=VKUInputs,
+        factory=lambda inputs: VKUStrategy(inputs.mass_flow_steam_nom, inputs.degree_dryness_steam_nom),
+        calculate=lambda strategy, inputs: strategy.calculate(inputs.to_strategy_params()),
+        calculate_many=_vku_many,
+        cache_key=lambda inputs: (inputs.mass_flow_steam_nom, inputs.degree_dryness_steam_nom),
+    ),
+    StrategyAdapter(
+        name="table_pressure",
+        inputs_model=TablePressureInputs,
+        factory=lambda inputs: TablePressureStrategy(),
+        calculate=lambda strategy, inputs: strategy.calculate(inputs.to_strategy_params()),
+        calculate_many=_table_pressure_many,
+    ),
+    StrategyAdapter(
+        name="exceptions",
+        inputs_model=ExceptionsInputs,
+        factory=lambda inputs: None,
+        calculate=_exceptions_point,
+    ),
+)
+
+
+# =============================================================================
+# РЕЗУЛЬТАТ
+# =============================================================================
+
+
+@dataclass
+class EngineResult:
+    """Колоночный результат: варьируемые поля сетки и выходные величины стратегии."""
+    strategy: str
+    mode: str
+    grid_columns: Columns
+    output_columns: Columns
+
+    @property
+    def size(self) -> int:
+        for column in (*self.grid_columns.values(), *self.output_columns.values()):
+            return len(column)
+        return 0
+
+    @property
+    def columns(self) -> Columns:
+        return {**self.grid_columns, **self.output_columns}
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Построчное представление: выходные величины, затем значения сетки."""
+        names = [*self.output_columns, *self.grid_columns]
+        data = [self.columns[name].tolist() for name in names]
+        return [dict(zip(names, row, strict=True)) for row in zip(*data, strict=True)]
+
+
+# =============================================================================
+# ДВИЖОК
+# =============================================================================
+
+
+class CondenserEngine:
+    """Реестр методик и единая точка входа `run(strategy, inputs, grid)`."""
+
+    def __init__(self, adapters: Sequence[StrategyAdapter] = DEFAULT_ADAPTERS, *,
+                 max_workers: int | None = None,
+                 executor: Executor | None = None) -> None:
+        self.strategies: dict[str, StrategyAdapter] = {}
+        for adapter in adapters:
+            self.register(adapter)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._instances: dict[tuple[str, Any], Any] = {}
+
+    # ------------------------ РЕЕСТР -----------------------------
+    def register(self, adapter: StrategyAdapter) -> None:
+        """
+        Добавить методику в реестр.
+
+        Процессы пула создают движок с `DEFAULT_ADAPTERS`, поэтому режим "pooled"
+        доступен только для методик из реестра по умолчанию.
+        """
+        if adapter.name in self.strategies:
+            raise ValueError(f"Стратегия '{adapter.name}' уже зарегистрирована")
+        self.strategies[adapter.name] = adapter
+
+    def get_adapter(self, name: str) -> StrategyAdapter:
+        if name not in self.strategies:
+            raise UnknownStrategyError(
+                f"Стратегия '{name}' не зарегистрирована. Доступны: {sorted(self.strategies)}")
+        return self.strategies[name]
+
+    def get_strategy(self, name: str, inputs: Any) -> Any:
+        """Экземпляр стратегии (создаётся один раз на ключ `cache_key`)."""
+        adapter = self.get_adapter(name)
+        key = (name, adapter.cache_key(inputs))
+        if key not in self._instances:
+            self._instances[key] = adapter.factory(inputs)
+        return self._instances[key]
+
+    # ------------------------- РАСЧЁТ ----------------------------
+    def run(self, strategy: str, inputs: Any, grid: Mapping[str, Sequence] | None = None, *,
+            mode: ExecutionMode = "vectorized", product: bool = True,
+            chunk_size: int | None = None) -> EngineResult:
+        """
+        Расчёт методики `strategy` по сетке `grid`.
+
+        :param strategy: Имя методики в реестре.
+        :param inputs: Модель входных данных или плоский словарь параметров.
+        :param grid: Варьируемые поля модели → значения. Без сетки считается одна точка.
+        :param mode: "scalar", "vectorized" или "pooled".
+        :param product: True — декартово произведение значений, False — поэлементно.
+        :param chunk_size: Размер части сетки для режима "pooled".
+        """
+        adapter = self.get_adapter(strategy)
+        if not isinstance(inputs, adapter.inputs_model):
+            inputs = adapter.inputs_model.from_params(inputs)
+
+        grid_columns = self.expand_grid(strategy, grid, product=product)
+        size = grid_size(grid_columns)
+
+        if mode == "pooled" and size > 1:
+            output_columns = self._run_pooled(strategy, inputs, grid_columns, size, chunk_size)
+        elif mode in ("scalar", "vectorized", "pooled"):
+            output_columns = self.evaluate(strategy, inputs, grid_columns, size,
+                                           vectorized=mode != "scalar")
+            # Без векторного расчёта методика посчитана поточечно — так и сообщаем
+            mode = "vectorized" if mode != "scalar" and adapter.calculate_many is not None else "scalar"
+        else:
+            raise ValueError(f"Неизвестный режим исполнения: '{mode}'")
+
+        return EngineResult(strategy=strategy, mode=mode,
+                            grid_columns=grid_columns, output_columns=output_columns)
+
+    def compare(self, inputs_by_strategy: Mapping[str, Any],
+                grid: Mapping[str, Sequence] | None = None, **kwargs) -> dict[str, EngineResult]:
+        """Расчёт нескольких методик по одной сетке (для сравнения методик)."""
+        return {name: self.run(name, inputs, grid, **kwargs)
+                for name, inputs in inputs_by_strategy.items()}
+
+    def evaluate(self, strategy: str, inputs: Any, grid_columns: Columns, size: int, *,
+                 vectorized: bool = True) -> Columns:
+        """Расчёт уже развёрнутой сетки в текущем процессе."""
+        adapter = self.get_adapter(strategy)
+        instance = self.get_strategy(strategy, inputs)
+
+        if vectorized and adapter.calculate_many is not None:
+            columns = {
+                f.name: np.asarray(grid_columns[f.name]) if f.name in grid_columns
+                else np.full(size, getattr(inputs, f.name), dtype=float)
+                for f in fields(inputs)
+                if f.name in grid_columns or _is_number(getattr(inputs, f.name))
+            }
+            outputs = adapter.calculate_many(instance, inputs, columns)
+            return {name: np.asarray(values, dtype=float) for name, values in outputs.items()}
+
+        rows = []
+        for i in range(size):
+            point = inputs
+            if grid_columns:
+                point = replace(inputs, **{name: col[i].item() for name, col in grid_columns.items()})
+            rows.append(adapter.calculate(instance, point))
+        return _rows_to_columns(rows)
+
+    # ------------------------- ПУЛ -------------------------------
+    def _run_pooled(self, strategy: str, inputs: Any, grid_columns: Columns, size: int,
+                    chunk_size: int | None) -> Columns:
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(size / (self.max_workers * 4)))
+        bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+        executor = self._get_executor()
+        futures = [
+            executor.submit(evaluate_chunk, strategy, inputs,
+                            {name: col[start:stop] for name, col in grid_columns.items()},
+                            stop - start)
+            for start, stop in bounds
+        ]
+        parts = [future.result() for future in futures]
+        names = list(parts[0]) if parts else []
+        return {name: np.concatenate([part[name] for part in parts]) for name in names}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=warm_up_worker)
+        return self._executor
+
+    def close(self) -> None:
+        """Останавливает собственный пул процессов (внешний пул не трогается)."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> CondenserEngine:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------- СЕТКА -----------------------------
+    def _check_grid(self, strategy: str, grid: Mapping[str, Sequence]) -> None:
+        adapter = self.get_adapter(strategy)
+        known = {f.name for f in fields(adapter.inputs_model)}
+        unknown = set(grid) - known
+        if unknown:
+            raise KeyError(f"Поля {sorted(unknown)} отсутствуют во входных данных '{adapter.name}'")
+
+    def grid_points(self, strategy: str, grid: Mapping[str, Sequence] | None, *,
+                    product: bool = True) -> int:
+        """
+        Число точек сетки по длинам осей, без её развёртывания — для проверки
+        лимитов до выделения памяти под `expand_grid`.
+        """
+        grid = grid or {}
+        self._check_grid(strategy, grid)
+        sizes = [len(values) for values in grid.values()]
+        if not product and len(set(sizes)) > 1:
+            raise ValueError("При product=False все массивы сетки должны быть одной длины")
+        if not sizes:
+            return 1
+        return math.prod(sizes) if product else sizes[0]
+
+    def expand_grid(self, strategy: str, grid: Mapping[str, Sequence] | None, *,
+                    product: bool = True) -> Columns:
+        """Развернуть сетку в колонки одинаковой длины (порядок — как в `run`)."""
+        grid = grid or {}
+        self._check_grid(strategy, grid)
+        if not grid:
+            return {}
+
+        axes = [np.asarray(values) for values in grid.values()]
+        if product:
+            mesh = np.meshgrid(*axes, indexing="ij")
+            return {name: m.ravel() for name, m in zip(grid, mesh, strict=True)}
+
+        if len({a.size for a in axes}) != 1:
+            raise ValueError("При product=False все массивы сетки должны быть одной длины")
+        return {name: a.ravel() for name, a in zip(grid, axes, strict=True)}
+
+
+# =============================================================================
+# ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
+# =============================================================================
+
+# Движок процесса-исполнителя: создаётся один раз, интерполяторы стратегий
+# остаются прогретыми между частями сетки.
+_WORKER_ENGINE: CondenserEngine | None = None
+
+# Методики, экземпляры которых не зависят от входных данных и могут быть
+# созданы заранее при старте процесса-исполнителя.
+_STATELESS_STRATEGIES = ("berman", "metro_vickers", "table_pressure")
+
+
+def _worker_engine() -> CondenserEngine:
+    global _WORKER_ENGINE
+    if _WORKER_ENGINE is None:
+        _WORKER_ENGINE = CondenserEngine(max_workers=1)
+    return _WORKER_ENGINE
+
+
+def warm_up_worker() -> None:
+    """Инициализатор процесса пула: создать движок и экземпляры методик заранее."""
+    engine = _worker_engine()
+    for name in _STATELESS_STRATEGIES:
+        engine.get_strategy(name, None)
+
+
+def evaluate_chunk(strategy: str, inputs: Any, grid_columns: Columns, size: int) -> Columns:
+    """Расчёт части сетки в процессе-исполнителе движком этого процесса."""
+    return _worker_engine().evaluate(strategy, inputs, grid_columns, size)
+
+
+def grid_size(grid_columns: Columns) -> int:
+    """Число точек развёрнутой сетки (без сетки считается одна точка)."""
+    return len(next(iter(grid_columns.values()))) if grid_columns else 1
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+def _rows_to_columns(rows: list[dict[str, Any]]) -> Columns:
+    names = list(dict.fromkeys(itertools.chain.from_iterable(rows)))
+    return {
+        name: np.array([np.nan if row.get(name) is None else row[name] for row in rows], dtype=float)
+        for name in names
+    }
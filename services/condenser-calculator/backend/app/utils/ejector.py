@@ -0,0 +1,85 @@
+"""
+Давление, создаваемое пароструйными эжекторами конденсатора (блок эжекторов методики Бермана).
+
+Давление зависит только от температур охлаждающей воды на входе, расхода
+отсасываемого воздуха G_air и числа работающих эжекторов, поэтому таблица
+считается одним векторным проходом по всем сочетаниям (число эжекторов ×
+температура) и запоминается: повторные расчёты с теми же входами берут
+готовые массивы.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Sequence
+
+import numpy as np
+
+
+EJECTOR_COUNTS = (1, 2)
+_CACHE_MAXSIZE = 256
+
+
+@functools.lru_cache(maxsize=_CACHE_MAXSIZE)
+def _ejector_table(inlet_temperatures: tuple[float, ...], G_air: float,
+                   number_of_ejectors: tuple[int, ...]) -> tuple[np.ndarray, np.ndarray]:
+    # Температура воды с запасом 1 К, затем эмпирическая формула давления насыщения
+    water_temp_K = np.asarray(inlet_temperatures, dtype=float) + 273.15 + 1.0
+    scaled_temp = water_temp_K / 1000.0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        exponent = -7.821541 / scaled_temp + 82.86586 + 10.28 * scaled_temp - 11.48776 * np.log(water_temp_K)
+        pressure_Pa = np.exp(exponent)
+        counts = np.asarray(number_of_ejectors, dtype=float)[:, np.newaxis]
+        P_ejector_kPa = (0.009 + 0.0003 * G_air / counts + pressure_Pa * 10) * 100
+    P_ejector_atm = P_ejector_kPa / 98.0665
+
+    P_ejector_kPa.flags.writeable = False
+    P_ejector_atm.flags.writeable = False
+    return P_ejector_kPa, P_ejector_atm
+
+
+def ejector_pressure(inlet_temperatures: Sequence[float] | np.ndarray, G_air: float,
+                     number_of_ejectors: Sequence[int] = EJECTOR_COUNTS) -> dict[str, np.ndarray]:
+    """
+    Давление эжекторов для всех сочетаний числа эжекторов и температур воды.
+
+    :param inlet_temperatures: Температуры охлаждающей воды на входе [°C].
+    :param G_air: Расход отсасываемого воздуха [кг/ч].
+    :param number_of_ejectors: Варианты числа работающих эжекторов.
+    :return: 'P_ejector_kPa' и 'P_ejector_atm' — массивы формы
+        (len(number_of_ejectors), len(inlet_temperatures)), только для чтения.
+        Для недопустимых температур (≤ −274.15 °C) значения не конечны.
+    """
+    temps = tuple(float(t) for t in np.ravel(inlet_temperatures))
+    counts = tuple(int(n) for n in number_of_ejectors)
+    if any(n <= 0 for n in counts):
+        raise ValueError("Число эжекторов должно быть положительным.")
+    P_ejector_kPa, P_ejector_atm = _ejector_table(temps, float(G_air), counts)
+    return {"P_ejector_kPa": P_ejector_kPa, "P_ejector_atm": P_ejector_atm}
+
+
+def ejector_records(inlet_temperatures: Sequence[float], G_air: float,
+                    number_of_ejectors: Sequence[int] = EJECTOR_COUNTS) -> list[dict[str, float]]:
+    """
+    Давление эжекторов списком словарей (формат 'ejector_results' методики Бермана):
+    сначала по числу эжекторов, затем по температурам в заданном порядке.
+    Сочетания с неконечным давлением пропускаются.
+    """
+    table = ejector_pressure(inlet_temperatures, G_air, number_of_ejectors)
+    records = []
+    for row, num_ejectors in enumerate(number_of_ejectors):
+        for P_ejector_kPa, P_ejector_atm in zip(table["P_ejector_kPa"][row].tolist(),
+                                                table["P_ejector_atm"][row].tolist(), strict=True):
+            if np.isfinite(P_ejector_kPa):
+                records.append({
+                    "number_of_ejectors": num_ejectors,
+                    "P_ejector_kPa": P_ejector_kPa,
+                    "P_ejector_atm": P_ejector_atm
+                })
+    return records
+
+
+def ejector_cache_info() -> dict[str, int]:
+    """Статистика кеша таблиц эжекторов: попадания, промахи, размер."""
+    info = _ejector_table.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
@@ -1,27 +1,35 @@
+import functools
 import math
 from typing import Any
 
 import numpy as np
-import seuif97
-from scipy.interpolate import RegularGridInterpolator
 
+from . import tables
 from .Constants import (
     coefficient_B_const,
-    k_interpolation_data,
     speed_cooling_water_const,
     temperature_cooling_water_average_heating_const,
 )
+from .saturation import saturation_pressure
 from .uniconv import UnitConverter
 
 
+@functools.cache
+def _k_nearest_interpolator():
+    """Интерполятор таблицы K (ближайший узел); строится один раз на процесс."""
+    from scipy.interpolate import RegularGridInterpolator
+
+    return RegularGridInterpolator(
+        (tables.get_table("k_speed_points"), tables.get_table("k_temperature_points")),
+        tables.get_table("k_values"),
+        bounds_error=False,
+        method="nearest"
+    )
+
+
 class MetroVickersStrategy:
     def __init__(self):
-        self._get_k_from_table_temp = RegularGridInterpolator(
-            (k_interpolation_data["speed_points"], k_interpolation_data["temperature_points"]),
-            np.array(k_interpolation_data["k_values_matrix"]),
-            bounds_error=False,
-            method="nearest"
-        )
+        self._get_k_from_table_temp = _k_nearest_interpolator()
         self._get_heat_of_vaporization = lambda temp: (30 - temp) * 0.582 + 580.4
         self.uc = UnitConverter()
 
@@ -100,17 +108,11 @@ class MetroVickersStrategy:
             # print(f"temperature_cooling_water_average_heating: значение = {temperature_cooling_water_average_heating}, тип = {type(temperature_cooling_water_average_heating)}")
             # ==============================================================
 
-            _get_k_from_table = RegularGridInterpolator(
-                (k_interpolation_data["speed_points"], k_interpolation_data["temperature_points"]),
-                np.array(k_interpolation_data["k_values_matrix"]),
-                bounds_error=False,
-                method="nearest"
-            )
-
             try:
                 query_point = np.array([[speed_cooling_water, temperature_cooling_water_average_heating]])
-                k_temp_new = _get_k_from_table(query_point).item()
+                k_temp_new = self._get_k_from_table_temp(query_point).item()
             except ValueError as e:
+                k_interpolation_data = tables.k_interpolation_data()
                 error_message = (
                     f"Ошибка интерполяции: расчетные параметры вышли за пределы таблицы.\n"
                     f"  - Расчетная скорость воды: {speed_cooling_water:.2f} м/с (допустимый диапазон: {k_interpolation_data['speed_points'][0]} - {k_interpolation_data['speed_points'][-1]})\n"
@@ -145,7 +147,7 @@ class MetroVickersStrategy:
 
         temperature_saturation_steam = temperature_cooling_water_2 + temperature_relative_underheating * (temperature_cooling_water_2 - temperature_cooling_water_1) # p.15
 
-        pressure_flow_path_1_mpa = seuif97.tx(temperature_saturation_steam, 1.0, 0)
+        pressure_flow_path_1_mpa = saturation_pressure(temperature_saturation_steam)
 
         pressure_flow_path_1_kgf_cm2 = self.uc.convert(
             pressure_flow_path_1_mpa,
@@ -173,3 +175,118 @@ class MetroVickersStrategy:
             'pressure_flow_path_1': pressure_flow_path_1_kgf_cm2
         })
         return results
+
+    def calculate_many(self, params: dict[str, Any]) -> dict[str, np.ndarray]:
+        """
+        Расчёт массива режимов за один проход по NumPy-массивам (формулы те же, что в `calculate`).
+
+        Значения `params` — скаляры или массивы; массивы приводятся к общей форме по
+        правилам broadcasting NumPy. Точки вне таблицы K дают NaN.
+
+        Returns:
+            Dict[str, np.ndarray]: Те же ключи, что и у `calculate`, значения — массивы.
+        """
+        def column(name: str, default: float | None = None) -> np.ndarray:
+            value = params.get(name, default)
+            return np.asarray(np.nan if value is None else value, dtype=float)
+
+        names = (
+            'diameter_inside_of_pipes', 'thickness_pipe_wall', 'length_cooling_tubes_of_the_main_bundle',
+            'number_cooling_tubes_of_the_main_bundle', 'number_cooling_tubes_of_the_built_in_bundle',
+            'number_cooling_water_passes_of_the_main_bundle', 'mass_flow_cooling_water',
+            'temperature_cooling_water_1', 'thermal_conductivity_cooling_surface_tube_material',
+            'mass_flow_flow_path_1', 'degree_dryness_flow_path_1',
+        )
+        (diameter_inside_of_pipes, thickness_pipe_wall, length_cooling_tubes_of_the_main_bundle,
+         number_cooling_tubes_of_the_main_bundle, number_cooling_tubes_of_the_built_in_bundle,
+         number_cooling_water_passes_of_the_main_bundle, mass_flow_cooling_water,
+         temperature_cooling_water_1, thermal_conductivity_cooling_surface_tube_material,
+         mass_flow_flow_path_1, degree_dryness_flow_path_1,
+         coefficient_b, number_air_cooler_total_pipes) = np.broadcast_arrays(
+            *(column(name) for name in names),
+            column('coefficient_b', 1.0),
+            column('number_air_cooler_total_pipes'),
+        )
+
+        total_tubes = number_cooling_tubes_of_the_main_bundle + number_cooling_tubes_of_the_built_in_bundle
+        number_air_cooler_total_pipes = np.where(np.isnan(number_air_cooler_total_pipes),
+                                                 total_tubes * 0.15, number_air_cooler_total_pipes)
+
+        diameter_outside_of_pipes = diameter_inside_of_pipes + 2 * thickness_pipe_wall # p.1
+        area_tube_bundle_surface_total = (math.pi * length_cooling_tubes_of_the_main_bundle * total_tubes *
+                                          diameter_outside_of_pipes * 1e-6) # p.2.1
+        area_surface_of_the_air_cooler_tube_bundle = (math.pi * length_cooling_tubes_of_the_main_bundle *
+                                                      number_air_cooler_total_pipes *
+                                                      diameter_outside_of_pipes * 1e-6) # p.2.2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coefficient_Kf = np.where(
+                area_tube_bundle_surface_total == 0, 1.0,
+                1 - 0.225 * (area_surface_of_the_air_cooler_tube_bundle / area_tube_bundle_surface_total)) # p.3
+
+        coefficient_R1 = ((2 * thickness_pipe_wall / 1000 * diameter_outside_of_pipes / 1000) /
+                          ((diameter_outside_of_pipes / 1000 + diameter_inside_of_pipes / 1000)
+                           * thermal_conductivity_cooling_surface_tube_material)) # p.4
+
+        speed_cooling_water = ((mass_flow_cooling_water * number_cooling_water_passes_of_the_main_bundle) /
+                               (900 * math.pi * total_tubes * (diameter_inside_of_pipes / 1000)**2)) # p.8
+
+        heat_of_vaporization = self._get_heat_of_vaporization(temperature_cooling_water_1) # p.9
+
+        delta_t_water = (mass_flow_flow_path_1 * heat_of_vaporization * degree_dryness_flow_path_1) / mass_flow_cooling_water
+        temperature_cooling_water_2 = temperature_cooling_water_1 + delta_t_water # p.10
+        temperature_cooling_water_average_heating = (temperature_cooling_water_1 + temperature_cooling_water_2) / 2 # p.11
+
+        # Уточнение K по таблице (p.5) — одним вызовом интерполятора на итерацию для всех точек
+        max_iterations = 20
+        tolerance = 0.001
+        query_points = np.column_stack([speed_cooling_water.ravel(), temperature_cooling_water_average_heating.ravel()])
+        coefficient_K_temp = np.full(query_points.shape[0], self._get_k_from_table_temp(
+            (speed_cooling_water_const, temperature_cooling_water_average_heating_const)).item())
+        converged = np.zeros(query_points.shape[0], dtype=bool)
+        for _ in range(max_iterations):
+            k_temp_new = self._get_k_from_table_temp(query_points)
+            converged |= np.abs(k_temp_new - coefficient_K_temp) < tolerance
+            coefficient_K_temp = k_temp_new
+            if converged.all():
+                break
+        else:
+            print(f"Warning: Iteration limit reached without convergence ({np.count_nonzero(~converged)} points).")
+        coefficient_K_temp = coefficient_K_temp.reshape(speed_cooling_water.shape)
+
+        k_clean_denominator = (1 / (coefficient_K_temp * 0.85 * coefficient_B_const * coefficient_Kf)) - 0.087 / 10000 + coefficient_R1 # p.12
+        coefficient_K = 1 / k_clean_denominator
+
+        coefficient_R = (1 / coefficient_K) * ((1 / coefficient_b) - 1) # p.7
+
+        k_zag_denominator = k_clean_denominator + coefficient_R # p.13
+        coefficient_Kzag = 1 / k_zag_denominator
+
+        temperature_relative_underheating = 1 / (np.exp((coefficient_Kzag * area_tube_bundle_surface_total) / (mass_flow_cooling_water * 1000)) - 1) # p.14
+
+        temperature_saturation_steam = temperature_cooling_water_2 + temperature_relative_underheating * (temperature_cooling_water_2 - temperature_cooling_water_1) # p.15
+
+        pressure_flow_path_1_kgf_cm2 = self.uc.convert(
+            saturation_pressure(temperature_saturation_steam),
+            from_unit="МПа",
+            to_unit="кгс/см²",
+            parameter_type="pressure"
+        )
+
+        return {
+            'diameter_outside_of_pipes': diameter_outside_of_pipes,
+            'area_tube_bundle_surface_total': area_tube_bundle_surface_total,
+            'area_surface_of_the_air_cooler_tube_bundle': area_surface_of_the_air_cooler_tube_bundle,
+            'coefficient_Kf': coefficient_Kf,
+            'coefficient_R1': coefficient_R1,
+            'speed_cooling_water': speed_cooling_water,
+            'heat_of_vaporization': heat_of_vaporization,
+            'temperature_cooling_water_2': temperature_cooling_water_2,
+            'temperature_cooling_water_average_heating': temperature_cooling_water_average_heating,
+            'coefficient_K_temp': coefficient_K_temp,
+            'coefficient_K': coefficient_K,
+            'coefficient_R': coefficient_R,
+            'coefficient_Kzag': coefficient_Kzag,
+            'temperature_relative_underheating': temperature_relative_underheating,
+            'temperature_saturation_steam': temperature_saturation_steam,
+            'pressure_flow_path_1': pressure_flow_path_1_kgf_cm2,
+        }
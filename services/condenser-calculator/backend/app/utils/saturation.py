@@ -0,0 +1,122 @@
+"""
+Векторизованное ядро линии насыщения воды и водяного пара.
+
+Реализует уравнения Области 4 IAPWS-IF97 (P_sat(T) и T_sat(P)) на NumPy,
+поэтому расчёт по массиву точек выполняется за одну операцию, без вызова
+seuif97 для каждой точки. Это те же уравнения, что и в `seuif97.tx(t, 1.0, 0)` и
+`seuif97.px(p, 1.0, 1)`: относительное расхождение по давлению не превышает 1e-9,
+по температуре — 1e-7 °C (проверяется в tests/unit/test_saturation.py).
+
+Единицы совпадают с seuif97: температура — °C, давление — МПа.
+Вне области применимости IF97 (0 … 373.946 °C, 611.213 Па … 22.064 МПа)
+возвращается NaN.
+
+Скаляр считается теми же формулами через `math`, без создания массивов:
+стратегии, которые считают по одной точке, не платят за накладные расходы NumPy.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+
+import numpy as np
+
+
+# Коэффициенты n1 … n10 уравнения линии насыщения (IAPWS-IF97, табл. 34)
+_N = (
+    0.11670521452767e4,
+    -0.72421316703206e6,
+    -0.17073846940092e2,
+    0.12020824702470e5,
+    -0.32325550322333e7,
+    0.14915108613530e2,
+    -0.48232657361591e4,
+    0.40511340542057e6,
+    -0.23855557567849,
+    0.65017534844798e3,
+)
+
+KELVIN_OFFSET = 273.15
+
+T_SAT_MIN_K = 273.15
+T_SAT_MAX_K = 647.096
+P_SAT_MIN_MPA = 611.212677e-6
+P_SAT_MAX_MPA = 22.064
+
+
+def _is_scalar(value) -> bool:
+    return isinstance(value, (int, float, np.number)) or (isinstance(value, np.ndarray) and value.ndim == 0)
+
+
+def _pressure_k(t_k, sqrt: Callable):
+    """P_sat по температуре в K (уравнение 30 IF97)."""
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = _N
+    theta = t_k + n9 / (t_k - n10)
+    a = theta * theta + n1 * theta + n2
+    b = n3 * theta * theta + n4 * theta + n5
+    c = n6 * theta * theta + n7 * theta + n8
+    return (2.0 * c / (-b + sqrt(b * b - 4.0 * a * c))) ** 4
+
+
+def _temperature_k(p, sqrt: Callable):
+    """T_sat в K по давлению в МПа (уравнение 31 IF97)."""
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = _N
+    beta = p ** 0.25
+    e = beta * beta + n3 * beta + n6
+    f = n1 * beta * beta + n4 * beta + n7
+    g = n2 * beta * beta + n5 * beta + n8
+    d = 2.0 * g / (-f - sqrt(f * f - 4.0 * e * g))
+    return (n10 + d - sqrt((n10 + d) ** 2 - 4.0 * (n9 + n10 * d))) / 2.0
+
+
+def saturation_pressure(temperature_c: float | np.ndarray) -> float | np.ndarray:
+    """
+    Давление насыщения P_sat(T) по IAPWS-IF97, Область 4.
+
+    :param temperature_c: Температура насыщения, °C (скаляр или массив).
+    :return: Давление насыщения, МПа. Для точек вне диапазона — NaN.
+    """
+    if _is_scalar(temperature_c):
+        t_k = float(temperature_c) + KELVIN_OFFSET
+        return _pressure_k(t_k, math.sqrt) if T_SAT_MIN_K <= t_k <= T_SAT_MAX_K else math.nan
+
+    t_k = np.asarray(temperature_c, dtype=float) + KELVIN_OFFSET
+    in_range = (t_k >= T_SAT_MIN_K) & (t_k <= T_SAT_MAX_K)
+    p = _pressure_k(np.where(in_range, t_k, T_SAT_MIN_K), np.sqrt)
+    return np.where(in_range, p, np.nan)
+
+
+def saturation_temperature(pressure_mpa: float | np.ndarray) -> float | np.ndarray:
+    """
+    Температура насыщения T_sat(P) по IAPWS-IF97, Область 4.
+
+    :param pressure_mpa: Давление насыщения, МПа (скаляр или массив).
+    :return: Температура насыщения, °C. Для точек вне диапазона — NaN.
+    """
+    if _is_scalar(pressure_mpa):
+        p = float(pressure_mpa)
+        return _temperature_k(p, math.sqrt) - KELVIN_OFFSET if P_SAT_MIN_MPA <= p <= P_SAT_MAX_MPA else math.nan
+
+    p = np.asarray(pressure_mpa, dtype=float)
+    in_range = (p >= P_SAT_MIN_MPA) & (p <= P_SAT_MAX_MPA)
+    t_k = _temperature_k(np.where(in_range, p, P_SAT_MIN_MPA), np.sqrt)
+    return np.where(in_range, t_k - KELVIN_OFFSET, np.nan)
+
+
+def saturation_pressure_berman(temperature_c: float | np.ndarray) -> float | np.ndarray:
+    """
+    Давление насыщения по аппроксимации, используемой в методике Бермана.
+
+    ln P = 82.86568 + 1.028003·10⁻²·T − 7821.541 / T − 11.48776·ln T, T — в K.
+
+    :param temperature_c: Температура насыщения, °C (скаляр или массив).
+    :return: Давление насыщения, МПа.
+    """
+    if _is_scalar(temperature_c):
+        t_k = float(temperature_c) + KELVIN_OFFSET
+        return math.exp(82.86568 + 1.028003 / 100.0 * t_k - 7821.541 / t_k - 11.48776 * math.log(t_k))
+
+    t_k = np.asarray(temperature_c, dtype=float) + KELVIN_OFFSET
+    exponent = 82.86568 + 1.028003 / 100.0 * t_k - 7821.541 / t_k - 11.48776 * np.log(t_k)
+    return np.exp(exponent)
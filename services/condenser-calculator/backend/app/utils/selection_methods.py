@@ -1,14 +1,65 @@
 import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+import numpy as np
 
 from .base_for_selection import ProblemDefinition
 
 
-class AnalyticalSolver:  # Аналитически!
-    """Решает задачу аналитически. Максимальная скорость, но не универсален."""
+@dataclass
+class SolverStats:
+    """
+    Статистика последнего векторного решения `solve_many`.
+
+    iterations  — число проходов векторного цикла;
+    evaluations — суммарное число вычислений F(X) по элементам;
+    converged   — маска элементов, для которых найдено решение;
+    fallback    — сколько элементов досчитано резервным методом (дихотомией).
+    """
+    iterations: int = 0
+    evaluations: int = 0
+    converged: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    fallback: int = 0
+
+    @property
+    def failed(self) -> int:
+        return int(np.count_nonzero(~self.converged))
+
+
+class Solver(ABC):
+    """
+    Общий интерфейс решателей.
+
+    `solve(target_delta)` — одна точка, ошибки сходимости как исключения;
+    `solve_many(target_deltas)` — массив точек: элементы без решения получают NaN,
+    а маска сходимости и число итераций записываются в `self.stats`.
+    """
 
     def __init__(self, problem: ProblemDefinition):
         self.problem = problem
         self.iterations = 0
+        self.stats = SolverStats()
+
+    @abstractmethod
+    def solve(self, target_delta, **kwargs):
+        ...
+
+    @abstractmethod
+    def solve_many(self, target_deltas, **kwargs) -> np.ndarray:
+        ...
+
+    def _finish(self, x: np.ndarray, stats: SolverStats) -> np.ndarray:
+        self.stats = stats
+        self.iterations = stats.iterations
+        return x
+
+
+class AnalyticalSolver(Solver):  # Аналитически!
+    """Решает задачу аналитически. Максимальная скорость, но не универсален."""
+
+    def __init__(self, problem: ProblemDefinition):
+        super().__init__(problem)
         self._inv_power = 1.0 / problem.power_minus_1
 
     def solve(self, target_delta, **kwargs):
@@ -18,15 +69,21 @@ class AnalyticalSolver:  # Аналитически!
             raise ValueError("Невозможно найти вещественное решение: основание степени отрицательное.")
         return math.pow(base, self._inv_power)
 
+    def solve_many(self, target_deltas, **kwargs) -> np.ndarray:
+        target = np.asarray(target_deltas, dtype=float)
+        base = (1.0 - target) / self.problem.c
+        valid = base >= 0
+        x = np.where(valid, np.power(np.where(valid, base, 1.0), self._inv_power), np.nan)
+        return self._finish(x, SolverStats(iterations=1, evaluations=target.size, converged=valid))
 
-class BisectionSolver:  # Дихотомии!
+
+class BisectionSolver(Solver):  # Дихотомии!
     """Решает задачу методом дихотомии. Надежен, но медленнее сходится."""
 
     def __init__(self, problem: ProblemDefinition, max_iter=100, tol=1e-7):
-        self.problem = problem
+        super().__init__(problem)
         self.max_iter = max_iter
         self.tol = tol
-        self.iterations = 0
 
     def solve(self, target_delta, a=1.0, b=10.0):  # Начальный отрезок [1, 10]
         self.iterations = 0
@@ -52,15 +109,56 @@ class BisectionSolver:  # Дихотомии!
 
         raise RuntimeError(f"Метод дихотомии не сошелся за {self.max_iter} итераций")
 
+    def solve_many(self, target_deltas, a=1.0, b=10.0) -> np.ndarray:
+        """
+        Дихотомия для массива target_delta. Отрезки [a, b] задаются общими
+        или поэлементно (массивы той же формы). Элементы, для которых на концах
+        отрезка функция одного знака или метод не сошёлся, получают NaN.
+        """
+        target, a, b = (arr.astype(float) for arr in np.broadcast_arrays(
+            np.asarray(target_deltas, dtype=float), np.asarray(a, dtype=float), np.asarray(b, dtype=float)))
+        shape = target.shape
+        target, a, b = target.ravel(), a.ravel(), b.ravel()
+
+        fa = self.problem.f_many(a, target)
+        fb = self.problem.f_many(b, target)
+        stats = SolverStats(evaluations=2 * target.size, converged=np.zeros(target.size, dtype=bool))
+        x = np.full(target.size, np.nan)
+
+        active = np.flatnonzero(fa * fb < 0)
+        fa = fa[active]
+        for _i in range(self.max_iter):
+            if active.size == 0:
+                break
+            stats.iterations += 1
+            lo, hi, t = a[active], b[active], target[active]
+            c = (lo + hi) / 2
+            fc = self.problem.f_many(c, t)
+            stats.evaluations += active.size
+
+            done = (hi - lo) / 2 < self.tol
+            x[active[done]] = c[done]
+            stats.converged[active[done]] = True
+
+            left = fa * fc < 0
+            b[active] = np.where(left, c, hi)
+            a[active] = np.where(left, lo, c)
+            fa = np.where(left, fa, fc)
+
+            keep = ~done
+            active, fa = active[keep], fa[keep]
+
+        stats.converged = stats.converged.reshape(shape)
+        return self._finish(x.reshape(shape), stats)
 
-class NewtonSolver:  # Ньютоном!
+
+class NewtonSolver(Solver):  # Ньютоном!
     """Решает задачу методом Ньютона. Быстрая сходимость, но требует производную."""
 
     def __init__(self, problem: ProblemDefinition, max_iter=20, tol=1e-9):
-        self.problem = problem
+        super().__init__(problem)
         self.max_iter = max_iter
         self.tol = tol
-        self.iterations = 0
 
     def solve(self, target_delta, initial_guess=2.0):
         self.iterations = 0
@@ -80,3 +178,51 @@ class NewtonSolver:  # Ньютоном!
             x = x - fx / dfx
 
         raise RuntimeError(f"Метод Ньютона не сошелся за {self.max_iter} итераций")
+
+    def solve_many(self, target_deltas, initial_guess=2.0, a=1.0, b=10.0) -> np.ndarray:
+        """
+        Метод Ньютона для массива target_delta с маской сходимости.
+
+        Элементы, у которых итерация расходится (X уходит из области определения,
+        производная близка к нулю) или не сходится за `max_iter`, досчитываются
+        дихотомией на отрезке [a, b].
+        """
+        target, x = (arr.astype(float) for arr in np.broadcast_arrays(
+            np.asarray(target_deltas, dtype=float), np.asarray(initial_guess, dtype=float)))
+        shape = target.shape
+        target, x = target.ravel(), x.ravel()
+
+        stats = SolverStats(converged=np.zeros(target.size, dtype=bool))
+
+        active = np.arange(target.size)
+        for _i in range(self.max_iter):
+            if active.size == 0:
+                break
+            stats.iterations += 1
+            fx = self.problem.f_many(x[active], target[active])
+            stats.evaluations += active.size
+
+            done = np.abs(fx) < self.tol
+            stats.converged[active[done]] = True
+
+            dfx = self.problem.df_many(x[active])
+            bad = ~done & ~(np.isfinite(fx) & np.isfinite(dfx) & (np.abs(dfx) >= 1e-12))
+
+            step = ~done & ~bad
+            x[active[step]] -= fx[step] / dfx[step]
+            active = active[step]
+
+        retry = np.flatnonzero(~stats.converged)
+        x[retry] = np.nan
+        if retry.size:
+            bisection = BisectionSolver(self.problem, tol=self.tol)
+            bounds_a, bounds_b = (np.broadcast_to(np.asarray(v, dtype=float), shape).ravel()[retry]
+                                  for v in (a, b))
+            x[retry] = bisection.solve_many(target[retry], a=bounds_a, b=bounds_b)
+            stats.converged[retry] = bisection.stats.converged
+            stats.iterations += bisection.stats.iterations
+            stats.evaluations += bisection.stats.evaluations
+            stats.fallback = retry.size
+
+        stats.converged = stats.converged.reshape(shape)
+        return self._finish(x.reshape(shape), stats)
@@ -1,34 +1,72 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import time
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import numpy as np
-from scipy.interpolate import RegularGridInterpolator, interp1d
 
 
-logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+if TYPE_CHECKING:
+    from scipy.interpolate import RegularGridInterpolator
+
+# Настройка вывода логов — дело приложения или скрипта, а не модуля при импорте
 logger = logging.getLogger(__name__)
 
 
+# Не чаще одного предупреждения об экстраполяции на таблицу за интервал (с);
+# точки вне диапазона между сообщениями суммируются.
+EXTRAP_WARNING_INTERVAL = 60.0
+
+
+@dataclass
+class _ExtrapolationLog:
+    """Агрегированная статистика экстраполяции одной таблицы."""
+    total: int = 0
+    pending: int = 0
+    x_min: float = np.inf
+    x_max: float = -np.inf
+    last_logged: float | None = None
+
+    def record(self, table_name: str, degree: int, x_values: np.ndarray) -> None:
+        count = int(x_values.size)
+        self.total += count
+        self.pending += count
+        self.x_min = min(self.x_min, float(np.min(x_values)))
+        self.x_max = max(self.x_max, float(np.max(x_values)))
+
+        now = time.monotonic()
+        if self.last_logged is not None and now - self.last_logged < EXTRAP_WARNING_INTERVAL:
+            return
+        logger.warning(
+            f"-> [{table_name}] {self.pending} точка(и) вне диапазона "
+            f"(X от {self.x_min:g} до {self.x_max:g}, всего {self.total}). "
+            f"Используется экстраполяция (полином ст. {degree}).")
+        self.pending = 0
+        self.last_logged = now
+
+
 @dataclass(frozen=True)
 class Table1D:
     """
     Представляет 1D таблицу для быстрой интерполяции и экстраполяции.
 
-    При создании объекта выполняются все "дорогие" вычисления:
-    1. Данные сортируются и валидируются.
-    2. Создается объект для быстрой линейной интерполяции.
-    3. Подбирается и сохраняется наилучшая полиномиальная модель для экстраполяции.
+    При создании объекта данные сортируются и валидируются. Полиномиальная
+    модель для экстраполяции подбирается лениво — при первом обращении
+    за пределы таблицы — и сохраняется в объекте. Предупреждения об
+    экстраполяции агрегируются по таблице и выводятся не чаще
+    EXTRAP_WARNING_INTERVAL секунд.
     """
     x_cords: np.ndarray
     y_cords: np.ndarray
     max_extrap_degree: int = 3
 
-    # Приватные поля для хранения "дорогих" объектов
-    _interp: interp1d = field(init=False, repr=False)
-    _extrap_model: np.poly1d = field(init=False, repr=False)
-    _best_extrap_degree: int = field(init=False, repr=False)
+    # Приватные поля: лениво подобранная модель (model, degree) и статистика экстраполяции
+    _extrapolation: tuple[np.poly1d, int] | None = field(init=False, repr=False, compare=False, default=None)
+    _extrap_log: _ExtrapolationLog | None = field(init=False, repr=False, compare=False, default=None)
 
     def __post_init__(self):
         # Валидация входных данных
@@ -41,7 +79,7 @@ class Table1D:
         if self.x_cords.size == 0:
             raise ValueError("Массивы координат не могут быть пустыми.")
 
-        # Шаг 1: Подготовка данных и создание интерполятора
+        # Подготовка данных
         sort_indices = np.argsort(self.x_cords)
         x_sorted = self.x_cords[sort_indices]
         y_sorted = self.y_cords[sort_indices]
@@ -53,33 +91,76 @@ class Table1D:
 
         object.__setattr__(self, 'x_cords', x_sorted)
         object.__setattr__(self, 'y_cords', y_sorted)
+        object.__setattr__(self, '_extrap_log', _ExtrapolationLog())
+
+    @classmethod
+    def bulk(cls, x_cords: np.ndarray, y_values: np.ndarray,
+             max_extrap_degree: int = 3) -> list[Table1D]:
+        """
+        Создаёт набор таблиц из одного массива значений.
 
-        # Создаем интерполятор один раз
-        interp_func = interp1d(x_sorted, y_sorted, kind="linear", bounds_error=False, fill_value=np.nan)
-        object.__setattr__(self, '_interp', interp_func)
+        :param x_cords: Общая ось X (1D, n точек) или оси каждой таблицы (2D, m × n).
+        :param y_values: Значения таблиц, 2D-массив m × n (строка — одна таблица).
+        :return: Список из m таблиц. Сортировка и валидация выполняются
+                 один раз для всего массива.
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        x_cords = np.asarray(x_cords, dtype=float)
+        if y_values.ndim != 2:
+            raise ValueError("y_values должен быть 2-мерным массивом (таблица × точка).")
+        if y_values.shape[1] == 0:
+            raise ValueError("Массивы координат не могут быть пустыми.")
+        if x_cords.shape not in (y_values.shape, y_values.shape[1:]):
+            raise ValueError("Размеры x_cords и y_cords должны совпадать.")
+        x_cords = np.broadcast_to(x_cords, y_values.shape)
 
-        # Шаг 2: Подбор и кэширование лучшей модели для экстраполяции
-        self._fit_extrapolation_model()
+        sort_indices = np.argsort(x_cords, axis=1)
+        x_sorted = np.take_along_axis(x_cords, sort_indices, axis=1)
+        y_sorted = np.take_along_axis(y_values, sort_indices, axis=1)
+        if np.any(np.diff(x_sorted, axis=1) <= 0):
+            raise ValueError(
+                "Координаты X должны быть строго возрастающими и не содержать дубликатов после сортировки.")
 
-    def _fit_extrapolation_model(self):
+        tables = []
+        for x_row, y_row in zip(x_sorted, y_sorted, strict=True):
+            table = cls.__new__(cls)
+            object.__setattr__(table, 'x_cords', x_row)
+            object.__setattr__(table, 'y_cords', y_row)
+            object.__setattr__(table, 'max_extrap_degree', max_extrap_degree)
+            object.__setattr__(table, '_extrapolation', None)
+            object.__setattr__(table, '_extrap_log', _ExtrapolationLog())
+            tables.append(table)
+        return tables
+
+    @property
+    def _extrap_model(self) -> np.poly1d:
+        return self._get_extrapolation()[0]
+
+    @property
+    def _best_extrap_degree(self) -> int:
+        return self._get_extrapolation()[1]
+
+    @property
+    def extrapolation_count(self) -> int:
+        """Сколько точек было экстраполировано этой таблицей."""
+        return self._extrap_log.total
+
+    def _get_extrapolation(self) -> tuple[np.poly1d, int]:
+        if self._extrapolation is None:
+            object.__setattr__(self, '_extrapolation', self._fit_extrapolation_model())
+        return self._extrapolation
+
+    def _fit_extrapolation_model(self) -> tuple[np.poly1d, int]:
         """
-        Находит лучшую полиномиальную модель и сохраняет ее в self._extrap_model.
-        Вызывается один раз из __post_init__.
+        Находит лучшую по AIC полиномиальную модель.
+        Вызывается один раз, при первой экстраполяции.
         """
         best_model = None
         best_aic = float('inf')
         best_degree = -1
         n = len(self.x_cords)
 
-        logger.info(
-            f"[{self.__class__.__name__}] Поиск лучшей модели для экстраполяции (max_degree={self.max_extrap_degree})")
-
-        for degree in range(1, self.max_extrap_degree + 1):
-            if degree >= n:
-                logger.warning(
-                    f"[{self.__class__.__name__}] Степень полинома ({degree}) >= кол-ва точек ({n}). Поиск прерван.")
-                break
-
+        for degree in range(1, min(self.max_extrap_degree, n - 1) + 1):
             coeffs = np.polyfit(self.x_cords, self.y_cords, degree)
             model = np.poly1d(coeffs)
 
@@ -88,7 +169,6 @@ class Table1D:
             k = degree + 1
 
             aic = n * np.log(rss / n) + 2 * k if rss > 0 else -np.inf
-            logger.debug(f"[{self.__class__.__name__}] Степень: {degree}, AIC: {aic:.4f}")
 
             if aic < best_aic:
                 best_aic = aic
@@ -98,10 +178,9 @@ class Table1D:
         if best_model is None:
             raise RuntimeError("Не удалось построить модель для экстраполяции.")
 
-        logger.info(
-            f"-> [{self.__class__.__name__}] Выбрана модель для экстраполяции: полином степени {best_degree} (AIC={best_aic:.4f})")
-        object.__setattr__(self, '_extrap_model', best_model)
-        object.__setattr__(self, '_best_extrap_degree', best_degree)
+        logger.debug(
+            f"[{self.__class__.__name__}] Модель для экстраполяции: полином степени {best_degree} (AIC={best_aic:.4f})")
+        return best_model, best_degree
 
     def __call__(self, target_x: float | np.ndarray) -> float | np.ndarray:
         """
@@ -109,24 +188,23 @@ class Table1D:
         Метод сам решает, какой инструмент использовать.
         Поддерживает как скалярные значения, так и массивы NumPy.
         """
-        interpolated_values = self._interp(target_x)
+        interpolated_values = np.interp(target_x, self.x_cords, self.y_cords, left=np.nan, right=np.nan)
 
         if np.isscalar(target_x):
             if not np.isnan(interpolated_values):
                 return float(interpolated_values)
-            else:
-                logger.warning(
-                    f"-> [{self.__class__.__name__}] Точка X={target_x} вне диапазона. Используется экстраполяция (полином ст. {self._best_extrap_degree}).")
-                return float(self._extrap_model(target_x))
+            model, degree = self._get_extrapolation()
+            self._extrap_log.record(self.__class__.__name__, degree, np.asarray([target_x], dtype=float))
+            return float(model(target_x))
 
-        output_values = np.copy(interpolated_values)
-        extrapolation_indices = np.isnan(interpolated_values)
+        output_values = np.array(interpolated_values, dtype=float)
+        extrapolation_indices = np.isnan(output_values)
 
         if np.any(extrapolation_indices):
-            logger.warning(
-                f"-> [{self.__class__.__name__}] {np.sum(extrapolation_indices)} точка(и) вне диапазона. Используется экстраполяция (полином ст. {self._best_extrap_degree}).")
-            x_to_extrapolate = np.asarray(target_x)[extrapolation_indices]
-            output_values[extrapolation_indices] = self._extrap_model(x_to_extrapolate)
+            model, degree = self._get_extrapolation()
+            x_to_extrapolate = np.asarray(target_x, dtype=float)[extrapolation_indices]
+            self._extrap_log.record(self.__class__.__name__, degree, x_to_extrapolate)
+            output_values[extrapolation_indices] = model(x_to_extrapolate)
 
         return output_values
 
@@ -140,7 +218,7 @@ class Table2D:
     x_cords: np.ndarray
     y_cords: np.ndarray
     z_values: np.ndarray
-    _rgi: RegularGridInterpolator = field(init=False, repr=False)
+    _rgi: RegularGridInterpolator | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not all(isinstance(arr, np.ndarray) for arr in [self.x_cords, self.y_cords, self.z_values]):
@@ -155,19 +233,118 @@ class Table2D:
         if np.any(np.diff(self.y_cords) <= 0):
             raise ValueError("y_cords должен быть строго возрастающим")
 
-        rgi_func = RegularGridInterpolator((self.x_cords, self.y_cords), self.z_values,
-                                           method="linear", bounds_error=False, fill_value=np.nan)
-        object.__setattr__(self, '_rgi', rgi_func)
+    def _get_rgi(self) -> RegularGridInterpolator:
+        """Интерполятор строится при первом вызове таблицы (scipy импортируется лениво)."""
+        if self._rgi is None:
+            from scipy.interpolate import RegularGridInterpolator
+
+            rgi_func = RegularGridInterpolator((self.x_cords, self.y_cords), self.z_values,
+                                               method="linear", bounds_error=False, fill_value=np.nan)
+            object.__setattr__(self, '_rgi', rgi_func)
+        return self._rgi
 
     def __call__(self, target_x: float | np.ndarray,
                  target_y: float | np.ndarray) -> float | np.ndarray:
         points_x = np.ravel(target_x)
         points_y = np.ravel(target_y)
         points_to_interpolate = np.column_stack((points_x, points_y))
-        interpolated_values = self._rgi(points_to_interpolate)
+        interpolated_values = self._get_rgi()(points_to_interpolate)
         return interpolated_values.reshape(np.shape(target_x))
 
 
+@dataclass(frozen=True)
+class Table3D:
+    """
+    Семейство 2D-характеристик Z(x, y), заданных для ряда значений параметра A,
+    на общей регулярной сетке (x, y).
+
+    Срезы хранятся одним массивом `z_values` формы (A, x, y), поэтому расчёт
+    по массивам точек (x, y, a) выполняется за один векторный проход:
+    ячейки находятся через `np.searchsorted`, значение — трилинейная
+    интерполяция. Как и в `interpolate_trilinear`, значение A ограничивается
+    диапазоном семейства, а точки вне диапазона x или y дают NaN.
+    """
+    a_values: np.ndarray
+    x_cords: np.ndarray
+    y_cords: np.ndarray
+    z_values: np.ndarray
+
+    def __post_init__(self):
+        arrays = [self.a_values, self.x_cords, self.y_cords, self.z_values]
+        if not all(isinstance(arr, np.ndarray) for arr in arrays):
+            raise TypeError("a_values, x_cords, y_cords и z_values должны быть экземплярами np.ndarray.")
+        if self.a_values.ndim != 1 or self.x_cords.ndim != 1 or self.y_cords.ndim != 1 or self.z_values.ndim != 3:
+            raise ValueError("Ожидаем 1-D a, 1-D x, 1-D y и 3-D z")
+        expected_shape = (self.a_values.size, self.x_cords.size, self.y_cords.size)
+        if self.z_values.shape != expected_shape:
+            raise ValueError(f"Размеры z {self.z_values.shape} не соответствуют {expected_shape}")
+        if min(expected_shape) < 2:
+            raise ValueError("По каждой оси нужно не менее двух точек")
+        if np.any(np.diff(self.x_cords) <= 0):
+            raise ValueError("x_cords должен быть строго возрастающим")
+        if np.any(np.diff(self.y_cords) <= 0):
+            raise ValueError("y_cords должен быть строго возрастающим")
+
+        # Срезы могут быть заданы в любом порядке A (например, по убыванию)
+        order = np.argsort(self.a_values)
+        a_sorted = self.a_values[order].astype(float)
+        if np.any(np.diff(a_sorted) <= 0):
+            raise ValueError("Значения параметра A не должны повторяться")
+        object.__setattr__(self, 'a_values', a_sorted)
+        object.__setattr__(self, 'z_values', np.ascontiguousarray(self.z_values[order], dtype=float))
+
+    @classmethod
+    def from_tables(cls, tables: Mapping[float, Table2D]) -> Table3D:
+        """Собирает семейство из срезов Table2D с общими осями x и y."""
+        if not tables:
+            raise ValueError("Семейство не может быть пустым")
+        first = next(iter(tables.values()))
+        for table in tables.values():
+            if not (np.array_equal(table.x_cords, first.x_cords) and np.array_equal(table.y_cords, first.y_cords)):
+                raise ValueError("Все срезы Table2D должны иметь одинаковые оси x и y")
+        return cls(
+            a_values=np.array(list(tables), dtype=float),
+            x_cords=first.x_cords,
+            y_cords=first.y_cords,
+            z_values=np.stack([table.z_values for table in tables.values()]),
+        )
+
+    def __call__(self, target_x: float | np.ndarray, target_y: float | np.ndarray,
+                 target_a: float | np.ndarray) -> float | np.ndarray:
+        x, y, a = np.broadcast_arrays(
+            np.asarray(target_x, dtype=float),
+            np.asarray(target_y, dtype=float),
+            np.asarray(target_a, dtype=float),
+        )
+        a = np.clip(a, self.a_values[0], self.a_values[-1])
+
+        ia, ta = _locate_cell(self.a_values, a)
+        ix, tx = _locate_cell(self.x_cords, x)
+        iy, ty = _locate_cell(self.y_cords, y)
+
+        result = np.zeros(x.shape)
+        for da, dx, dy in itertools.product((0, 1), repeat=3):
+            weight = ((ta if da else 1.0 - ta)
+                      * (tx if dx else 1.0 - tx)
+                      * (ty if dy else 1.0 - ty))
+            result += weight * self.z_values[ia + da, ix + dx, iy + dy]
+
+        out_of_domain = ((x < self.x_cords[0]) | (x > self.x_cords[-1])
+                         | (y < self.y_cords[0]) | (y > self.y_cords[-1]))
+        result[out_of_domain] = np.nan
+
+        if result.ndim == 0:
+            return float(result)
+        return result
+
+
+def _locate_cell(axis: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Индекс левого узла ячейки и относительное положение точки в ней."""
+    idx = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, axis.size - 2)
+    t = (values - axis[idx]) / (axis[idx + 1] - axis[idx])
+    return idx, t
+
+
 def interpolate_trilinear(
         table_low_a: Table2D, a_low: float,
         table_high_a: Table2D, a_high: float,
@@ -0,0 +1,85 @@
+"""
+Справочные таблицы методик.
+
+Таблицы хранятся один раз в сжатом бинарном файле `data/tables.npz` и читаются
+при первом обращении, а не при импорте модулей методик. Массивы доступны
+только для чтения и общие для всех потребителей процесса.
+
+Состав хранилища:
+    k_speed_points, k_temperature_points, k_values — коэффициент теплопередачи K
+        от скорости воды Cов [м/с] и средней температуры tср [°C] (Метро-Виккерс);
+    vku_temperature_air, vku_mass_flow_reduced, vku_pressure — давление в ВКУ
+        [кгс/см²] от приведённого расхода пара [%] и температуры воздуха [°C].
+
+Для изменения таблиц используется `save_tables`.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+TABLES_PATH = Path(__file__).resolve().parent / "data" / "tables.npz"
+
+_tables: dict[str, np.ndarray] | None = None
+_lock = threading.Lock()
+
+
+def _load() -> dict[str, np.ndarray]:
+    global _tables
+    if _tables is None:
+        with _lock:
+            if _tables is None:
+                with np.load(TABLES_PATH) as store:
+                    tables = {name: store[name] for name in store.files}
+                for array in tables.values():
+                    array.flags.writeable = False
+                _tables = tables
+    return _tables
+
+
+def get_table(name: str) -> np.ndarray:
+    """Массив таблицы `name` (только чтение)."""
+    tables = _load()
+    if name not in tables:
+        raise KeyError(f"Таблица '{name}' отсутствует в {TABLES_PATH.name}. Доступны: {sorted(tables)}")
+    return tables[name]
+
+
+def table_names() -> list[str]:
+    return sorted(_load())
+
+
+def save_tables(tables: Mapping[str, Any], path: Path = TABLES_PATH) -> None:
+    """Записать таблицы в хранилище (полностью заменяет файл)."""
+    global _tables
+    np.savez_compressed(path, **{name: np.asarray(values, dtype=float) for name, values in tables.items()})
+    if path == TABLES_PATH:
+        with _lock:
+            _tables = None
+
+
+# ----------------- ПРЕДСТАВЛЕНИЯ ДЛЯ МЕТОДИК ----------------------
+
+
+def k_interpolation_data() -> dict[str, list]:
+    """Таблица K в прежнем формате словаря (оси и матрица — списки)."""
+    return {
+        "temperature_points": get_table("k_temperature_points").tolist(),
+        "speed_points": get_table("k_speed_points").tolist(),
+        "k_values_matrix": get_table("k_values").tolist(),
+    }
+
+
+def vku_pressure_data() -> list:
+    """Таблица ВКУ в прежнем формате [t_возд, Gк_прив, P]."""
+    return [
+        get_table("vku_temperature_air").tolist(),
+        get_table("vku_mass_flow_reduced").tolist(),
+        get_table("vku_pressure").tolist(),
+    ]
@@ -5,8 +5,12 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, ClassVar
+
+import numpy as np
 
 
 Number = int | float
@@ -34,6 +38,37 @@ def _linear(to_base_factor: float) -> tuple[Callable[[Number], Number],
     )
 
 
+@dataclass(frozen=True)
+class ConversionPlan:
+    """
+    Скомпилированная конверсия `from_unit` → `to_unit` одного параметра.
+
+    Линейные (аффинные) конверсии сводятся к `value * scale + offset`,
+    поэтому применяются к массиву NumPy или колонке pandas одной операцией.
+    Для нелинейных единиц `scale is None`, а `func` — композиция пользовательских
+    функций to_base/from_base (они должны принимать массивы).
+    """
+    parameter_type: str
+    from_unit: str
+    to_unit: str
+    scale: float | None = None
+    offset: float = 0.0
+    func: Callable[[Any], Any] | None = None
+
+    @property
+    def is_affine(self) -> bool:
+        return self.scale is not None
+
+    def __call__(self, values: Any) -> Any:
+        if isinstance(values, (list, tuple)):
+            values = np.asarray(values, dtype=float)
+        if self.scale is None:
+            return self.func(values)
+        if self.offset == 0.0:
+            return values if self.scale == 1.0 else values * self.scale
+        return values * self.scale + self.offset
+
+
 class UnitConverter:
     """
     Главный класс-конвертер.
@@ -57,20 +92,29 @@ class UnitConverter:
                     'name': 'паскаль',
                     'to_base':  lambda v: v / 98_066.5,
                     'from_base':lambda v: v * 98_066.5,
+                    'affine': (1 / 98_066.5, 0.0),   # to_base = v * k + b
                 },
                 ...
             }
         },
         ...
     }
+
+    Реестр единиц по умолчанию строится один раз и разделяется всеми
+    экземплярами в виде неизменяемого отображения. `add_parameter`/`add_unit`
+    копируют его в собственный реестр экземпляра (copy-on-write), поэтому
+    расширение одного конвертера не влияет на остальные.
     """
 
+    _shared_parameters: ClassVar[Mapping[str, Any] | None] = None
+    _shared_plans: ClassVar[dict[tuple[str, str, str], ConversionPlan]] = {}
+
     # -------------------------------------------------------------
     # API
     # -------------------------------------------------------------
     def __init__(self) -> None:
-        self.parameters: dict[str, dict[str, Any]] = {}
-        self._build_defaults()
+        self.parameters: Mapping[str, Any] = self._default_registry()
+        self._plans = UnitConverter._shared_plans
 
     # ------------------------ PUBLIC -----------------------------
     def convert(self, value: Number, *,
@@ -87,6 +131,20 @@ class UnitConverter:
         return self.from_base(base_val, to_unit=to_unit,
                               parameter_type=parameter_type)
 
+    def plan(self, parameter_type: str, from_unit: str, to_unit: str) -> ConversionPlan:
+        """
+        Скомпилированная конверсия для массовой обработки (кешируется).
+
+        >>> to_kgf = uc.plan("pressure", "МПа", "кгс/см²")
+        >>> df["p"] = to_kgf(df["p"])      # одно умножение на всю колонку
+        """
+        key = (parameter_type, from_unit, to_unit)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._compile_plan(self._norm_param(parameter_type), from_unit, to_unit)
+            self._plans[key] = plan
+        return plan
+
     def to_base(self, value: Number, *,
                 from_unit: str,
                 parameter_type: str) -> float:
@@ -120,6 +178,7 @@ class UnitConverter:
                       base_unit_symbol: str,
                       base_unit_name: str) -> None:
         """Добавить новый тип физического параметра."""
+        self._ensure_own_registry()
         p = self._norm_param(parameter_type)
         if p in self.parameters:
             raise ValueError(f"Parameter '{parameter_type}' уже существует")
@@ -131,6 +190,7 @@ class UnitConverter:
                     "name": base_unit_name,
                     "to_base": lambda v: v,   # identity
                     "from_base": lambda v: v,
+                    "affine": (1.0, 0.0),
                 }
             },
         }
@@ -141,13 +201,17 @@ class UnitConverter:
                  unit_symbol: str,
                  unit_name: str,
                  to_base: FactorOrFunc,
-                 from_base: FactorOrFunc | None = None) -> None:
+                 from_base: FactorOrFunc | None = None,
+                 affine: tuple[float, float] | None = None) -> None:
         """
         Добавить новую единицу к существующему параметру.
 
         Если `to_base` и/или `from_base` — число,
         то считаем это линейным коэффициентом.
+        Для функции `to_base` вида `v * k + b` можно указать `affine=(k, b)` —
+        тогда `plan()` применит конверсию к массиву одной операцией.
         """
+        self._ensure_own_registry()
         parameter_type = self._norm_param(parameter_type)
         if parameter_type not in self.parameters:
             raise UnknownParameterError(parameter_type)
@@ -178,13 +242,61 @@ class UnitConverter:
         else:
             from_base_func = from_base
 
+        if affine is None and not callable(to_base):
+            affine = (float(to_base), 0.0)
+
         self.parameters[parameter_type]["units"][unit_symbol] = {
             "name": unit_name,
             "to_base": to_base_func,
             "from_base": from_base_func,
+            "affine": affine,
         }
+        self._plans.clear()
 
     # ---------------------- INTERNAL -----------------------------
+    @classmethod
+    def _default_registry(cls) -> Mapping[str, Any]:
+        """Реестр единиц «из коробки»: строится один раз на процесс."""
+        if cls._shared_parameters is None:
+            builder = cls.__new__(cls)
+            builder.parameters = {}
+            builder._plans = {}
+            builder._build_defaults()
+            cls._shared_parameters = MappingProxyType({
+                p: MappingProxyType({
+                    **entry,
+                    "units": MappingProxyType({u: MappingProxyType(unit) for u, unit in entry["units"].items()}),
+                })
+                for p, entry in builder.parameters.items()
+            })
+        return cls._shared_parameters
+
+    def _ensure_own_registry(self) -> None:
+        if isinstance(self.parameters, MappingProxyType):
+            self.parameters = {
+                p: {**entry, "units": {u: dict(unit) for u, unit in entry["units"].items()}}
+                for p, entry in self.parameters.items()
+            }
+            self._plans = {}
+
+    def _compile_plan(self, parameter_type: str, from_unit: str, to_unit: str) -> ConversionPlan:
+        src = self._get_unit(parameter_type, from_unit)
+        dst = self._get_unit(parameter_type, to_unit)
+
+        if from_unit == to_unit:
+            return ConversionPlan(parameter_type, from_unit, to_unit, scale=1.0)
+
+        if src["affine"] is not None and dst["affine"] is not None:
+            # value → base: v*k1 + b1;  base → to_unit: (x - b2) / k2
+            k1, b1 = src["affine"]
+            k2, b2 = dst["affine"]
+            return ConversionPlan(parameter_type, from_unit, to_unit,
+                                  scale=k1 / k2, offset=(b1 - b2) / k2)
+
+        to_base, from_base = src["to_base"], dst["from_base"]
+        return ConversionPlan(parameter_type, from_unit, to_unit,
+                              func=lambda v: from_base(to_base(v)))
+
     # нормализация ключа параметра
     @staticmethod
     def _norm_param(p: str) -> str:
@@ -219,42 +331,48 @@ class UnitConverter:
                       unit_symbol="Па",
                       unit_name="паскаль",
                       to_base=lambda v: v / 98_066.5,
-                      from_base=lambda v: v * 98_066.5)
+                      from_base=lambda v: v * 98_066.5,
+                      affine=(1 / 98_066.5, 0.0))
 
         # кПа
         self.add_unit("pressure",
                       unit_symbol="кПа",
                       unit_name="килопаскаль",
                       to_base=lambda v: v * 1_000 / 98_066.5,
-                      from_base=lambda v: v * 98_066.5 / 1_000)
+                      from_base=lambda v: v * 98_066.5 / 1_000,
+                      affine=(1_000 / 98_066.5, 0.0))
 
         # МПа
         self.add_unit("pressure",
                       unit_symbol="МПа",
                       unit_name="мегапаскаль",
                       to_base=lambda v: v * 1_000_000 / 98_066.5,
-                      from_base=lambda v: v * 98_066.5 / 1_000_000)
+                      from_base=lambda v: v * 98_066.5 / 1_000_000,
+                      affine=(1_000_000 / 98_066.5, 0.0))
 
         # бар
         self.add_unit("pressure",
                       unit_symbol="бар",
                       unit_name="бар",
                       to_base=lambda v: v * 100_000 / 98_066.5,
-                      from_base=lambda v: v * 98_066.5 / 100_000)
+                      from_base=lambda v: v * 98_066.5 / 100_000,
+                      affine=(100_000 / 98_066.5, 0.0))
 
         # атм
         self.add_unit("pressure",
                       unit_symbol="атм",
                       unit_name="атмосфера",
                       to_base=lambda v: v * 101_325 / 98_066.5,
-                      from_base=lambda v: v * 98_066.5 / 101_325)
+                      from_base=lambda v: v * 98_066.5 / 101_325,
+                      affine=(101_325 / 98_066.5, 0.0))
 
         # мм рт. ст.
         self.add_unit("pressure",
                       unit_symbol="мм рт. ст.",
                       unit_name="миллиметр ртутного столба",
                       to_base=lambda v: v * 133.322 / 98_066.5,
-                      from_base=lambda v: v * 98_066.5 / 133.322)
+                      from_base=lambda v: v * 98_066.5 / 133.322,
+                      affine=(133.322 / 98_066.5, 0.0))
 
         # 2) Temperature --------------------------------------------
         self.add_parameter("temperature",
@@ -266,7 +384,8 @@ class UnitConverter:
                       unit_symbol="K",
                       unit_name="кельвин",
                       to_base=lambda v: v - 273.15,        # K -> °C
-                      from_base=lambda v: v + 273.15)      # °C -> K
+                      from_base=lambda v: v + 273.15,      # °C -> K
+                      affine=(1.0, -273.15))
 
         # 3) Enthalpy -----------------------------------------------
         self.add_parameter("enthalpy",
@@ -278,14 +397,16 @@ class UnitConverter:
                       unit_symbol="кДж/кг",
                       unit_name="килоджоуль на килограмм",
                       to_base=lambda v, c=kJ_coeff: v * c,
-                      from_base=lambda v, c=kJ_coeff: v / c)
+                      from_base=lambda v, c=kJ_coeff: v / c,
+                      affine=(kJ_coeff, 0.0))
 
         J_coeff = 1 / 4186.8
         self.add_unit("enthalpy",
                       unit_symbol="Дж/кг",
                       unit_name="джоуль на килограмм",
                       to_base=lambda v, c=J_coeff: v * c,
-                      from_base=lambda v, c=J_coeff: v / c)
+                      from_base=lambda v, c=J_coeff: v / c,
+                      affine=(J_coeff, 0.0))
 
         # 4) Entropy -------------------------------------------------
         self.add_parameter("entropy",
@@ -297,7 +418,8 @@ class UnitConverter:
                       unit_symbol="кДж/кгК",
                       unit_name="килоджоуль на килограмм-кельвин",
                       to_base=lambda v, c=kJ_coeff_S: v * c,
-                      from_base=lambda v, c=kJ_coeff_S: v / c)
+                      from_base=lambda v, c=kJ_coeff_S: v / c,
+                      affine=(kJ_coeff_S, 0.0))
 
         # 5) Density -------------------------------------------------
         self.add_parameter("density",
@@ -389,7 +511,8 @@ class UnitConverter:
                       unit_symbol="%",
                       unit_name="проценты",
                       to_base=lambda v: v / 100.0,
-                      from_base=lambda v: v * 100.0)
+                      from_base=lambda v: v * 100.0,
+                      affine=(0.01, 0.0))
 
     # -------------------------------------------------------------
 
@@ -0,0 +1,244 @@
+"""
+Эталонные данные методик из `validation_data/condenser-calculator`.
+
+Общие загрузчики для скриптов бенчмарков и валидации: пути к данным,
+построение входных моделей движка из geometry/mode JSON и колоночное
+представление эталонных случаев Бермана с кешем в файлах .npy
+(загружаются через memory-map).
+"""
+
+from _common import setup_path
+
+
+setup_path()
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+from app.utils.condenser_engine import BermanInputs, MetroVickersInputs
+
+
+def _find_monorepo_root(start: Path) -> Path:
+    """Поднимаемся вверх, пока не найдём корень монорепозитория (`services/` и `docs/`)."""
+    start = start.resolve()
+    for p in [start, *start.parents]:
+        if (p / "services").is_dir() and (p / "docs").is_dir():
+            return p
+    return start.parents[4]
+
+
+STRATEGIES_DATA_PATH = (
+    _find_monorepo_root(Path(__file__)) / "validation_data" / "condenser-calculator" / "strategies"
+)
+BERMAN_DATA_PATH = STRATEGIES_DATA_PATH / "berman"
+METRO_VICKERS_DATA_PATH = STRATEGIES_DATA_PATH / "metro_vikers"
+
+# Колонки входных данных BermanInputs, которые меняются от случая к случаю
+BERMAN_CASE_FIELDS = (
+    "L_main", "N_main", "Z_main", "d_in", "S_tube", "H_steam", "G_nom",
+    "L_builtin", "N_builtin", "Z_builtin",
+    "W_main", "W_builtin", "t1_main", "t1_builtin", "G_steam", "coefficient_b",
+)
+
+# Небольшие таблицы NAMET/NAMED из примеров табличного метода
+NAMET = [
+    [35, 33, 30, 25],
+    [20, 50, 100, 150, 200],
+    [
+        [6.549, 7.211, 8.88, 10.945, 13.409],
+        [5.9, 6.499, 8.018, 9.927, 12.214],
+        [5.036, 5.552, 6.872, 8.572, 10.622],
+        [3.851, 4.257, 5.299, 6.712, 8.438],
+    ],
+]
+NAMED = [
+    [15.3, 26.8, 38.4, 49.9, 61.5, 73],
+    [0.157, 0.258, 0.469, 0.607, 0.763, 0.919],
+]
+
+
+def load_json(filepath: Path) -> dict:
+    with open(filepath, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def berman_inputs(geometry: dict, mode: dict, *, two_bundle: bool = True) -> BermanInputs:
+    """
+    Входные данные Бермана по геометрии и режиму; рабочая точка — первые
+    значения осей режима. `two_bundle=False` — только основной пучок.
+    """
+    geom = geometry["geometry"]
+    builtin = {}
+    if two_bundle:
+        builtin = {
+            "L_builtin": geom.get("builtin_length") or 0.0,
+            "N_builtin": int(geom.get("builtin_count") or 0),
+            "Z_builtin": int(geom.get("passes_builtin") or 0),
+            "W_builtin": (mode.get("W_builtin") or [0.0])[0],
+            "t1_builtin": (mode.get("t1_builtin") or mode["t1_main"])[0],
+        }
+    return BermanInputs(
+        L_main=geom["main_length"],
+        N_main=int(geom["main_count"]),
+        Z_main=int(geom["passes_main"]),
+        d_in=geom["diameter_internal"],
+        S_tube=geom["wall_thickness"],
+        H_steam=mode["H_steam"],
+        G_nom=geometry["limits"]["mass_flow_steam_nom"],
+        W_main=mode["W_main"][0],
+        t1_main=mode["t1_main"][0],
+        G_steam=mode["G_steam"][0],
+        coefficient_b=mode["coefficient_b"][0],
+        **builtin,
+    )
+
+
+def metro_vickers_inputs(geometry: dict, mode: dict) -> MetroVickersInputs:
+    """Входные данные Метро-Виккерс по geometry_mv/mode_mv; рабочая точка — первые значения осей."""
+    geom = geometry["geometry"]
+    return MetroVickersInputs(
+        diameter_inside_of_pipes=geom["diameter_internal"],
+        thickness_pipe_wall=geom["wall_thickness"],
+        length_cooling_tubes_of_the_main_bundle=geom["main_length"],
+        number_cooling_tubes_of_the_main_bundle=int(geom["main_count"]),
+        number_cooling_tubes_of_the_built_in_bundle=int(geom.get("builtin_count") or 0),
+        number_cooling_water_passes_of_the_main_bundle=int(geom["passes_main"]),
+        mass_flow_cooling_water=mode["W_main"][0],
+        temperature_cooling_water_1=mode["t1_main"][0],
+        thermal_conductivity_cooling_surface_tube_material=16.2,
+        mass_flow_flow_path_1=mode["G_steam"][0],
+        degree_dryness_flow_path_1=mode["X_steam"],
+        coefficient_b=mode["coefficient_b"][0],
+        number_air_cooler_total_pipes=geom.get("aircooler_count"),
+    )
+
+
+# --------------------- ЭТАЛОННЫЕ СЛУЧАИ БЕРМАНА ---------------------
+
+
+def _berman_dataset_cases(results: dict, mode: dict, geometry: dict) -> list[dict]:
+    """Случаи матрицы давлений одного results_X.json (как в tests/validation/berman)."""
+    geom = geometry["geometry"]
+    fixed = {
+        "L_main": geom["main_length"],
+        "N_main": int(geom["main_count"]),
+        "Z_main": int(geom["passes_main"]),
+        "d_in": geom["diameter_internal"],
+        "S_tube": geom["wall_thickness"],
+        "H_steam": mode["H_steam"],
+        "G_nom": geometry["limits"]["mass_flow_steam_nom"],
+        "L_builtin": geom.get("builtin_length") or 0.0,
+        "N_builtin": int(geom.get("builtin_count") or 0),
+        "Z_builtin": int(geom.get("passes_builtin") or 0),
+    }
+    different_builtin = mode.get("t1_builtin") and mode["t1_builtin"] != mode["t1_main"]
+
+    cases = []
+    for mode_data in results["condenser_modes"]:
+        table = mode_data["table_data"][0]
+        for t_idx, t1_main in enumerate(table["t1_main"]):
+            t1_builtin = mode["t1_builtin"][t_idx] if different_builtin else t1_main
+            for g_idx, g_steam in enumerate(table["G_steam_axis"]):
+                cases.append({
+                    **fixed,
+                    "W_main": mode_data["W_main"],
+                    "W_builtin": mode_data["W_builtin"],
+                    "t1_main": t1_main,
+                    "t1_builtin": t1_builtin,
+                    "G_steam": g_steam,
+                    "coefficient_b": mode_data["coefficient_b"],
+                    "expected_pressure": table["pressures_axis"][t_idx][g_idx],
+                    "id": (f"W{mode_data['W_main']}_Wb{mode_data['W_builtin']}_t{t1_main}"
+                           f"_G{g_steam}_b{mode_data['coefficient_b']}"),
+                })
+    return cases
+
+
+def _natural_key(name: str) -> list:
+    """results_2 раньше results_10."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def berman_datasets(data_path: Path = BERMAN_DATA_PATH) -> list[tuple[str, str, str]]:
+    """
+    Наборы эталонов Бермана (results, mode, geometry), найденные в каталоге данных:
+    results/results_<N>.json, режим modes/mode_<N>.json и геометрия
+    geometrys/geometry_<N>.json (если её нет — общая geometrys/geometry.json).
+    """
+    datasets = []
+    for results in sorted((data_path / "results").glob("results_*.json"), key=lambda p: _natural_key(p.stem)):
+        suffix = results.stem.removeprefix("results_")
+        mode = f"mode_{suffix}"
+        if not (data_path / "modes" / f"{mode}.json").exists():
+            raise FileNotFoundError(f"Для {results.name} нет режима modes/{mode}.json")
+        geometry = f"geometry_{suffix}"
+        if not (data_path / "geometrys" / f"{geometry}.json").exists():
+            geometry = "geometry"
+        datasets.append((results.stem, mode, geometry))
+    return datasets
+
+
+def _berman_sources(data_path: Path) -> list[Path]:
+    return [
+        data_path / folder / f"{name}.json"
+        for dataset in berman_datasets(data_path)
+        for folder, name in zip(("results", "modes", "geometrys"), dataset, strict=True)
+    ]
+
+
+def _sources_digest(paths: list[Path]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build_berman_golden(data_path: Path = BERMAN_DATA_PATH) -> tuple[dict[str, np.ndarray], list[str]]:
+    """Все эталонные случаи Бермана в виде колонок (один проход по JSON)."""
+    rows, ids = [], []
+    for results_name, mode_name, geometry_name in berman_datasets(data_path):
+        cases = _berman_dataset_cases(
+            load_json(data_path / "results" / f"{results_name}.json"),
+            load_json(data_path / "modes" / f"{mode_name}.json"),
+            load_json(data_path / "geometrys" / f"{geometry_name}.json"),
+        )
+        rows += cases
+        ids += [f"{results_name}:{case['id']}" for case in cases]
+
+    int_fields = {"N_main", "Z_main", "N_builtin", "Z_builtin"}
+    columns = {
+        name: np.array([row[name] for row in rows], dtype=np.int64 if name in int_fields else float)
+        for name in (*BERMAN_CASE_FIELDS, "expected_pressure")
+    }
+    columns["dataset"] = np.array([i.split(":", 1)[0] for i in ids])
+    return columns, ids
+
+
+def load_berman_golden(cache_dir: Path,
+                       data_path: Path = BERMAN_DATA_PATH) -> tuple[dict[str, np.ndarray], list[str]]:
+    """
+    Эталонные случаи Бермана из кеша .npy (memory-map, только чтение).
+
+    Кеш перестраивается, если изменился набор исходных JSON или их содержимое.
+    """
+    digest = _sources_digest(_berman_sources(data_path))
+    manifest_path = cache_dir / "manifest.json"
+    manifest = load_json(manifest_path) if manifest_path.exists() else {}
+
+    if manifest.get("digest") != digest:
+        columns, ids = build_berman_golden(data_path)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / ".gitignore").write_text("*\n", encoding="utf-8")
+        for name, values in columns.items():
+            np.save(cache_dir / f"{name}.npy", values)
+        manifest = {"digest": digest, "columns": list(columns), "ids": ids}
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    columns = {name: np.load(cache_dir / f"{name}.npy", mmap_mode="r") for name in manifest["columns"]}
+    return columns, manifest["ids"]
@@ -0,0 +1,285 @@
+"""
+Бенчмарки методик расчёта конденсатора.
+
+Замеряет Бермана (один и два пучка), Метро-Виккерс, ВКУ, табличный метод и
+`batch_calculate` в двух размерах: одна точка ("scalar") и сетка ("grid").
+Входные данные берутся из `validation_data/condenser-calculator`, сеть не нужна.
+
+Результаты дописываются в историю JSON Lines (одна строка — один запуск).
+Для каждого замера берётся минимум по сериям, база — медиана таких минимумов
+за последние `--baseline-runs` запусков на той же машине (шум одного запуска
+на малых замерах достигает нескольких раз). Рост времени относительно базы
+больше порога считается регрессией (код возврата 1).
+
+    python scripts/benchmark_strategies.py                # замер и сравнение
+    python scripts/benchmark_strategies.py --save         # + запись в историю
+    python scripts/benchmark_strategies.py --size scalar --case vku
+"""
+
+from _common import setup_path
+
+
+setup_path()
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from _golden_data import (
+    BERMAN_DATA_PATH,
+    METRO_VICKERS_DATA_PATH,
+    NAMED,
+    NAMET,
+    berman_inputs,
+    load_json,
+    metro_vickers_inputs,
+)
+
+from app.utils.berman_strategy import BermanStrategy
+from app.utils.calculation_engine import batch_calculate
+from app.utils.condenser_engine import CondenserEngine, TablePressureInputs, VKUInputs
+from app.utils.metrovickers_strategy import MetroVickersStrategy
+from app.utils.TPS_module import TablePressureStrategy
+from app.utils.VKU_strategy import VKUStrategy
+
+
+DEFAULT_HISTORY = Path(__file__).resolve().parent.parent / ".benchmarks" / "history.jsonl"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BASELINE_RUNS = 5
+LARGE_GRID_SIDE = 300  # сетка ВКУ и табличного метода: 300 × 300 = 90 000 точек
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    size: str          # "scalar" или "grid"
+    points: int        # число расчётных точек за один вызов
+    func: Callable[[], Any]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+def build_cases() -> list[BenchmarkCase]:
+    """Набор замеров на эталонных геометриях и режимах."""
+    engine = CondenserEngine()
+
+    berman_geometry = load_json(BERMAN_DATA_PATH / "geometrys" / "geometry.json")
+    berman_mode = load_json(BERMAN_DATA_PATH / "modes" / "mode_1.json")
+    berman_grid = {
+        "W_main": berman_mode["W_main"],
+        "t1_main": berman_mode["t1_main"],
+        "G_steam": berman_mode["G_steam"],
+    }
+    berman_points = int(np.prod([len(v) for v in berman_grid.values()]))
+
+    mv_geometry = load_json(METRO_VICKERS_DATA_PATH / "geometry_mv.json")
+    mv_mode = load_json(METRO_VICKERS_DATA_PATH / "mode_mv.json")
+    mv_inputs = metro_vickers_inputs(mv_geometry, mv_mode)
+    mv_grid = {
+        "mass_flow_cooling_water": mv_mode["W_main"],
+        "temperature_cooling_water_1": mv_mode["t1_main"],
+        "mass_flow_flow_path_1": mv_mode["G_steam"],
+    }
+    mv_points = int(np.prod([len(v) for v in mv_grid.values()]))
+
+    vku_inputs = VKUInputs(mass_flow_steam_nom=1250.0, degree_dryness_steam_nom=0.92,
+                           mass_flow_flow_path_1=1250.0, degree_dryness_flow_path_1=0.92)
+    vku_grid = {
+        "temperature_air": np.linspace(-30.0, 40.0, LARGE_GRID_SIDE),
+        "mass_flow_flow_path_1": np.linspace(300.0, 1500.0, LARGE_GRID_SIDE),
+    }
+
+    tps_inputs = TablePressureInputs(namet=NAMET, named=NAMED,
+                                     temperature_cooling_water_1=30.0, mass_flow_flow_path_1=100.0)
+    tps_grid = {
+        "temperature_cooling_water_1": np.linspace(25.0, 35.0, LARGE_GRID_SIDE),
+        "mass_flow_flow_path_1": np.linspace(20.0, 200.0, LARGE_GRID_SIDE),
+    }
+
+    cases = []
+    for name, two_bundle in (("berman_single", False), ("berman_two_bundle", True)):
+        inputs = berman_inputs(berman_geometry, berman_mode, two_bundle=two_bundle)
+        strategy, params = BermanStrategy(), inputs.to_strategy_params()
+        cases += [
+            BenchmarkCase(name, "scalar", 1, lambda s=strategy, p=params: s.calculate(p)),
+            BenchmarkCase(name, "grid", berman_points,
+                          lambda i=inputs: engine.run("berman", i, grid=berman_grid)),
+        ]
+
+    mv_strategy, mv_params = MetroVickersStrategy(), mv_inputs.to_strategy_params()
+    vku_strategy = VKUStrategy(1250.0, 0.92)
+    tps_strategy = TablePressureStrategy()
+    cases += [
+        BenchmarkCase("metro_vickers", "scalar", 1, lambda: mv_strategy.calculate(mv_params)),
+        BenchmarkCase("metro_vickers", "grid", mv_points,
+                      lambda: engine.run("metro_vickers", mv_inputs, grid=mv_grid)),
+        BenchmarkCase("vku", "scalar", 1,
+                      lambda: vku_strategy.calculate(vku_inputs.to_strategy_params())),
+        BenchmarkCase("vku", "grid", LARGE_GRID_SIDE ** 2,
+                      lambda: engine.run("vku", vku_inputs, grid=vku_grid)),
+        BenchmarkCase("table_pressure", "scalar", 1,
+                      lambda: tps_strategy.calculate(tps_inputs.to_strategy_params())),
+        BenchmarkCase("table_pressure", "grid", LARGE_GRID_SIDE ** 2,
+                      lambda: engine.run("table_pressure", tps_inputs, grid=tps_grid)),
+        BenchmarkCase("batch_calculate", "scalar", 1,
+                      lambda: batch_calculate(mv_params, {"mass_flow_cooling_water": mv_mode["W_main"][:1]})),
+        BenchmarkCase("batch_calculate", "grid", mv_points, lambda: batch_calculate(mv_params, mv_grid)),
+    ]
+    return cases
+
+
+def measure(case: BenchmarkCase, repeat: int = 5, min_time: float = 0.2) -> dict[str, float]:
+    """
+    Время одного вызова: минимум и медиана по `repeat` сериям (как у timeit).
+    Отладочный вывод методик (calculate_pressure печатает строку на точку)
+    перенаправляется, чтобы не засорять отчёт.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        case.func()  # прогрев: кеши интерполяторов, экземпляры стратегий
+        timer = timeit.Timer(case.func)
+        number = 1
+        while True:
+            if timer.timeit(number) >= min_time or number >= 1_000_000:
+                break
+            number *= 10
+        times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    best = min(times)
+    return {
+        "min_s": best,
+        "median_s": statistics.median(times),
+        "per_point_s": best / case.points,
+        "points": case.points,
+        "rounds": repeat * number,
+    }
+
+
+# ------------------------- ИСТОРИЯ ----------------------------------
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_id() -> str:
+    return f"{platform.node()}|{platform.machine()}|{platform.python_version()}"
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    """Запуски из истории; повреждённые строки (например, оборванная запись) пропускаются."""
+    if not path.exists():
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"⚠️ {path}:{number}: повреждённая запись истории пропущена")
+    return entries
+
+
+def append_history(path: Path, entry: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def build_baseline(history: list[dict[str, Any]], machine: str,
+                   runs: int = DEFAULT_BASELINE_RUNS) -> dict[str, dict]:
+    """
+    База сравнения по каждому замеру: медиана минимального времени за последние
+    `runs` запусков на машине `machine`, в которых этот замер был.
+    """
+    samples: dict[str, list[float]] = {}
+    for entry in reversed(history):
+        if entry.get("machine") != machine:
+            continue
+        for key, result in entry.get("results", {}).items():
+            values = samples.setdefault(key, [])
+            if len(values) < runs:
+                values.append(result["min_s"])
+    return {key: {"min_s": statistics.median(values), "runs": len(values)} for key, values in samples.items()}
+
+
+def find_regressions(current: dict[str, dict], baseline: dict[str, dict],
+                     threshold: float) -> dict[str, float]:
+    """Замеры, у которых минимальное время выросло больше чем на `threshold` (доля) относительно базы."""
+    regressions = {}
+    for key, result in current.items():
+        if key not in baseline or baseline[key]["min_s"] <= 0:
+            continue
+        ratio = result["min_s"] / baseline[key]["min_s"]
+        if ratio > 1.0 + threshold:
+            regressions[key] = ratio
+    return regressions
+
+
+def print_report(current: dict[str, dict], baseline: dict[str, dict], regressions: dict[str, float]) -> None:
+    print(f"{'Замер':<32} | {'Точек':>7} | {'min, мс':>10} | {'мкс/точка':>10} | {'к базе':>8}")
+    print("=" * 80)
+    for key, result in current.items():
+        ratio = f"{result['min_s'] / baseline[key]['min_s']:.2f}x" if baseline.get(key, {}).get("min_s") else "—"
+        mark = "  << РЕГРЕССИЯ" if key in regressions else ""
+        print(f"{key:<32} | {result['points']:>7} | {result['min_s'] * 1e3:>10.3f} | "
+              f"{result['per_point_s'] * 1e6:>10.3f} | {ratio:>8}{mark}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", action="append", help="Имя методики (можно несколько раз)")
+    parser.add_argument("--size", choices=("scalar", "grid"), help="Только один размер")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="Файл истории JSON Lines")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Допустимый рост времени (доля), по умолчанию 0.25")
+    parser.add_argument("--repeat", type=int, default=5, help="Число серий замера")
+    parser.add_argument("--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS,
+                        help="Сколько последних запусков на этой машине входит в базу (медиана)")
+    parser.add_argument("--save", action="store_true", help="Дописать результат в историю")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in build_cases()
+             if (not args.case or c.name in args.case) and (not args.size or c.size == args.size)]
+    current = {case.key: measure(case, repeat=args.repeat) for case in cases}
+
+    machine = machine_id()
+    baseline = build_baseline(load_history(args.history), machine, args.baseline_runs)
+    regressions = find_regressions(current, baseline, args.threshold)
+    print_report(current, baseline, regressions)
+
+    if args.save:
+        append_history(args.history, {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "machine": machine,
+            "results": current,
+        })
+        print(f"\nРезультат записан в {args.history}")
+
+    if regressions:
+        print(f"\nРегрессия производительности (порог {args.threshold:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
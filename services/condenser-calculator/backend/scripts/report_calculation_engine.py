@@ -8,7 +8,7 @@ import numpy as np
 from scipy.interpolate import CubicSpline
 from scipy.optimize import curve_fit
 
-from app.utils.calculation_engine import k_interpolation_data
+from app.utils.tables import get_table
 
 
 def power_law_model(v, a, b, c):
@@ -16,9 +16,9 @@ def power_law_model(v, a, b, c):
 
 
 def plot_hybrid_extrapolation():
-    speeds = np.array(k_interpolation_data["speed_points"])
-    temperatures = np.array(k_interpolation_data["temperature_points"])
-    k_values_matrix = np.array(k_interpolation_data["k_values_matrix"])
+    speeds = get_table("k_speed_points")
+    temperatures = get_table("k_temperature_points")
+    k_values_matrix = get_table("k_values")
     new_speeds = np.arange(0, 10.01, 0.2)
 
     print("Применение гибридной модели с ручной коррекцией от 0 до 0.4 м/с...")
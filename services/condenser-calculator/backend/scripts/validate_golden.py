@@ -0,0 +1,164 @@
+"""
+Валидация методики Бермана по всем эталонным случаям за один прогон.
+
+Случаи из `validation_data/condenser-calculator/strategies/berman` один раз
+разворачиваются в колонки и кешируются в `.validation_cache/` (файлы .npy,
+читаются через memory-map). Все случаи считаются одним вызовом
+`CondenserEngine.run(..., product=False, mode="pooled")` в пуле процессов,
+затем строится единый отчёт допусков: по наборам данных и по полям —
+число случаев, число прошедших, максимальные абсолютная и относительная
+погрешности, а также худшие случаи.
+
+    python scripts/validate_golden.py                 # отчёт, код возврата 1 при выходе за допуск
+    python scripts/validate_golden.py --worst 20 --json report.json
+    python scripts/validate_golden.py --mode vectorized --workers 1
+"""
+
+from _common import setup_path
+
+
+setup_path()
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from _golden_data import BERMAN_CASE_FIELDS, load_berman_golden
+
+from app.utils.condenser_engine import BermanInputs, CondenserEngine
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".validation_cache" / "berman"
+DEFAULT_REL_TOLERANCE = 0.001  # как assert_pressure_approx в tests/validation/berman
+
+# Выходное поле методики → колонка эталона
+GOLDEN_FIELDS = {"P_steam_formula_atm": "expected_pressure"}
+
+
+@dataclass
+class FieldReport:
+    field: str
+    dataset: str
+    cases: int
+    passed: int
+    not_computed: int
+    max_abs_error: float
+    max_rel_error: float
+
+    @property
+    def ok(self) -> bool:
+        return self.passed == self.cases
+
+
+def run_cases(columns: dict[str, np.ndarray], *, mode: str = "pooled",
+              max_workers: int | None = None) -> dict[str, np.ndarray]:
+    """Расчёт всех случаев одним вызовом движка (поэлементная сетка по колонкам случаев)."""
+    base = BermanInputs(**{name: columns[name][0].item() for name in BERMAN_CASE_FIELDS})
+    grid = {name: columns[name] for name in BERMAN_CASE_FIELDS}
+    with CondenserEngine(max_workers=max_workers) as engine, contextlib.redirect_stdout(io.StringIO()):
+        result = engine.run("berman", base, grid=grid, product=False, mode=mode)
+    return result.output_columns
+
+
+def relative_errors(calculated: np.ndarray, expected: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Абсолютная и относительная погрешности; нерассчитанные точки — inf."""
+    abs_error = np.abs(calculated - expected)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_error = abs_error / np.abs(expected)
+    return np.nan_to_num(abs_error, nan=np.inf), np.nan_to_num(rel_error, nan=np.inf)
+
+
+def build_report(columns: dict[str, np.ndarray], outputs: dict[str, np.ndarray], ids: list[str],
+                 rel_tolerance: float, worst: int) -> tuple[list[FieldReport], list[dict[str, Any]]]:
+    """Сводка по (полю, набору данных) плюс строка "all" и `worst` худших случаев."""
+    datasets = np.asarray(columns["dataset"])
+    reports, worst_cases = [], []
+
+    for field, golden in GOLDEN_FIELDS.items():
+        expected = np.asarray(columns[golden], dtype=float)
+        calculated = np.asarray(outputs.get(field, np.full(expected.size, np.nan)), dtype=float)
+        abs_error, rel_error = relative_errors(calculated, expected)
+        passed = rel_error <= rel_tolerance
+
+        for dataset in [*dict.fromkeys(datasets.tolist()), "all"]:
+            mask = np.ones(expected.size, dtype=bool) if dataset == "all" else datasets == dataset
+            reports.append(FieldReport(
+                field=field,
+                dataset=dataset,
+                cases=int(mask.sum()),
+                passed=int(passed[mask].sum()),
+                not_computed=int(np.isnan(calculated[mask]).sum()),
+                max_abs_error=float(abs_error[mask].max()),
+                max_rel_error=float(rel_error[mask].max()),
+            ))
+
+        for i in np.argsort(-rel_error, kind="stable")[:worst]:
+            worst_cases.append({
+                "field": field,
+                "id": ids[i],
+                "calculated": float(calculated[i]),
+                "expected": float(expected[i]),
+                "rel_error": float(rel_error[i]),
+                "inputs": {name: columns[name][i].item() for name in BERMAN_CASE_FIELDS},
+            })
+    return reports, worst_cases
+
+
+def print_report(reports: list[FieldReport], worst_cases: list[dict[str, Any]], rel_tolerance: float) -> None:
+    print(f"Допуск: относительная погрешность ≤ {rel_tolerance:g}\n")
+    print(f"{'Поле':<22} | {'Набор':<10} | {'Случаев':>7} | {'Прошло':>7} | {'Не расч.':>8} | "
+          f"{'max abs':>10} | {'max rel':>10}")
+    print("=" * 95)
+    for r in reports:
+        print(f"{r.field:<22} | {r.dataset:<10} | {r.cases:>7} | {r.passed:>7} | {r.not_computed:>8} | "
+              f"{r.max_abs_error:>10.3g} | {r.max_rel_error:>10.3g}")
+
+    if worst_cases:
+        print("\nХудшие случаи:")
+        for case in worst_cases:
+            print(f"  {case['id']:<60} расчёт={case['calculated']:.6g} эталон={case['expected']:.6g} "
+                  f"rel={case['rel_error']:.3g}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Каталог кеша .npy")
+    parser.add_argument("--rel-tol", type=float, default=DEFAULT_REL_TOLERANCE, help="Допуск (доля)")
+    parser.add_argument("--worst", type=int, default=10, help="Сколько худших случаев показать")
+    parser.add_argument("--mode", choices=("pooled", "vectorized", "scalar"), default="pooled",
+                        help="Режим исполнения движка")
+    parser.add_argument("--workers", type=int, help="Число процессов пула (по умолчанию — по числу ядер)")
+    parser.add_argument("--json", type=Path, help="Сохранить отчёт в JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    columns, ids = load_berman_golden(args.cache_dir)
+    loaded = time.perf_counter()
+    outputs = run_cases(columns, mode=args.mode, max_workers=args.workers)
+    computed = time.perf_counter()
+
+    reports, worst_cases = build_report(columns, outputs, ids, args.rel_tol, args.worst)
+    print_report(reports, worst_cases, args.rel_tol)
+    print(f"\nЗагрузка: {loaded - started:.2f} с, расчёт {len(ids)} случаев: {computed - loaded:.2f} с")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "rel_tolerance": args.rel_tol,
+                "fields": [{**asdict(r), "ok": r.ok} for r in reports],
+                "worst": worst_cases,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"Отчёт записан в {args.json}")
+
+    return 0 if all(r.ok for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,11 @@ BACKEND_ROOT = Path(__file__).resolve().parents[1]  # .../backend
 if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
 
+# --- sys.path: скрипты (`_golden_data`, `validate_golden`, ...) импортируются по имени модуля ---
+SCRIPTS_ROOT = BACKEND_ROOT / "scripts"
+if str(SCRIPTS_ROOT) not in sys.path:
+    sys.path.append(str(SCRIPTS_ROOT))
+
 
 # --- пути к данным ---
 MONOREPO_ROOT = _find_monorepo_root(Path(__file__))
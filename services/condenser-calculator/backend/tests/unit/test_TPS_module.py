@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from app.utils.TPS_module import TablePressureStrategy
+
+
+NAMET = [
+    [35, 33, 30, 25],
+    [20, 50, 100, 150, 200],
+    [
+        [6.549, 7.211, 8.88, 10.945, 13.409],
+        [5.9, 6.499, 8.018, 9.927, 12.214],
+        [5.036, 5.552, 6.872, 8.572, 10.622],
+        [3.851, 4.257, 5.299, 6.712, 8.438],
+    ],
+]
+NAMED = [
+    [15.3, 26.8, 38.4, 49.9, 61.5, 73],
+    [0.157, 0.258, 0.469, 0.607, 0.763, 0.919],
+]
+
+
+class TestTablePressureStrategy:
+    """Тесты табличного метода и кеша интерполяторов."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        TablePressureStrategy.clear_cache()
+        self.strategy = TablePressureStrategy()
+        self.params = {
+            "NAMET": {"data": NAMET},
+            "NAMED": {"data": NAMED},
+            "inputs": {"temperature_cooling_water_1": 30.0, "mass_flow_flow_path_1": 100.0},
+        }
+        yield
+        TablePressureStrategy.clear_cache()
+
+    def test_calculation_on_grid_point(self):
+        """Точка в узле таблицы NAMET."""
+        result = self.strategy.calculate(self.params)
+        assert result["pressure_flow_path_1_NAMET"] == pytest.approx(6.872, abs=1e-9)
+        assert result["pressure_flow_path_1"] == pytest.approx(6.872, abs=1e-9)
+
+    def test_interpolators_are_cached_across_instances(self):
+        """Повторный расчёт по тем же таблицам не строит интерполяторы заново."""
+        self.strategy.calculate(self.params)
+        TablePressureStrategy().calculate(self.params)
+
+        info = TablePressureStrategy.cache_info()
+        assert info["misses"] == 2
+        assert info["hits"] == 2
+        assert info["size"] == 2
+
+    def test_changed_table_is_cache_miss(self):
+        """Изменение содержимого таблицы даёт новый ключ кеша."""
+        self.strategy.calculate(self.params)
+        named_changed = [NAMED[0], [v * 2 for v in NAMED[1]]]
+        params = {**self.params, "NAMED": {"data": named_changed}}
+        result = self.strategy.calculate(params)
+
+        assert TablePressureStrategy.cache_info()["misses"] == 3
+        assert result["pressure_flow_path_1_NAMED"] == pytest.approx(
+            2 * self.strategy.calculate(self.params)["pressure_flow_path_1_NAMED"]
+        )
+
+    def test_lru_eviction(self, monkeypatch):
+        monkeypatch.setattr(TablePressureStrategy, "_CACHE_MAXSIZE", 2)
+        for shift in range(3):
+            named = [NAMED[0], [v + shift for v in NAMED[1]]]
+            self.strategy._get_interpolator("NAMED", named)
+        assert TablePressureStrategy.cache_info()["size"] == 2
+
+        # Самая старая таблица вытеснена — повторный запрос является промахом
+        self.strategy._get_interpolator("NAMED", NAMED)
+        assert TablePressureStrategy.cache_info()["misses"] == 4
+
+    def test_calculate_many_matches_calculate(self):
+        """Пакетный расчёт совпадает с поточечным."""
+        t_cw1 = np.array([26.0, 28.5, 30.0, 34.0])
+        g = np.array([20.0, 75.0, 112.0, 200.0])
+        batch = self.strategy.calculate_many(NAMET, NAMED, t_cw1, g)
+
+        for i, (t, gi) in enumerate(zip(t_cw1, g, strict=True)):
+            params = {**self.params, "inputs": {"temperature_cooling_water_1": t, "mass_flow_flow_path_1": gi}}
+            single = self.strategy.calculate(params)
+            for key, value in single.items():
+                assert batch[key][i] == pytest.approx(value, rel=1e-12)
+
+    def test_calculate_many_broadcasts(self):
+        """Массив температур против скаляра расхода."""
+        batch = self.strategy.calculate_many(NAMET, NAMED, np.array([26.0, 30.0]), 100.0)
+        assert batch["pressure_flow_path_1"].shape == (2,)
@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from app.utils.VKU_strategy import VKUStrategy
+from app.utils.VKU_strategy import VKUStrategy, read_weather_series
 
 
 class TestVKUStrategy:
@@ -69,3 +70,65 @@ class TestVKUStrategy:
 
         with pytest.raises(KeyError):
             self.strategy.calculate(params)
+
+    def test_calculate_many_matches_calculate(self):
+        """Тест: Пакетный расчет совпадает с поточечным."""
+        g = np.array([900.0, 1187.5, 1250.0, 1500.0])
+        x = np.array([0.9, 0.92, 0.92, 0.95])
+        t_air = np.array([20.0, 27.5, 30.0, 38.0])
+
+        batch = self.strategy.calculate_many(g, x, t_air)
+
+        for i in range(g.size):
+            single = self.strategy.calculate({
+                'mass_flow_flow_path_1': g[i],
+                'degree_dryness_flow_path_1': x[i],
+                'temperature_air': t_air[i]
+            })
+            assert batch['pressure_flow_path_1'][i] == pytest.approx(single['pressure_flow_path_1'], rel=1e-12)
+            assert batch['mass_flow_reduced_steam_condencer'][i] == pytest.approx(
+                single['mass_flow_reduced_steam_condencer'], rel=1e-12)
+
+    def test_calculate_many_broadcast_and_default_temperature(self):
+        """Тест: Один режим на ряд температур и температура по умолчанию."""
+        year = np.linspace(20.0, 40.0, 8760)
+        batch = self.strategy.calculate_many(1250.0, 0.92, year)
+        assert batch['pressure_flow_path_1'].shape == (8760,)
+        assert batch['pressure_flow_path_1'][0] == pytest.approx(self.p_at_100_20, abs=1e-7)
+
+        default = self.strategy.calculate_many(np.array([1250.0]), 0.92)
+        assert default['pressure_flow_path_1'][0] == pytest.approx(self.p_at_100_20, abs=1e-7)
+
+    def test_weather_series_csv_streaming(self, tmp_path):
+        """Тест: Потоковый расчет по CSV с десятичной запятой, по частям."""
+        path = tmp_path / "weather.csv"
+        temps = [20.0, 25.0, 30.0, 35.0, 40.0]
+        path.write_text("hour;t_air\n" + "\n".join(f"{i};{t:.1f}".replace(".", ",") for i, t in enumerate(temps)),
+                        encoding="utf-8")
+
+        chunks = list(read_weather_series(path, "t_air", chunk_size=2, delimiter=";"))
+        assert [c.size for c in chunks] == [2, 2, 1]
+
+        results = list(self.strategy.calculate_weather_series(
+            path, 1250.0, 0.92, column="t_air", chunk_size=2, delimiter=";"))
+        pressures = np.concatenate([r['pressure_flow_path_1'] for r in results])
+        assert pressures[0] == pytest.approx(self.p_at_100_20, abs=1e-7)
+        assert pressures[2] == pytest.approx(self.p_at_100_30, abs=1e-7)
+
+    def test_weather_series_missing_column(self, tmp_path):
+        """Тест: Отсутствующий столбец в файле погоды."""
+        path = tmp_path / "weather.csv"
+        path.write_text("hour,t\n0,20\n", encoding="utf-8")
+        with pytest.raises(KeyError):
+            next(read_weather_series(path))
+
+    def test_weather_series_parquet_streaming(self, tmp_path):
+        """Тест: Потоковое чтение ряда температур из Parquet."""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "weather.parquet"
+        pq.write_table(pa.table({'temperature_air': np.linspace(20.0, 40.0, 10)}), path)
+
+        results = list(self.strategy.calculate_weather_series(path, 1250.0, 0.92, chunk_size=4))
+        assert [r['pressure_flow_path_1'].size for r in results] == [4, 4, 2]
+        assert results[0]['pressure_flow_path_1'][0] == pytest.approx(self.p_at_100_20, abs=1e-7)
@@ -0,0 +1,84 @@
+# tests/unit/test_benchmark_strategies.py
+"""
+Юнит-тесты истории и проверки регрессий бенчмарков (scripts/benchmark_strategies.py).
+"""
+
+import pytest
+from benchmark_strategies import append_history, build_baseline, find_regressions, load_history
+
+
+def _entry(machine: str, **min_s: float) -> dict:
+    return {"machine": machine, "results": {key: {"min_s": value} for key, value in min_s.items()}}
+
+
+class TestHistory:
+    """Запись и чтение истории JSON Lines."""
+
+    def test_missing_file_is_empty_history(self, tmp_path):
+        assert load_history(tmp_path / "history.jsonl") == []
+
+    def test_append_and_load_round_trip(self, tmp_path):
+        path = tmp_path / ".benchmarks" / "history.jsonl"
+        append_history(path, _entry("m1", vku=1.0))
+        append_history(path, {**_entry("m1", vku=2.0), "commit": "абв"})
+
+        assert load_history(path) == [_entry("m1", vku=1.0), {**_entry("m1", vku=2.0), "commit": "абв"}]
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_blank_and_broken_lines_skipped(self, tmp_path, capsys):
+        path = tmp_path / "history.jsonl"
+        append_history(path, _entry("m1", vku=1.0))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n{\"machine\": \"m1\", \"res")  # оборванная последняя запись
+
+        assert load_history(path) == [_entry("m1", vku=1.0)]
+        assert "history.jsonl:3" in capsys.readouterr().out
+
+
+class TestBaseline:
+    """База сравнения — медиана последних запусков на той же машине."""
+
+    def test_median_of_last_runs_on_same_machine(self):
+        history = [
+            _entry("m1", vku=100.0),            # вне окна из трёх запусков
+            _entry("m1", vku=1.0),
+            _entry("m2", vku=50.0),             # другая машина
+            _entry("m1", vku=3.0),
+            _entry("m1", vku=1.2),
+        ]
+
+        baseline = build_baseline(history, "m1", runs=3)
+
+        assert baseline == {"vku": {"min_s": 1.2, "runs": 3}}
+
+    def test_window_counts_runs_per_case(self):
+        history = [_entry("m1", vku=1.0, tps=10.0), _entry("m1", vku=2.0), _entry("m1", vku=3.0)]
+
+        baseline = build_baseline(history, "m1", runs=2)
+
+        assert baseline["vku"]["min_s"] == pytest.approx(2.5)
+        assert baseline["tps"] == {"min_s": 10.0, "runs": 1}
+
+    def test_no_runs_on_machine(self):
+        assert build_baseline([_entry("m2", vku=1.0)], "m1") == {}
+
+
+class TestFindRegressions:
+    """Регрессия — рост минимального времени больше порога."""
+
+    def test_threshold(self):
+        baseline = {"vku": {"min_s": 1.0}, "tps": {"min_s": 2.0}}
+        current = {"vku": {"min_s": 1.3}, "tps": {"min_s": 2.4}, "new": {"min_s": 5.0}}
+
+        assert find_regressions(current, baseline, threshold=0.25) == {"vku": pytest.approx(1.3)}
+
+    def test_single_noisy_run_does_not_trigger(self):
+        # Один медленный запуск в истории не сдвигает медиану и не маскирует замер
+        history = [_entry("m1", vku=1.0), _entry("m1", vku=3.0), _entry("m1", vku=1.05)]
+        baseline = build_baseline(history, "m1", runs=3)
+
+        assert find_regressions({"vku": {"min_s": 1.1}}, baseline, threshold=0.25) == {}
+        assert find_regressions({"vku": {"min_s": 1.5}}, baseline, threshold=0.25) == {"vku": pytest.approx(1.5 / 1.05)}
+
+    def test_zero_baseline_ignored(self):
+        assert find_regressions({"vku": {"min_s": 1.0}}, {"vku": {"min_s": 0.0}}, threshold=0.25) == {}
@@ -0,0 +1,181 @@
+import json
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import calculations
+from app.core.job_queue import JobQueue
+from app.dependencies import get_berman_cache, get_engine, get_job_queue
+from app.main import app
+from app.utils.berman_incremental import IncrementalBerman
+from app.utils.condenser_engine import CondenserEngine
+from app.utils.ejector import ejector_pressure
+
+
+VKU_INPUTS = {
+    "mass_flow_steam_nom": 1250.0,
+    "degree_dryness_steam_nom": 0.92,
+    "mass_flow_flow_path_1": 1250.0,
+    "degree_dryness_flow_path_1": 0.92,
+}
+GRID = {"temperature_air": [20.0, 25.0, 30.0, 35.0, 40.0], "mass_flow_flow_path_1": [900.0, 1250.0]}
+
+
+class _PendingExecutor(Executor):
+    """Исполнитель, который никогда не берёт части в работу (для проверки отмены)."""
+
+    def submit(self, fn, *args, **kwargs):
+        return Future()
+
+
+class TestCondenserApi:
+    """Тесты HTTP-сервиса: синхронный расчёт и очередь заданий."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.engine = CondenserEngine()
+        self.queue = JobQueue(self.engine, chunk_size=3, executor=ThreadPoolExecutor(max_workers=2))
+        app.dependency_overrides[get_engine] = lambda: self.engine
+        app.dependency_overrides[get_job_queue] = lambda: self.queue
+        self.berman_cache = IncrementalBerman()
+        app.dependency_overrides[get_berman_cache] = lambda: self.berman_cache
+        self.client = TestClient(app)
+        yield
+        app.dependency_overrides.clear()
+        self.queue._executor.shutdown()
+
+    def _wait(self, job_id: str) -> dict:
+        for _ in range(200):
+            job = self.client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] != "running":
+                return job
+            time.sleep(0.01)
+        raise AssertionError("Задание не завершилось")
+
+    def test_health(self):
+        assert self.client.get("/health").json()["status"] == "ok"
+
+    def test_strategies(self):
+        strategies = self.client.get("/api/v1/strategies").json()
+        assert "temperature_air" in strategies["vku"]
+        assert "lambda" in strategies["berman"]
+
+    def test_sync_calculation_matches_engine(self):
+        response = self.client.post("/api/v1/calculations", json={
+            "strategy": "vku", "inputs": VKU_INPUTS, "grid": GRID,
+        })
+        assert response.status_code == 200
+        body = response.json()
+        expected = self.engine.run("vku", VKU_INPUTS, grid=GRID)
+        assert body["size"] == 10
+        np.testing.assert_allclose(body["columns"]["pressure_flow_path_1"],
+                                   expected.columns["pressure_flow_path_1"])
+
+    def test_sync_limit(self, monkeypatch):
+        """Сетка больше лимита отправляется в очередь заданий."""
+        monkeypatch.setattr(calculations, "settings", replace(calculations.settings, SYNC_MAX_POINTS=3))
+        response = self.client.post("/api/v1/calculations", json={
+            "strategy": "vku", "inputs": VKU_INPUTS, "grid": GRID,
+        })
+        assert response.status_code == 413
+        assert "/jobs" in response.json()["detail"]
+
+    def test_sync_limit_checked_before_expanding_grid(self, monkeypatch):
+        """Размер сетки считается по длинам осей: большая сетка не разворачивается."""
+        monkeypatch.setattr(self.engine, "expand_grid", lambda *a, **k: pytest.fail("сетка развёрнута"))
+        axis = list(np.linspace(1000.0, 1250.0, 2000))
+        response = self.client.post("/api/v1/calculations", json={
+            "strategy": "vku", "inputs": VKU_INPUTS,
+            "grid": {"temperature_air": axis, "mass_flow_flow_path_1": axis},
+        })
+        assert response.status_code == 413
+        assert "4000000" in response.json()["detail"]
+
+    def test_errors(self):
+        assert self.client.post("/api/v1/calculations", json={
+            "strategy": "unknown", "inputs": {},
+        }).status_code == 404
+        response = self.client.post("/api/v1/jobs", json={
+            "strategy": "vku", "inputs": {"mass_flow_steam_nom": 1250.0},
+        })
+        assert response.status_code == 422
+        assert "Отсутствует обязательный параметр" in response.json()["detail"]
+
+    def test_ejector(self):
+        response = self.client.post("/api/v1/ejector", json={"inlet_temperatures": [20.0, 30.0], "G_air": 16.5})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["number_of_ejectors"] == [1, 2]
+        np.testing.assert_allclose(body["P_ejector_kPa"],
+                                   ejector_pressure([20.0, 30.0], 16.5)["P_ejector_kPa"])
+
+        assert self.client.post("/api/v1/ejector", json={
+            "inlet_temperatures": [20.0], "G_air": 1.0, "number_of_ejectors": [0],
+        }).status_code == 422
+
+    def test_berman_table_incremental(self):
+        params = {
+            "L_main": 7500.0, "N_main": 12000, "Z_main": 2, "d_in": 20.0, "S_tube": 1.0,
+            "G_nom": 350.0, "H_steam": 515.0, "lambda": 90.0,
+            "W_main_list": [10000.0, 12000.0], "t1_main_list": [10.0, 20.0],
+            "G_steam_list": [100.0, 200.0], "coefficient_b_list": [1.0],
+        }
+        first = self.client.post("/api/v1/berman/table", json={"params": params}).json()
+        assert first["size"] == 8
+        assert first["dims"][0] == "W_main"
+        assert len(first["columns"]["P_steam_formula_atm"]) == 8
+
+        params["coefficient_b_list"] = [0.8]
+        second = self.client.post("/api/v1/berman/table", json={"params": params}).json()
+        assert second["stages"]["load"] == {"computed": 0, "reused": 8}
+        assert second["stages"]["solution"]["computed"] == 8
+
+        del params["G_steam_list"]
+        response = self.client.post("/api/v1/berman/table", json={"params": params})
+        assert response.status_code == 422
+        assert "G_steam_list" in response.json()["detail"]
+
+    def test_job_lifecycle(self):
+        """Постановка, опрос прогресса, части и полный результат NDJSON."""
+        response = self.client.post("/api/v1/jobs", json={
+            "strategy": "vku", "inputs": VKU_INPUTS, "grid": GRID,
+        })
+        assert response.status_code == 202
+        job = self._wait(response.json()["job_id"])
+        assert job["status"] == "done"
+        assert job["chunks_total"] == 4
+        assert job["progress"] == 1.0
+
+        chunk = self.client.get(f"/api/v1/jobs/{job['job_id']}/chunks/3").json()
+        assert (chunk["start"], chunk["stop"]) == (9, 10)
+        assert len(chunk["columns"]["pressure_flow_path_1"]) == 1
+
+        response = self.client.get(f"/api/v1/jobs/{job['job_id']}/result")
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["content-encoding"] == "gzip"
+        lines = response.text.splitlines()
+        records = [json.loads(line) for line in lines]
+        expected = self.engine.run("vku", VKU_INPUTS, grid=GRID).to_records()
+        assert len(records) == len(expected)
+        for record, row in zip(records, expected, strict=True):
+            assert record["temperature_air"] == row["temperature_air"]
+            assert record["pressure_flow_path_1"] == pytest.approx(row["pressure_flow_path_1"], rel=1e-12)
+
+    def test_cancel(self):
+        self.queue._executor = _PendingExecutor()
+        job_id = self.client.post("/api/v1/jobs", json={
+            "strategy": "vku", "inputs": VKU_INPUTS, "grid": GRID,
+        }).json()["job_id"]
+
+        assert self.client.get(f"/api/v1/jobs/{job_id}/chunks/0").status_code == 409
+        assert self.client.delete(f"/api/v1/jobs/{job_id}").json()["status"] == "cancelled"
+        assert self.client.get(f"/api/v1/jobs/{job_id}/result").status_code == 409
+        assert all(f.cancelled() for f in self.queue.get(job_id).futures)
+
+    def test_unknown_job(self):
+        assert self.client.get("/api/v1/jobs/missing").status_code == 404
+        assert self.client.delete("/api/v1/jobs/missing").status_code == 404
@@ -0,0 +1,216 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.utils.calculation_engine import batch_calculate
+from app.utils.condenser_engine import (
+    BermanInputs,
+    CondenserEngine,
+    StrategyAdapter,
+    TablePressureInputs,
+    UnknownStrategyError,
+    VKUInputs,
+)
+from app.utils.VKU_strategy import VKUStrategy
+
+
+MV_PARAMS = {
+    'diameter_inside_of_pipes': 22.4,
+    'thickness_pipe_wall': 0.8,
+    'length_cooling_tubes_of_the_main_bundle': 13910,
+    'number_cooling_tubes_of_the_main_bundle': 20904,
+    'number_cooling_tubes_of_the_built_in_bundle': 0,
+    'number_cooling_water_passes_of_the_main_bundle': 2,
+    'mass_flow_cooling_water': 45000.0,
+    'temperature_cooling_water_1': 45.0,
+    'thermal_conductivity_cooling_surface_tube_material': 16.2,
+    'coefficient_b': 1.0,
+    'mass_flow_flow_path_1': 200.0,
+    'degree_dryness_flow_path_1': 0.95,
+}
+
+NAMET = [
+    [35, 33, 30, 25],
+    [20, 50, 100, 150, 200],
+    [
+        [6.549, 7.211, 8.88, 10.945, 13.409],
+        [5.9, 6.499, 8.018, 9.927, 12.214],
+        [5.036, 5.552, 6.872, 8.572, 10.622],
+        [3.851, 4.257, 5.299, 6.712, 8.438],
+    ],
+]
+NAMED = [
+    [15.3, 26.8, 38.4, 49.9, 61.5, 73],
+    [0.157, 0.258, 0.469, 0.607, 0.763, 0.919],
+]
+
+
+class TestCondenserEngine:
+    """Тесты единого движка расчёта конденсатора."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.engine = CondenserEngine(max_workers=2)
+        self.vku_inputs = VKUInputs(
+            mass_flow_steam_nom=1250.0,
+            degree_dryness_steam_nom=0.92,
+            mass_flow_flow_path_1=1250.0,
+            degree_dryness_flow_path_1=0.92,
+        )
+        yield
+        self.engine.close()
+
+    def test_registry_contains_all_strategies(self):
+        """В реестре по умолчанию есть все методики."""
+        assert set(self.engine.strategies) >= {
+            "berman", "metro_vickers", "metro_vickers_engine", "vku", "table_pressure", "exceptions"
+        }
+
+    def test_unknown_strategy(self):
+        with pytest.raises(UnknownStrategyError):
+            self.engine.run("unknown", {})
+
+    def test_duplicate_registration_fails(self):
+        adapter = self.engine.get_adapter("vku")
+        with pytest.raises(ValueError, match="уже зарегистрирована"):
+            self.engine.register(adapter)
+
+    def test_custom_strategy_registration(self):
+        """Новая методика подключается через адаптер."""
+        self.engine.register(StrategyAdapter(
+            name="double_vku",
+            inputs_model=VKUInputs,
+            factory=lambda inputs: None,
+            calculate=lambda _s, inputs: {"value": 2 * inputs.temperature_air},
+        ))
+        result = self.engine.run("double_vku", self.vku_inputs, grid={"temperature_air": [1.0, 2.0]})
+        np.testing.assert_allclose(result.columns["value"], [2.0, 4.0])
+
+    def test_unknown_grid_field(self):
+        with pytest.raises(KeyError):
+            self.engine.run("vku", self.vku_inputs, grid={"t_air": [20.0]})
+
+    def test_grid_points_match_expanded_grid(self):
+        grid = {"mass_flow_flow_path_1": [900.0, 1250.0], "temperature_air": [20.0, 27.5, 40.0]}
+        assert self.engine.grid_points("vku", grid) == len(self.engine.expand_grid("vku", grid)["temperature_air"]) == 6
+        assert self.engine.grid_points("vku", {"mass_flow_flow_path_1": [900.0], "temperature_air": [20.0]},
+                                       product=False) == 1
+        assert self.engine.grid_points("vku", None) == 1
+        with pytest.raises(ValueError, match="одной длины"):
+            self.engine.grid_points("vku", grid, product=False)
+        with pytest.raises(KeyError):
+            self.engine.grid_points("vku", {"t_air": [20.0]})
+
+    def test_missing_required_param(self):
+        with pytest.raises(KeyError, match="mass_flow_flow_path_1"):
+            self.engine.run("vku", {"mass_flow_steam_nom": 1250.0, "degree_dryness_steam_nom": 0.92})
+
+    def test_vectorized_matches_scalar_strategy(self):
+        """Векторный расчёт ВКУ совпадает с поточечным вызовом VKUStrategy."""
+        grid = {"mass_flow_flow_path_1": [900.0, 1250.0], "temperature_air": [20.0, 27.5, 40.0]}
+        result = self.engine.run("vku", self.vku_inputs, grid=grid, mode="vectorized")
+
+        strategy = VKUStrategy(1250.0, 0.92)
+        expected = [
+            strategy.calculate({
+                "mass_flow_flow_path_1": g,
+                "degree_dryness_flow_path_1": 0.92,
+                "temperature_air": t,
+            })["pressure_flow_path_1"]
+            for g, t in itertools.product(*grid.values())
+        ]
+        np.testing.assert_allclose(result.columns["pressure_flow_path_1"], expected, rtol=1e-12)
+        np.testing.assert_array_equal(result.columns["temperature_air"], [20.0, 27.5, 40.0] * 2)
+
+    def test_zipped_grid(self):
+        """product=False: массивы сетки берутся поэлементно."""
+        result = self.engine.run(
+            "vku", self.vku_inputs,
+            grid={"mass_flow_flow_path_1": [900.0, 1250.0], "temperature_air": [20.0, 30.0]},
+            product=False,
+        )
+        assert result.size == 2
+        assert result.columns["pressure_flow_path_1"][1] == pytest.approx(0.097280927, abs=1e-7)
+
+    def test_table_pressure_vectorized_matches_scalar(self):
+        inputs = TablePressureInputs(
+            namet=NAMET, named=NAMED, temperature_cooling_water_1=30.0, mass_flow_flow_path_1=112.0
+        )
+        grid = {"temperature_cooling_water_1": [26.0, 30.0, 34.0], "mass_flow_flow_path_1": [50.0, 112.0]}
+        vectorized = self.engine.run("table_pressure", inputs, grid=grid)
+        scalar = self.engine.run("table_pressure", inputs, grid=grid, mode="scalar")
+        for name in ("pressure_flow_path_1_NAMET", "pressure_flow_path_1_NAMED", "pressure_flow_path_1"):
+            np.testing.assert_allclose(vectorized.columns[name], scalar.columns[name], rtol=1e-12)
+
+    def test_berman_grid(self):
+        """Берман по сетке температур: t_sat растёт с температурой воды."""
+        inputs = BermanInputs(
+            L_main=7500.0, N_main=12000, Z_main=2, d_in=20.0, S_tube=1.0,
+            H_steam=515.0, G_nom=350.0, W_main=12000.0, t1_main=20.0, G_steam=200.0,
+        )
+        result = self.engine.run("berman", inputs, grid={"t1_main": [10.0, 20.0, 30.0]})
+        t_sat = result.columns["t_sat"]
+        assert result.size == 3
+        assert np.all(np.diff(t_sat) > 0)
+
+    def test_berman_vectorized_matches_scalar(self):
+        """Векторный расчёт Бермана совпадает с поточечным, включая пропущенные точки и два пучка."""
+        inputs = BermanInputs(
+            L_main=7500.0, N_main=12000, Z_main=2, d_in=20.0, S_tube=1.0, H_steam=515.0, G_nom=350.0,
+            W_main=12000.0, t1_main=20.0, G_steam=200.0,
+            L_builtin=7500.0, N_builtin=2000, Z_builtin=2, W_builtin=2000.0, t1_builtin=20.0,
+        )
+        grid = {"t1_main": [10.0, 25.0, 40.0], "G_steam": [0.0, 150.0, 250.0], "coefficient_b": [0.8, 1.0]}
+        vectorized = self.engine.run("berman", inputs, grid=grid)
+        scalar = self.engine.run("berman", inputs, grid=grid, mode="scalar")
+
+        assert vectorized.mode == "vectorized"
+        assert np.isnan(vectorized.columns["t_sat"][0])  # G_steam = 0 — точка не считается
+        for name in ("t_sat", "P_steam_seuif_Pa", "P_steam_formula_atm", "K_dirty_builtin", "t2_builtin"):
+            np.testing.assert_allclose(vectorized.columns[name], scalar.columns[name], rtol=1e-12)
+
+    def test_metro_vickers_vectorized_matches_scalar(self):
+        grid = {"temperature_cooling_water_1": [12.0, 20.0, 30.0], "mass_flow_flow_path_1": [150.0, 200.0],
+                "coefficient_b": [0.85, 1.0]}
+        vectorized = self.engine.run("metro_vickers", MV_PARAMS, grid=grid)
+        scalar = self.engine.run("metro_vickers", MV_PARAMS, grid=grid, mode="scalar")
+
+        assert vectorized.mode == "vectorized"
+        assert set(vectorized.output_columns) == set(scalar.output_columns)
+        for name, values in scalar.output_columns.items():
+            np.testing.assert_allclose(vectorized.output_columns[name], values, rtol=1e-12, err_msg=name)
+
+    def test_mode_reports_point_fallback(self):
+        """Методика без векторного расчёта считается поточечно, и результат об этом сообщает."""
+        result = self.engine.run("metro_vickers_engine", MV_PARAMS, grid={"temperature_cooling_water_1": [20.0, 30.0]})
+        assert result.mode == "scalar"
+        assert self.engine.run("vku", self.vku_inputs, grid={"temperature_air": [20.0]}).mode == "vectorized"
+
+    def test_pooled_matches_vectorized(self):
+        grid = {"temperature_air": np.linspace(20.0, 40.0, 30), "mass_flow_flow_path_1": [900.0, 1250.0]}
+        pooled = self.engine.run("vku", self.vku_inputs, grid=grid, mode="pooled", chunk_size=7)
+        vectorized = self.engine.run("vku", self.vku_inputs, grid=grid)
+        np.testing.assert_allclose(
+            pooled.columns["pressure_flow_path_1"], vectorized.columns["pressure_flow_path_1"]
+        )
+
+    def test_compare_strategies(self):
+        results = self.engine.compare(
+            {"metro_vickers": MV_PARAMS, "metro_vickers_engine": MV_PARAMS},
+            grid={"temperature_cooling_water_1": [20.0, 30.0]},
+        )
+        assert set(results) == {"metro_vickers", "metro_vickers_engine"}
+        assert results["metro_vickers"].size == 2
+        assert results["metro_vickers"].columns["pressure_flow_path_1"][0] > 0
+
+    def test_batch_calculate_uses_engine(self):
+        """batch_calculate сохраняет формат: записи с результатами и варьируемыми полями."""
+        records = batch_calculate(MV_PARAMS, {
+            "mass_flow_cooling_water": [40000.0, 45000.0],
+            "temperature_cooling_water_1": [20.0, 30.0],
+        })
+        assert len(records) == 4
+        assert records[1]["mass_flow_cooling_water"] == 40000.0
+        assert records[1]["temperature_cooling_water_1"] == 30.0
+        assert records[1]["p_kgf"] > records[0]["p_kgf"]
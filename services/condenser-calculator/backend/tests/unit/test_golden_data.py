@@ -0,0 +1,149 @@
+# tests/unit/test_golden_data.py
+"""
+Юнит-тесты эталонных данных скриптов (scripts/_golden_data.py) и отчёта
+валидации (scripts/validate_golden.py).
+"""
+
+import json
+import shutil
+
+import _golden_data
+import numpy as np
+import pytest
+from _golden_data import BERMAN_DATA_PATH, berman_datasets, build_berman_golden, load_berman_golden
+from validate_golden import build_report
+
+
+pytestmark = pytest.mark.skipif(not (BERMAN_DATA_PATH / "results").is_dir(),
+                                reason="Нет эталонных данных Бермана")
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    """Копия эталонов: два набора с общей геометрией."""
+    path = tmp_path / "berman"
+    for folder, name in (("results", "results_1"), ("results", "results_2"), ("modes", "mode_1"),
+                         ("modes", "mode_2"), ("geometrys", "geometry")):
+        (path / folder).mkdir(parents=True, exist_ok=True)
+        shutil.copy(BERMAN_DATA_PATH / folder / f"{name}.json", path / folder / f"{name}.json")
+    return path
+
+
+def _add_dataset(data_path, suffix: str, geometry: bool = False) -> None:
+    shutil.copy(data_path / "results" / "results_1.json", data_path / "results" / f"results_{suffix}.json")
+    shutil.copy(data_path / "modes" / "mode_1.json", data_path / "modes" / f"mode_{suffix}.json")
+    if geometry:
+        shutil.copy(BERMAN_DATA_PATH / "geometrys" / "geometry_4.json",
+                    data_path / "geometrys" / f"geometry_{suffix}.json")
+
+
+class TestBermanDatasets:
+    """Поиск наборов эталонов в каталоге данных."""
+
+    def test_repository_datasets(self):
+        assert berman_datasets() == [
+            ("results_1", "mode_1", "geometry"),
+            ("results_2", "mode_2", "geometry"),
+            ("results_3", "mode_3", "geometry"),
+            ("results_4", "mode_4", "geometry_4"),
+        ]
+
+    def test_new_dataset_found_in_natural_order(self, data_path):
+        _add_dataset(data_path, "10", geometry=True)
+
+        assert berman_datasets(data_path) == [
+            ("results_1", "mode_1", "geometry"),
+            ("results_2", "mode_2", "geometry"),
+            ("results_10", "mode_10", "geometry_10"),
+        ]
+
+    def test_missing_mode_rejected(self, data_path):
+        (data_path / "modes" / "mode_2.json").unlink()
+        with pytest.raises(FileNotFoundError, match="mode_2"):
+            berman_datasets(data_path)
+
+
+class TestLoadBermanGolden:
+    """Колоночный кеш .npy и его перестроение."""
+
+    def test_cache_matches_build_and_is_memory_mapped(self, data_path, tmp_path):
+        expected, expected_ids = build_berman_golden(data_path)
+        columns, ids = load_berman_golden(tmp_path / "cache", data_path)
+
+        assert ids == expected_ids
+        assert set(columns) == set(expected)
+        assert isinstance(columns["expected_pressure"], np.memmap)
+        np.testing.assert_array_equal(columns["expected_pressure"], expected["expected_pressure"])
+        assert set(columns["dataset"].tolist()) == {"results_1", "results_2"}
+
+    def test_cache_reused_until_sources_change(self, data_path, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        calls = []
+        build = _golden_data.build_berman_golden
+        monkeypatch.setattr(_golden_data, "build_berman_golden",
+                            lambda path: calls.append(path) or build(path))
+
+        load_berman_golden(cache_dir, data_path)
+        load_berman_golden(cache_dir, data_path)
+        assert len(calls) == 1
+
+        # Изменилось содержимое эталона — кеш перестраивается
+        results_path = data_path / "results" / "results_2.json"
+        results = json.loads(results_path.read_text(encoding="utf-8"))
+        results["condenser_modes"][0]["table_data"][0]["pressures_axis"][0][0] = 0.5
+        results_path.write_text(json.dumps(results), encoding="utf-8")
+        columns, ids = load_berman_golden(cache_dir, data_path)
+        assert len(calls) == 2
+        first_case = next(i for i, case_id in enumerate(ids) if case_id.startswith("results_2:"))
+        assert columns["expected_pressure"][first_case] == 0.5
+
+    def test_new_dataset_rebuilds_cache(self, data_path, tmp_path):
+        cache_dir = tmp_path / "cache"
+        _, ids = load_berman_golden(cache_dir, data_path)
+
+        _add_dataset(data_path, "3")
+        columns, new_ids = load_berman_golden(cache_dir, data_path)
+
+        assert len(new_ids) == len(ids) + sum(i.startswith("results_1:") for i in ids)
+        assert "results_3" in set(columns["dataset"].tolist())
+
+
+class TestBuildReport:
+    """Сводка допусков validate_golden."""
+
+    @pytest.fixture
+    def golden(self):
+        columns = {name: np.zeros(4) for name in _golden_data.BERMAN_CASE_FIELDS}
+        columns["expected_pressure"] = np.array([1.0, 2.0, 4.0, 5.0])
+        columns["dataset"] = np.array(["results_1", "results_1", "results_2", "results_2"])
+        ids = ["results_1:a", "results_1:b", "results_2:c", "results_2:d"]
+        return columns, ids
+
+    def test_per_dataset_and_total(self, golden):
+        columns, ids = golden
+        outputs = {"P_steam_formula_atm": np.array([1.0, 2.001, 4.4, np.nan])}
+
+        reports, worst = build_report(columns, outputs, ids, rel_tolerance=0.001, worst=2)
+
+        by_dataset = {r.dataset: r for r in reports}
+        assert list(by_dataset) == ["results_1", "results_2", "all"]
+        assert by_dataset["results_1"].ok
+        assert by_dataset["results_1"].max_rel_error == pytest.approx(0.0005)
+        assert not by_dataset["results_2"].ok
+        assert by_dataset["results_2"].passed == 0
+        assert by_dataset["results_2"].not_computed == 1
+        assert by_dataset["all"].cases == 4
+        assert by_dataset["all"].passed == 2
+        # Нерассчитанная точка — худшая (inf), затем погрешность 10 %
+        assert [case["id"] for case in worst] == ["results_2:d", "results_2:c"]
+        assert worst[1]["rel_error"] == pytest.approx(0.1)
+
+    def test_missing_output_field_counts_as_not_computed(self, golden):
+        columns, ids = golden
+
+        reports, _ = build_report(columns, {}, ids, rel_tolerance=0.001, worst=0)
+
+        total = reports[-1]
+        assert total.dataset == "all"
+        assert total.not_computed == total.cases == 4
+        assert total.passed == 0
@@ -3,9 +3,16 @@
 Юнит-тесты для BermanStrategy.
 """
 
+import json
+import math
+
+import numpy as np
 import pytest
 
-from app.utils.berman_strategy import BermanStrategy
+from app.utils.berman_incremental import IncrementalBerman
+from app.utils.berman_strategy import COORD_DIMS, MAIN_RESULT_FIELDS, BermanStrategy
+from app.utils.columnar import ColumnarResult
+from app.utils.ejector import ejector_cache_info, ejector_pressure
 
 
 class TestBermanStrategy:
@@ -159,6 +166,43 @@ class TestBermanEjectorPressure:
         assert len(result['ejector_results']) == 0
 
 
+    def test_ejector_table_matches_formula(self):
+        """Таблица эжекторов (число эжекторов × температура) совпадает с формулой по точкам."""
+        temps, G_air = [30.0, 20.0, 10.0], 16.5
+        table = ejector_pressure(temps, G_air)
+
+        assert table['P_ejector_kPa'].shape == (2, 3)
+        for row, n in enumerate((1, 2)):
+            for col, t in enumerate(temps):
+                T_K = t + 273.15 + 1.0
+                exponent = -7.821541 / (T_K / 1000) + 82.86586 + 10.28 * (T_K / 1000) - 11.48776 * math.log(T_K)
+                expected = (0.009 + 0.0003 * G_air / n + math.exp(exponent) * 10) * 100
+                assert table['P_ejector_kPa'][row, col] == pytest.approx(expected, rel=1e-12)
+
+    def test_ejector_table_memoized(self):
+        """Повторный расчёт с теми же входами берёт таблицу из кеша."""
+        first = ejector_pressure([21.5, 23.5], 7.0)
+        hits = ejector_cache_info()["hits"]
+        second = ejector_pressure(np.array([21.5, 23.5]), 7.0)
+
+        assert ejector_cache_info()["hits"] == hits + 1
+        assert second['P_ejector_kPa'] is first['P_ejector_kPa']
+        assert not second['P_ejector_kPa'].flags.writeable
+
+    def test_ejector_results_order(self):
+        """Порядок 'ejector_results': число эжекторов, затем температуры от последней к первой."""
+        params = self.params_with_ejector.copy()
+        params['t1_main_list'] = [10.0, 20.0]
+        params['t1_builtin_list'] = [10.0, 20.0]
+
+        result = self.strategy.calculate(params)
+        table = ejector_pressure([20.0, 10.0], params['G_air'])
+
+        assert [r['number_of_ejectors'] for r in result['ejector_results']] == [1, 1, 2, 2]
+        np.testing.assert_array_equal([r['P_ejector_kPa'] for r in result['ejector_results']],
+                                      table['P_ejector_kPa'].ravel())
+
+
 class TestBermanEdgeCases:
     """Тесты граничных условий."""
 
@@ -236,3 +280,161 @@ class TestBermanEdgeCases:
         # Должно быть 3 результата (по одному на каждую температуру)
         # Или больше, если есть комбинации с G_steam
         assert len(result['main_results']) >= 3
+
+    def test_inactive_bundle_values_zero(self):
+        """Величины пучка без расхода воды в точке равны 0, а не значениям предыдущей точки."""
+        params = self.base_params.copy()
+        params['W_main_list'] = [12000.0, 12000.0]
+        params['W_builtin_list'] = [4000.0, 0.0]
+
+        two_bundles, main_only = self.strategy.calculate(params)['main_results']
+
+        assert two_bundles['K_dirty_builtin'] > 0
+        for name in ('B_builtin', 'Phi_c_builtin', 'K_base_builtin', 'K_clean_builtin', 'K_dirty_builtin',
+                     'delta_t_heat_builtin', 'delta_t_builtin', 't2_builtin'):
+            assert main_only[name] == 0
+        assert main_only['K_dirty_main'] > 0
+
+
+class TestBermanColumnar:
+    """Тесты колоночного результата (columnar=True)."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.strategy = BermanStrategy()
+        self.params = {
+            'L_main': 7500.0, 'L_builtin': 7500.0, 'N_main': 12000, 'N_builtin': 4000,
+            'd_in': 20.0, 'S_tube': 1.0, 'Z_main': 2, 'Z_builtin': 2,
+            'G_nom': 350.0, 'H_steam': 515.0, 'lambda': 90.0,
+            'W_main_list': [10000.0, 12000.0],
+            'W_builtin_list': [3000.0, 4000.0],
+            't1_main_list': [10.0, 20.0, 30.0],
+            't1_builtin_list': [10.0, 20.0, 30.0],
+            'G_steam_list': [100.0, 200.0],
+            'coefficient_b_list': [1.0, 0.8],
+            'G_air': 0.0,
+        }
+
+    def test_columns_match_records(self):
+        """Колонки совпадают со списком словарей по значениям и порядку строк."""
+        records = self.strategy.calculate(self.params)['main_results']
+        result = self.strategy.calculate(self.params, columnar=True)['main_results']
+
+        assert isinstance(result, ColumnarResult)
+        assert len(result) == len(records) == 2 * 2 * 3 * 2
+        assert list(result.columns) == list(MAIN_RESULT_FIELDS)
+        for name in MAIN_RESULT_FIELDS:
+            np.testing.assert_array_equal(result[name], [r[name] for r in records])
+        assert result.to_records() == records
+
+    def test_coordinates(self):
+        """Координаты строк — значения осей в порядке вложенности циклов W, b, t1, G."""
+        result = self.strategy.calculate(self.params, columnar=True)['main_results']
+
+        assert result.dims == COORD_DIMS
+        np.testing.assert_array_equal(result['W_main'][:12], 10000.0)
+        np.testing.assert_array_equal(result['coefficient_b'][:6], 1.0)
+        np.testing.assert_array_equal(result['t1_main'][:6], [10.0, 10.0, 20.0, 20.0, 30.0, 30.0])
+        np.testing.assert_array_equal(result['G_steam'][:4], [100.0, 200.0, 100.0, 200.0])
+
+    def test_jsonl_export(self, tmp_path):
+        result = self.strategy.calculate(self.params, columnar=True)['main_results']
+        path = tmp_path / "berman.jsonl"
+        result.to_jsonl(path, chunk_size=5)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == len(result)
+        row = json.loads(lines[7])
+        assert row['t1_main'] == result['t1_main'][7]
+        assert row['P_steam_formula_atm'] == result['P_steam_formula_atm'][7]
+
+    def test_jsonl_nan_as_null(self):
+        result = ColumnarResult(dims=("x",), coords={"x": np.array([1.0, 2.0])},
+                                columns={"y": np.array([np.nan, 3.0])})
+        assert [json.loads(line) for line in result.iter_jsonl()] == [
+            {"x": 1.0, "y": None}, {"x": 2.0, "y": 3.0}]
+
+    def test_parquet_export(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        result = self.strategy.calculate(self.params, columnar=True)['main_results']
+        path = tmp_path / "berman.parquet"
+        result.to_parquet(path)
+
+        table = pq.read_table(path)
+        assert table.column_names == result.names
+        np.testing.assert_array_equal(table.column('P_steam_formula_atm').to_numpy(),
+                                      result['P_steam_formula_atm'])
+        assert json.loads(table.schema.metadata[b'dims']) == list(COORD_DIMS)
+
+    def test_mismatched_lengths_rejected(self):
+        with pytest.raises(ValueError, match="разной длины"):
+            ColumnarResult(dims=("x",), coords={"x": np.zeros(2)}, columns={"y": np.zeros(3)})
+
+
+class TestIncrementalBerman:
+    """Тесты инкрементального пересчёта (кеш этапов)."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.cache = IncrementalBerman()
+        self.params = {
+            'L_main': 7500.0, 'L_builtin': 7500.0, 'N_main': 12000, 'N_builtin': 4000,
+            'd_in': 20.0, 'S_tube': 1.0, 'Z_main': 2, 'Z_builtin': 3,
+            'G_nom': 350.0, 'H_steam': 515.0, 'lambda': 90.0,
+            'W_main_list': [10000.0, 12000.0],
+            'W_builtin_list': [3000.0, 4000.0],
+            't1_main_list': [10.0, 20.0, 36.0],
+            't1_builtin_list': [12.0, 0.0, 31.0],
+            'G_steam_list': [50.0, 200.0],
+            'coefficient_b_list': [1.0, 0.8],
+            'G_air': 16.5,
+        }
+
+    @pytest.mark.parametrize("changes", [
+        {},
+        {'W_builtin_list': [0.0]},
+        {'W_builtin_list': [], 't1_builtin_list': []},
+        {'L_builtin': 0.0, 'N_builtin': 0},
+        {'W_main_list': [0.0, 5000.0]},
+    ])
+    def test_matches_strategy(self, changes):
+        """Результат совпадает с BermanStrategy.calculate точно."""
+        params = {**self.params, **changes}
+        expected = BermanStrategy().calculate(params)
+        result = self.cache.calculate(params)
+
+        assert result['main_results'] == expected['main_results']
+        assert result['ejector_results'] == expected['ejector_results']
+
+    def test_fouling_change_recomputes_solution_only(self):
+        self.cache.calculate(self.params)
+        stages = self.cache.calculate({**self.params, 'coefficient_b_list': [1.0, 0.7]})['stages']
+
+        assert stages['load']['computed'] == 0
+        assert stages['heat_transfer']['computed'] == 0
+        # Пересчитаны только точки с новым коэффициентом чистоты: 2 W × 3 t1 × 2 G
+        assert stages['solution']['computed'] == 12
+
+    def test_temperature_change_recomputes_its_slice(self):
+        self.cache.calculate(self.params)
+        changed = {**self.params, 't1_main_list': [10.0, 21.0, 36.0]}
+        result = self.cache.calculate(changed)
+        stages = result['stages']
+
+        assert stages['velocity']['computed'] == 0
+        assert stages['heat_transfer']['computed'] == 2   # по одной новой паре t1 на каждый W
+        assert stages['load']['computed'] == 4
+        assert stages['solution']['computed'] == 8
+        assert result['main_results'] == BermanStrategy().calculate(changed)['main_results']
+
+    def test_repeat_reuses_everything(self):
+        self.cache.calculate(self.params)
+        stages = self.cache.calculate(self.params)['stages']
+        assert all(report['computed'] == 0 for report in stages.values())
+
+    def test_cache_bounded(self):
+        cache = IncrementalBerman(max_entries=5)
+        cache.calculate(self.params)
+        assert max(cache.cache_sizes().values()) == 5
+        cache.clear()
+        assert not any(cache.cache_sizes().values())
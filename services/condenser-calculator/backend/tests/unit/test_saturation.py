@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from app.utils.saturation import (
+    saturation_pressure,
+    saturation_pressure_berman,
+    saturation_temperature,
+)
+
+
+seuif97 = pytest.importorskip("seuif97")
+
+
+class TestSaturationKernel:
+    """Тесты векторизованного ядра линии насыщения (IF97, Область 4)."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.temperatures = np.linspace(0.5, 370.0, 500)
+
+    def test_pressure_matches_seuif97(self):
+        """P_sat(T) совпадает с seuif97.tx(t, 1.0, 0) по всему диапазону."""
+        expected = np.array([seuif97.tx(t, 1.0, 0) for t in self.temperatures])
+        calculated = saturation_pressure(self.temperatures)
+        np.testing.assert_allclose(calculated, expected, rtol=1e-9)
+
+    def test_temperature_matches_seuif97(self):
+        """T_sat(P) совпадает с seuif97.px(p, 1.0, 1)."""
+        pressures = saturation_pressure(self.temperatures)
+        expected = np.array([seuif97.px(p, 1.0, 1) for p in pressures])
+        calculated = saturation_temperature(pressures)
+        np.testing.assert_allclose(calculated, expected, rtol=1e-9, atol=1e-7)
+
+    def test_round_trip(self):
+        """T_sat(P_sat(T)) возвращает исходную температуру."""
+        back = saturation_temperature(saturation_pressure(self.temperatures))
+        np.testing.assert_allclose(back, self.temperatures, atol=1e-8)
+
+    def test_scalar_input_returns_float(self):
+        """Скалярный вход возвращает float."""
+        p = saturation_pressure(30.0)
+        assert isinstance(p, float)
+        assert p == pytest.approx(0.0042466883392411215, rel=1e-8)
+        assert isinstance(saturation_temperature(p), float)
+
+    def test_scalar_path_matches_array(self):
+        """Скаляр (float, numpy-скаляр, 0-мерный массив) считается без массивов и совпадает с векторным расчётом."""
+        pressures = saturation_pressure(self.temperatures)
+        for i in range(0, self.temperatures.size, 50):
+            t = self.temperatures[i]
+            for value in (float(t), np.float64(t), np.array(t)):
+                assert type(saturation_pressure(value)) is float
+                assert saturation_pressure(value) == pytest.approx(pressures[i], rel=1e-14)
+            assert saturation_temperature(float(pressures[i])) == pytest.approx(t, rel=1e-12)
+            assert saturation_pressure_berman(float(t)) == pytest.approx(
+                saturation_pressure_berman(self.temperatures)[i], rel=1e-14)
+        assert np.isnan(saturation_pressure(-5.0)) and np.isnan(saturation_pressure(400))
+        assert np.isnan(saturation_temperature(1e-6)) and np.isnan(saturation_temperature(30.0))
+
+    def test_out_of_range_is_nan(self):
+        """Точки вне области IF97 дают NaN, а не исключение."""
+        p = saturation_pressure(np.array([-5.0, 30.0, 400.0]))
+        assert np.isnan(p[0]) and np.isnan(p[2])
+        assert p[1] > 0
+        t = saturation_temperature(np.array([1e-6, 0.1, 30.0]))
+        assert np.isnan(t[0]) and np.isnan(t[2])
+
+    def test_berman_formula_vectorized(self):
+        """Аппроксимация Бермана на массиве совпадает с поэлементным расчётом."""
+        t = np.array([10.0, 30.0, 50.0])
+        values = saturation_pressure_berman(t)
+        scalars = [saturation_pressure_berman(float(v)) for v in t]
+        np.testing.assert_allclose(values, scalars, rtol=1e-15)
+        # Аппроксимация близка к IF97 в рабочем диапазоне конденсатора
+        np.testing.assert_allclose(values, saturation_pressure(t), rtol=5e-3)
@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 
 from app.utils.base_for_selection import ProblemDefinition
-from app.utils.selection_methods import AnalyticalSolver, BisectionSolver, NewtonSolver
+from app.utils.selection_methods import AnalyticalSolver, BisectionSolver, NewtonSolver, Solver
 
 
 class TestSolvers:
@@ -49,3 +50,72 @@ class TestSolvers:
         # На отрезке [3, 10] f(x) одного знака для данной задачи
         with pytest.raises(ValueError, match="функция имеет одинаковый знак"):
             solver.solve(self.target_delta, a=3.0, b=10.0)
+
+
+class TestSolverInterface:
+    """Тесты общего интерфейса решателей."""
+
+    def test_missing_method_fails_on_creation(self):
+        """Тест: Решатель без solve_many не создаётся."""
+        class ScalarOnlySolver(Solver):
+            def solve(self, target_delta, **kwargs):
+                return 0.0
+
+        with pytest.raises(TypeError, match="solve_many"):
+            ScalarOnlySolver(ProblemDefinition())
+        with pytest.raises(TypeError):
+            Solver(ProblemDefinition())
+
+
+class TestVectorizedSolvers:
+    """Тесты векторных решателей solve_many."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.problem = ProblemDefinition()
+        self.targets = np.linspace(-0.05, 0.02, 40)
+        self.expected = AnalyticalSolver(self.problem).solve_many(self.targets)
+
+    def test_analytical_matches_scalar(self):
+        """Тест: Векторный аналитический решатель совпадает со скалярным."""
+        solver = AnalyticalSolver(self.problem)
+        scalar = [solver.solve(t) for t in self.targets]
+        np.testing.assert_allclose(self.expected, scalar, rtol=1e-14)
+
+    def test_bisection_per_element_brackets(self):
+        """Тест: Дихотомия с поэлементными отрезками; неверный отрезок даёт NaN."""
+        solver = BisectionSolver(self.problem, tol=1e-9)
+        b = np.full(self.targets.shape, 10.0)
+        b[0] = 1.5  # на [1, 1.5] корня нет
+        result = solver.solve_many(self.targets, a=1.0, b=b)
+
+        assert np.isnan(result[0])
+        assert not solver.stats.converged[0]
+        assert solver.stats.failed == 1
+        np.testing.assert_allclose(result[1:], self.expected[1:], atol=1e-8)
+        assert solver.iterations == solver.stats.iterations > 10
+
+    def test_newton_converges_for_all(self):
+        solver = NewtonSolver(self.problem, tol=1e-12)
+        result = solver.solve_many(self.targets)
+        assert solver.stats.converged.all()
+        assert solver.stats.fallback == 0
+        np.testing.assert_allclose(result, self.expected, atol=1e-8)
+        assert solver.stats.iterations < 10
+
+    def test_newton_falls_back_to_bisection(self):
+        """Тест: Расходящиеся элементы Ньютона досчитываются дихотомией."""
+        solver = NewtonSolver(self.problem, tol=1e-12)
+        guesses = np.full(self.targets.shape, 2.0)
+        guesses[:5] = 10.0  # из X=10 итерация уходит в X < 0
+        result = solver.solve_many(self.targets, initial_guess=guesses)
+
+        assert solver.stats.fallback == 5
+        assert solver.stats.converged.all()
+        np.testing.assert_allclose(result, self.expected, atol=1e-8)
+
+    def test_scalar_input_shape(self):
+        solver = NewtonSolver(self.problem)
+        result = solver.solve_many(0.001)
+        assert result.shape == ()
+        assert float(result) == pytest.approx(2.0694058273, abs=1e-7)
@@ -3,7 +3,8 @@ import logging
 import numpy as np
 import pytest
 
-from app.utils.table_models import Table1D, Table2D, interpolate_trilinear
+from app.utils import table_models
+from app.utils.table_models import Table1D, Table2D, Table3D, interpolate_trilinear
 
 
 logging.disable(logging.CRITICAL)
@@ -96,6 +97,57 @@ class TestOptimizedTable1D:
         table_small = Table1D(x_small, y_small, max_extrap_degree=5)
         assert table_small._best_extrap_degree == 2
 
+    # --- Ленивая экстраполяция и агрегированные предупреждения ---
+
+    def test_extrapolation_model_is_fitted_lazily(self, monkeypatch):
+        """Модель подбирается при первой экстраполяции и только один раз."""
+        calls = []
+        original_polyfit = np.polyfit
+        monkeypatch.setattr(np, "polyfit", lambda *a, **k: calls.append(a[2]) or original_polyfit(*a, **k))
+
+        table = Table1D(self.x_data, self.y_data)
+        table(30.0)
+        assert calls == []
+
+        table(125.0)
+        table(np.array([-10.0, 130.0]))
+        assert calls == [1, 2, 3]
+
+    def test_extrapolation_warnings_are_rate_limited(self, monkeypatch):
+        messages = []
+        monkeypatch.setattr(table_models.logger, "warning", messages.append)
+        table = Table1D(self.x_data, self.y_data)
+
+        for x in (100.0, 110.0, 120.0):
+            table(x)
+        table(np.array([-5.0, 30.0, 200.0]))
+
+        assert len(messages) == 1
+        assert table.extrapolation_count == 5
+
+        monkeypatch.setattr(table_models, "EXTRAP_WARNING_INTERVAL", 0.0)
+        table(90.0)
+        assert len(messages) == 2
+        assert "5 точка(и)" in messages[1]
+
+    def test_bulk_construction(self):
+        """Набор таблиц с общей осью X из одного массива значений."""
+        y_values = np.vstack([self.y_data, 2 * self.y_data, self.y_data + 1])
+        tables = Table1D.bulk(self.x_data[::-1], y_values[:, ::-1])
+
+        assert len(tables) == 3
+        for table, y in zip(tables, y_values, strict=True):
+            single = Table1D(self.x_data, y)
+            assert np.array_equal(table.x_cords, self.x_data)
+            assert table(30.0) == pytest.approx(single(30.0))
+            assert table(125.0) == pytest.approx(single(125.0))
+
+    def test_bulk_construction_fails(self):
+        with pytest.raises(ValueError, match="Координаты X должны быть строго возрастающими"):
+            Table1D.bulk(np.array([[1, 2, 3], [1, 1, 2]]), np.ones((2, 3)))
+        with pytest.raises(ValueError, match="Размеры x_cords и y_cords должны совпадать"):
+            Table1D.bulk(np.array([1, 2]), np.ones((2, 3)))
+
 
 class TestTable2DAndTrilinear:
     """ Тесты для Table2D и трилинейной интерполяции. """
@@ -136,3 +188,61 @@ class TestTable2DAndTrilinear:
         result = interpolate_trilinear(self.table_a2, self.a_val2, self.table_a1, self.a_val1,
                                        self.target_x, self.target_y, target_a=7500.0)
         assert result == z_at_8000
+
+
+class TestTable3D:
+    """ Тесты семейства характеристик Table3D. """
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.x_cords = np.array([25.0, 30.0, 33.0, 35.0])
+        self.y_cords = np.array([20.0, 50.0, 100.0, 150.0, 200.0])
+        z_a1 = np.array([
+            [6.549, 7.211, 8.88, 10.945, 13.409], [5.9, 6.499, 8.018, 9.927, 12.214],
+            [5.036, 5.552, 6.872, 8.572, 10.622], [3.851, 4.257, 5.299, 6.712, 8.438]
+        ])[::-1, :]
+        z_a2 = np.array([
+            [6.635, 7.384, 9.285, 11.678, 14.582], [5.979, 6.655, 8.384, 10.591, 13.28],
+            [5.104, 5.687, 7.184, 9.144, 11.546], [3.906, 4.362, 5.539, 7.158, 9.169]
+        ])[::-1, :]
+        self.table_a1 = Table2D(self.x_cords, self.y_cords, z_a1)
+        self.table_a2 = Table2D(self.x_cords, self.y_cords, z_a2)
+        self.family = Table3D.from_tables({9000.0: self.table_a1, 8000.0: self.table_a2})
+
+    def test_matches_interpolate_trilinear(self):
+        """Векторный расчёт совпадает с поточечной interpolate_trilinear."""
+        rng = np.random.default_rng(0)
+        x = rng.uniform(25.0, 35.0, 200)
+        y = rng.uniform(20.0, 200.0, 200)
+        a = rng.uniform(7500.0, 9500.0, 200)
+
+        result = self.family(x, y, a)
+        expected = [
+            interpolate_trilinear(self.table_a2, 8000.0, self.table_a1, 9000.0, xi, yi, ai)
+            for xi, yi, ai in zip(x, y, a, strict=True)
+        ]
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+    def test_scalar_point(self):
+        assert self.family(27.0, 112.0, 8800.0) == pytest.approx(6.360, abs=1e-3)
+
+    def test_grid_nodes(self):
+        assert self.family(30.0, 50.0, 9000.0) == pytest.approx(self.table_a1(30.0, 50.0))
+
+    def test_out_of_domain_is_nan(self):
+        result = self.family(np.array([20.0, 27.0, 27.0, np.nan]),
+                             np.array([50.0, 250.0, 112.0, 112.0]), 8500.0)
+        assert np.isnan(result[[0, 1, 3]]).all()
+        assert not np.isnan(result[2])
+
+    def test_broadcasting(self):
+        """Сетка x × y для одного значения A."""
+        result = self.family(self.x_cords[:, None], self.y_cords[None, :], 8000.0)
+        np.testing.assert_allclose(result, self.table_a2.z_values)
+
+    def test_from_tables_validation(self):
+        other = Table2D(self.x_cords + 1.0, self.y_cords, self.table_a1.z_values)
+        with pytest.raises(ValueError, match="одинаковые оси"):
+            Table3D.from_tables({1.0: self.table_a1, 2.0: other})
+        with pytest.raises(ValueError, match="не менее двух"):
+            Table3D.from_tables({1.0: self.table_a1})
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.utils import Constants, calculation_engine, tables
+from app.utils.VKU_strategy import VKUStrategy
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Бюджет времени импорта движка методик (без запуска интерпретатора), с
+IMPORT_TIME_BUDGET_S = 0.5
+
+
+def _import_report(module: str) -> tuple[float, set[str]]:
+    """Время импорта модуля по `-X importtime` и загруженные тяжёлые зависимости."""
+    code = (f"import sys, {module}; "
+            "print(','.join(m for m in ('scipy', 'seuif97', 'pandas') if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND_DIR,
+                          capture_output=True, text=True, check=True)
+    cumulative_us = next(int(line.split("|")[1]) for line in proc.stderr.splitlines()
+                         if line.rstrip().endswith(f"| {module}"))
+    loaded = set(filter(None, proc.stdout.strip().split(",")))
+    return cumulative_us / 1e6, loaded
+
+
+class TestTablesStore:
+    """Тесты хранилища справочных таблиц."""
+
+    def test_k_table_shape(self):
+        assert tables.get_table("k_values").shape == (
+            tables.get_table("k_speed_points").size, tables.get_table("k_temperature_points").size)
+        assert tables.get_table("k_values")[0, 0] == 800
+
+    def test_vku_table_shape(self):
+        assert tables.get_table("vku_pressure").shape == (
+            tables.get_table("vku_mass_flow_reduced").size, tables.get_table("vku_temperature_air").size)
+
+    def test_tables_are_read_only(self):
+        with pytest.raises(ValueError):
+            tables.get_table("k_values")[0, 0] = 0.0
+
+    def test_unknown_table(self):
+        with pytest.raises(KeyError, match="отсутствует"):
+            tables.get_table("no_such_table")
+
+    def test_legacy_module_attributes(self):
+        """Прежние атрибуты модулей читаются из того же хранилища."""
+        assert Constants.k_interpolation_data == calculation_engine.k_interpolation_data
+        assert Constants.k_interpolation_data["k_values_matrix"] == tables.get_table("k_values").tolist()
+        assert tables.vku_pressure_data() == Constants._P_DATA
+
+    def test_legacy_module_attributes_cached(self):
+        """Таблица собирается один раз и дальше берётся из атрибута модуля."""
+        assert calculation_engine.k_interpolation_data is calculation_engine.k_interpolation_data
+        assert "k_interpolation_data" in vars(calculation_engine)
+        assert Constants._P_DATA is Constants._P_DATA
+
+    def test_vku_interpolator_shared(self):
+        assert VKUStrategy(1250.0, 0.92)._interpolator is VKUStrategy(1000.0, 0.9)._interpolator
+
+    def test_save_tables_roundtrip(self, tmp_path):
+        path = tmp_path / "tables.npz"
+        tables.save_tables({"axis": [1, 2, 3]}, path)
+        with np.load(path) as store:
+            np.testing.assert_array_equal(store["axis"], [1.0, 2.0, 3.0])
+
+
+class TestImportTime:
+    """Импорт движка не тянет scipy/seuif97 и укладывается в бюджет."""
+
+    def test_engine_import_is_light(self):
+        seconds, loaded = _import_report("app.utils.condenser_engine")
+        assert not loaded & {"scipy", "seuif97"}
+        assert seconds < IMPORT_TIME_BUDGET_S, f"Импорт занял {seconds:.3f} с"
+
+    def test_table_models_import_keeps_logging_config(self):
+        code = "import logging, app.utils.table_models; print(logging.getLogger().handlers)"
+        proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True)
+        assert proc.stdout.strip() == "[]"
@@ -6,6 +6,7 @@
 """
 import contextlib
 
+import numpy as np
 import pytest
 
 from app.utils.uniconv import (
@@ -139,3 +140,52 @@ def test_unknown_unit_raises(uc: UnitConverter):
     with pytest.raises(UnknownUnitError):
         uc.convert(1, from_unit="foo", to_unit="bar", parameter_type="pressure")
 
+
+
+# ------------------------------------------------------------------
+# 5. Скомпилированные конверсии (plan) и общий реестр
+# ------------------------------------------------------------------
+def test_plan_matches_convert_on_arrays(uc: UnitConverter):
+    """Аффинный план на массиве совпадает с поэлементным convert()."""
+    values = np.linspace(0.001, 0.02, 50)
+    for param, src, dst in (("pressure", "МПа", "кгс/см²"), ("temperature", "K", "°C"),
+                            ("pressure", "кПа", "мм рт. ст."), ("quality", "%", "fraction")):
+        plan = uc.plan(param, src, dst)
+        assert plan.is_affine
+        expected = [uc.convert(v, from_unit=src, to_unit=dst, parameter_type=param) for v in values]
+        np.testing.assert_allclose(plan(values), expected, rtol=1e-14, atol=1e-12)
+
+
+def test_plan_is_cached_and_shared():
+    """План строится один раз и общий для экземпляров с реестром по умолчанию."""
+    plan = UnitConverter().plan("pressure", "бар", "Па")
+    assert UnitConverter().plan("pressure", "бар", "Па") is plan
+    assert plan(2.0) == pytest.approx(200_000.0)
+
+
+def test_plan_on_pandas_column():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"t": [0.0, 100.0]})
+    df["t_k"] = UnitConverter().plan("temperature", "°C", "K")(df["t"])
+    assert df["t_k"].tolist() == pytest.approx([273.15, 373.15])
+
+
+def test_plan_non_linear_unit():
+    """Для функции без affine план — композиция функций to_base/from_base."""
+    local = UnitConverter()
+    local.add_unit("temperature", unit_symbol="°F", unit_name="градус Фаренгейта",
+                   to_base=lambda f: (f - 32) * 5.0 / 9.0,
+                   from_base=lambda c: c * 9.0 / 5.0 + 32)
+    plan = local.plan("temperature", "°F", "K")
+    assert not plan.is_affine
+    np.testing.assert_allclose(plan(np.array([32.0, 212.0])), [273.15, 373.15])
+
+
+def test_extension_does_not_leak_into_shared_registry():
+    """Расширение одного конвертера не меняет реестр остальных."""
+    local = UnitConverter()
+    local.add_unit("pressure", unit_symbol="Торр", unit_name="торр", to_base=133.322 / 98_066.5)
+    assert "Торр" in local.get_available_units("pressure")
+    assert "Торр" not in UnitConverter().get_available_units("pressure")
+    with pytest.raises(UnknownUnitError):
+        UnitConverter().plan("pressure", "Торр", "Па")